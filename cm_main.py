@@ -1,8 +1,6 @@
 from datetime import date, timedelta
 
-import copernicusmarine as cm
-
-from src import config
+from src.config import cfg
 from src.copernicus.cm_credentials import CMCredentials
 from src.copernicus.cm_subset_client import CMSubsetClient
 
@@ -28,9 +26,11 @@ def main():
     # Example: one-off coarse bounding box for Galicia
     bboxes = [(-10.0, -7.0, 41.8, 44.0)]
 
-    output_dir = config.OUTPUT_PATH / "sst_coarse_bb"
+    output_dir = cfg.output_path / "sst_coarse_bb"
     year = 2020
 
+    import copernicusmarine as cm  # deferred: slow SDK import
+
     creds = CMCredentials()
     creds.ensure_present()
 
@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+import math
+import shutil
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
-import numpy as np
 import pandas as pd
 
 from src.config import cfg  # unified config object
 from src.data_processing.assign_hauls_to_tiles_id import HaulTileAssigner, StaticSpec
+from src.data_processing.haul_tile_batch import (
+    BatchOptions,
+    BatchPart,
+    HaulTileBatchAssigner,
+)
 from src.data_processing.tile_days_builder import ColumnConfig, TileDaysBuilder
 
+# Settings this action reads (validated together at the start of run()).
+REQUIRED_SETTINGS = (
+    "input_path",
+    "output_path",
+    "product_owner",
+    "product_slug",
+    "static_filename",
+)
+
 
 def assign_tiles_to_hauls(
     hauls: pd.DataFrame,
@@ -22,8 +37,6 @@ def assign_tiles_to_hauls(
     time_col: str = "time",
     tolerance_deg: Optional[float] = None,
 ) -> pd.DataFrame:
-    lat0_hint = float(np.nanmedian(hauls[lat_col].to_numpy()))
-
     assigner = HaulTileAssigner(
         static_spec=StaticSpec(
             path=static_nc_path, mask_var=mask_var, is_bit=is_bit, sea_value=sea_value
@@ -32,11 +45,43 @@ def assign_tiles_to_hauls(
         lat_col=lat_col,
         time_col=time_col,
     )
-    assigner.load_static_and_build_index(lat0_hint=lat0_hint)
+    assigner.load_static_and_build_index()
     enriched = assigner.assign(hauls, tolerance_deg=tolerance_deg)
     return enriched
 
 
+def assign_tiles_to_haul_files(
+    haul_paths: Sequence[Path],
+    static_nc_path: Path,
+    out_dir: Path,
+    index_dir: Optional[Path] = None,
+    mask_var: str = "mask",
+    is_bit: bool = True,
+    sea_value: int = 1,
+    workers: Optional[int] = None,
+    output_format: str = "csv",
+    tolerance_deg: Optional[float] = None,
+    lat0: Optional[float] = None,
+    chunk_bytes: int = 64 * 1024 * 1024,
+) -> List[BatchPart]:
+    """
+    Batch variant of assign_tiles_to_hauls: one index (lat0 from the static grid
+    unless given) shared by a process pool over many haul CSVs; parts are
+    written to out_dir.
+    """
+    batch = HaulTileBatchAssigner(
+        static_spec=StaticSpec(
+            path=static_nc_path, mask_var=mask_var, is_bit=is_bit, sea_value=sea_value
+        ),
+        index_dir=index_dir or (out_dir / "_index"),
+        lat0=lat0,
+        workers=workers,
+        chunk_bytes=chunk_bytes,
+        options=BatchOptions(tolerance_deg=tolerance_deg, output_format=output_format),
+    )
+    return batch.run(haul_paths, out_dir)
+
+
 def build_tiles_dbs(
     hauls_db: pd.DataFrame, static_layer_path: Path, mask_var: str = "mask"
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -54,7 +99,38 @@ def build_tiles_dbs(
     return enriched, per_day_df
 
 
-def run() -> None:
+def build_tiles_dbs_parallel(
+    hauls_csv: Path, static_layer_path: Path, work_dir: Path, workers: int
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    build_tiles_dbs over a haul CSV with a pool of `workers` processes: the file
+    is cut into about one chunk per worker, and the index (same lat0 as the
+    in-memory path: median grid latitude) is kept in work_dir for later runs.
+    """
+    parts_dir = work_dir / "_assign_parts"
+    chunk_bytes = math.ceil(hauls_csv.stat().st_size / workers)
+    parts = assign_tiles_to_haul_files(
+        [hauls_csv],
+        static_layer_path,
+        parts_dir,
+        index_dir=work_dir / "_haul_tile_index",
+        workers=workers,
+        lat0=None,
+        chunk_bytes=max(chunk_bytes, 1024 * 1024),
+    )
+    try:
+        merged = HaulTileBatchAssigner.concat_csv_parts(parts, parts_dir / "all.csv")
+        enriched = pd.read_csv(merged)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+    builder = TileDaysBuilder(columns=ColumnConfig(time="time"))
+    return enriched, builder.build_per_day(enriched)
+
+
+def run(workers: Optional[int] = None) -> None:
+    """workers > 1 assigns tiles in a process pool (build_tiles_dbs_parallel)."""
+    cfg.require(REQUIRED_SETTINGS)
     owner = cfg.product_owner
 
     # haul_df = pd.read_csv(cfg.input_path / owner / "capturas_2023_nueva.csv", encoding="latin-1")
@@ -72,13 +148,19 @@ def run() -> None:
     # haul_db_builder = HaulDbBuilder(haul_df, haul_correction_df)
     # clean_haul_df = haul_db_builder.run(selected_columns)
 
-    clean_haul_df = pd.read_csv(cfg.input_path / owner / "clean_haul_db.csv")
-    haul_with_tiles_df, tiles_with_date_df = build_tiles_dbs(
-        clean_haul_df, static_nc, mask_var="mask"
-    )
+    clean_haul_csv = cfg.input_path / owner / "clean_haul_db.csv"
+    out_dir = cfg.output_path / owner / cfg.product_slug
+    if workers is not None and workers > 1:
+        haul_with_tiles_df, tiles_with_date_df = build_tiles_dbs_parallel(
+            clean_haul_csv, static_nc, out_dir, workers
+        )
+    else:
+        clean_haul_df = pd.read_csv(clean_haul_csv)
+        haul_with_tiles_df, tiles_with_date_df = build_tiles_dbs(
+            clean_haul_df, static_nc, mask_var="mask"
+        )
 
     # clean_haul_df.to_csv(out_dir / "clean_haul_db.csv", index=False)
-    out_dir = cfg.output_path / owner / cfg.product_slug
     haul_with_tiles_df.to_csv(out_dir / "haul_with_tiles_db.csv", index=False)
     tiles_with_date_df.to_csv(out_dir / "tiles_with_date_db.csv", index=False)
 
@@ -1,10 +1,22 @@
-import copernicusmarine as cm
-
 from src.app.downloader import Downloader
 from src.config import cfg
 
-if __name__ == "__main__":
-    # Ensure hauls are unique
+# Settings this action reads (validated together at the start of run()).
+REQUIRED_SETTINGS = (
+    "dataset_id",
+    "region_min_lon",
+    "region_max_lon",
+    "region_min_lat",
+    "region_max_lat",
+    "input_path",
+    "product_owner",
+    "static_filename",
+)
+
+
+def run() -> None:
+    cfg.require(REQUIRED_SETTINGS)
+    import copernicusmarine as cm  # deferred: slow SDK import
 
     downloader = Downloader(cm_handle=cm)
     downloader.download_static(
@@ -20,3 +32,7 @@ if __name__ == "__main__":
         / "static_data"
         / cfg.static_filename,
     )
+
+
+if __name__ == "__main__":
+    run()
@@ -1,19 +1,85 @@
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Optional
+
 import pandas as pd
 
 from src.app.csv_amalgamation import CSVAmalgamation
-from src.app.download_and_convert import DownloadAndConvert
+from src.app.download_and_convert import DownloadAndConvert, convert_products
+from src.app.jobs import JobTable
 from src.config import cfg
 from src.copernicus.cm_credentials import CMCredentials
 
+# Settings this action reads (validated together at the start of run()).
+REQUIRED_SETTINGS = (
+    "input_path",
+    "output_root",
+    "product_owner",
+    "product_slug",
+    "tile_csv_filename",
+    "dataset_id",
+    "variables",
+    "spatial_resolution_deg",
+    "region_min_lon",
+    "region_max_lon",
+    "region_min_lat",
+    "region_max_lat",
+    "lat_band_count",
+    "bbox_max_tiles",
+    "depth_levels_file",
+    "depth_bucket_edges",
+    "depth_max_extra_levels",
+    "aws_max_concurrency",
+)
+# The convert and amalgamate stages alone only touch the product tree.
+CONVERT_SETTINGS = ("output_root", "product_slug", "variables")
 
-def run(download_and_convert: int) -> None:
-    CMCredentials().ensure_present()
+
+def _download_and_convert(
+    previous_tiles_csv: Optional[Path], workers: Optional[int]
+) -> DownloadAndConvert:
+    cfg.require(REQUIRED_SETTINGS)
     tiles_df = pd.read_csv(
         cfg.input_path / cfg.product_owner / cfg.product_slug / cfg.tile_csv_filename
     )
-    dac = DownloadAndConvert(tiles_df)
+    previous_df = (
+        None if previous_tiles_csv is None else pd.read_csv(previous_tiles_csv)
+    )
+    return DownloadAndConvert(tiles_df, previous_tiles_df=previous_df, workers=workers)
+
+
+def plan(previous_tiles_csv: Optional[Path] = None) -> JobTable:
+    """Job table of the next download, without credentials or network."""
+    return _download_and_convert(previous_tiles_csv, None).plan()
+
+
+def download(
+    previous_tiles_csv: Optional[Path] = None, workers: Optional[int] = None
+) -> None:
+    dac = _download_and_convert(previous_tiles_csv, workers)
+    CMCredentials().ensure_present()
+    dac.run(1)
+
+
+def convert(workers: Optional[int] = None) -> None:
+    cfg.require(CONVERT_SETTINGS)
+    convert_products(workers)
+
+
+def amalgamate() -> None:
+    cfg.require(CONVERT_SETTINGS)
+    CSVAmalgamation(product_root=cfg.output_root / cfg.product_slug).run()
+
+
+def run(
+    download_and_convert: int,
+    previous_tiles_csv: Optional[Path] = None,
+    workers: Optional[int] = None,
+) -> None:
+    """previous_tiles_csv: last run's tiles_with_date table; enables delta mode."""
+    dac = _download_and_convert(previous_tiles_csv, workers)
+    CMCredentials().ensure_present()
     dac.run(download_and_convert)
     CSVAmalgamation(product_root=cfg.output_root / cfg.product_slug).run()
 
@@ -3,44 +3,109 @@ from __future__ import annotations
 import logging
 import shutil
 from pathlib import Path
+from typing import Optional
 
 from src import utils
+from src.app.archiver import make_archiver
+from src.app.s3_stream_upload import stream_zip_dir_to_s3
+from src.app.s3_sync import S3TreeSync, SyncManifest
+from src.app.tracing import annotate, traced
 from src.config import cfg  # unified config object
 
+# Settings this action reads (validated together at the start of run()).
+REQUIRED_SETTINGS = (
+    "output_root",
+    "product_slug",
+    "s3_bucket",
+    "s3_output_prefix",
+    "aws_clean",
+    "aws_verbose",
+    "aws_policy",
+    "aws_progress_step",
+    "aws_max_concurrency",
+    "aws_upload_mode",
+    "archive_format",
+    "archive_level",
+    "archive_workers",
+)
+
 
 def _configure_logging(verbose: bool) -> None:
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(message)s")
 
 
-def _s3_key_for_product_zip(product_slug: str) -> str:
-    # Store as: <prefix>/<product_slug>.zip
+def _s3_key_for_product_zip(product_slug: str, suffix: str = ".zip") -> str:
+    # Store as: <prefix>/<product_slug>.zip (or .tar.zst)
     prefix = cfg.s3_output_prefix.rstrip("/")
-    return f"{prefix}/{product_slug}.zip" if prefix else f"{product_slug}.zip"
+    name = f"{product_slug}{suffix}"
+    return f"{prefix}/{name}" if prefix else name
+
 
+@traced("zip+upload product")
+def _zip_and_upload_product(
+    product_root: Path, product_slug: str, workers: Optional[int] = None
+) -> None:
+    import boto3  # only needed for the upload itself
 
-@utils.timed("zip+upload product")
-def _zip_and_upload_product(product_root: Path, product_slug: str) -> None:
-    zipper = utils.ProductZipper()
-    archive_path = zipper.zip_dir(
-        product_root, out_dir=product_root.parent, name=product_slug
+    archiver = make_archiver(
+        cfg.archive_format,
+        level=cfg.archive_level,
+        workers=workers or cfg.archive_workers,
+    )
+    key = _s3_key_for_product_zip(product_slug, archiver.suffix)
+    logging.info("Streaming %s to s3://%s/%s", product_root, cfg.s3_bucket, key)
+    summary = stream_zip_dir_to_s3(
+        product_root,
+        boto3.client("s3"),
+        cfg.s3_bucket,
+        key,
+        max_concurrency=workers or cfg.aws_max_concurrency,
+        archiver=archiver,
+        progress_step=cfg.aws_progress_step,
+    )
+    annotate(
+        files=summary.files,
+        bytes_in=summary.bytes_in,
+        bytes=summary.bytes_out,
+        parts=summary.parts,
     )
-    size = archive_path.stat().st_size
-    logging.info("Archive created: %s (%s)", archive_path.name, utils.human_bytes(size))
+    logging.info(
+        "Upload complete: %d files, %s in, %s archive in %d parts",
+        summary.files,
+        utils.human_bytes(summary.bytes_in),
+        utils.human_bytes(summary.bytes_out),
+        summary.parts,
+    )
+
 
-    key = _s3_key_for_product_zip(product_slug)
-    logging.info("Uploading to s3://%s/%s", cfg.s3_bucket, key)
-    utils.upload_file_to_s3(archive_path, cfg.s3_bucket, key)
-    logging.info("Upload complete")
+@traced("sync product")
+def _sync_product(
+    product_root: Path, product_slug: str, workers: Optional[int] = None
+) -> None:
+    import boto3  # only needed for the upload itself
 
-    try:
-        archive_path.unlink()
-        logging.debug("Removed local archive %s", archive_path)
-    except Exception:
-        logging.warning("Could not remove local archive %s", archive_path)
+    prefix = cfg.s3_output_prefix.rstrip("/")
+    manifest = SyncManifest(product_root.parent / f".{product_slug}.s3-manifest.json")
+    summary = S3TreeSync(
+        boto3.client("s3"),
+        cfg.s3_bucket,
+        f"{prefix}/{product_slug}" if prefix else product_slug,
+        manifest,
+        policy=cfg.aws_policy,
+        max_concurrency=workers or cfg.aws_max_concurrency,
+        progress_step=cfg.aws_progress_step,
+    ).sync(product_root)
+    annotate(
+        uploaded=summary.uploaded,
+        skipped=summary.skipped,
+        bytes=summary.bytes_uploaded,
+    )
 
 
-def run() -> None:
+def run(workers: Optional[int] = None) -> None:
+    """workers overrides both ARCHIVE_WORKERS and AWS_MAX_CONCURRENCY."""
+    cfg.require(REQUIRED_SETTINGS)
     _configure_logging(cfg.aws_verbose)
 
     product_root = cfg.output_root / cfg.product_slug
@@ -54,7 +119,12 @@ def run() -> None:
         shutil.rmtree(product_root, ignore_errors=True)
         product_root.mkdir(parents=True, exist_ok=True)
 
-    _zip_and_upload_product(product_root, cfg.product_slug)
+    if cfg.aws_upload_mode == "sync":
+        _sync_product(product_root, cfg.product_slug, workers)
+    elif cfg.aws_upload_mode == "zip":
+        _zip_and_upload_product(product_root, cfg.product_slug, workers)
+    else:
+        raise ValueError(f"Unknown AWS_UPLOAD_MODE: {cfg.aws_upload_mode!r}")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 
 from src.bounding_box.bounding_box import BoundingBox
 from src.bounding_box.lat_bb_splitter import LatBandSplitter
+from src.bounding_box.quadtree_partitioner import QuadtreePartitioner
 
 from .orchestrator import BBoxSpec
 
@@ -28,8 +29,8 @@ class BBoxFactory:
     def build(self, tiles_df: pd.DataFrame) -> List[BBoxSpec]:
         """
         Build latitude-band bboxes using the existing splitter.
-        The splitter requires a DataFrame with columns 'lon' and 'lat'.
-        We feed it the tile centers from the CSV.
+        Tile centers are assigned to bands in one vectorized pass; no band
+        yields bboxes when no center falls inside the region.
         """
         region = BoundingBox(
             min_lon=self.min_lon,
@@ -39,18 +40,19 @@ class BBoxFactory:
         )
         splitter = LatBandSplitter(bbox=region, n_bands=self.lat_band_count)
 
-        coords_df = tiles_df[["tile_lon_center", "tile_lat_center"]].rename(
-            columns={"tile_lon_center": "lon", "tile_lat_center": "lat"}
+        split = splitter.assign(
+            tiles_df["tile_lon_center"].to_numpy(dtype=float),
+            tiles_df["tile_lat_center"].to_numpy(dtype=float),
         )
-
-        bands = splitter.split(coords_df) or []
+        if split is None:
+            return []
 
         out: List[BBoxSpec] = []
-        for br in bands:
-            bb = br.bbox
+        for band in range(splitter.n_bands):
+            bb = splitter.band_bbox(band)
             out.append(
                 BBoxSpec(
-                    bbox_id=f"bbox_{int(br.band):02d}",
+                    bbox_id=f"bbox_{band:02d}",
                     min_lon=bb.min_lon,
                     min_lat=bb.min_lat,
                     max_lon=bb.max_lon,
@@ -58,3 +60,57 @@ class BBoxFactory:
                 )
             )
         return out
+
+
+class AdaptiveBBoxFactory:
+    """
+    Drop-in alternative to BBoxFactory: bboxes follow the tiles instead of
+    cutting the region into equal latitude bands.
+
+    The region is split as a fixed quadtree until every box holds at most
+    max_tiles tile centers (and, optionally, spans at most max_area_deg2);
+    each resulting BBoxSpec is tight around its tiles. Ids are derived from the
+    quadtree path ("bbox_q" + digits), so a given area keeps its id across runs
+    unless it had to split further.
+    """
+
+    def __init__(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        max_tiles: int,
+        max_area_deg2: Optional[float] = None,
+        max_depth: int = 12,
+    ) -> None:
+        self.region = BoundingBox(
+            min_lon=float(min_lon),
+            max_lon=float(max_lon),
+            min_lat=float(min_lat),
+            max_lat=float(max_lat),
+        )
+        self.partitioner = QuadtreePartitioner(
+            self.region,
+            max_points=max_tiles,
+            max_area_deg2=max_area_deg2,
+            max_depth=max_depth,
+        )
+
+    def build(self, tiles_df: pd.DataFrame) -> List[BBoxSpec]:
+        # One box per distinct tile: repeated days must not inflate the counts.
+        centers = tiles_df[["tile_lon_center", "tile_lat_center"]].drop_duplicates()
+        leaves = self.partitioner.partition(
+            centers["tile_lon_center"].to_numpy(dtype=float),
+            centers["tile_lat_center"].to_numpy(dtype=float),
+        )
+        return [
+            BBoxSpec(
+                bbox_id=f"bbox_q{leaf.path}",
+                min_lon=leaf.bbox.min_lon,
+                min_lat=leaf.bbox.min_lat,
+                max_lon=leaf.bbox.max_lon,
+                max_lat=leaf.bbox.max_lat,
+            )
+            for leaf in leaves
+        ]
@@ -7,7 +7,13 @@ from typing import List
 
 import pandas as pd
 
-from src import utils
+from src.app.metrics import REGISTRY
+from src.app.tracing import span, traced
+from src.memory import measure_memory
+
+_FILES = REGISTRY.counter("amalgamate_files_total", "Tile CSVs merged")
+_ROWS = REGISTRY.counter("amalgamate_rows_total", "Rows written to the merged CSV")
+_PROGRESS = REGISTRY.progress("amalgamate", unit="files")
 
 
 class CSVAmalgamation:
@@ -47,7 +53,7 @@ class CSVAmalgamation:
             raise ValueError(f"Cannot infer tile_id from filename: {path.name}")
         return int(m.group(1))
 
-    @utils.timed("csv amalgamation")
+    @traced("csv amalgamation")
     def run(self) -> None:
         csv_files = self._list_csv_files()
         if not csv_files:
@@ -57,16 +63,31 @@ class CSVAmalgamation:
             return
 
         frames: List[pd.DataFrame] = []
+        _PROGRESS.start(len(csv_files))
         for p in csv_files:
-            df = pd.read_csv(p)
             tile_id = self._parse_tile_id_from_filename(p)
+            with (
+                span("amalgamate.read", tile_id=tile_id, bbox_id=p.parts[-4]) as s,
+                measure_memory("file", f"{p.parts[-4]}/{p.name}"),
+            ):
+                df = pd.read_csv(p)
+                nbytes = p.stat().st_size
+                s.set(rows=len(df), bytes=nbytes)
+            _FILES.inc()
+            _PROGRESS.advance(1, nbytes)
             # Insert tile_id as the first column (no copy; mutate local df only)
             df.insert(0, "tile_id", tile_id)
             frames.append(df)
 
-        merged = pd.concat(frames, ignore_index=True, sort=False)
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        merged.to_csv(self.output_path, index=False)
+        with (
+            span("amalgamate.write", files=len(csv_files)) as s,
+            measure_memory("step", "amalgamate.write", files=len(csv_files)),
+        ):
+            merged = pd.concat(frames, ignore_index=True, sort=False)
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            merged.to_csv(self.output_path, index=False)
+            s.set(rows=len(merged), bytes=self.output_path.stat().st_size)
+        _ROWS.inc(len(merged))
         logging.info(
             "csv amalgamation: wrote %s (%d rows from %d files)",
             self.output_path,
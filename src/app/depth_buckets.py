@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+class DepthBucketPolicy:
+    """
+    Snaps each job's z_max up to the nearest bucket edge, so jobs that only
+    differed by a few meters of depth share the same request (and cache file).
+
+    - from_levels(): edges are the product's own depth levels. With
+      max_extra_levels=k only every (k+1)-th level is an edge, i.e. a request
+      may carry at most k levels more than it needs, in exchange for fewer
+      distinct depth ranges.
+    - Direct edges (e.g. 10, 50, 100, 500 m) work the same way.
+    Depths deeper than the last edge are left unchanged.
+    """
+
+    def __init__(self, edges: Sequence[float]) -> None:
+        edges = np.unique(np.asarray(edges, dtype=np.float64))
+        if edges.size == 0 or not np.isfinite(edges).all():
+            raise ValueError("Depth bucket edges must be finite and non-empty.")
+        self.edges = edges
+
+    @classmethod
+    def from_levels(
+        cls, levels: Sequence[float], *, max_extra_levels: int = 0
+    ) -> "DepthBucketPolicy":
+        if max_extra_levels < 0:
+            raise ValueError("max_extra_levels must be non-negative.")
+        levels = np.unique(np.asarray(levels, dtype=np.float64))
+        if levels.size == 0:
+            raise ValueError("No depth levels given.")
+        step = max_extra_levels + 1
+        edges = levels[max_extra_levels::step]
+        if edges.size == 0 or edges[-1] != levels[-1]:
+            edges = np.append(edges, levels[-1])  # the bottom level stays reachable
+        return cls(edges)
+
+    @classmethod
+    def from_levels_file(
+        cls, path: Path, dataset_id: str, *, max_extra_levels: int = 0
+    ) -> "DepthBucketPolicy":
+        return cls.from_levels(
+            load_depth_levels(path, dataset_id), max_extra_levels=max_extra_levels
+        )
+
+    def snap(self, z_max: np.ndarray) -> np.ndarray:
+        """Smallest edge >= z for every depth (unchanged past the last edge)."""
+        z = np.asarray(z_max, dtype=np.float64)
+        pos = np.searchsorted(self.edges, z, side="left")
+        inside = pos < self.edges.size
+        return np.where(inside, self.edges[np.minimum(pos, self.edges.size - 1)], z)
+
+
+# -------------------- cached product metadata --------------------
+
+
+def depth_levels_from_dataset(ds, depth_name: str = "depth") -> np.ndarray:
+    """Depth coordinate of an opened product (e.g. any downloaded NetCDF)."""
+    if depth_name not in ds.coords and depth_name not in ds:
+        raise KeyError(f"Dataset has no depth coordinate '{depth_name}'.")
+    return np.asarray(ds[depth_name].values, dtype=np.float64)
+
+
+def save_depth_levels(path: Path, dataset_id: str, levels: Sequence[float]) -> Path:
+    """Stores (or updates) one dataset's depth levels in a small JSON cache."""
+    path = Path(path)
+    cache = json.loads(path.read_text()) if path.exists() else {}
+    cache[dataset_id] = [float(v) for v in np.unique(np.asarray(levels, float))]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, indent=2))
+    return path
+
+
+def load_depth_levels(path: Path, dataset_id: str) -> np.ndarray:
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Depth levels cache not found: {path}")
+    cache = json.loads(path.read_text())
+    if dataset_id not in cache:
+        raise KeyError(f"No cached depth levels for dataset '{dataset_id}' in {path}")
+    return np.asarray(cache[dataset_id], dtype=np.float64)
+
+
+def depth_policy_from_settings(
+    dataset_id: str,
+    *,
+    levels_file: Optional[Path] = None,
+    edges: Sequence[float] = (),
+    max_extra_levels: int = 0,
+) -> Optional[DepthBucketPolicy]:
+    """Cached product levels win over explicit edges; None means exact z_max."""
+    if levels_file is not None:
+        return DepthBucketPolicy.from_levels_file(
+            levels_file, dataset_id, max_extra_levels=max_extra_levels
+        )
+    if len(edges):
+        return DepthBucketPolicy(edges)
+    return None
@@ -1,57 +1,116 @@
 from __future__ import annotations
 
-from typing import List
+import logging
+from typing import Optional
 
-import copernicusmarine as cm
 import pandas as pd
 
-from src import utils
-from src.app.bbox_factory import BBoxFactory
-from src.app.jobs import DownloadJob
+from src.app.bbox_factory import AdaptiveBBoxFactory, BBoxFactory
+from src.app.depth_buckets import depth_policy_from_settings
+from src.app.jobs import JobTable
 from src.app.layout import ProjectLayout
 from src.app.nc_to_csv_batch_converter import NCTileToCSVBatchConverter
 from src.app.orchestrator import TileDayOrchestrator
 from src.app.scheduler import AsyncScheduler, SchedulerContext, SerialScheduler
+from src.app.tracing import span, traced
 from src.config import cfg
+from src.data_processing.tile_days_delta import TileDaysDelta
+
+
+@traced("convert")
+def convert_products(workers: Optional[int] = None) -> None:
+    """NetCDF -> per-tile CSV for every bbox of the configured product."""
+    NCTileToCSVBatchConverter(
+        output_root=cfg.output_root,
+        product_slug=cfg.product_slug,
+        variables=list(cfg.variables),
+        workers=workers,
+    ).run()
 
 
 class DownloadAndConvert:
-    def __init__(self, tiles_df: pd.DataFrame) -> None:
+    def __init__(
+        self,
+        tiles_df: pd.DataFrame,
+        previous_tiles_df: Optional[pd.DataFrame] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        previous_tiles_df: the tiles_with_date table of the last completed run.
+        When given, only new (tile, day) pairs and known pairs of tiles whose
+        deepest_depth grew are planned (delta mode); bboxes still come from the
+        full tiles_df so bbox ids stay stable across runs.
+        workers: download concurrency and convert processes; None keeps
+        AWS_MAX_CONCURRENCY for downloads and converts serially.
+        """
         self.tiles_df = tiles_df
+        self.previous_tiles_df = previous_tiles_df
+        self.workers = workers
         self._layout = ProjectLayout(root=cfg.output_root)
 
+    def _plan_df(self) -> pd.DataFrame:
+        if self.previous_tiles_df is None:
+            return self.tiles_df
+        diff = TileDaysDelta().diff(self.previous_tiles_df, self.tiles_df)
+        logging.info("Delta plan: %s", diff.summary())
+        return diff.plan()
+
     @staticmethod
-    def _build_jobs(tiles_df: pd.DataFrame) -> List[DownloadJob]:
-        bboxes = BBoxFactory(
-            min_lon=cfg.region_min_lon,
-            min_lat=cfg.region_min_lat,
-            max_lon=cfg.region_max_lon,
-            max_lat=cfg.region_max_lat,
-            lat_band_count=cfg.lat_band_count,
-        ).build(tiles_df)
+    def _build_jobs(
+        tiles_df: pd.DataFrame, plan_df: Optional[pd.DataFrame] = None
+    ) -> JobTable:
+        if cfg.bbox_max_tiles > 0:
+            factory = AdaptiveBBoxFactory(
+                min_lon=cfg.region_min_lon,
+                min_lat=cfg.region_min_lat,
+                max_lon=cfg.region_max_lon,
+                max_lat=cfg.region_max_lat,
+                max_tiles=cfg.bbox_max_tiles,
+            )
+        else:
+            factory = BBoxFactory(
+                min_lon=cfg.region_min_lon,
+                min_lat=cfg.region_min_lat,
+                max_lon=cfg.region_max_lon,
+                max_lat=cfg.region_max_lat,
+                lat_band_count=cfg.lat_band_count,
+            )
+        bboxes = factory.build(tiles_df)
 
         orch = TileDayOrchestrator(
             dataset_id=cfg.dataset_id,
             variables=list(cfg.variables),
             spatial_resolution_deg=cfg.spatial_resolution_deg,
+            depth_policy=depth_policy_from_settings(
+                cfg.dataset_id,
+                levels_file=cfg.depth_levels_file,
+                edges=cfg.depth_bucket_edges,
+                max_extra_levels=cfg.depth_max_extra_levels,
+            ),
         )
-        return orch.build_jobs(df=tiles_df, bboxes=bboxes)
+        return orch.build_job_table(
+            df=tiles_df if plan_df is None else plan_df, bboxes=bboxes
+        )
+
+    def plan(self) -> JobTable:
+        """The download jobs a run would execute (nothing is fetched)."""
+        with span("plan") as s:
+            jobs = self._build_jobs(self.tiles_df, self._plan_df())
+            s.set(jobs=len(jobs), bboxes=len(jobs.bbox_ids))
+        return jobs
 
-    @utils.timed("convert")
     def _convert(self) -> None:
-        NCTileToCSVBatchConverter(
-            output_root=cfg.output_root,
-            product_slug=cfg.product_slug,
-            variables=list(cfg.variables),
-        ).run()
+        convert_products(self.workers)
 
-    @utils.timed("download")
+    @traced("download")
     def _download(self) -> None:
-        jobs = self._build_jobs(self.tiles_df)
+        jobs = self.plan()
 
         ctx = SchedulerContext(layout=self._layout, product_slug=cfg.product_slug)
 
-        max_conc = int(cfg.aws_max_concurrency)  # from .env via src.config
+        import copernicusmarine as cm  # deferred: slow SDK import
+
+        max_conc = int(self.workers or cfg.aws_max_concurrency)
         if max_conc <= 1:
             SerialScheduler(cm_handle=cm).download(jobs, ctx)
         else:
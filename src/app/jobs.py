@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Mapping, Sequence
+from typing import Iterator, Mapping, Sequence
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -16,3 +18,85 @@ class DownloadJob:
     dataset_id: str
     variables: Sequence[str]
     request_opts: Mapping[str, object] | None = None
+    refresh: bool = False  # overwrite an existing file (e.g. deeper z_max)
+
+
+@dataclass(frozen=True, eq=False)
+class JobTable:
+    """
+    Structure-of-arrays job plan: one entry per (tile, day), all columns aligned.
+    DownloadJob objects are only materialized on access (indexing/iteration),
+    so planning millions of tile-days never builds millions of dataclasses.
+    """
+
+    bbox_ids: tuple[str, ...]  # bbox_id by bbox index
+    bbox_index: np.ndarray  # int, index into bbox_ids
+    tile_id: np.ndarray  # int64
+    lon: np.ndarray  # float64 tile center
+    lat: np.ndarray  # float64 tile center
+    day: np.ndarray  # datetime64[D]
+    z_min: np.ndarray  # float64
+    z_max: np.ndarray  # float64
+    epsilon: float  # half-width of each job's area around the tile center
+    refresh: np.ndarray  # bool
+    dataset_id: str
+    variables: tuple[str, ...]
+
+    @property
+    def area(self) -> np.ndarray:
+        """(N, 4) float64 areas: lon_min, lat_min, lon_max, lat_max."""
+        e = self.epsilon
+        return np.column_stack([self.lon - e, self.lat - e, self.lon + e, self.lat + e])
+
+    def request_groups(self) -> tuple[np.ndarray, int]:
+        """
+        (group id per job, number of groups): jobs with the same bbox, day and
+        depth range could be served by one subset request.
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), 0
+        codes = [
+            np.unique(col, return_inverse=True)[1].astype(np.int64)
+            for col in (self.bbox_index, self.day, self.z_min, self.z_max)
+        ]
+        key = codes[0]
+        for col in codes[1:]:
+            key = key * (int(col.max()) + 1) + col
+        uniq, group = np.unique(key, return_inverse=True)
+        return group, int(uniq.size)
+
+    def __len__(self) -> int:
+        return int(self.tile_id.size)
+
+    def __getitem__(self, i: int) -> DownloadJob:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("job index out of range.")
+        lon, lat = float(self.lon[i]), float(self.lat[i])
+        return DownloadJob(
+            bbox_id=self.bbox_ids[int(self.bbox_index[i])],
+            tile_id_padded=str(int(self.tile_id[i])).zfill(5),
+            lon=lon,
+            lat=lat,
+            day=self.day[i].astype(object),
+            z_min=float(self.z_min[i]),
+            z_max=float(self.z_max[i]),
+            area=(
+                lon - self.epsilon,
+                lat - self.epsilon,
+                lon + self.epsilon,
+                lat + self.epsilon,
+            ),
+            dataset_id=self.dataset_id,
+            variables=self.variables,
+            request_opts=None,
+            refresh=bool(self.refresh[i]),
+        )
+
+    def __iter__(self) -> Iterator[DownloadJob]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_list(self) -> list[DownloadJob]:
+        return list(self)
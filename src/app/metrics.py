@@ -0,0 +1,358 @@
+"""
+In-process run metrics: counters, gauges and latency histograms, a rolling
+progress/ETA line, and a Prometheus textfile export.
+
+Hot paths grab their metric objects once (module level) and only call
+inc()/set()/observe(), which take one uncontended lock each. Updates may
+come from any thread, including asyncio.to_thread workers; work done in
+worker processes is reported back and recorded by the parent.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, labels: Labels) -> None:
+        self.name = name
+        self.labels = labels
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, n: float = 1) -> None:
+        if n < 0:
+            raise ValueError("Counters only go up.")
+        with self._lock:
+            self._value += n
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(self.labels)} {_fmt_value(self._value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, v: float) -> None:
+        with self._lock:
+            self._value = float(v)
+
+    def inc(self, n: float = 1) -> None:
+        with self._lock:
+            self._value += n
+
+    def dec(self, n: float = 1) -> None:
+        self.inc(-n)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus expects (le = upper bound)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, labels: Labels, buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds or len(set(bounds)) != len(bounds):
+            raise ValueError("Histogram buckets must be distinct and non-empty.")
+        self.name = name
+        self.labels = labels
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(bounds) + 1)  # last slot: > largest bound
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, v: float) -> None:
+        k = bisect.bisect_left(self.bounds, v)
+        with self._lock:
+            self._counts[k] += 1
+            self._sum += v
+
+    def time(self) -> "_Timer":
+        """with hist.time(): ... observes the body's wall time in seconds."""
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf past the last)."""
+        with self._lock:
+            counts = list(self._counts)
+        total = sum(counts)
+        if total == 0:
+            return math.nan
+        rank, seen = q * total, 0
+        for bound, c in zip(self.bounds + (math.inf,), counts):
+            seen += c
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            counts, total_sum = list(self._counts), self._sum
+        out, cum = [], 0
+        for bound, c in zip(self.bounds + (math.inf,), counts):
+            cum += c
+            le = (("le", _fmt_value(bound)),)
+            out.append(f"{self.name}_bucket{_fmt_labels(self.labels, le)} {cum}")
+        out.append(f"{self.name}_sum{_fmt_labels(self.labels)} {_fmt_value(total_sum)}")
+        out.append(f"{self.name}_count{_fmt_labels(self.labels)} {cum}")
+        return out
+
+
+class _Timer:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist: Histogram) -> None:
+        self.hist = hist
+
+    def __enter__(self) -> "_Timer":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.hist.observe(time.perf_counter() - self.t0)
+
+
+class Progress:
+    """
+    Done/total for one stage plus rolling rates over the last `window`
+    seconds, sampled on every line() call (the reporter's tick).
+    """
+
+    def __init__(self, stage: str, unit: str = "items", window: float = 60.0) -> None:
+        self.stage = stage
+        self.unit = unit
+        self.window = float(window)
+        self.total = 0
+        self.done = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._samples: Deque[Tuple[float, int, int]] = deque()
+
+    def start(self, total: int) -> None:
+        with self._lock:
+            self.total, self.done, self.bytes = int(total), 0, 0
+            self._samples.clear()
+            self._samples.append((time.monotonic(), 0, 0))
+
+    def advance(self, n: int = 1, nbytes: int = 0) -> None:
+        with self._lock:
+            self.done += n
+            self.bytes += nbytes
+
+    def rates(self, now: Optional[float] = None) -> Tuple[float, float]:
+        """(items/s, bytes/s) over the rolling window."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._samples.append((now, self.done, self.bytes))
+            while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+                self._samples.popleft()
+            t0, d0, b0 = self._samples[0]
+        dt = now - t0
+        if dt <= 0:
+            return 0.0, 0.0
+        return (self.done - d0) / dt, (self.bytes - b0) / dt
+
+    def eta(self, rate: float) -> Optional[float]:
+        remaining = self.total - self.done
+        if remaining <= 0:
+            return 0.0
+        return remaining / rate if rate > 0 else None
+
+    def line(self, now: Optional[float] = None) -> str:
+        rate, byte_rate = self.rates(now)
+        eta = self.eta(rate)
+        pct = 100.0 * self.done / self.total if self.total else 100.0
+        parts = [
+            f"{self.stage}: {self.done}/{self.total} {self.unit} ({pct:.1f}%)",
+            f"{rate:.2f} {self.unit}/s",
+        ]
+        if self.bytes:
+            parts.append(f"{byte_rate / (1024 * 1024):.2f} MiB/s")
+        parts.append("ETA " + ("--:--:--" if eta is None else _hms(eta)))
+        return ", ".join(parts)
+
+
+def _hms(seconds: float) -> str:
+    s = int(round(seconds))
+    return f"{s // 3600:02d}:{s % 3600 // 60:02d}:{s % 60:02d}"
+
+
+class MetricsRegistry:
+    """Metrics keyed by (name, labels); asking twice returns the same object."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[Tuple[str, Labels], object] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}  # name -> (kind, help)
+        self._progress: Dict[str, Progress] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, labels: Dict[str, str], **kw):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                known = self._help.get(name)
+                if known is not None and known[0] != cls.kind:
+                    raise ValueError(f"Metric {name} is already a {known[0]}.")
+                metric = cls(name, key[1], **kw)
+                self._metrics[key] = metric
+                self._help.setdefault(name, (cls.kind, help))
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already a {metric.kind}.")
+            return metric
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels: str) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        **labels: str,
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def progress(self, stage: str, unit: str = "items") -> Progress:
+        with self._lock:
+            if stage not in self._progress:
+                self._progress[stage] = Progress(stage, unit)
+            return self._progress[stage]
+
+    def progress_lines(self) -> List[str]:
+        with self._lock:
+            active = [p for p in self._progress.values() if p.total]
+        return [p.line() for p in active]
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            items = sorted(self._metrics.items(), key=lambda kv: kv[0])
+            helps = dict(self._help)
+        lines: List[str] = []
+        last = None
+        for (name, _), metric in items:
+            if name != last:
+                kind, text = helps[name]
+                if text:
+                    lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                last = name
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> Path:
+        """Atomic write, as the node_exporter textfile collector requires."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render())
+        os.replace(tmp, path)
+        return path
+
+
+REGISTRY = MetricsRegistry()
+
+
+class MetricsReporter:
+    """
+    Background thread that, every `interval` seconds and once more on stop(),
+    rewrites the Prometheus textfile (if any) and logs the progress lines.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        *,
+        textfile: Optional[Path] = None,
+        interval: float = 15.0,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be > 0.")
+        self.registry = registry
+        self.textfile = None if textfile is None else Path(textfile)
+        self.interval = float(interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def report(self) -> None:
+        if self.textfile is not None:
+            self.registry.write_textfile(self.textfile)
+        for line in self.registry.progress_lines():
+            logging.info("progress %s", line)
+
+    def start(self) -> "MetricsReporter":
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="metrics-reporter", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.report()
+
+    def __enter__(self) -> "MetricsReporter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.report()
+            except OSError as e:  # a full disk must not kill the run
+                logging.warning("metrics report failed: %s", e)
@@ -1,21 +1,96 @@
 from __future__ import annotations
 
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from src.app.layout import ProjectLayout
+from src.app.metrics import REGISTRY
 from src.app.nc_to_csv_converter import NCTileToCSVConverter
+from src.app.tracing import current_span_id, span
+from src.memory import MemoryRecord, add_records, drain_records, measure_memory
+
+_TILES = REGISTRY.counter("convert_tiles_total", "Tile CSVs (re)written")
+_ROWS = REGISTRY.counter("convert_rows_total", "CSV rows written by convert")
+_BYTES = REGISTRY.counter("convert_bytes_total", "CSV bytes written by convert")
+_LATENCY = REGISTRY.histogram("convert_tile_seconds", "Wall time to convert one tile")
+_PROGRESS = REGISTRY.progress("convert", unit="tiles")
+
+# (rows, bytes written, seconds) of one converted tile
+TileResult = Tuple[int, int, float]
+
+
+def _convert_tile(
+    converter: NCTileToCSVConverter,
+    out_csv: Path,
+    nc_files: List[Path],
+    parent_id: Optional[str] = None,
+) -> TileResult:
+    # out_csv = <product>/<bbox>/csv/all/<tile>.csv
+    t0 = time.perf_counter()
+    rows = nbytes = 0
+    bbox_id, tile_id = out_csv.parts[-4], out_csv.stem
+    with (
+        span(
+            "convert.tile",
+            parent_id=parent_id,
+            bbox_id=bbox_id,
+            tile_id=tile_id,
+            files=len(nc_files),
+        ) as s,
+        measure_memory("tile", f"{bbox_id}/{tile_id}", files=len(nc_files)) as mem,
+    ):
+        df = converter.run(nc_files)
+        if not df.empty:
+            out_csv.parent.mkdir(parents=True, exist_ok=True)
+            df.to_csv(out_csv, index=False)
+            rows, nbytes = len(df), out_csv.stat().st_size
+            s.set(rows=rows, bytes=nbytes)
+            mem.update(rows=rows, bytes=nbytes)
+    return rows, nbytes, time.perf_counter() - t0
+
+
+def _record(result: TileResult) -> None:
+    """Metrics are kept by the parent: pool workers only return numbers."""
+    rows, nbytes, seconds = result
+    _TILES.inc()
+    _ROWS.inc(rows)
+    _BYTES.inc(nbytes)
+    _LATENCY.observe(seconds)
+    _PROGRESS.advance(1, nbytes)
+
+
+def _convert_job(
+    task: Tuple[Tuple[str, ...], Path, List[Path], Optional[str]],
+) -> Tuple[TileResult, List[MemoryRecord]]:
+    """
+    Process-pool entry point: one tile's NetCDF files -> one CSV. Memory
+    records made in the worker travel back with the result.
+    """
+    variables, out_csv, nc_files, parent_id = task
+    result = _convert_tile(
+        NCTileToCSVConverter(variables=variables), out_csv, nc_files, parent_id
+    )
+    return result, drain_records()
 
 
 class NCTileToCSVBatchConverter:
     def __init__(
-        self, *, output_root: Path, product_slug: str, variables: Sequence[str]
+        self,
+        *,
+        output_root: Path,
+        product_slug: str,
+        variables: Sequence[str],
+        workers: Optional[int] = None,
     ) -> None:
+        """workers > 1 converts tiles in a process pool; None/1 stays serial."""
         self.output_root = Path(output_root)
         self.product_slug = product_slug
         self.variables = tuple(variables)
         self.layout = ProjectLayout(root=self.output_root)
         self.converter = NCTileToCSVConverter(variables=self.variables)
+        self.workers = max(1, int(workers or 1))
 
     def run(self) -> None:
         product_root = self.layout.product_root(self.product_slug)
@@ -25,12 +100,18 @@ class NCTileToCSVBatchConverter:
         bbox_dirs = [
             d for d in product_root.iterdir() if d.is_dir() and (d / "nc").is_dir()
         ]
+        planned = []
         for bbox_dir in bbox_dirs:
             bbox_id = bbox_dir.name
             self.layout.ensure_product_bbox(self.product_slug, bbox_id)
 
             jobs = self._build_jobs_for_bbox(bbox_dir=bbox_dir, bbox_id=bbox_id)
             if jobs:
+                planned.append((bbox_id, jobs))
+
+        _PROGRESS.start(sum(len(jobs) for _, jobs in planned))
+        for bbox_id, jobs in planned:
+            with span("convert.bbox", bbox_id=bbox_id, tiles=len(jobs)):
                 self._write_jobs(jobs)
 
     def _build_jobs_for_bbox(
@@ -49,14 +130,26 @@ class NCTileToCSVBatchConverter:
                 p for p in tile_dir.iterdir() if p.suffix.lower() == ".nc"
             )
 
-            needs_work = (not ProjectLayout.exists_nonempty(out_csv)) and bool(nc_files)
-            if needs_work:
+            if nc_files and self._is_stale(out_csv, nc_files):
                 jobs.append((out_csv, nc_files))
         return jobs
 
+    @staticmethod
+    def _is_stale(out_csv: Path, nc_files: Sequence[Path]) -> bool:
+        """Missing/empty CSV, or any NetCDF newer than it (new or refreshed days)."""
+        if not ProjectLayout.exists_nonempty(out_csv):
+            return True
+        csv_mtime = out_csv.stat().st_mtime
+        return any(p.stat().st_mtime > csv_mtime for p in nc_files)
+
     def _write_jobs(self, jobs: List[Tuple[Path, list[Path]]]) -> None:
+        if self.workers > 1 and len(jobs) > 1:
+            parent_id = current_span_id()  # link worker spans to this bbox
+            tasks = [(self.variables, out_csv, nc, parent_id) for out_csv, nc in jobs]
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                for result, memory in pool.map(_convert_job, tasks):
+                    _record(result)
+                    add_records(memory)
+            return
         for out_csv, nc_files in jobs:
-            df = self.converter.run(nc_files)
-            if not df.empty:
-                out_csv.parent.mkdir(parents=True, exist_ok=True)
-                df.to_csv(out_csv, index=False)
+            _record(_convert_tile(self.converter, out_csv, nc_files))
@@ -4,7 +4,6 @@ from pathlib import Path
 from typing import Iterable, Sequence
 
 import pandas as pd
-import xarray as xr
 
 
 class NCTileToCSVConverter:
@@ -16,6 +15,8 @@ class NCTileToCSVConverter:
         if not paths:
             return pd.DataFrame()
 
+        import xarray as xr  # deferred: heavy, only needed to convert
+
         ds = xr.open_mfdataset(paths, combine="by_coords")
         try:
             sel = ds[list(self.variables)]  # let KeyError surface if misconfigured
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable, Sequence
+from typing import Iterable, Optional, Sequence
 
+import numpy as np
 from pandas import DataFrame
 
-from .jobs import DownloadJob
+from src.data_processing.date_normalizer import DateNormalizer
+
+from .depth_buckets import DepthBucketPolicy
+from .jobs import DownloadJob, JobTable
+
+_Z_MIN = 0.6
 
 
 @dataclass(frozen=True)
@@ -25,15 +30,29 @@ class BBoxSpec:
 
 class TileDayOrchestrator:
     def __init__(
-        self, dataset_id: str, variables: Sequence[str], spatial_resolution_deg: float
+        self,
+        dataset_id: str,
+        variables: Sequence[str],
+        spatial_resolution_deg: float,
+        depth_policy: Optional[DepthBucketPolicy] = None,
     ) -> None:
         self.dataset_id = dataset_id
         self.variables = tuple(variables)
         self.spatial_resolution_deg = float(spatial_resolution_deg)
+        self.depth_policy = depth_policy  # None: z_max = the tile's deepest_depth
 
     def build_jobs(
         self, df: DataFrame, bboxes: Iterable[BBoxSpec]
     ) -> list[DownloadJob]:
+        return self.build_job_table(df, bboxes).to_list()
+
+    def build_job_table(self, df: DataFrame, bboxes: Iterable[BBoxSpec]) -> JobTable:
+        """
+        Columnar planning: bbox lookup, areas, depth ranges and days are computed
+        with array ops over the whole table; see JobTable for lazy DownloadJobs.
+        Jobs are ordered by (tile_id, day); each tile goes to the first bbox (in
+        the given order) that contains its center.
+        """
         required = [
             "tile_id",
             "tile_lon_center",
@@ -43,53 +62,96 @@ class TileDayOrchestrator:
         ]
         _ = df[required]
 
-        epsilon = self.spatial_resolution_deg / 8.0
+        days = DateNormalizer().parse(df["time"])
+        days.raise_if_invalid("time")
+        tile_id = df["tile_id"].to_numpy(dtype=np.int64)
+        order = _tile_day_order(tile_id, days.dates)
+
+        lon = df["tile_lon_center"].to_numpy(dtype=np.float64)[order]
+        lat = df["tile_lat_center"].to_numpy(dtype=np.float64)[order]
+        deepest = df["deepest_depth"].to_numpy(dtype=np.float64)[order]
+        refresh = (
+            df["refresh"].to_numpy(dtype=bool)[order]
+            if "refresh" in df.columns
+            else np.zeros(order.size, dtype=bool)
+        )
+
         bbox_list = list(bboxes)
-        df_sorted = df.sort_values(["tile_id", "time"])
-
-        out: list[DownloadJob] = []
-        for row in df_sorted.itertuples(index=False):
-            lon = float(getattr(row, "tile_lon_center"))
-            lat = float(getattr(row, "tile_lat_center"))
-            day_val = getattr(row, "time")
-            if isinstance(day_val, str):
-                day = datetime.fromisoformat(day_val).date()
-            else:
-                try:
-                    day = day_val.date()
-                except AttributeError:
-                    day = day_val
-
-            deepest = float(getattr(row, "deepest_depth"))
-            z_min = 0.6
-            z_max = deepest if deepest > 0.6 else 0.6
-
-            area = (lon - epsilon, lat - epsilon, lon + epsilon, lat + epsilon)
-
-            picked = None
-            for b in bbox_list:
-                if b.contains(lon, lat):
-                    picked = b
-                    break
-            if picked is None:
-                raise ValueError(f"Tile center not in any bbox: lon={lon}, lat={lat}")
-
-            tile_id_val = getattr(row, "tile_id")
-            tile_id_padded = str(int(tile_id_val)).zfill(5)
-
-            out.append(
-                DownloadJob(
-                    bbox_id=picked.bbox_id,
-                    tile_id_padded=tile_id_padded,
-                    lon=lon,
-                    lat=lat,
-                    day=day,
-                    z_min=z_min,
-                    z_max=z_max,
-                    area=area,
-                    dataset_id=self.dataset_id,
-                    variables=self.variables,
-                    request_opts=None,
-                )
+        bbox_index = self._locate_bboxes(lon, lat, bbox_list)
+
+        z_min = np.full(order.size, _Z_MIN)
+        z_max = np.where(deepest > _Z_MIN, deepest, _Z_MIN)
+        if self.depth_policy is not None:
+            z_max = self.depth_policy.snap(z_max)
+        return JobTable(
+            bbox_ids=tuple(b.bbox_id for b in bbox_list),
+            bbox_index=bbox_index,
+            tile_id=tile_id[order],
+            lon=lon,
+            lat=lat,
+            day=days.dates[order],
+            z_min=z_min,
+            z_max=z_max,
+            epsilon=self.spatial_resolution_deg / 8.0,
+            refresh=refresh,
+            dataset_id=self.dataset_id,
+            variables=self.variables,
+        )
+
+    @staticmethod
+    def _locate_bboxes(
+        lon: np.ndarray, lat: np.ndarray, bboxes: Sequence[BBoxSpec]
+    ) -> np.ndarray:
+        """Index of the first bbox containing each (lon, lat); raises if none."""
+        idx = np.full(lon.size, -1, dtype=np.int32)
+        if bboxes and _are_lat_bands(bboxes):
+            # Sorted, non-overlapping bands sharing one lon range: the first
+            # band whose top edge is >= lat is the only candidate.
+            tops = np.array([b.max_lat for b in bboxes])
+            cand = np.searchsorted(tops, lat, side="left")
+            ok = cand < len(bboxes)
+            safe = np.minimum(cand, len(bboxes) - 1)
+            bottoms = np.array([b.min_lat for b in bboxes])
+            ok &= (bottoms[safe] <= lat) & (bboxes[0].min_lon <= lon)
+            ok &= lon <= bboxes[0].max_lon
+            idx[ok] = cand[ok]
+        elif bboxes:
+            # Generic boxes (e.g. adaptive partitions): sort by lat once, then
+            # each box only tests the points of its latitude strip.
+            by_lat = np.argsort(lat, kind="stable")
+            lat_sorted = lat[by_lat]
+            for k, b in enumerate(bboxes):
+                lo = np.searchsorted(lat_sorted, b.min_lat, side="left")
+                hi = np.searchsorted(lat_sorted, b.max_lat, side="right")
+                cand = by_lat[lo:hi]
+                cand = cand[(idx[cand] < 0) & (b.min_lon <= lon[cand])]
+                cand = cand[lon[cand] <= b.max_lon]
+                idx[cand] = k
+
+        missing = np.flatnonzero(idx < 0)
+        if missing.size:
+            first = missing[0]
+            raise ValueError(
+                f"Tile center not in any bbox: lon={float(lon[first])}, "
+                f"lat={float(lat[first])}"
             )
-        return out
+        return idx
+
+
+def _tile_day_order(tile_id: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Stable (tile_id, day) order; one int64 key sort when the ids allow it."""
+    day_num = days.astype(np.int64)
+    if tile_id.size and 0 <= tile_id.min() and tile_id.max() < 2**31:
+        key = (tile_id << 32) | (day_num + 2**31)
+        return np.argsort(key, kind="stable")
+    return np.lexsort((day_num, tile_id))
+
+
+def _are_lat_bands(bboxes: Sequence[BBoxSpec]) -> bool:
+    lon_range = (bboxes[0].min_lon, bboxes[0].max_lon)
+    if any((b.min_lon, b.max_lon) != lon_range for b in bboxes):
+        return False
+    return all(
+        a.max_lat < b.max_lat and a.max_lat <= b.min_lat
+        for a, b in zip(bboxes, bboxes[1:])
+    )
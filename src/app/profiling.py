@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class ProfileOptions:
+    profile_path: Optional[Path] = None  # cProfile stats (.prof); None: off
+    trace_memory: int = 0  # top N allocation sites; 0: off
+    sort: str = "cumulative"  # pstats sort key for the text report
+    top: int = 30  # functions listed in the text report
+
+    @property
+    def enabled(self) -> bool:
+        return self.profile_path is not None or self.trace_memory > 0
+
+
+def pstats_report(stats_path: Path, *, sort: str = "cumulative", top: int = 30) -> str:
+    """Top functions of a saved cProfile run, as pstats prints them."""
+    buf = io.StringIO()
+    pstats.Stats(str(stats_path), stream=buf).sort_stats(sort).print_stats(top)
+    return buf.getvalue()
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, top: int) -> List[str]:
+    """One line per allocation site (file:line), largest first."""
+    stats = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+    ).statistics("lineno")
+    return [str(s) for s in stats[:top]]
+
+
+@contextmanager
+def stage_profile(stage: str, options: ProfileOptions) -> Iterator[None]:
+    """
+    Runs the body under cProfile and/or tracemalloc as options ask.
+
+    - profile_path: raw stats are dumped there (load with pstats or snakeviz)
+      and the top functions are written next to it as <name>.txt.
+    - trace_memory=N: the N largest allocation sites still alive at the end
+      and the traced peak are logged.
+    Reports are produced even when the stage raises.
+    """
+    if not options.enabled:
+        yield
+        return
+
+    profiler = cProfile.Profile() if options.profile_path is not None else None
+    started_tracing = options.trace_memory > 0 and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _write_profile(stage, profiler, options)
+        if options.trace_memory > 0:
+            _log_allocations(stage, options.trace_memory)
+            if started_tracing:
+                tracemalloc.stop()
+
+
+def _write_profile(
+    stage: str, profiler: cProfile.Profile, options: ProfileOptions
+) -> None:
+    path = Path(options.profile_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(path))
+    report = path.with_suffix(".txt")
+    report.write_text(pstats_report(path, sort=options.sort, top=options.top))
+    logging.info("%s: profile written to %s (summary: %s)", stage, path, report)
+
+
+def _log_allocations(stage: str, top: int) -> None:
+    _, peak = tracemalloc.get_traced_memory()
+    lines = top_allocations(tracemalloc.take_snapshot(), top)
+    logging.info(
+        "%s: traced peak %.1f MiB; top %d allocation sites:\n  %s",
+        stage,
+        peak / (1024 * 1024),
+        len(lines),
+        "\n  ".join(lines) or "(none)",
+    )
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import io
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.app.archiver import ParallelZipArchiver, ZstdTarArchiver
+from src.app.metrics import REGISTRY
+
+MiB = 1024 * 1024
+S3_MIN_PART_SIZE = 5 * MiB  # every part but the last must be at least this big
+S3_MAX_PARTS = 10_000
+
+Archiver = Union[ParallelZipArchiver, ZstdTarArchiver]
+
+_PARTS = REGISTRY.counter("s3_parts_total", "Multipart parts uploaded")
+_BYTES = REGISTRY.counter("s3_bytes_total", "Bytes uploaded to S3")
+_ERRORS = REGISTRY.counter("s3_errors_total", "S3 uploads (parts or files) that failed")
+_PART_LATENCY = REGISTRY.histogram("s3_part_seconds", "Wall time of one part upload")
+_PARTS_PENDING = REGISTRY.gauge(
+    "s3_parts_in_flight", "Parts buffered or uploading (writer queue depth)"
+)
+_PROGRESS = REGISTRY.progress("archive", unit="entries")
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only, non-seekable file object backed by an S3 multipart upload.
+
+    Bytes are cut into part_size parts which are uploaded by max_concurrency
+    threads while the caller keeps writing. At most max_in_flight parts are
+    buffered or uploading at any time (write() blocks beyond that), so memory
+    stays around (max_in_flight + 1) * part_size however large the object is.
+
+    close() uploads the tail and completes the upload; leaving a `with` block
+    with an exception (or any part failing) aborts it, so no partial object is
+    ever published. `client` is a boto3 S3 client or anything with the same
+    create/upload_part/complete/abort_multipart_upload methods.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        key: str,
+        *,
+        part_size: int = 16 * MiB,
+        max_concurrency: int = 4,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        if part_size < S3_MIN_PART_SIZE:
+            raise ValueError(f"part_size must be >= {S3_MIN_PART_SIZE} bytes.")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1.")
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = int(part_size)
+        self.max_in_flight = int(max_in_flight or 2 * max_concurrency)
+
+        self._buf = bytearray()
+        self._written = 0
+        self._next_part = 1
+        self._parts: Dict[int, str] = {}  # part number -> ETag
+        self._futures: List[Future] = []
+        self._error: Optional[BaseException] = None
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="s3-part"
+        )
+        self._upload_id = client.create_multipart_upload(Bucket=bucket, Key=key)[
+            "UploadId"
+        ]
+        self._finished = False
+        self.etag: Optional[str] = None  # set by complete_multipart_upload
+
+    # -------------------- file protocol --------------------
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._written
+
+    def write(self, b) -> int:
+        if self.closed:
+            raise ValueError("write to closed S3MultipartWriter.")
+        self._raise_if_failed()
+        view = memoryview(b).cast("B")
+        self._buf += view
+        self._written += view.nbytes
+        while len(self._buf) >= self.part_size:
+            part = bytes(self._buf[: self.part_size])
+            del self._buf[: self.part_size]
+            self._submit(part)
+        return view.nbytes
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if not self._finished:
+                self._complete()
+        finally:
+            self._pool.shutdown(wait=True)
+            super().close()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        self.close()
+
+    # -------------------- multipart --------------------
+
+    @property
+    def num_parts(self) -> int:
+        return len(self._parts)
+
+    def abort(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        for f in self._futures:
+            f.cancel()
+        self._pool.shutdown(wait=True)
+        self.client.abort_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+        )
+        logging.warning("Aborted multipart upload s3://%s/%s", self.bucket, self.key)
+
+    def _submit(self, data: bytes) -> None:
+        number = self._next_part
+        if number > S3_MAX_PARTS:
+            raise ValueError(
+                f"Object needs more than {S3_MAX_PARTS} parts; raise part_size."
+            )
+        self._next_part += 1
+        self._slots.acquire()  # bounded in-flight buffers: block the producer
+        self._raise_if_failed()
+        _PARTS_PENDING.inc()
+        future = self._pool.submit(self._upload_part, number, data)
+        future.add_done_callback(self._on_part_done)
+        self._futures.append(future)
+
+    def _upload_part(self, number: int, data: bytes) -> None:
+        t0 = time.perf_counter()
+        resp = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=data,
+        )
+        _PART_LATENCY.observe(time.perf_counter() - t0)
+        _PARTS.inc()
+        _BYTES.inc(len(data))
+        self._parts[number] = resp["ETag"]
+
+    def _on_part_done(self, future: Future) -> None:
+        self._slots.release()
+        _PARTS_PENDING.dec()
+        if not future.cancelled() and future.exception() is not None:
+            _ERRORS.inc()
+            self._error = self._error or future.exception()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            self.abort()
+            raise self._error
+
+    def _complete(self) -> None:
+        try:
+            if self._buf or self._next_part == 1:  # S3 needs at least one part
+                self._submit(bytes(self._buf))
+                self._buf.clear()
+            for f in self._futures:
+                f.result()
+        except BaseException:
+            self.abort()
+            raise
+        self._finished = True
+        resp = self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": n, "ETag": self._parts[n]}
+                    for n in sorted(self._parts)
+                ]
+            },
+        )
+        self.etag = (resp or {}).get("ETag")
+
+
+@dataclass(frozen=True)
+class ZipUploadSummary:
+    files: int
+    stored: int  # members kept uncompressed (e.g. NetCDF-4)
+    bytes_in: int  # uncompressed file bytes
+    bytes_out: int  # archive bytes uploaded
+    parts: int
+
+
+def stream_zip_dir_to_s3(
+    root: Path,
+    client: Any,
+    bucket: str,
+    key: str,
+    *,
+    part_size: int = 16 * MiB,
+    max_concurrency: int = 4,
+    max_in_flight: Optional[int] = None,
+    archiver: Optional[Archiver] = None,
+    progress_step: Optional[float] = None,
+) -> ZipUploadSummary:
+    """
+    Archives `root` straight into an S3 multipart upload: no local archive, and
+    compression of the next entries overlaps the upload of earlier parts.
+    archiver defaults to a ParallelZipArchiver (entries "<root name>/...");
+    progress_step (0, 1] logs every time that fraction of the input bytes has
+    been compressed.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        raise ValueError(f"Not a directory: {root}")
+    if progress_step is not None and not 0 < progress_step <= 1:
+        raise ValueError("progress_step must be in (0, 1].")
+    archiver = archiver or ParallelZipArchiver()
+    paths = list(root.rglob("*"))
+    total = sum(p.stat().st_size for p in paths if p.is_file()) or 1
+    state = {"done": 0, "next": progress_step}
+    _PROGRESS.start(len(paths) + 1)  # + the root directory entry
+
+    def progress(size: int) -> None:
+        _PROGRESS.advance(1, size)
+        state["done"] += size
+        while state["next"] is not None and state["done"] / total >= state["next"]:
+            logging.info("zip+upload %s: %.0f%% of input", key, 100 * state["next"])
+            state["next"] = state["next"] + progress_step if state["next"] < 1 else None
+
+    with S3MultipartWriter(
+        client,
+        bucket,
+        key,
+        part_size=part_size,
+        max_concurrency=max_concurrency,
+        max_in_flight=max_in_flight,
+    ) as sink:
+        summary = archiver.write(root, sink, progress)
+    return ZipUploadSummary(
+        files=summary.files,
+        stored=summary.stored,
+        bytes_in=summary.bytes_in,
+        bytes_out=summary.bytes_out,
+        parts=sink.num_parts,
+    )
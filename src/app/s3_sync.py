@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.app.metrics import REGISTRY
+from src.app.s3_stream_upload import S3_MAX_PARTS, MiB, S3MultipartWriter
+
+POLICIES = ("skip_if_exists", "always_put")
+_HASH_CHUNK = 1024 * 1024
+S3_MAX_PUT_SIZE = 5 * 1024**3  # put_object refuses bodies above this
+
+_UPLOADED = REGISTRY.counter("s3_files_uploaded_total", "Files put by S3 sync")
+_SKIPPED = REGISTRY.counter("s3_files_skipped_total", "Unchanged files S3 sync skipped")
+_BYTES = REGISTRY.counter("s3_bytes_total", "Bytes uploaded to S3")
+_ERRORS = REGISTRY.counter("s3_errors_total", "S3 uploads (parts or files) that failed")
+_PUT_LATENCY = REGISTRY.histogram("s3_put_seconds", "Wall time of one file upload")
+_PROGRESS = REGISTRY.progress("sync", unit="files")
+
+
+@dataclass(frozen=True)
+class FileRecord:
+    size: int
+    mtime_ns: int
+    md5: str  # hex digest of the content
+    etag: Optional[str] = None  # ETag S3 returned when we last uploaded it
+
+
+@dataclass(frozen=True)
+class SyncSummary:
+    uploaded: int
+    skipped: int
+    bytes_uploaded: int
+    remote_only: int  # objects under the prefix with no local file (left alone)
+
+
+class SyncManifest:
+    """
+    Local JSON record of what was hashed/uploaded, keyed by relative path.
+    Files whose size and mtime are unchanged reuse the stored MD5, so a
+    refresh only reads the files that actually changed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.records: Dict[str, FileRecord] = {}
+        if self.path.exists():
+            raw = json.loads(self.path.read_text())
+            self.records = {k: FileRecord(**v) for k, v in raw.items()}
+        self._lock = threading.Lock()
+
+    def get(self, rel: str) -> Optional[FileRecord]:
+        with self._lock:
+            return self.records.get(rel)
+
+    def put(self, rel: str, record: FileRecord) -> None:
+        with self._lock:
+            self.records[rel] = record
+
+    def save(self) -> None:
+        with self._lock:
+            data = {k: vars(v) for k, v in sorted(self.records.items())}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=1))
+        os.replace(tmp, self.path)
+
+
+class S3TreeSync:
+    """
+    Uploads a directory tree file by file to s3://bucket/prefix/<relative path>.
+
+    - policy "skip_if_exists": a file is skipped when its object already exists
+      and is unchanged: same size and an ETag equal to the local MD5 (or to the
+      ETag recorded in the manifest at upload time, for multipart ETags).
+    - policy "always_put": every file is uploaded.
+    Hashing and uploads run on max_concurrency threads; progress is logged
+    every progress_step (0, 1] of the total bytes. Files of multipart_threshold
+    bytes or more are streamed as multipart uploads (put_object stops at 5 GiB).
+    Remote objects without a local file are counted but never deleted.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        prefix: str,
+        manifest: SyncManifest,
+        *,
+        policy: str = "skip_if_exists",
+        max_concurrency: int = 8,
+        progress_step: Optional[float] = None,
+        multipart_threshold: int = 64 * MiB,
+        part_size: int = 16 * MiB,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Unknown AWS policy {policy!r}; expected one of {POLICIES}"
+            )
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1.")
+        if progress_step is not None and not 0 < progress_step <= 1:
+            raise ValueError("progress_step must be in (0, 1].")
+        if not 0 < multipart_threshold <= S3_MAX_PUT_SIZE:
+            raise ValueError(f"multipart_threshold must be in (0, {S3_MAX_PUT_SIZE}].")
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.manifest = manifest
+        self.policy = policy
+        self.max_concurrency = int(max_concurrency)
+        self.progress_step = progress_step
+        self.multipart_threshold = int(multipart_threshold)
+        self.part_size = int(part_size)
+        self._lock = threading.Lock()
+        self._done = 0  # bytes processed in the current sync (progress)
+        self._next_report = progress_step
+
+    def sync(self, root: Path) -> SyncSummary:
+        root = Path(root)
+        if not root.is_dir():
+            raise ValueError(f"Not a directory: {root}")
+        files = sorted(p for p in root.rglob("*") if p.is_file())
+        remote = self._list_remote()
+        total = sum(p.stat().st_size for p in files) or 1
+
+        self._done = 0
+        self._next_report = self.progress_step
+        _PROGRESS.start(len(files))
+        uploaded = skipped = sent = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                results = pool.map(
+                    lambda p: self._sync_one(
+                        p, p.relative_to(root).as_posix(), remote, total
+                    ),
+                    files,
+                )
+                for did_upload, size in results:
+                    if did_upload:
+                        uploaded += 1
+                        sent += size
+                    else:
+                        skipped += 1
+        finally:
+            self.manifest.save()  # keep what was uploaded even if a file failed
+
+        local_keys = {self._key(p.relative_to(root).as_posix()) for p in files}
+        summary = SyncSummary(
+            uploaded=uploaded,
+            skipped=skipped,
+            bytes_uploaded=sent,
+            remote_only=len(set(remote) - local_keys),
+        )
+        logging.info(
+            "S3 sync s3://%s/%s: %d uploaded, %d unchanged, %d remote-only",
+            self.bucket,
+            self.prefix,
+            summary.uploaded,
+            summary.skipped,
+            summary.remote_only,
+        )
+        return summary
+
+    # -------------------- internals --------------------
+
+    def _key(self, rel: str) -> str:
+        return f"{self.prefix}/{rel}" if self.prefix else rel
+
+    def _list_remote(self) -> Dict[str, Tuple[int, str]]:
+        """key -> (size, ETag without quotes) for every object under the prefix."""
+        out: Dict[str, Tuple[int, str]] = {}
+        paginator = self.client.get_paginator("list_objects_v2")
+        prefix = f"{self.prefix}/" if self.prefix else ""
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                out[obj["Key"]] = (int(obj["Size"]), obj["ETag"].strip('"'))
+        return out
+
+    def _local_record(self, path: Path, rel: str) -> FileRecord:
+        st = path.stat()
+        known = self.manifest.get(rel)
+        if known and known.size == st.st_size and known.mtime_ns == st.st_mtime_ns:
+            return known
+        h = hashlib.md5()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                h.update(chunk)
+        return FileRecord(size=st.st_size, mtime_ns=st.st_mtime_ns, md5=h.hexdigest())
+
+    def _unchanged(self, record: FileRecord, remote: Optional[Tuple[int, str]]) -> bool:
+        if remote is None or remote[0] != record.size:
+            return False
+        etag = remote[1]
+        return etag == record.md5 or (record.etag is not None and etag == record.etag)
+
+    def _sync_one(
+        self, path: Path, rel: str, remote: Dict[str, Tuple[int, str]], total: int
+    ) -> Tuple[bool, int]:
+        record = self._local_record(path, rel)
+        key = self._key(rel)
+        upload = self.policy == "always_put" or not self._unchanged(
+            record, remote.get(key)
+        )
+        if upload:
+            t0 = time.perf_counter()
+            try:
+                etag = self._upload(path, key, record.size)
+            except Exception:
+                _ERRORS.inc()
+                raise
+            _PUT_LATENCY.observe(time.perf_counter() - t0)
+            _UPLOADED.inc()
+            _BYTES.inc(record.size)
+            record = FileRecord(
+                size=record.size,
+                mtime_ns=record.mtime_ns,
+                md5=record.md5,
+                etag=str(etag or "").strip('"') or None,
+            )
+            logging.debug("Uploaded s3://%s/%s", self.bucket, key)
+        else:
+            _SKIPPED.inc()
+        self.manifest.put(rel, record)
+        _PROGRESS.advance(1, record.size if upload else 0)
+        self._advance(record.size, total)
+        return upload, record.size
+
+    def _upload(self, path: Path, key: str, size: int) -> Optional[str]:
+        """Puts one file, as a streamed multipart upload when it is large."""
+        with path.open("rb") as body:
+            if size < self.multipart_threshold:
+                resp = self.client.put_object(Bucket=self.bucket, Key=key, Body=body)
+                return resp.get("ETag")
+            part_size = max(self.part_size, math.ceil(size / S3_MAX_PARTS))
+            # The sync already runs a thread per file: upload parts one at a time.
+            with S3MultipartWriter(
+                self.client, self.bucket, key, part_size=part_size, max_concurrency=1
+            ) as sink:
+                shutil.copyfileobj(body, sink, _HASH_CHUNK)
+            return sink.etag
+
+    def _advance(self, size: int, total: int) -> None:
+        if self.progress_step is None:
+            return
+        with self._lock:
+            self._done += size
+            while (
+                self._next_report is not None
+                and self._done / total >= self._next_report
+            ):
+                logging.info("S3 sync: %.0f%%", 100 * min(self._next_report, 1.0))
+                self._next_report = (
+                    self._next_report + self.progress_step
+                    if self._next_report < 1
+                    else None
+                )
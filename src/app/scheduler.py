@@ -1,13 +1,33 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import time
+from collections.abc import Iterator, Sized
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
 
 from src.app.downloader import Downloader
 from src.app.downloader_async import DownloaderAsync
 from src.app.jobs import DownloadJob
 from src.app.layout import ProjectLayout
+from src.app.metrics import REGISTRY
+from src.app.tracing import span
+
+_REQUESTS = REGISTRY.counter("download_requests_total", "Subset requests completed")
+_ERRORS = REGISTRY.counter("download_errors_total", "Subset requests that raised")
+_SKIPPED = REGISTRY.counter(
+    "download_skipped_total", "Jobs whose NetCDF file already existed"
+)
+_BYTES = REGISTRY.counter("download_bytes_total", "NetCDF bytes downloaded")
+_LATENCY = REGISTRY.histogram(
+    "download_request_seconds", "Wall time of one subset request"
+)
+_QUEUE = REGISTRY.gauge("download_queue_depth", "Jobs not started yet")
+_IN_FLIGHT = REGISTRY.gauge("download_in_flight", "Subset requests running")
+_PROGRESS = REGISTRY.progress("download", unit="jobs")
 
 
 @dataclass(frozen=True)
@@ -16,11 +36,77 @@ class SchedulerContext:
     product_slug: str
 
 
+def _file_size(path: Path) -> int:
+    return path.stat().st_size if path.exists() else 0
+
+
+def _prepare_target(job: DownloadJob, nc_path: Path) -> bool:
+    """True when the job must download; refresh jobs always do."""
+    _QUEUE.dec()
+    if job.refresh:
+        return True
+    if ProjectLayout.exists_nonempty(nc_path):
+        _SKIPPED.inc()
+        _PROGRESS.advance()
+        return False
+    return True
+
+
+@contextmanager
+def _download_target(job: DownloadJob, nc_path: Path) -> Iterator[Path]:
+    """
+    Path the request writes to. Refresh jobs download to a sibling temporary
+    file that replaces nc_path only on success, so a failed refresh keeps the
+    previous file.
+    """
+    if not job.refresh:
+        yield nc_path
+        return
+    tmp = nc_path.with_name(f".{nc_path.stem}.refresh{nc_path.suffix}")
+    try:
+        yield tmp
+        os.replace(tmp, nc_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _start_progress(n_jobs: int) -> None:
+    _PROGRESS.start(n_jobs)
+    _QUEUE.set(n_jobs)
+
+
+class _RequestMetrics:
+    """Latency, errors, bytes and progress of one subset request."""
+
+    __slots__ = ("nc_path", "t0", "size")
+
+    def __init__(self, nc_path: Path) -> None:
+        self.nc_path = nc_path
+        self.size = 0
+
+    def __enter__(self) -> "_RequestMetrics":
+        _IN_FLIGHT.inc()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _LATENCY.observe(time.perf_counter() - self.t0)
+        _IN_FLIGHT.dec()
+        if exc_type is not None:
+            _ERRORS.inc()
+            return
+        self.size = _file_size(self.nc_path)
+        _REQUESTS.inc()
+        _BYTES.inc(self.size)
+        _PROGRESS.advance(1, self.size)
+
+
 class SerialScheduler:
     def __init__(self, cm_handle) -> None:
         self._downloader = Downloader(cm_handle=cm_handle)
 
-    def download(self, jobs: List[DownloadJob], ctx: SchedulerContext) -> None:
+    def download(self, jobs: Iterable[DownloadJob], ctx: SchedulerContext) -> None:
+        _start_progress(len(jobs) if isinstance(jobs, Sized) else 0)
         for job in jobs:
             ctx.layout.ensure_product_bbox(ctx.product_slug, job.bbox_id)
             ctx.layout.ensure_nc_tile_dir(
@@ -33,9 +119,20 @@ class SerialScheduler:
                 tile_id_padded=job.tile_id_padded,
                 day_iso=job.day.isoformat(),
             )
-            if ProjectLayout.exists_nonempty(nc_path):
+            if not _prepare_target(job, nc_path):
                 continue
-            self._downloader.download_day(job, nc_path)
+            with span(
+                "download.day",
+                bbox_id=job.bbox_id,
+                tile_id=job.tile_id_padded,
+                day=job.day.isoformat(),
+            ) as s:
+                with (
+                    _RequestMetrics(nc_path) as m,
+                    _download_target(job, nc_path) as target,
+                ):
+                    self._downloader.download_day(job, target)
+                s.set(bytes=m.size)
 
 
 class AsyncScheduler:
@@ -43,16 +140,17 @@ class AsyncScheduler:
         self._downloader = DownloaderAsync(cm_handle=cm_handle)
         self._max_concurrency = max(1, int(max_concurrency))
 
-    def download(self, jobs: List[DownloadJob], ctx: SchedulerContext) -> None:
+    def download(self, jobs: Iterable[DownloadJob], ctx: SchedulerContext) -> None:
         asyncio.run(self._download_async(jobs, ctx))
 
     async def _download_async(
-        self, jobs: List[DownloadJob], ctx: SchedulerContext
+        self, jobs: Iterable[DownloadJob], ctx: SchedulerContext
     ) -> None:
         groups: Dict[Tuple[str, str], List[DownloadJob]] = {}
         for job in jobs:
             key = (job.bbox_id, job.tile_id_padded)
             groups.setdefault(key, []).append(job)
+        _start_progress(sum(len(js) for js in groups.values()))
 
         sem = asyncio.Semaphore(self._max_concurrency)
 
@@ -70,9 +168,20 @@ class AsyncScheduler:
                         tile_id_padded=job.tile_id_padded,
                         day_iso=job.day.isoformat(),
                     )
-                    if ProjectLayout.exists_nonempty(nc_path):
+                    if not _prepare_target(job, nc_path):
                         continue
-                    await self._downloader.download_day_async(job, nc_path)
+                    with span(
+                        "download.day",
+                        bbox_id=bbox_id,
+                        tile_id=tile_id,
+                        day=job.day.isoformat(),
+                    ) as s:
+                        with (
+                            _RequestMetrics(nc_path) as m,
+                            _download_target(job, nc_path) as target,
+                        ):
+                            await self._downloader.download_day_async(job, target)
+                        s.set(bytes=m.size)
 
         tasks = [
             asyncio.create_task(run_tile(b, t, js)) for (b, t), js in groups.items()
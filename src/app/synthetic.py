@@ -0,0 +1,670 @@
+"""
+Synthetic Copernicus-like inputs for benchmarks and offline tests.
+
+    ocean = SyntheticOcean(SyntheticSpec(nx=240, ny=180, days=90))
+    project = write_synthetic_project(tmp_dir, ocean, n_hauls=5_000)
+
+SyntheticOcean is a deterministic model of one product on a regular grid: a
+wiggly coastline (land to the east, a few lakes inland), a shelf deepening
+offshore, and daily fields that vary with latitude, season, depth and a
+smooth noise pattern. From it come
+
+  - the static layer: a `mask` bit field (1 = sea, 2 = land, 4 = lake,
+    8 = ice) per depth level, as SeaMaskBuilder(is_bit=True, sea_value=1)
+    reads it, plus the sea floor depth (`deptho`);
+  - data datasets with time/depth/latitude/longitude dims, CF attributes and
+    int16 packing (scale_factor, add_offset, _FillValue on land), written
+    as NetCDF or Zarr;
+  - haul tables (haul_id, time, lat, lon, depth) clustered around fishing
+    grounds along the coast, with a share of positions on land as real
+    GPS logs have;
+  - the per-tile-day NetCDF tree of a finished download (ProjectLayout),
+    planned with the same assigner, bboxes and orchestrator as production.
+
+Every size is a parameter, and equal specs always give equal data.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.app.layout import ProjectLayout
+
+if TYPE_CHECKING:
+    import xarray as xr
+
+# Static mask bits (flag_masks); a cell is sea when bit MASK_SEA is set.
+MASK_SEA = 1
+MASK_LAND = 2
+MASK_LAKE = 4
+MASK_ICE = 8
+MASK_FILL = -128
+
+PACKED_FILL = -32767
+PACKED_SCALE = 0.001
+
+# The first depth levels of the Copernicus global physics products.
+DEFAULT_DEPTHS = (0.494, 1.541, 2.646, 3.819, 5.078, 6.441, 7.93)
+
+
+class VariableSpec(NamedTuple):
+    standard_name: str
+    long_name: str
+    units: str
+    add_offset: float  # int16 packing centre: values within +-32.7 of it
+    has_depth: bool
+
+
+VARIABLES: Dict[str, VariableSpec] = {
+    "thetao": VariableSpec(
+        "sea_water_potential_temperature", "Temperature", "degrees_C", 10.0, True
+    ),
+    "so": VariableSpec("sea_water_salinity", "Salinity", "1e-3", 20.0, True),
+    "uo": VariableSpec(
+        "eastward_sea_water_velocity", "Eastward velocity", "m s-1", 0.0, True
+    ),
+    "vo": VariableSpec(
+        "northward_sea_water_velocity", "Northward velocity", "m s-1", 0.0, True
+    ),
+    "zos": VariableSpec(
+        "sea_surface_height_above_geoid", "Sea surface height", "m", 0.0, False
+    ),
+}
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Grid, calendar and coastline of a synthetic product."""
+
+    min_lon: float = -10.0
+    min_lat: float = 41.5
+    nx: int = 48  # longitude cells
+    ny: int = 36  # latitude cells
+    step: float = 1 / 12  # degrees between cell centers
+    depths: Tuple[float, ...] = DEFAULT_DEPTHS
+    start: date = date(2020, 1, 1)
+    days: int = 31
+    variables: Tuple[str, ...] = ("thetao", "so")
+    land_fraction: float = 0.3  # mean share of each row that is land (east side)
+    lakes: int = 3  # isolated inland cells flagged MASK_LAKE
+    ice_lat: Optional[float] = None  # sea cells north of it also get MASK_ICE
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.nx < 2 or self.ny < 2:
+            raise ValueError("The grid needs at least 2x2 cells.")
+        if not self.depths or list(self.depths) != sorted(set(self.depths)):
+            raise ValueError("depths must be non-empty and strictly increasing.")
+        if self.days < 1:
+            raise ValueError("days must be >= 1.")
+        if not 0.0 <= self.land_fraction < 1.0:
+            raise ValueError("land_fraction must be in [0, 1).")
+        unknown = [v for v in self.variables if v not in VARIABLES]
+        if unknown or not self.variables:
+            raise ValueError(f"Unknown variables {unknown}; known: {list(VARIABLES)}")
+
+    @property
+    def max_lon(self) -> float:
+        return self.min_lon + (self.nx - 1) * self.step
+
+    @property
+    def max_lat(self) -> float:
+        return self.min_lat + (self.ny - 1) * self.step
+
+
+class SyntheticOcean:
+    """Deterministic fields on the grid of a SyntheticSpec."""
+
+    def __init__(self, spec: SyntheticSpec) -> None:
+        self.spec = spec
+        s = spec
+        self.lons = (s.min_lon + np.arange(s.nx) * s.step).astype(np.float32)
+        self.lats = (s.min_lat + np.arange(s.ny) * s.step).astype(np.float32)
+        self.depths = np.asarray(s.depths, dtype=np.float32)
+        self.days = np.arange(
+            np.datetime64(s.start, "D"), np.datetime64(s.start, "D") + s.days
+        )
+        rng = np.random.default_rng(s.seed)
+        self.coast = self._coastline(rng)  # first land column of each row
+        cols = np.arange(s.nx)[None, :]
+        self.sea = cols < self.coast[:, None]  # (ny, nx) surface sea mask
+        # Distance to the coast in cells (sea only), then a shelf and a slope.
+        dist = np.where(self.sea, self.coast[:, None] - cols, 0).astype(np.float64)
+        self.seabed = np.where(
+            self.sea, 15.0 + 180.0 * dist**0.8 + 3000.0 * (1 - np.exp(-dist / 25)), 0
+        ).astype(np.float32)
+        self.lake_cells = self._lakes(rng)
+        self._pattern = _smooth_noise(rng, s.ny, s.nx)  # fixed spatial anomaly
+
+    def _coastline(self, rng: np.random.Generator) -> np.ndarray:
+        s = self.spec
+        y = np.arange(s.ny)
+        mean = s.nx * (1.0 - s.land_fraction)
+        if s.land_fraction == 0:
+            return np.full(s.ny, s.nx, dtype=np.int64)
+        # Capes and bays: two sines plus a smoothed random walk.
+        walk = np.cumsum(rng.normal(0.0, 0.6, s.ny))
+        walk -= np.linspace(walk[0], walk[-1], s.ny)
+        wiggle = 0.12 * s.nx * np.sin(2 * np.pi * y / max(s.ny, 8) * 1.3 + 0.7)
+        wiggle += 0.05 * s.nx * np.sin(2 * np.pi * y / max(s.ny, 8) * 4.1)
+        coast = np.rint(mean + wiggle + walk).astype(np.int64)
+        return np.clip(coast, 1, s.nx - 1)
+
+    def _lakes(self, rng: np.random.Generator) -> np.ndarray:
+        """Flat indices of inland cells (2+ cells from the sea) turned into lakes."""
+        cols = np.arange(self.spec.nx)[None, :]
+        inland = np.flatnonzero(cols >= self.coast[:, None] + 2)
+        if inland.size == 0 or self.spec.lakes <= 0:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(rng.choice(inland, min(self.spec.lakes, inland.size), False))
+
+    # -------------------- static layer --------------------
+
+    def mask_bits(self) -> np.ndarray:
+        """(depth, lat, lon) int8 bit field; deeper levels lose the shallow sea."""
+        s = self.spec
+        surface = np.where(self.sea, MASK_SEA, MASK_LAND).astype(np.int8)
+        surface.ravel()[self.lake_cells] = MASK_LAKE
+        if s.ice_lat is not None:
+            icy = self.sea & (self.lats[:, None] >= s.ice_lat)
+            surface[icy] |= MASK_ICE
+        out = np.repeat(surface[None], len(s.depths), axis=0)
+        below_floor = self.depths[:, None, None] > self.seabed[None]
+        out[below_floor & self.sea[None]] = MASK_LAND
+        return out
+
+    def static_dataset(self) -> xr.Dataset:
+        import xarray as xr
+
+        bits = self.mask_bits()
+        ds = xr.Dataset(
+            {
+                "mask": (
+                    ("depth", "latitude", "longitude"),
+                    bits,
+                    {
+                        "long_name": "land sea ice lake bit mask",
+                        "flag_masks": np.array(
+                            [MASK_SEA, MASK_LAND, MASK_LAKE, MASK_ICE], dtype=np.int8
+                        ),
+                        "flag_meanings": "sea land lake ice",
+                    },
+                ),
+                "deptho": (
+                    ("latitude", "longitude"),
+                    np.where(self.sea, self.seabed, np.nan).astype(np.float32),
+                    {
+                        "standard_name": "sea_floor_depth_below_geoid",
+                        "long_name": "Bathymetry",
+                        "units": "m",
+                    },
+                ),
+            },
+            coords=self._coords(time=False),
+            attrs=self._global_attrs("static layer"),
+        )
+        ds["mask"].encoding["_FillValue"] = np.int8(MASK_FILL)
+        ds["deptho"].encoding["_FillValue"] = np.float32(np.nan)
+        return ds
+
+    # -------------------- data --------------------
+
+    def fields(self, day: int) -> Dict[str, np.ndarray]:
+        """
+        Values of day index `day` (0 = spec.start) as float32 arrays,
+        (depth, lat, lon) or (lat, lon), NaN on land and below the sea floor.
+        """
+        s = self.spec
+        rng = np.random.default_rng([s.seed, 1, int(day)])
+        doy = (self.days[0] + day).astype("datetime64[D]").item().timetuple().tm_yday
+        season = np.sin(2 * np.pi * (doy - 110) / 365.25)
+        lat_c = (self.lats - self.lats.mean())[:, None]
+        z = self.depths[:, None, None]
+        daily = rng.normal(0.0, 0.05, (s.ny, s.nx))
+        wet = self.sea[None] & (z <= self.seabed[None])
+
+        out: Dict[str, np.ndarray] = {}
+        for name in s.variables:
+            if name == "thetao":
+                sst = 15.5 + 3.0 * season - 0.6 * lat_c + 0.8 * self._pattern + daily
+                deep = 11.5 - 0.0004 * np.minimum(z, 4000.0)
+                values = deep + (sst[None] - deep) * np.exp(-z / 60.0)
+            elif name == "so":
+                values = (
+                    35.6 - 0.1 * season + 0.15 * self._pattern + 0.2 * daily
+                ) + 0.0004 * np.minimum(z, 1000.0)
+            elif name in ("uo", "vo"):
+                sign = 1.0 if name == "uo" else -1.0
+                values = (0.15 * sign * self._pattern + 0.5 * daily) * np.exp(
+                    -z / 200.0
+                )
+            else:  # zos
+                values = 0.1 * season + 0.05 * self._pattern + 0.2 * daily
+            values = np.asarray(values, dtype=np.float32)
+            if VARIABLES[name].has_depth:
+                values = np.where(wet, values, np.nan)
+            else:
+                values = np.where(self.sea, values, np.nan)
+            out[name] = values.astype(np.float32, copy=False)
+        return out
+
+    def dataset(self, start_day: int = 0, days: Optional[int] = None) -> xr.Dataset:
+        """Days [start_day, start_day + days) of every variable, packing encoded."""
+        import xarray as xr
+
+        stop = self.spec.days if days is None else min(start_day + days, self.spec.days)
+        if not 0 <= start_day < stop:
+            raise ValueError(f"No days in [{start_day}, {stop}).")
+        per_day = [self.fields(d) for d in range(start_day, stop)]
+        data_vars = {}
+        for name in self.spec.variables:
+            dims = ("time", "depth", "latitude", "longitude")
+            if not VARIABLES[name].has_depth:
+                dims = ("time", "latitude", "longitude")
+            stacked = np.stack([f[name] for f in per_day])
+            data_vars[name] = (dims, stacked, _variable_attrs(name, stacked))
+        ds = xr.Dataset(
+            data_vars,
+            coords=self._coords(time=True, days=self.days[start_day:stop]),
+            attrs=self._global_attrs("daily mean fields"),
+        )
+        for name in self.spec.variables:
+            ds[name].encoding.update(_packing(name))
+        ds["time"].encoding.update(units="hours since 1950-01-01", calendar="standard")
+        return ds
+
+    # -------------------- hauls --------------------
+
+    def hauls(
+        self,
+        n: int,
+        *,
+        grounds: int = 8,
+        spread_cells: float = 1.5,
+        on_land_fraction: float = 0.02,
+    ) -> pd.DataFrame:
+        """
+        n hauls (haul_id, time, lat, lon, depth) around `grounds` fishing
+        grounds 1-6 cells off the coast; ground popularity is uneven, and a
+        share of positions lands just inside the coast (the assigner snaps
+        them to the nearest sea cell).
+        """
+        s = self.spec
+        if n < 0 or grounds < 1:
+            raise ValueError("n must be >= 0 and grounds >= 1.")
+        rng = np.random.default_rng([s.seed, 2])
+        cols = np.arange(s.nx)[None, :]
+        dist = self.coast[:, None] - cols
+        near = np.flatnonzero((self.sea & (dist >= 1) & (dist <= 6)).ravel())
+        if near.size == 0:
+            near = np.flatnonzero(self.sea.ravel())
+        if near.size == 0:
+            raise ValueError("The synthetic grid has no sea cells.")
+        centers = rng.choice(near, min(grounds, near.size), replace=False)
+        weights = rng.dirichlet(np.full(centers.size, 0.8))
+        pick = rng.choice(centers.size, n, p=weights)
+        cj, ci = np.divmod(centers[pick], s.nx)
+        fj = cj + rng.normal(0.0, spread_cells, n)
+        fi = ci + rng.normal(0.0, spread_cells, n)
+        fj = np.clip(fj, 0, s.ny - 1)
+        j = np.rint(fj).astype(np.int64)
+        coast = self.coast[j]
+        # Positions on land are mirrored back to sea except the on_land share.
+        on_land = np.rint(fi) >= coast
+        keep_land = rng.random(n) < on_land_fraction
+        fi = np.where(on_land & ~keep_land, 2 * coast - 1 - fi, fi)
+        fi = np.clip(fi, 0, s.nx - 1)
+        i = np.clip(np.rint(fi).astype(np.int64), 0, np.maximum(coast - 1, 0))
+
+        floor = self.seabed[j, i]
+        floor = np.where(floor > 0, floor, 15.0)
+        depth = np.round(np.maximum(5.0, floor * rng.uniform(0.6, 1.0, n)), 1)
+        day = rng.integers(0, s.days, n)
+        seconds = rng.integers(4 * 3600, 20 * 3600, n)
+        when = self.days[day].astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+        return pd.DataFrame(
+            {
+                "haul_id": np.arange(1, n + 1),
+                "time": when,
+                "lat": np.round(s.min_lat + fj * s.step, 5),
+                "lon": np.round(s.min_lon + fi * s.step, 5),
+                "depth": depth,
+            }
+        )
+
+    # -------------------- helpers --------------------
+
+    def _coords(self, *, time: bool, days: Optional[np.ndarray] = None) -> Dict:
+        import xarray as xr
+
+        coords = {
+            "depth": xr.Variable(
+                "depth",
+                self.depths,
+                {
+                    "standard_name": "depth",
+                    "long_name": "Depth",
+                    "units": "m",
+                    "positive": "down",
+                    "axis": "Z",
+                },
+            ),
+            "latitude": xr.Variable(
+                "latitude",
+                self.lats,
+                {
+                    "standard_name": "latitude",
+                    "long_name": "Latitude",
+                    "units": "degrees_north",
+                    "axis": "Y",
+                },
+            ),
+            "longitude": xr.Variable(
+                "longitude",
+                self.lons,
+                {
+                    "standard_name": "longitude",
+                    "long_name": "Longitude",
+                    "units": "degrees_east",
+                    "axis": "X",
+                },
+            ),
+        }
+        if time:
+            coords["time"] = xr.Variable(
+                "time",
+                (self.days if days is None else days).astype("datetime64[ns]"),
+                {"standard_name": "time", "long_name": "Time", "axis": "T"},
+            )
+        return coords
+
+    def _global_attrs(self, what: str) -> Dict[str, str]:
+        return {
+            "Conventions": "CF-1.6",
+            "title": f"Synthetic Copernicus-like product: {what}",
+            "institution": "synthetic",
+            "source": f"src.app.synthetic (seed {self.spec.seed})",
+        }
+
+
+def _smooth_noise(rng: np.random.Generator, ny: int, nx: int) -> np.ndarray:
+    """Zero-mean, unit-std noise correlated over a few cells."""
+    from scipy.ndimage import gaussian_filter
+
+    field = gaussian_filter(rng.standard_normal((ny, nx)), sigma=3.0, mode="nearest")
+    std = field.std()
+    return (field - field.mean()) / (std if std > 0 else 1.0)
+
+
+def _variable_attrs(name: str, values: np.ndarray) -> Dict[str, object]:
+    v = VARIABLES[name]
+    finite = values[np.isfinite(values)]
+    attrs: Dict[str, object] = {
+        "standard_name": v.standard_name,
+        "long_name": v.long_name,
+        "units": v.units,
+    }
+    if finite.size:
+        attrs["valid_min"] = float(np.floor(finite.min()))
+        attrs["valid_max"] = float(np.ceil(finite.max()))
+    return attrs
+
+
+def _packing(name: str) -> Dict[str, object]:
+    return {
+        "dtype": "int16",
+        "scale_factor": PACKED_SCALE,
+        "add_offset": VARIABLES[name].add_offset,
+        "_FillValue": np.int16(PACKED_FILL),
+    }
+
+
+def logbook(
+    hauls: pd.DataFrame,
+    *,
+    duplicate_fraction: float = 0.05,
+    missing_start_fraction: float = 0.02,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    The raw logbook export HaulDbBuilder cleans, for the given hauls: start
+    and end positions as degree-minute integers (DDMMmmm, west positive)
+    with decimal commas, `dia` as d/m/yyyy, PROFMax/PROFMin, repeated
+    Idlance rows and a share of rows with only the end position.
+    """
+    rng = np.random.default_rng([seed, 3])
+    n = len(hauls)
+    lon = hauls["lon"].to_numpy(dtype=np.float64)
+    lat = hauls["lat"].to_numpy(dtype=np.float64)
+    tow = rng.normal(0.0, 0.03, (2, n))  # end of the tow, in degrees
+    when = pd.to_datetime(hauls["time"])
+    depth = hauls["depth"].to_numpy(dtype=np.float64)
+    raw = pd.DataFrame(
+        {
+            "Idlance": hauls["haul_id"].to_numpy(),
+            "dia": [f"{t.day}/{t.month}/{t.year}" for t in when],
+            "LON inicio": _degree_minutes(-lon),
+            "LAT inicio": _degree_minutes(lat),
+            "LON final": _degree_minutes(-(lon + tow[0])),
+            "LAT final": _degree_minutes(lat + tow[1]),
+            "PROFMax": depth,
+            "PROFMin": np.round(depth * rng.uniform(0.5, 0.9, n), 1),
+        }
+    )
+    no_start = rng.random(n) < missing_start_fraction
+    raw.loc[no_start, ["LON inicio", "LAT inicio"]] = None
+    dupes = raw.sample(frac=duplicate_fraction, random_state=seed)
+    raw = pd.concat([raw, dupes], ignore_index=True)
+    return raw.iloc[rng.permutation(len(raw))].reset_index(drop=True)
+
+
+def _degree_minutes(deg: np.ndarray) -> np.ndarray:
+    whole = np.trunc(deg)
+    raw = whole * 100000.0 + (deg - whole) * 60.0 * 1000.0
+    return np.char.replace(np.round(raw, 1).astype(str), ".", ",")
+
+
+# -------------------- writers --------------------
+
+
+def write_dataset(ds: xr.Dataset, path: Path, *, fmt: str = "netcdf") -> Path:
+    """Writes ds with its encodings as NetCDF4 (fmt="netcdf") or Zarr ("zarr")."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "netcdf":
+        ds.to_netcdf(path, engine="netcdf4")
+    elif fmt == "zarr":
+        try:
+            import zarr  # noqa: F401
+        except ImportError as e:  # optional dependency
+            raise ImportError(
+                "Zarr output needs the 'zarr' package (pip install zarr)."
+            ) from e
+        ds.to_zarr(path, mode="w")
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected 'netcdf' or 'zarr'.")
+    return path
+
+
+def write_tile_day_tree(
+    ocean: SyntheticOcean,
+    tile_days: pd.DataFrame,
+    layout: ProjectLayout,
+    product: str,
+    *,
+    lat_bands: int = 2,
+    half_cells: int = 0,
+) -> int:
+    """
+    Writes the NetCDF files a download of tile_days (the tiles_with_date
+    table) would leave: one file per tile and day at layout.nc_path, holding
+    the (2 * half_cells + 1)^2 cells around the tile and the depth levels
+    down to its z_max. Bboxes are latitude bands, as in production.
+    Returns the number of files written.
+    """
+    from src.app.bbox_factory import BBoxFactory
+    from src.app.orchestrator import TileDayOrchestrator
+
+    s = ocean.spec
+    if tile_days.empty:
+        return 0
+    bboxes = BBoxFactory(
+        s.min_lon - s.step / 2,
+        s.min_lat - s.step / 2,
+        s.max_lon + s.step / 2,
+        s.max_lat + s.step / 2,
+        lat_bands,
+    ).build(tile_days)
+    jobs = TileDayOrchestrator("synthetic", s.variables, s.step).build_job_table(
+        tile_days, bboxes
+    )
+
+    day_index = ((jobs.day - ocean.days[0]) // np.timedelta64(1, "D")).astype(int)
+    if day_index.min() < 0 or day_index.max() >= s.days:
+        raise ValueError("tile_days has days outside the synthetic calendar.")
+    jj = np.abs(ocean.lats[None, :] - jobs.lat[:, None]).argmin(axis=1)
+    ii = np.abs(ocean.lons[None, :] - jobs.lon[:, None]).argmin(axis=1)
+
+    written = 0
+    for d in np.unique(day_index):  # one day of fields in memory at a time
+        day_ds = ocean.dataset(int(d), 1)
+        for k in np.flatnonzero(day_index == d):
+            j, i = int(jj[k]), int(ii[k])
+            levels = np.flatnonzero(ocean.depths <= max(jobs.z_max[k], ocean.depths[0]))
+            sub = day_ds.isel(
+                latitude=slice(max(0, j - half_cells), j + half_cells + 1),
+                longitude=slice(max(0, i - half_cells), i + half_cells + 1),
+                depth=slice(0, int(levels[-1]) + 1),
+            )
+            bbox_id = jobs.bbox_ids[int(jobs.bbox_index[k])]
+            tile = str(int(jobs.tile_id[k])).zfill(5)
+            layout.ensure_nc_tile_dir(product, bbox_id, tile)
+            day_iso = str(jobs.day[k].astype("datetime64[D]"))
+            path = layout.nc_path(product, bbox_id, tile, day_iso)
+            sub.to_netcdf(path, engine="netcdf4")
+            written += 1
+    for bbox_id in jobs.bbox_ids:
+        layout.ensure_product_bbox(product, bbox_id)
+    return written
+
+
+@dataclass(frozen=True)
+class SyntheticProject:
+    root: Path
+    product: str
+    static_path: Path
+    data_path: Optional[Path]  # the full-grid dataset, when asked for
+    hauls_path: Path
+    haul_with_tiles_path: Path
+    tile_days_path: Path
+    nc_files: int
+
+    @property
+    def layout(self) -> ProjectLayout:
+        return ProjectLayout(self.root / "output")
+
+    @property
+    def product_root(self) -> Path:
+        return self.layout.product_root(self.product)
+
+
+def write_synthetic_project(
+    root: Path,
+    ocean: SyntheticOcean,
+    *,
+    product: str = "synthetic",
+    n_hauls: int = 1000,
+    grounds: int = 8,
+    lat_bands: int = 2,
+    half_cells: int = 0,
+    data_format: Optional[str] = "netcdf",
+) -> SyntheticProject:
+    """
+    Lays out a complete offline project under root:
+
+      input/static_data/<product>_static.nc   static mask layer
+      input/<product>.nc (or .zarr)           full-grid data (data_format)
+      input/clean_haul_db.csv                 hauls
+      output/<product>/...                    tables and per-tile-day tree
+
+    Hauls are assigned to tiles with the production assigner, so the tree
+    matches what the pipeline itself would plan.
+    """
+    from src.data_processing.assign_hauls_to_tiles_id import (
+        HaulTileAssigner,
+        StaticSpec,
+    )
+    from src.data_processing.tile_days_builder import TileDaysBuilder
+
+    root = Path(root)
+    static_path = write_dataset(
+        ocean.static_dataset(), root / "input" / "static_data" / f"{product}_static.nc"
+    )
+    data_path = None
+    if data_format is not None:
+        suffix = ".zarr" if data_format == "zarr" else ".nc"
+        data_path = write_dataset(
+            ocean.dataset(), root / "input" / f"{product}{suffix}", fmt=data_format
+        )
+
+    hauls = ocean.hauls(n_hauls, grounds=grounds)
+    hauls_path = root / "input" / "clean_haul_db.csv"
+    hauls.to_csv(hauls_path, index=False)
+
+    assigner = HaulTileAssigner(StaticSpec(path=static_path))
+    assigner.load_static_and_build_index()
+    enriched = assigner.assign(hauls)
+    tile_days = TileDaysBuilder().build_per_day(enriched)
+
+    layout = ProjectLayout(root / "output")
+    out_dir = layout.product_root(product)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    haul_with_tiles_path = out_dir / "haul_with_tiles_db.csv"
+    tile_days_path = out_dir / "tiles_with_date_db.csv"
+    enriched.to_csv(haul_with_tiles_path, index=False)
+    tile_days.to_csv(tile_days_path, index=False)
+
+    nc_files = write_tile_day_tree(
+        ocean,
+        tile_days,
+        layout,
+        product,
+        lat_bands=lat_bands,
+        half_cells=half_cells,
+    )
+    logging.info(
+        "synthetic project %s: %d hauls, %d tile-days, %d NetCDF files",
+        root,
+        len(hauls),
+        len(tile_days),
+        nc_files,
+    )
+    return SyntheticProject(
+        root=root,
+        product=product,
+        static_path=static_path,
+        data_path=data_path,
+        hauls_path=hauls_path,
+        haul_with_tiles_path=haul_with_tiles_path,
+        tile_days_path=tile_days_path,
+        nc_files=nc_files,
+    )
+
+
+def sizes(ocean: SyntheticOcean) -> Dict[str, int]:
+    """Cell counts, for labelling benchmark results."""
+    s = ocean.spec
+    return {
+        "cells": s.nx * s.ny,
+        "sea_cells": int(ocean.sea.sum()),
+        "depths": len(s.depths),
+        "days": s.days,
+        "variables": len(s.variables),
+    }
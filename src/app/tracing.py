@@ -0,0 +1,281 @@
+"""
+Lightweight hierarchical tracing.
+
+    with span("convert.tile", tile_id=38, bbox_id="bbox_1") as s:
+        ...
+        s.set(rows=len(df))
+
+Spans nest through a context variable, so every asyncio task and thread
+keeps its own parent chain. Finished spans are buffered per process and
+appended as JSON lines to the trace file named by TRACE_FILE_ENV; worker
+processes inherit the variable and append to the same file (each flush is a
+single O_APPEND write). With tracing off, span() costs an environment lookup.
+export_chrome_trace() turns the JSON lines into a chrome://tracing / Perfetto
+file.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import count
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_FILE_ENV = "PIPELINE_TRACE_FILE"
+_FLUSH_EVERY = 256  # buffered spans before a write (root spans always flush)
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "attrs", "pid", "_start_us", "_t0")
+
+    def __init__(self, name: str, span_id: str, parent_id: Optional[str], attrs):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attrs: Dict[str, Any] = attrs
+        self.pid = os.getpid()
+        self._start_us = time.time_ns() // 1000  # wall clock: aligns processes
+        self._t0 = time.perf_counter_ns()
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def _record(self, error: Optional[BaseException]) -> Dict[str, Any]:
+        rec = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_us": self._start_us,
+            "dur_us": (time.perf_counter_ns() - self._t0) // 1000,
+            "pid": self.pid,
+            "tid": threading.get_native_id(),
+            "attrs": self.attrs,
+        }
+        if error is not None:
+            rec["error"] = f"{type(error).__name__}: {error}"
+        return rec
+
+
+class _NullSpan:
+    """Stand-in yielded while tracing is off."""
+
+    __slots__ = ()
+    span_id = None
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Recorder:
+    """Per-process span buffer writing to the shared JSON-lines file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.pid = os.getpid()
+        self._ids = count(1)
+        self._buf: List[str] = []
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        return f"{self.pid:x}.{next(self._ids):x}"
+
+    def add(self, rec: Dict[str, Any], *, flush: bool) -> None:
+        line = json.dumps(rec, default=str, separators=(",", ":"))
+        with self._lock:
+            self._buf.append(line)
+            if flush or len(self._buf) >= _FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buf:
+            return
+        data = ("\n".join(self._buf) + "\n").encode()
+        self._buf.clear()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+_recorder: Optional[_Recorder] = None
+_recorder_lock = threading.Lock()
+
+
+def _active() -> Optional[_Recorder]:
+    """This process' recorder; re-created after fork, picked up from the env."""
+    global _recorder
+    rec = _recorder
+    if rec is not None and rec.pid == os.getpid():
+        return rec
+    path = os.environ.get(TRACE_FILE_ENV)
+    if rec is None and not path:
+        return None
+    with _recorder_lock:
+        if _recorder is None or _recorder.pid != os.getpid():
+            path = path or str(_recorder.path)
+            _recorder = _Recorder(Path(path))
+        return _recorder
+
+
+def enable_tracing(path: Path, *, truncate: bool = True) -> Path:
+    """Starts recording spans to path (and in every worker started later)."""
+    global _recorder
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if truncate:
+        path.write_text("")
+    os.environ[TRACE_FILE_ENV] = str(path)
+    with _recorder_lock:
+        _recorder = _Recorder(path)
+    return path
+
+
+def disable_tracing() -> None:
+    global _recorder
+    with _recorder_lock:
+        if _recorder is not None:
+            _recorder.flush()
+        _recorder = None
+    os.environ.pop(TRACE_FILE_ENV, None)
+
+
+def flush() -> None:
+    rec = _active()
+    if rec is not None:
+        rec.flush()
+
+
+def annotate(**attrs: Any) -> None:
+    """Adds attributes to the innermost open span (no-op outside spans)."""
+    cur = _current.get()
+    if cur is not None:
+        cur.set(**attrs)
+
+
+atexit.register(flush)  # spans of still-open roots when the interpreter exits
+
+
+def current_span_id() -> Optional[str]:
+    """Id of the innermost open span; pass it as parent_id to a worker task."""
+    cur = _current.get()
+    return None if cur is None else cur.span_id
+
+
+@contextmanager
+def span(name: str, *, parent_id: Optional[str] = None, **attrs: Any) -> Iterator[Any]:
+    """
+    Times the body as a child of the current span. parent_id links a span
+    opened in a worker process to the span that submitted the work.
+    """
+    rec = _active()
+    if rec is None:
+        yield _NULL_SPAN
+        return
+    parent = _current.get()
+    if parent_id is None and parent is not None:
+        parent_id = parent.span_id
+    # A forked worker inherits the submitting span: link to it, but this
+    # process' span is still a root and must flush when it ends.
+    is_root = parent is None or parent.pid != rec.pid
+    s = Span(name, rec.next_id(), parent_id, attrs)
+    token = _current.set(s)
+    error: Optional[BaseException] = None
+    try:
+        yield s
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current.reset(token)
+        rec.add(s._record(error), flush=is_root)
+
+
+def traced(label: str):
+    """
+    Decorator: the call runs inside span(label) and logs its start and
+    duration at INFO. Works on coroutines too.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                logging.info("%s: start", label)
+                t0 = time.perf_counter()
+                try:
+                    with span(label):
+                        return await func(*args, **kwargs)
+                finally:
+                    logging.info("%s: done in %.2fs", label, time.perf_counter() - t0)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            logging.info("%s: start", label)
+            t0 = time.perf_counter()
+            try:
+                with span(label):
+                    return func(*args, **kwargs)
+            finally:
+                logging.info("%s: done in %.2fs", label, time.perf_counter() - t0)
+
+        return wrapper
+
+    return decorator
+
+
+# -------------------- export --------------------
+
+
+def read_spans(path: Path) -> List[Dict[str, Any]]:
+    with Path(path).open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def export_chrome_trace(jsonl_path: Path, out_path: Path) -> Path:
+    """Complete ("X") events, one lane per process/thread, attrs as args."""
+    events = []
+    for rec in read_spans(jsonl_path):
+        args = dict(rec.get("attrs") or {})
+        if rec.get("error"):
+            args["error"] = rec["error"]
+        events.append(
+            {
+                "name": rec["name"],
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": rec["start_us"],
+                "dur": rec["dur_us"],
+                "pid": rec["pid"],
+                "tid": rec["tid"],
+                "args": args,
+            }
+        )
+    events.sort(key=lambda e: (e["ts"], -e["dur"]))
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+    return out_path
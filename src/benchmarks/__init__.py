@@ -0,0 +1,10 @@
+"""
+Performance benchmarks on synthetic data, with JSON baselines and a
+regression gate:
+
+    python -m src.benchmarks run --scale small --out benchmarks/baselines/small.json
+    python -m src.benchmarks run --scale small --baseline benchmarks/baselines/small.json
+    python -m src.benchmarks compare OLD.json NEW.json
+
+Baselines are machine-specific: record them on the machine that gates.
+"""
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+from src.benchmarks.cases import CASES, SCALES
+from src.benchmarks.harness import (
+    SuiteResult,
+    Thresholds,
+    compare,
+    format_comparison,
+    run_suite,
+)
+
+
+def _fraction(value: str) -> float:
+    x = float(value)
+    if not 0 <= x < 1:
+        raise argparse.ArgumentTypeError("must be in [0, 1)")
+    return x
+
+
+def build_parser() -> argparse.ArgumentParser:
+    gate = argparse.ArgumentParser(add_help=False)
+    gate.add_argument(
+        "--throughput-tolerance",
+        type=_fraction,
+        default=Thresholds.throughput,
+        metavar="X",
+        help="fail when items/s drop below (1 - X) * baseline (default: %(default)s)",
+    )
+    gate.add_argument(
+        "--memory-tolerance",
+        type=_fraction,
+        default=Thresholds.memory,
+        metavar="X",
+        help="fail when the peak grows over (1 + X) * baseline (default: %(default)s)",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks",
+        description="Pipeline benchmarks on synthetic data",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", parents=[gate], help="run the suite")
+    run.add_argument("--scale", choices=sorted(SCALES), default="small")
+    run.add_argument(
+        "--case",
+        action="append",
+        choices=sorted(CASES),
+        default=None,
+        help="run only this case (repeatable; default: all)",
+    )
+    run.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    run.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="write the results as JSON (default: bench-<scale>.json)",
+    )
+    run.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="compare against this baseline and fail on regressions",
+    )
+    run.add_argument(
+        "--scratch",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="where cases write their inputs (default: a temporary directory)",
+    )
+
+    cmp = sub.add_parser("compare", parents=[gate], help="compare two result files")
+    cmp.add_argument("baseline", type=Path)
+    cmp.add_argument("current", type=Path)
+    return parser
+
+
+def _gate(baseline: Path, current: SuiteResult, args: argparse.Namespace) -> int:
+    thresholds = Thresholds(
+        throughput=args.throughput_tolerance, memory=args.memory_tolerance
+    )
+    rows = compare(SuiteResult.read(baseline), current, thresholds)
+    print(format_comparison(rows))
+    failed = [c.case for c in rows if c.failed]
+    if failed:
+        print(f"regressions in: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    if args.command == "compare":
+        return _gate(args.baseline, SuiteResult.read(args.current), args)
+
+    cases = [CASES[name] for name in (args.case or CASES)]
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        suite = run_suite(
+            cases,
+            args.scale,
+            SCALES[args.scale],
+            args.scratch or Path(tmp),
+            repeat=args.repeat,
+        )
+    out = suite.write(args.out or Path(f"bench-{args.scale}.json"))
+    logging.info("results written to %s", out)
+    if args.baseline is not None:
+        return _gate(args.baseline, suite, args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
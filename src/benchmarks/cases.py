@@ -0,0 +1,283 @@
+"""
+Benchmark cases on synthetic data (src.app.synthetic), at three scales.
+
+Each case times one hot entry point; inputs are built in setup and cached
+per scale, so only the body under test is measured.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.app.synthetic import SyntheticOcean, SyntheticSpec
+from src.benchmarks.harness import Case
+
+COLUMNS_MAP = {
+    "haul_id": "Idlance",
+    "time": "date",
+    "lat": "lat",
+    "lon": "lon",
+    "depth": "depth",
+}
+
+
+@dataclass(frozen=True)
+class Scale:
+    nx: int  # grid cells (longitude)
+    ny: int  # grid cells (latitude)
+    step: float  # degrees between cell centers
+    days: int  # calendar length
+    hauls: int  # haul rows (cleaning, tile-days, planning)
+    queries: int  # KD lookups
+    frame_days: int  # days flattened by the frame extractor
+    tiles: int  # tiles with NetCDF/CSV files
+    tile_days: int  # days per tile for the NetCDF/CSV cases
+
+    def spec(self) -> SyntheticSpec:
+        return SyntheticSpec(nx=self.nx, ny=self.ny, step=self.step, days=self.days)
+
+
+SCALES: Dict[str, Scale] = {
+    "small": Scale(120, 90, 1 / 24, 31, 20_000, 200_000, 2, 40, 10),
+    "medium": Scale(360, 270, 1 / 72, 90, 200_000, 2_000_000, 4, 50, 31),
+    "large": Scale(1080, 810, 1 / 216, 365, 1_000_000, 10_000_000, 4, 200, 90),
+}
+
+
+# -------------------- shared inputs (cached per scale) --------------------
+
+
+@lru_cache(maxsize=2)
+def _ocean(scale: Scale) -> SyntheticOcean:
+    return SyntheticOcean(scale.spec())
+
+
+@lru_cache(maxsize=2)
+def _catalog_and_index(scale: Scale):
+    from src.data_processing.grid_spec import GridSpec
+    from src.data_processing.kd_index import KDIndex
+    from src.data_processing.tile_catalog import TileCatalog
+
+    ocean = _ocean(scale)
+    grid = GridSpec.from_dataset(ocean.static_dataset())
+    catalog = TileCatalog(grid, ocean.sea)
+    return catalog, KDIndex(catalog, lat0=float(np.median(grid.lats)))
+
+
+@lru_cache(maxsize=2)
+def _enriched_hauls(scale: Scale) -> pd.DataFrame:
+    """Hauls with their tile, as HaulTileAssigner leaves them."""
+    catalog, kd = _catalog_and_index(scale)
+    hauls = _ocean(scale).hauls(scale.hauls)
+    tile_id = kd.query_many(hauls["lon"].to_numpy(), hauls["lat"].to_numpy())
+    lon, lat = catalog.sea_tile_coords()
+    return hauls.assign(
+        tile_id=tile_id, tile_lon_center=lon[tile_id], tile_lat_center=lat[tile_id]
+    )
+
+
+@lru_cache(maxsize=2)
+def _tile_days(scale: Scale) -> pd.DataFrame:
+    from src.data_processing.tile_days_builder import TileDaysBuilder
+
+    return TileDaysBuilder().build_per_day(_enriched_hauls(scale))
+
+
+def _spread_tiles(scale: Scale) -> List[Tuple[int, int, int]]:
+    """(tile_id, j, i) of scale.tiles sea tiles spread over the catalog."""
+    catalog, _ = _catalog_and_index(scale)
+    n = catalog.sea_tile_ids().size
+    ids = np.unique(np.linspace(0, n - 1, min(scale.tiles, n)).astype(int))
+    j, i = catalog.sea_cell_ids_many(ids)
+    return [(int(t), int(a), int(b)) for t, a, b in zip(ids, j, i)]
+
+
+# -------------------- cases --------------------
+
+
+def _kd_setup(scale: Scale, work_dir: Path):
+    _, kd = _catalog_and_index(scale)
+    hauls = _ocean(scale).hauls(scale.queries)
+    return kd, hauls["lon"].to_numpy(), hauls["lat"].to_numpy()
+
+
+def _kd_run(ctx) -> int:
+    kd, lons, lats = ctx
+    return int(kd.query_many(lons, lats).size)
+
+
+def _catalog_setup(scale: Scale, work_dir: Path):
+    catalog, _ = _catalog_and_index(scale)
+    return catalog.grid, _ocean(scale).sea
+
+
+def _catalog_run(ctx) -> int:
+    from src.data_processing.tile_catalog import TileCatalog
+
+    grid, sea = ctx
+    TileCatalog(grid, sea)
+    return grid.nx * grid.ny
+
+
+def _frame_setup(scale: Scale, work_dir: Path):
+    from src.data_processing.dataset_tile_frame_extractor import (
+        DatasetTileFrameExtractor,
+    )
+
+    catalog, _ = _catalog_and_index(scale)
+    ocean = _ocean(scale)
+    ds = ocean.dataset(0, scale.frame_days)
+    return DatasetTileFrameExtractor(catalog, bbox_id=0), ds, ocean.spec.variables
+
+
+def _frame_run(ctx) -> int:
+    extractor, ds, variables = ctx
+    return len(extractor.to_frame_multi(ds, variables))
+
+
+def _nc_setup(scale: Scale, work_dir: Path):
+    from src.app.layout import ProjectLayout
+    from src.app.nc_to_csv_converter import NCTileToCSVConverter
+    from src.app.synthetic import write_tile_day_tree
+
+    ocean = _ocean(scale)
+    lon, lat = _catalog_and_index(scale)[0].sea_tile_coords()
+    rows = [
+        (t, float(lon[t]), float(lat[t]), str(day), float(ocean.depths[-1]))
+        for t, _, _ in _spread_tiles(scale)
+        for day in ocean.days[: scale.tile_days]
+    ]
+    tile_days = pd.DataFrame(
+        rows,
+        columns=[
+            "tile_id",
+            "tile_lon_center",
+            "tile_lat_center",
+            "time",
+            "deepest_depth",
+        ],
+    )
+    layout = ProjectLayout(work_dir)
+    write_tile_day_tree(ocean, tile_days, layout, "bench")
+    product = layout.product_root("bench")
+    tiles = {}
+    for path in sorted(product.glob("*/nc/*/*.nc")):
+        tiles.setdefault(path.parent, []).append(path)
+    return NCTileToCSVConverter(ocean.spec.variables), list(tiles.values())
+
+
+def _nc_run(ctx) -> int:
+    converter, tiles = ctx
+    for files in tiles:
+        converter.run(files)
+    return sum(len(files) for files in tiles)
+
+
+def _amalgamation_setup(scale: Scale, work_dir: Path):
+    from src.app.csv_amalgamation import CSVAmalgamation
+
+    ocean = _ocean(scale)
+    spread = _spread_tiles(scale)
+    days = range(min(scale.tile_days, ocean.spec.days))
+    fields = [ocean.fields(d) for d in days]
+    variables = ocean.spec.variables
+    rows = 0
+    for n, (tile_id, j, i) in enumerate(spread):
+        # Tile CSVs as the converter writes them: one row per day and depth.
+        frame = pd.DataFrame(
+            {
+                "time": np.repeat(ocean.days[: len(fields)], ocean.depths.size),
+                "depth": np.tile(ocean.depths, len(fields)),
+                "latitude": ocean.lats[j],
+                "longitude": ocean.lons[i],
+                **{
+                    v: np.concatenate([f[v][..., j, i].ravel() for f in fields])
+                    for v in variables
+                    if fields[0][v].ndim == 3
+                },
+            }
+        )
+        csv_dir = work_dir / f"bbox_{n % 2:02d}" / "csv" / "all"
+        csv_dir.mkdir(parents=True, exist_ok=True)
+        frame.to_csv(csv_dir / f"{str(tile_id).zfill(5)}.csv", index=False)
+        rows += len(frame)
+    return CSVAmalgamation(work_dir), rows
+
+
+def _amalgamation_run(ctx) -> int:
+    amalgamation, rows = ctx
+    amalgamation.run()
+    return rows
+
+
+def _tile_days_setup(scale: Scale, work_dir: Path):
+    from src.data_processing.tile_days_builder import TileDaysBuilder
+
+    return TileDaysBuilder(), _enriched_hauls(scale)
+
+
+def _tile_days_run(ctx) -> int:
+    builder, enriched = ctx
+    builder.build_per_day(enriched)
+    return len(enriched)
+
+
+def _hauls_setup(scale: Scale, work_dir: Path):
+    from src.app.synthetic import logbook
+
+    raw = logbook(_ocean(scale).hauls(scale.hauls))
+    ids = raw["Idlance"].drop_duplicates().to_numpy()[:2]
+    to_fix = pd.DataFrame({"haul_id": ids, "lon_corrected": [np.nan, -9.5]})
+    return raw, to_fix
+
+
+def _hauls_run(ctx) -> int:
+    from src.data_processing.hauls_cleaner import HaulDbBuilder
+
+    raw, to_fix = ctx
+    HaulDbBuilder(raw, to_fix).run(COLUMNS_MAP)
+    return len(raw)
+
+
+def _planning_setup(scale: Scale, work_dir: Path):
+    from src.app.bbox_factory import BBoxFactory
+    from src.app.orchestrator import TileDayOrchestrator
+
+    spec = _ocean(scale).spec
+    # As read back from tiles_with_date_db.csv: times are strings.
+    tile_days = _tile_days(scale).assign(time=lambda d: d["time"].astype(str))
+    bboxes = BBoxFactory(
+        spec.min_lon - spec.step,
+        spec.min_lat - spec.step,
+        spec.max_lon + spec.step,
+        spec.max_lat + spec.step,
+        4,
+    ).build(tile_days)
+    orchestrator = TileDayOrchestrator("synthetic", spec.variables, spec.step)
+    return orchestrator, tile_days, bboxes
+
+
+def _planning_run(ctx) -> int:
+    orchestrator, tile_days, bboxes = ctx
+    return len(orchestrator.build_job_table(tile_days, bboxes))
+
+
+CASES: Dict[str, Case] = {
+    c.name: c
+    for c in (
+        Case("kd_query", "queries", _kd_setup, _kd_run),
+        Case("tile_catalog", "cells", _catalog_setup, _catalog_run),
+        Case("frame_extract", "rows", _frame_setup, _frame_run),
+        Case("nc_to_csv", "files", _nc_setup, _nc_run, requires=("dask",)),
+        Case("csv_amalgamation", "rows", _amalgamation_setup, _amalgamation_run),
+        Case("tile_days", "hauls", _tile_days_setup, _tile_days_run),
+        Case("hauls_cleaner", "rows", _hauls_setup, _hauls_run),
+        Case("job_planning", "tile-days", _planning_setup, _planning_run),
+    )
+}
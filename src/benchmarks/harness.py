@@ -0,0 +1,289 @@
+"""
+Timing and memory harness, JSON baselines and the regression comparison.
+
+A Case prepares its inputs once (setup, untimed). After a warm-up call,
+the body is timed in `repeat` rounds of `number` calls each, number being
+picked so that a round lasts at least min_seconds (as timeit's autorange
+does); INFO logging is muted meanwhile. Throughput is items per second of
+the fastest round. One more call inside a MemoryAccountant block
+gives the peak Python allocation (tracemalloc, which numpy and pandas
+buffers report to) and the RSS growth. Only the tracemalloc peak gates
+comparisons: it is deterministic, RSS is not.
+"""
+
+from __future__ import annotations
+
+import gc
+import importlib.util
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.memory import MemoryAccountant, MiB
+
+SCHEMA = 1
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    unit: str  # what run() counts: "queries", "rows", "files", ...
+    setup: Callable[[Any, Path], Any]  # (scale, scratch dir) -> context
+    run: Callable[[Any], int]  # context -> items processed
+    requires: Tuple[str, ...] = ()  # importable modules the body needs
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    case: str
+    unit: str
+    items: int
+    repeat: int
+    number: int  # calls per timed round
+    seconds_best: float  # per call
+    seconds_median: float
+    peak_bytes: int  # tracemalloc peak above the start of the body
+    rss_growth_bytes: int
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds_best if self.seconds_best > 0 else 0.0
+
+
+@dataclass
+class SuiteResult:
+    scale: str
+    results: Dict[str, BenchResult] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)  # case -> reason
+    machine: Dict[str, Any] = field(default_factory=dict)
+    created: str = ""
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "schema": SCHEMA,
+            "scale": self.scale,
+            "created": self.created,
+            "machine": self.machine,
+            "results": {
+                name: {**asdict(r), "throughput": r.throughput}
+                for name, r in sorted(self.results.items())
+            },
+            "skipped": dict(sorted(self.skipped.items())),
+        }
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_json(), indent=1) + "\n")
+        return path
+
+    @classmethod
+    def read(cls, path: Path) -> "SuiteResult":
+        data = json.loads(Path(path).read_text())
+        if data.get("schema") != SCHEMA:
+            raise ValueError(f"Unsupported benchmark file schema in {path}.")
+        results = {}
+        for name, r in data["results"].items():
+            r = dict(r)
+            r.pop("throughput", None)
+            results[name] = BenchResult(**r)
+        return cls(
+            scale=data["scale"],
+            results=results,
+            skipped=dict(data.get("skipped", {})),
+            machine=dict(data.get("machine", {})),
+            created=data.get("created", ""),
+        )
+
+
+def machine_info() -> Dict[str, Any]:
+    import numpy as np
+    import pandas as pd
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def missing_modules(case: Case) -> List[str]:
+    return [m for m in case.requires if importlib.util.find_spec(m) is None]
+
+
+def measure(
+    case: Case, context: Any, *, repeat: int = 3, min_seconds: float = 0.2
+) -> BenchResult:
+    """Times case.run(context) (see the module docstring), then its memory."""
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1.")
+    logging.disable(logging.INFO)
+    try:
+        t0 = time.perf_counter()
+        items = case.run(context)  # warm-up: imports, caches, page cache
+        first = time.perf_counter() - t0
+        number = max(1, math.ceil(min_seconds / first)) if first > 0 else 1000
+        timings = []
+        for _ in range(repeat):
+            gc.collect()
+            t0 = time.perf_counter()
+            for _ in range(number):
+                case.run(context)
+            timings.append((time.perf_counter() - t0) / number)
+
+        gc.collect()
+        accountant = MemoryAccountant(trace_python=True)
+        try:
+            with accountant.measure("bench", case.name):
+                case.run(context)
+        finally:
+            accountant.close()
+    finally:
+        logging.disable(logging.NOTSET)
+    rec = accountant.records[-1]
+    return BenchResult(
+        case=case.name,
+        unit=case.unit,
+        items=int(items),
+        repeat=repeat,
+        number=number,
+        seconds_best=min(timings),
+        seconds_median=statistics.median(timings),
+        peak_bytes=int(rec.traced_peak or 0),
+        rss_growth_bytes=rec.rss_growth,
+    )
+
+
+def run_suite(
+    cases: Sequence[Case],
+    scale_name: str,
+    scale: Any,
+    scratch: Path,
+    *,
+    repeat: int = 3,
+    min_seconds: float = 0.2,
+) -> SuiteResult:
+    suite = SuiteResult(
+        scale=scale_name,
+        machine=machine_info(),
+        created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+    for case in cases:
+        missing = missing_modules(case)
+        if missing:
+            suite.skipped[case.name] = "missing " + ", ".join(missing)
+            logging.warning(
+                "bench %s: skipped (%s)", case.name, suite.skipped[case.name]
+            )
+            continue
+        work_dir = Path(scratch) / case.name
+        work_dir.mkdir(parents=True, exist_ok=True)
+        context = case.setup(scale, work_dir)
+        result = measure(case, context, repeat=repeat, min_seconds=min_seconds)
+        del context
+        suite.results[case.name] = result
+        logging.info(
+            "bench %s/%s: %.0f %s/s (best of %dx%d: %.4fs), peak %.1f MiB",
+            scale_name,
+            case.name,
+            result.throughput,
+            case.unit,
+            repeat,
+            result.number,
+            result.seconds_best,
+            result.peak_bytes / MiB,
+        )
+    return suite
+
+
+# -------------------- comparison --------------------
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    throughput: float = 0.15  # fail below (1 - x) * baseline items/s
+    memory: float = 0.20  # fail above (1 + x) * baseline peak ...
+    memory_floor: int = 4 * MiB  # ... and more than this many bytes over it
+
+
+@dataclass(frozen=True)
+class Comparison:
+    case: str
+    throughput_ratio: Optional[float]  # current / baseline
+    memory_ratio: Optional[float]
+    regressions: Tuple[str, ...]
+    note: str = ""
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.regressions)
+
+
+def compare(
+    baseline: SuiteResult,
+    current: SuiteResult,
+    thresholds: Thresholds = Thresholds(),
+) -> List[Comparison]:
+    """One Comparison per baseline case; cases new in `current` are listed too."""
+    if baseline.scale != current.scale:
+        raise ValueError(
+            f"Scale mismatch: baseline {baseline.scale!r}, current {current.scale!r}."
+        )
+    out: List[Comparison] = []
+    for name, base in sorted(baseline.results.items()):
+        cur = current.results.get(name)
+        if cur is None:
+            reason = current.skipped.get(name, "not run")
+            out.append(Comparison(name, None, None, (), note=f"missing: {reason}"))
+            continue
+        if cur.items != base.items:
+            out.append(
+                Comparison(
+                    name,
+                    None,
+                    None,
+                    (),
+                    note=f"items differ ({base.items} -> {cur.items}); not comparable",
+                )
+            )
+            continue
+        regressions = []
+        t_ratio = cur.throughput / base.throughput if base.throughput else None
+        if t_ratio is not None and t_ratio < 1.0 - thresholds.throughput:
+            regressions.append("throughput")
+        m_ratio = cur.peak_bytes / base.peak_bytes if base.peak_bytes else None
+        if (
+            cur.peak_bytes > base.peak_bytes * (1.0 + thresholds.memory)
+            and cur.peak_bytes - base.peak_bytes > thresholds.memory_floor
+        ):
+            regressions.append("memory")
+        out.append(Comparison(name, t_ratio, m_ratio, tuple(regressions)))
+    for name in sorted(set(current.results) - set(baseline.results)):
+        out.append(Comparison(name, None, None, (), note="new (no baseline)"))
+    return out
+
+
+def format_comparison(rows: Sequence[Comparison]) -> str:
+    def ratio(x: Optional[float]) -> str:
+        return "-" if x is None else f"{x:.2f}x"
+
+    lines = [f"{'case':<20} {'throughput':>10} {'peak mem':>10}  status"]
+    for c in rows:
+        status = ("REGRESSED: " + ", ".join(c.regressions)) if c.failed else "ok"
+        if c.note:
+            status = f"{status} ({c.note})"
+        lines.append(
+            f"{c.case:<20} {ratio(c.throughput_ratio):>10} "
+            f"{ratio(c.memory_ratio):>10}  {status}"
+        )
+    return "\n".join(lines)
@@ -13,17 +13,40 @@ from src.bounding_box.bounding_box import BoundingBox
 class BandResult:
     band: int
     bbox: BoundingBox
-    coords_within_band_df: (
-        pd.DataFrame
-    )  # only 'lon','lat' rows inside this band's sub-bbox
+    lon: np.ndarray  # view into BandSplit's band-sorted longitudes
+    lat: np.ndarray  # view into BandSplit's band-sorted latitudes
     band_lat0: float  # representative latitude for this band (mean or mid)
     num_points: int
 
+    @property
+    def coords_within_band_df(self) -> pd.DataFrame:
+        """Only 'lon','lat' rows inside this band's sub-bbox (built on access)."""
+        return pd.DataFrame({"lon": self.lon, "lat": self.lat}, copy=False)
+
+
+@dataclass(frozen=True)
+class BandSplit:
+    """
+    Band membership of every input point, computed in one linear pass.
+    Points of band b (input order preserved) are order[offsets[b]:offsets[b + 1]].
+    """
+
+    edges: np.ndarray  # n_bands + 1 latitude edges
+    band_ids: np.ndarray  # per input point; -1 when outside the bbox
+    order: np.ndarray  # input positions of inside points, grouped by band
+    offsets: np.ndarray  # int64, n_bands + 1
+    band_lat0: np.ndarray  # float64 per band: mean lat, or mid-band when empty
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
 
 class LatBandSplitter:
     """
     Split a BoundingBox into N latitude bands and assign points (lon, lat) to bands.
     Use band.lat0 as the local scaling latitude for lon*cos(lat0) in each band.
+    Bands are half-open [lo, hi) except the last one, which includes max_lat.
     """
 
     def __init__(self, bbox: BoundingBox, n_bands: int) -> None:
@@ -38,55 +61,84 @@ class LatBandSplitter:
     def n_bands(self) -> int:
         return self._n_bands
 
-    def split(self, df: pd.DataFrame) -> Optional[List[BandResult]]:
+    def edges(self) -> np.ndarray:
+        return np.linspace(self._bbox.min_lat, self._bbox.max_lat, self._n_bands + 1)
+
+    def band_bbox(self, band: int) -> BoundingBox:
+        edges = self.edges()
+        return BoundingBox(
+            self._bbox.min_lon,
+            self._bbox.max_lon,
+            float(edges[band]),
+            float(edges[band + 1]),
+        )
+
+    def assign(self, lons: np.ndarray, lats: np.ndarray) -> Optional[BandSplit]:
         """
-        Perform the split. Keeps only rows with columns 'lon','lat' inside the bbox.
+        Band ids for many points with a single np.digitize pass; None when no
+        point falls inside the bbox.
         """
-        # filter to overall bbox
-        inside_bbox_band = (
-            (df["lon"] >= self._bbox.min_lon)
-            & (df["lon"] <= self._bbox.max_lon)
-            & (df["lat"] >= self._bbox.min_lat)
-            & (df["lat"] <= self._bbox.max_lat)
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        inside = (
+            (lons >= self._bbox.min_lon)
+            & (lons <= self._bbox.max_lon)
+            & (lats >= self._bbox.min_lat)
+            & (lats <= self._bbox.max_lat)
         )
-        df_in = df.loc[inside_bbox_band, ["lon", "lat"]].reset_index(drop=False)
-        if not len(df_in):
+        if not inside.any():
             return None
 
-        # lat band edges
-        edges = np.linspace(self._bbox.min_lat, self._bbox.max_lat, self._n_bands + 1)
+        edges = self.edges()
+        # Inner edges only: [lo, hi) per band, max_lat falls in the last band.
+        id_dtype = np.int16 if self._n_bands < np.iinfo(np.int16).max else np.int32
+        band_ids = np.full(lats.size, -1, dtype=id_dtype)
+        band_ids[inside] = np.digitize(lats[inside], edges[1:-1])
+
+        # Stable sort on small ints is a radix sort: linear, keeps input order.
+        positions = np.flatnonzero(inside)
+        order = positions[np.argsort(band_ids[inside], kind="stable")]
+        counts = np.bincount(band_ids[inside], minlength=self._n_bands)
+        offsets = np.zeros(self._n_bands + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        lat_sum = np.bincount(
+            band_ids[inside], weights=lats[inside], minlength=self._n_bands
+        )
+        band_lat0 = (edges[:-1] + edges[1:]) * 0.5  # empty bands: mid-band
+        np.divide(lat_sum, counts, out=band_lat0, where=counts > 0)
+        return BandSplit(
+            edges=edges,
+            band_ids=band_ids,
+            order=order,
+            offsets=offsets,
+            band_lat0=band_lat0,
+        )
+
+    def split(self, df: pd.DataFrame) -> Optional[List[BandResult]]:
+        """
+        Perform the split. Keeps only rows with columns 'lon','lat' inside the bbox.
+        """
+        lons = df["lon"].to_numpy(dtype=np.float64)
+        lats = df["lat"].to_numpy(dtype=np.float64)
+        split = self.assign(lons, lats)
+        if split is None:
+            return None
 
+        # One gather for all bands; each band is then a zero-copy slice.
+        lon_sorted = lons[split.order]
+        lat_sorted = lats[split.order]
         bbox_list: List[BandResult] = []
         for band in range(self._n_bands):
-            lat_lo = float(edges[band])
-            lat_hi = float(edges[band + 1])
-
-            # include top edge only on the last band
-            if band < self._n_bands - 1:
-                band_mask = (df_in["lat"] >= lat_lo) & (df_in["lat"] < lat_hi)
-            else:
-                band_mask = (df_in["lat"] >= lat_lo) & (df_in["lat"] <= lat_hi)
-
-            df_band = df_in.loc[band_mask, ["lon", "lat"]].reset_index(drop=True)
-
-            num_points = len(df_band)
-            if num_points == 0:
-                lat0 = float(df_band["lat"].mean())
-            else:
-                lat0 = (
-                    lat_lo + lat_hi
-                ) * 0.5  # there may not be coordinates in such band.
-
-            sub_bbox = BoundingBox(
-                self._bbox.min_lon, self._bbox.max_lon, lat_lo, lat_hi
-            )
+            lo, hi = split.offsets[band], split.offsets[band + 1]
             bbox_list.append(
                 BandResult(
                     band=band,
-                    bbox=sub_bbox,
-                    coords_within_band_df=df_band,
-                    band_lat0=lat0,
-                    num_points=num_points,
+                    bbox=self.band_bbox(band),
+                    lon=lon_sorted[lo:hi],
+                    lat=lat_sorted[lo:hi],
+                    band_lat0=float(split.band_lat0[band]),
+                    num_points=int(hi - lo),
                 )
             )
         return bbox_list
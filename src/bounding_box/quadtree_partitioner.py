@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from src.bounding_box.bounding_box import BoundingBox
+
+
+@dataclass(frozen=True)
+class Partition:
+    path: str  # quadtree path from the region root, one digit (0-3) per level
+    bbox: BoundingBox  # tight around the points of this leaf
+    cell: BoundingBox  # the fixed quadtree cell the leaf occupies
+    num_points: int
+
+
+class QuadtreePartitioner:
+    """
+    Adaptive partition of a region over many points (e.g. tile centers).
+
+    - Cells come from a fixed quadtree over the region (midpoint splits), so a
+      cell and its path depend only on the region, never on the data: the same
+      area keeps the same path across runs, and only cells that grow past the
+      target split further.
+    - A cell is split while it holds more than max_points, or while its tight
+      box is larger than max_area_deg2 (if given), up to max_depth levels.
+    - Each leaf is reported with a tight bbox around its points; leaves are
+      disjoint because cells are half-open [lo, hi) except at the region's top
+      and east edges.
+    - Digits: 0=SW, 1=SE, 2=NW, 3=NE.
+
+    Fully vectorized: points get integer cell coordinates at max_depth once;
+    each level is one np.unique over the still-open cells.
+    """
+
+    def __init__(
+        self,
+        region: BoundingBox,
+        *,
+        max_points: int,
+        max_area_deg2: Optional[float] = None,
+        max_depth: int = 12,
+    ) -> None:
+        if max_points < 1:
+            raise ValueError("max_points must be >= 1.")
+        if max_area_deg2 is not None and max_area_deg2 <= 0:
+            raise ValueError("max_area_deg2 must be positive.")
+        if not 0 <= max_depth <= 30:
+            raise ValueError("max_depth must be within [0, 30].")
+        self.region = region
+        self.max_points = int(max_points)
+        self.max_area_deg2 = max_area_deg2
+        self.max_depth = int(max_depth)
+
+    def partition(self, lons: np.ndarray, lats: np.ndarray) -> List[Partition]:
+        """Leaves holding at least one point inside the region, sorted by path."""
+        r = self.region
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        inside = (
+            (lons >= r.min_lon)
+            & (lons <= r.max_lon)
+            & (lats >= r.min_lat)
+            & (lats <= r.max_lat)
+        )
+        lons, lats = lons[inside], lats[inside]
+        if lons.size == 0:
+            return []
+
+        depth = self.max_depth
+        ix = self._cell_coords(lons, r.min_lon, r.max_lon, depth)
+        iy = self._cell_coords(lats, r.min_lat, r.max_lat, depth)
+
+        leaves: List[Partition] = []
+        open_pts = np.arange(lons.size)
+        for level in range(depth + 1):
+            shift = depth - level
+            key = (iy[open_pts] >> shift) << 32 | (ix[open_pts] >> shift)
+            order = np.argsort(key, kind="stable")
+            open_pts, key = open_pts[order], key[order]
+            uniq, starts, counts = np.unique(key, return_index=True, return_counts=True)
+
+            lon_lo = np.minimum.reduceat(lons[open_pts], starts)
+            lon_hi = np.maximum.reduceat(lons[open_pts], starts)
+            lat_lo = np.minimum.reduceat(lats[open_pts], starts)
+            lat_hi = np.maximum.reduceat(lats[open_pts], starts)
+
+            done = counts <= self.max_points
+            if self.max_area_deg2 is not None:
+                done &= (lon_hi - lon_lo) * (lat_hi - lat_lo) <= self.max_area_deg2
+            if level == depth:
+                done[:] = True
+
+            for k in np.flatnonzero(done):
+                cx, cy = int(uniq[k] & 0xFFFFFFFF), int(uniq[k] >> 32)
+                leaves.append(
+                    Partition(
+                        path=self._path(cx, cy, level),
+                        bbox=BoundingBox(
+                            float(lon_lo[k]),
+                            float(lon_hi[k]),
+                            float(lat_lo[k]),
+                            float(lat_hi[k]),
+                        ),
+                        cell=self._cell_bbox(cx, cy, level),
+                        num_points=int(counts[k]),
+                    )
+                )
+            keep = np.repeat(~done, counts)
+            open_pts = open_pts[keep]
+            if open_pts.size == 0:
+                break
+        return sorted(leaves, key=lambda p: p.path)
+
+    @staticmethod
+    def _cell_coords(v: np.ndarray, lo: float, hi: float, depth: int) -> np.ndarray:
+        n = 1 << depth
+        span = hi - lo
+        if span <= 0:
+            return np.zeros(v.size, dtype=np.int64)
+        c = np.floor((v - lo) / span * n).astype(np.int64)
+        return np.clip(c, 0, n - 1)  # the top/east edge belongs to the last cell
+
+    @staticmethod
+    def _path(cx: int, cy: int, level: int) -> str:
+        return "".join(
+            str(((cy >> s) & 1) * 2 + ((cx >> s) & 1)) for s in range(level - 1, -1, -1)
+        )
+
+    def _cell_bbox(self, cx: int, cy: int, level: int) -> BoundingBox:
+        r = self.region
+        n = 1 << level
+        w = (r.max_lon - r.min_lon) / n
+        h = (r.max_lat - r.min_lat) / n
+        return BoundingBox(
+            r.min_lon + cx * w,
+            r.min_lon + (cx + 1) * w,
+            r.min_lat + cy * h,
+            r.min_lat + (cy + 1) * h,
+        )
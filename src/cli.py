@@ -0,0 +1,248 @@
+"""
+Single entry point for the pipeline stages:
+
+    python -m src <stage> [--workers N] [--profile out.prof] [--trace-memory [N]]
+                          [--trace spans.jsonl] [--metrics run.prom]
+                          [--memory-report [PATH]]
+
+Stages run in this order in production: static, assign, plan (optional dry
+run), download, convert, amalgamate, upload. Settings still come from the
+environment / .env; the switches only change how a stage runs. Progress
+(done/total, rates, ETA) is logged every --metrics-interval seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Sequence
+
+from src.app.metrics import MetricsReporter
+from src.app.profiling import ProfileOptions, stage_profile
+from src.app.tracing import (
+    disable_tracing,
+    enable_tracing,
+    export_chrome_trace,
+    span,
+)
+from src.memory import (
+    disable_memory_accounting,
+    enable_memory_accounting,
+    measure_memory,
+    memory_accountant,
+)
+
+
+class Stage(NamedTuple):
+    help: str
+    handler: Callable[[argparse.Namespace], None]
+    parallel: bool  # whether --workers changes anything
+
+
+# Stage handlers import their action lazily: `--help` and stages that do not
+# touch the heavy SDKs never pay for them.
+
+
+def _static(args: argparse.Namespace) -> None:
+    from src.actions import download_static_layer
+
+    download_static_layer.run()
+
+
+def _assign(args: argparse.Namespace) -> None:
+    from src.actions import build_tiles_source_data
+
+    build_tiles_source_data.run(workers=args.workers)
+
+
+def _plan(args: argparse.Namespace) -> None:
+    from src.actions import fetch_copernicus_data
+
+    jobs = fetch_copernicus_data.plan(args.previous_tiles)
+    _, requests = jobs.request_groups()
+    days = len(set(jobs.day.tolist()))
+    print(
+        f"{len(jobs)} tile-day jobs, {len(jobs.bbox_ids)} bboxes, "
+        f"{days} days, {requests} request groups"
+    )
+
+
+def _download(args: argparse.Namespace) -> None:
+    from src.actions import fetch_copernicus_data
+
+    fetch_copernicus_data.download(args.previous_tiles, workers=args.workers)
+
+
+def _convert(args: argparse.Namespace) -> None:
+    from src.actions import fetch_copernicus_data
+
+    fetch_copernicus_data.convert(workers=args.workers)
+
+
+def _amalgamate(args: argparse.Namespace) -> None:
+    from src.actions import fetch_copernicus_data
+
+    fetch_copernicus_data.amalgamate()
+
+
+def _upload(args: argparse.Namespace) -> None:
+    from src.actions import zip_and_upload_to_s3
+
+    zip_and_upload_to_s3.run(workers=args.workers)
+
+
+STAGES: Dict[str, Stage] = {
+    "static": Stage("download the product's static (mask) layer", _static, False),
+    "assign": Stage("assign hauls to tiles and build tile-days", _assign, True),
+    "plan": Stage("build the download job table without fetching", _plan, False),
+    "download": Stage("download tile-day NetCDF files", _download, True),
+    "convert": Stage("convert downloaded NetCDF to per-tile CSV", _convert, True),
+    "amalgamate": Stage("merge per-tile CSVs into one table", _amalgamate, False),
+    "upload": Stage("archive or sync the product to S3", _upload, True),
+}
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return n
+
+
+def _positive_float(value: str) -> float:
+    x = float(value)
+    if not x > 0:
+        raise argparse.ArgumentTypeError("must be > 0")
+    return x
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="parallelism of the stage (default: from the environment)",
+    )
+    common.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        default=None,
+        help="write cProfile stats to PATH and a pstats summary beside it (.txt)",
+    )
+    common.add_argument(
+        "--trace-memory",
+        type=_positive_int,
+        nargs="?",
+        const=25,
+        default=0,
+        metavar="N",
+        help="log the N largest allocation sites (tracemalloc; default N: 25)",
+    )
+    common.add_argument(
+        "--trace",
+        type=Path,
+        metavar="PATH",
+        default=None,
+        help="record tracing spans as JSON lines to PATH, plus a Chrome trace "
+        "beside it (.trace.json)",
+    )
+    common.add_argument(
+        "--metrics",
+        type=Path,
+        metavar="PATH",
+        default=None,
+        help="keep a Prometheus textfile with the run metrics at PATH",
+    )
+    common.add_argument(
+        "--metrics-interval",
+        type=_positive_float,
+        default=15.0,
+        metavar="SEC",
+        help="seconds between metrics/progress reports (default: 15)",
+    )
+    common.add_argument(
+        "--memory-report",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="record peak RSS and tracemalloc deltas per stage, tile and file "
+        "(workers included) and flag outliers; the JSON report goes to PATH "
+        "or next to the product as <slug>.memory-<stage>.json",
+    )
+    common.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src", description="Copernicus coverage pipeline"
+    )
+    sub = parser.add_subparsers(dest="stage", required=True, metavar="stage")
+    for name, stage in STAGES.items():
+        p = sub.add_parser(name, parents=[common], help=stage.help)
+        if name in ("plan", "download"):
+            p.add_argument(
+                "--previous-tiles",
+                type=Path,
+                default=None,
+                metavar="CSV",
+                help="last run's tiles_with_date table (plan only the delta)",
+            )
+    return parser
+
+
+def _memory_report_path(args: argparse.Namespace) -> Path:
+    if args.memory_report:
+        return Path(args.memory_report)
+    name = f"memory-{args.stage}.json"
+    try:
+        from src.config import cfg
+
+        return cfg.output_root / f"{cfg.product_slug}.{name}"
+    except ValueError:  # product settings missing: keep the report anyway
+        return Path(name)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    stage = STAGES[args.stage]
+    if args.workers is not None and not stage.parallel:
+        logging.warning("--workers has no effect on the %s stage", args.stage)
+
+    options = ProfileOptions(profile_path=args.profile, trace_memory=args.trace_memory)
+    if args.trace is not None:
+        enable_tracing(args.trace)
+    if args.memory_report is not None:
+        enable_memory_accounting()
+    try:
+        reporter = MetricsReporter(
+            textfile=args.metrics, interval=args.metrics_interval
+        )
+        with reporter, stage_profile(args.stage, options):
+            with (
+                span(f"stage.{args.stage}", workers=args.workers),
+                measure_memory("stage", args.stage, workers=args.workers),
+            ):
+                stage.handler(args)
+    finally:
+        if args.memory_report is not None:
+            memory_accountant().write_report(
+                _memory_report_path(args), stage=args.stage
+            )
+            disable_memory_accounting()
+        if args.trace is not None:
+            disable_tracing()
+            chrome = export_chrome_trace(
+                args.trace, args.trace.with_suffix(".trace.json")
+            )
+            logging.info("trace written to %s (Chrome trace: %s)", args.trace, chrome)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,47 @@
 import os
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
-from dotenv import load_dotenv
+_env_loaded = False
+_env_lock = threading.Lock()
 
-load_dotenv()  # expects a .env at project root
+
+def _load_env() -> None:
+    """Reads the project .env once, on the first setting actually used."""
+    global _env_loaded
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()  # expects a .env at project root
+            _env_loaded = True
+
+
+_MISSING = "Missing required environment variable: "
 
 
 def _req(name: str) -> str:
     v = os.getenv(name)
     if not v:
-        raise ValueError(f"Missing required environment variable: {name}")
+        raise ValueError(f"{_MISSING}{name}")
+    return v
+
+
+def _opt(name: str, default: str) -> str:
+    return os.getenv(name) or default
+
+
+def _flag(name: str) -> bool:
+    return _req(name).lower() in {"1", "true", "yes"}
+
+
+def _fraction(name: str) -> float:
+    """A required value in (0, 1]."""
+    v = float(_req(name))
+    if not 0 < v <= 1:
+        raise ValueError(f"{name} must be in (0, 1], got {v}")
     return v
 
 
@@ -29,6 +59,10 @@ class Config:
     aws_policy: str  # "skip_if_exists" | "always_put"
     aws_progress_step: float  # (0, 1]
     aws_max_concurrency: int
+    aws_upload_mode: str  # "zip" (one archive) | "sync" (file by file)
+    archive_format: str  # "zip" | "tar.zst"
+    archive_level: Optional[int]  # None: format default (zip 6, zstd 3)
+    archive_workers: Optional[int]  # None: all cores
 
     product_owner: str
     static_filename: str
@@ -42,6 +76,10 @@ class Config:
     region_min_lat: float
     region_max_lat: float
     lat_band_count: int
+    bbox_max_tiles: int  # > 0: adaptive quadtree bboxes instead of lat bands
+    depth_levels_file: Optional[Path]  # JSON cache of product depth levels
+    depth_bucket_edges: Tuple[float, ...]  # used when no levels file is set
+    depth_max_extra_levels: int
 
     download_and_convert: int
     tile_csv_filename: str
@@ -50,28 +88,89 @@ class Config:
     output_root: Path  # OUTPUT_PATH / PRODUCT_OWNER / "data"
 
 
-cfg = Config(
-    output_path=Path(_req("OUTPUT_PATH")),
-    input_path=Path(_req("INPUT_PATH")),
-    s3_bucket=_req("S3_BUCKET"),
-    s3_output_prefix=_req("S3_OUTPUT_PREFIX"),
-    aws_clean=_req("AWS_CLEAN").lower() in {"1", "true", "yes"},
-    aws_verbose=_req("AWS_VERBOSE").lower() in {"1", "true", "yes"},
-    aws_policy=_req("AWS_POLICY"),
-    aws_progress_step=float(_req("AWS_PROGRESS_STEP")),
-    aws_max_concurrency=int(_req("AWS_MAX_CONCURRENCY")),
-    download_and_convert=int(_req("DOWNLOAD_AND_CONVERT")),
-    tile_csv_filename=_req("TILE_CSV_FILENAME"),
-    product_owner=_req("PRODUCT_OWNER"),
-    static_filename=_req("STATIC_FILENAME"),
-    product_slug=_req("PRODUCT_SLUG").lower(),
-    dataset_id=_req("DATASET_ID"),
-    variables=tuple(_req("VARIABLES").split(",")),
-    spatial_resolution_deg=float(_req("SPATIAL_RESOLUTION_DEG")),
-    region_min_lon=float(_req("REGION_MIN_LON")),
-    region_max_lon=float(_req("REGION_MAX_LON")),
-    region_min_lat=float(_req("REGION_MIN_LAT")),
-    region_max_lat=float(_req("REGION_MAX_LAT")),
-    lat_band_count=int(_req("LAT_BAND_COUNT")),
-    output_root=(Path(_req("OUTPUT_PATH")) / _req("PRODUCT_OWNER") / "data"),
-)
+# One resolver per Config field; each reads (and validates) only its own keys.
+_RESOLVERS: Dict[str, Callable[[], Any]] = {
+    "output_path": lambda: Path(_req("OUTPUT_PATH")),
+    "input_path": lambda: Path(_req("INPUT_PATH")),
+    "s3_bucket": lambda: _req("S3_BUCKET"),
+    "s3_output_prefix": lambda: _req("S3_OUTPUT_PREFIX"),
+    "aws_clean": lambda: _flag("AWS_CLEAN"),
+    "aws_verbose": lambda: _flag("AWS_VERBOSE"),
+    "aws_policy": lambda: _req("AWS_POLICY"),
+    "aws_progress_step": lambda: _fraction("AWS_PROGRESS_STEP"),
+    "aws_max_concurrency": lambda: int(_req("AWS_MAX_CONCURRENCY")),
+    "aws_upload_mode": lambda: _opt("AWS_UPLOAD_MODE", "zip").lower(),
+    "archive_format": lambda: _opt("ARCHIVE_FORMAT", "zip").lower(),
+    "archive_level": lambda: (
+        int(os.environ["ARCHIVE_LEVEL"]) if os.getenv("ARCHIVE_LEVEL") else None
+    ),
+    "archive_workers": lambda: int(_opt("ARCHIVE_WORKERS", "0")) or None,
+    "download_and_convert": lambda: int(_req("DOWNLOAD_AND_CONVERT")),
+    "tile_csv_filename": lambda: _req("TILE_CSV_FILENAME"),
+    "product_owner": lambda: _req("PRODUCT_OWNER"),
+    "static_filename": lambda: _req("STATIC_FILENAME"),
+    "product_slug": lambda: _req("PRODUCT_SLUG").lower(),
+    "dataset_id": lambda: _req("DATASET_ID"),
+    "variables": lambda: tuple(_req("VARIABLES").split(",")),
+    "spatial_resolution_deg": lambda: float(_req("SPATIAL_RESOLUTION_DEG")),
+    "region_min_lon": lambda: float(_req("REGION_MIN_LON")),
+    "region_max_lon": lambda: float(_req("REGION_MAX_LON")),
+    "region_min_lat": lambda: float(_req("REGION_MIN_LAT")),
+    "region_max_lat": lambda: float(_req("REGION_MAX_LAT")),
+    "lat_band_count": lambda: int(_req("LAT_BAND_COUNT")),
+    "bbox_max_tiles": lambda: int(_opt("BBOX_MAX_TILES", "0")),
+    "depth_levels_file": lambda: (
+        Path(os.environ["DEPTH_LEVELS_FILE"])
+        if os.getenv("DEPTH_LEVELS_FILE")
+        else None
+    ),
+    "depth_bucket_edges": lambda: tuple(
+        float(v) for v in _opt("DEPTH_BUCKET_EDGES", "").split(",") if v.strip()
+    ),
+    "depth_max_extra_levels": lambda: int(_opt("DEPTH_MAX_EXTRA_LEVELS", "0")),
+    "output_root": lambda: Path(_req("OUTPUT_PATH")) / _req("PRODUCT_OWNER") / "data",
+}
+
+
+class LazyConfig:
+    """
+    Drop-in for a Config instance whose settings are resolved on first access:
+    importing a module that uses `cfg` costs nothing, and a command only fails
+    on the environment variables it actually reads. Values are cached; call
+    require() at the start of a command to report every missing key at once.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        resolve = _RESOLVERS.get(name)
+        if resolve is None:
+            raise AttributeError(f"Unknown config setting: {name}")
+        _load_env()
+        value = resolve()
+        self.__dict__[name] = value  # later reads skip __getattr__
+        return value
+
+    def require(self, names: Iterable[str]) -> None:
+        problems = []
+        for name in names:
+            try:
+                getattr(self, name)
+            except ValueError as e:
+                msg = str(e)
+                if msg.startswith(_MISSING):
+                    problems.append(msg[len(_MISSING) :])
+                else:
+                    problems.append(f"{name} ({msg})")
+        if problems:
+            raise ValueError("Invalid configuration: " + ", ".join(problems))
+
+    def reset(self) -> None:
+        """Forget cached values (e.g. after changing the environment)."""
+        self.__dict__.clear()
+
+    def load(self) -> Config:
+        """Resolves every setting (fails on any missing key)."""
+        self.require(f.name for f in fields(Config))
+        return Config(**{f.name: getattr(self, f.name) for f in fields(Config)})
+
+
+cfg = LazyConfig()
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import numpy as np
 import pandas as pd
-import xarray as xr
 
+from src.bounding_box.bounding_box import BoundingBox
 from src.data_processing.coords_tile_mapper import CoordinatesToTileMapper
 from src.data_processing.grid_spec import GridSpec
 from src.data_processing.kd_index import KDIndex
 from src.data_processing.sea_mask_builder import SeaMaskBuilder
 from src.data_processing.tile_catalog import TileCatalog
 
+_INDEX_META_FILENAME = "kd_index.json"
+
 
 @dataclass(frozen=True)
 class StaticSpec:
@@ -23,6 +26,8 @@ class StaticSpec:
     mask_var: str = "mask"
     is_bit: bool = True
     sea_value: int = 1  # bit value when is_bit=True, or integer class when is_bit=False
+    region: Optional[BoundingBox] = None  # read only cells inside this box (None = all)
+    chunk_rows: int = 256  # latitude rows classified per read of the mask plane
 
 
 class HaulTileAssigner:
@@ -57,6 +62,7 @@ class HaulTileAssigner:
         self._grid: Optional[GridSpec] = None
         self._catalog: Optional[TileCatalog] = None
         self._kd: Optional[KDIndex] = None
+        self._source: Optional[Dict[str, Any]] = None  # static file the index is from
 
     # -------------------- lifecycle --------------------
 
@@ -66,23 +72,19 @@ class HaulTileAssigner:
         path = spec.path
         if not path.exists():
             raise FileNotFoundError(f"Static dataset not found: {path}")
+        source = self.source_meta()
+
+        import xarray as xr
 
-        # Open static dataset
+        # Open static dataset lazily; only the mask plane (and coords) are read
         with xr.open_dataset(path) as ds:
-            # Build grid spec (strict hash from lon/lat 1-D arrays)
-            grid = GridSpec.from_dataset(
-                ds,
-                lon_candidates=(self.lon_name, "lon", "x"),
-                lat_candidates=(self.lat_name, "lat", "y"),
-            )
+            mask_builder = self._mask_builder(ds)
+            grid = self._static_grid(ds, mask_builder)
 
             # Build boolean sea mask: True = sea, False = land
-            mask_builder = SeaMaskBuilder(
-                mask_name=spec.mask_var,
-                is_bit=spec.is_bit,
-                sea_value=spec.sea_value,
-            )
-            sea = mask_builder.build(ds)  # 2-D bool, shape ny×nx in (lat, lon) order
+            sea = mask_builder.build_lazy(
+                ds, region=spec.region, chunk_rows=spec.chunk_rows
+            )  # 2-D bool, shape ny×nx in (lat, lon) order
 
         # Create tile catalog (stable sea tile IDs and their centers)
         catalog = TileCatalog(grid=grid, sea_land_mask=sea)
@@ -96,17 +98,115 @@ class HaulTileAssigner:
         self._grid = grid
         self._catalog = catalog
         self._kd = kd
+        self._source = source
+
+    def source_meta(self) -> Dict[str, Any]:
+        """Identity of the static file and mask settings an index is built from."""
+        spec = self.static_spec
+        st = Path(spec.path).stat()
+        return {
+            "static_path": str(Path(spec.path).resolve()),
+            "static_mtime_ns": st.st_mtime_ns,
+            "static_size": st.st_size,
+            "mask_var": spec.mask_var,
+            "is_bit": spec.is_bit,
+            "sea_value": spec.sea_value,
+            "region": None if spec.region is None else list(spec.region),
+        }
+
+    def static_grid(self) -> GridSpec:
+        """Grid of the static file's mask plane (coordinates only, region applied)."""
+        import xarray as xr
+
+        with xr.open_dataset(self.static_spec.path) as ds:
+            return self._static_grid(ds, self._mask_builder(ds))
+
+    def save_index(self, directory: Path) -> Path:
+        """Persist the tile catalog and KD metric (lat0) so other processes can reuse them."""
+        self._ensure_ready()
+        directory = Path(directory)
+        self._catalog.save(directory)  # type: ignore[union-attr]
+        meta = {
+            "lat0": self._kd.lat0,  # type: ignore[union-attr]
+            "grid_hash": self._grid.grid_hash,  # type: ignore[union-attr]
+            **(self._source or self.source_meta()),
+        }
+        (directory / _INDEX_META_FILENAME).write_text(json.dumps(meta, indent=2))
+        return directory
+
+    @staticmethod
+    def index_exists(directory: Path) -> bool:
+        return (Path(directory) / _INDEX_META_FILENAME).exists()
+
+    def stale_index_reason(
+        self,
+        directory: Path,
+        *,
+        lat0: Optional[float] = None,
+        check_grid: bool = False,
+    ) -> Optional[str]:
+        """
+        Why the index in directory does not belong to static_spec (None when it
+        does): a different or modified static file, other mask settings, another
+        lat0 (when given) or, with check_grid, a grid hash that no longer matches
+        the static file's coordinates. With check_grid and no lat0, the expected
+        lat0 is the median grid latitude that load_static_and_build_index uses.
+        """
+        meta_path = Path(directory) / _INDEX_META_FILENAME
+        if not meta_path.exists():
+            return "missing"
+        meta = json.loads(meta_path.read_text())
+        for key, value in self.source_meta().items():
+            if meta.get(key) != value:
+                return f"{key} differs"
+        if check_grid:
+            grid = self.static_grid()
+            if meta.get("grid_hash") != grid.grid_hash:
+                return "grid_hash differs"
+            if lat0 is None:
+                lat0 = float(np.nanmedian(grid.lats))
+        if lat0 is not None and meta.get("lat0") != float(lat0):
+            return "lat0 differs"
+        return None
+
+    def load_index(self, directory: Path, *, mmap: bool = True) -> None:
+        """
+        Load an index written by save_index(); catalog arrays are memory-mapped.
+        Raises ValueError when the index was built from another static file.
+        """
+        directory = Path(directory)
+        meta_path = directory / _INDEX_META_FILENAME
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Haul tile index not found: {meta_path}")
+        reason = self.stale_index_reason(directory)
+        if reason is not None:
+            raise ValueError(f"Stale haul tile index in {directory}: {reason}.")
+        meta = json.loads(meta_path.read_text())
+
+        catalog = TileCatalog.load(directory, mmap=mmap)
+        if catalog.grid.grid_hash != meta["grid_hash"]:
+            raise ValueError(
+                f"Stale haul tile index in {directory}: grid_hash differs."
+            )
+        self._grid = catalog.grid
+        self._catalog = catalog
+        self._kd = KDIndex(catalog=catalog, lat0=float(meta["lat0"]))
+        self._source = {key: meta[key] for key in self.source_meta()}
 
     # -------------------- main operation --------------------
 
     def assign(
-        self, hauls: pd.DataFrame, tolerance_deg: Optional[float] = None
+        self,
+        hauls: pd.DataFrame,
+        tolerance_deg: Optional[float] = None,
+        workers: int = -1,
     ) -> pd.DataFrame:
         """
         Return a copy of hauls with three new columns:
           - tile_id
           - tile_lon_center
           - tile_lat_center
+        workers is the KD query thread count (-1 = all cores).
         """
         self._ensure_ready()
 
@@ -123,6 +223,7 @@ class HaulTileAssigner:
             lat_col=self.lat_col,
             tolerance_deg=tolerance_deg,
             out_col=self.out_tile_col,
+            workers=workers,
         )
 
         # 2) append sea-cell center coords from catalog for the mapped tile_ids
@@ -145,6 +246,41 @@ class HaulTileAssigner:
 
     # -------------------- helpers --------------------
 
+    def _mask_builder(self, ds) -> SeaMaskBuilder:
+        """Mask builder for ds, using the lon/lat dim names its mask variable has."""
+        spec = self.static_spec
+        dims = ds[spec.mask_var].dims if spec.mask_var in ds else ()
+        lon = next((d for d in self._lon_candidates() if d in dims), "longitude")
+        lat = next((d for d in self._lat_candidates() if d in dims), "latitude")
+        return SeaMaskBuilder(
+            mask_name=spec.mask_var,
+            is_bit=spec.is_bit,
+            sea_value=spec.sea_value,
+            lat_name=lat,
+            lon_name=lon,
+        )
+
+    def _lon_candidates(self) -> tuple[str, ...]:
+        return (self.lon_name, "longitude", "lon", "x")
+
+    def _lat_candidates(self) -> tuple[str, ...]:
+        return (self.lat_name, "latitude", "lat", "y")
+
+    def _static_grid(self, ds, mask_builder: SeaMaskBuilder) -> GridSpec:
+        """Grid spec (strict hash from lon/lat 1-D arrays) of the mask plane."""
+        spec = self.static_spec
+        grid_ds = ds[[spec.mask_var]]
+        if spec.region is not None:
+            lat_slice, lon_slice = mask_builder.region_slices(ds, spec.region)
+            grid_ds = grid_ds.isel(
+                {mask_builder.lat_name: lat_slice, mask_builder.lon_name: lon_slice}
+            )
+        return GridSpec.from_dataset(
+            grid_ds,
+            lon_candidates=self._lon_candidates(),
+            lat_candidates=self._lat_candidates(),
+        )
+
     def _ensure_ready(self) -> None:
         if (self._grid is None) or (self._catalog is None) or (self._kd is None):
             raise RuntimeError("Call load_static_and_build_index() before assign().")
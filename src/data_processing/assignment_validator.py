@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.data_processing.tile_catalog import TileCatalog
+
+# Match categories (int8 codes) between an index result and the exact reference.
+SAME, NEIGHBOR, NON_NEIGHBOR, UNASSIGNED = 0, 1, 2, 3
+MATCH_LABELS = ("same", "neighbor", "non-neighbor", "unassigned")
+_TILE_BLOCK = 65536
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """Per-point reference results plus aggregate match rates."""
+
+    ref_ids: np.ndarray  # exact nearest tile_id per point (int64)
+    ref_d2: np.ndarray  # squared distance to ref tile in the KD metric
+    match: np.ndarray  # int8 code per point (SAME, NEIGHBOR, ...)
+    equal_distance: np.ndarray  # bool: mismatch but the index tile is equally close
+
+    def summary(self) -> Dict[str, float]:
+        n = max(int(self.match.size), 1)
+        counts = np.bincount(self.match, minlength=len(MATCH_LABELS))
+        out = {
+            "points": float(self.match.size),
+            "same_pct": 100.0 * counts[SAME] / n,
+            "neighbor_pct": 100.0 * counts[NEIGHBOR] / n,
+            "non_neighbor_pct": 100.0 * counts[NON_NEIGHBOR] / n,
+            "unassigned_pct": 100.0 * counts[UNASSIGNED] / n,
+            "tie_pct": 100.0 * float(np.count_nonzero(self.equal_distance)) / n,
+        }
+        return out
+
+
+class BruteForceValidator:
+    """
+    Exact nearest sea tile for many points, in the same planar metric as KDIndex
+    (x = lon * cos(lat0), y = lat), computed over blocks of the points × tiles
+    distance matrix so memory stays bounded by max_block_elems floats.
+
+    Ties resolve to the lowest tile_id (same as np.argmin over all tiles).
+    """
+
+    def __init__(
+        self, catalog: TileCatalog, lat0: float, *, max_block_elems: int = 4_000_000
+    ) -> None:
+        if max_block_elems < 1:
+            raise ValueError("max_block_elems must be >= 1.")
+        self.catalog = catalog
+        self.lat0 = float(lat0)
+        self.max_block_elems = int(max_block_elems)
+        sea_lon, sea_lat = catalog.sea_tile_coords()
+        self._scale = math.cos(math.radians(self.lat0))
+        self._xs = np.asarray(sea_lon, dtype=np.float64) * self._scale
+        self._ys = np.asarray(sea_lat, dtype=np.float64)
+
+    def nearest(
+        self, lons: np.ndarray, lats: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (tile_ids int64, squared distances float64) for every point."""
+        xq = np.asarray(lons, dtype=np.float64).ravel() * self._scale
+        yq = np.asarray(lats, dtype=np.float64).ravel()
+        if xq.size != yq.size:
+            raise ValueError("lons and lats must have the same length.")
+        n, k = xq.size, self._xs.size
+        best_id = np.full(n, -1, dtype=np.int64)
+        best_d2 = np.full(n, np.inf, dtype=np.float64)
+        if n == 0 or k == 0:
+            return best_id, best_d2
+
+        # Cache-friendly tile blocks; query rows fill the remaining element budget.
+        tile_block = min(k, self.max_block_elems, _TILE_BLOCK)
+        query_block = max(1, self.max_block_elems // tile_block)
+        for q0 in range(0, n, query_block):
+            q1 = min(q0 + query_block, n)
+            qx = xq[q0:q1, None]
+            qy = yq[q0:q1, None]
+            cur_id = best_id[q0:q1]
+            cur_d2 = best_d2[q0:q1]
+            for t0 in range(0, k, tile_block):
+                t1 = min(t0 + tile_block, k)
+                d2 = (self._xs[None, t0:t1] - qx) ** 2
+                d2 += (self._ys[None, t0:t1] - qy) ** 2
+                arg = np.argmin(d2, axis=1)
+                blk = d2[np.arange(q1 - q0), arg]
+                # Strict < keeps the earlier (lower) tile_id on ties across blocks.
+                better = blk < cur_d2
+                cur_id[better] = arg[better] + t0
+                cur_d2[better] = blk[better]
+        return best_id, best_d2
+
+    def validate(
+        self,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        index_ids: np.ndarray,
+        *,
+        rtol: float = 1e-12,
+        ref: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> ValidationReport:
+        """
+        Classify index_ids against the exact reference: same tile, 8-neighbor on
+        the grid, non-neighbor, or unassigned (-1). ref may be passed to reuse a
+        previous nearest() result across several index types.
+        """
+        index_ids = np.asarray(index_ids, dtype=np.int64).ravel()
+        ref_ids, ref_d2 = ref if ref is not None else self.nearest(lons, lats)
+        if index_ids.size != ref_ids.size:
+            raise ValueError("index_ids must have one entry per point.")
+
+        match = np.full(index_ids.size, NON_NEIGHBOR, dtype=np.int8)
+        assigned = index_ids >= 0
+        match[~assigned] = UNASSIGNED
+        same = assigned & (index_ids == ref_ids)
+        match[same] = SAME
+
+        diff = assigned & ~same
+        equal = np.zeros(index_ids.size, dtype=bool)
+        if np.any(diff):
+            a_j, a_i = self.catalog.sea_cell_ids_many(index_ids[diff])
+            b_j, b_i = self.catalog.sea_cell_ids_many(ref_ids[diff])
+            dj = np.abs(a_j.astype(np.int64) - b_j)
+            di = np.abs(a_i.astype(np.int64) - b_i)
+            match[np.flatnonzero(diff)[(dj <= 1) & (di <= 1)]] = NEIGHBOR
+
+            xq = np.asarray(lons, dtype=np.float64).ravel()[diff] * self._scale
+            yq = np.asarray(lats, dtype=np.float64).ravel()[diff]
+            got = index_ids[diff]
+            got_d2 = (self._xs[got] - xq) ** 2 + (self._ys[got] - yq) ** 2
+            equal[diff] = np.isclose(got_d2, ref_d2[diff], rtol=rtol, atol=0.0)
+
+        return ValidationReport(
+            ref_ids=ref_ids, ref_d2=ref_d2, match=match, equal_distance=equal
+        )
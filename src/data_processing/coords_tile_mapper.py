@@ -21,11 +21,17 @@ class CoordinatesToTileMapper:
         lat_col: str = "lat",
         tolerance_deg: Optional[float] = None,
         out_col: str = "tile_id",
+        workers: int = -1,
     ) -> pd.DataFrame:
-        """Returns a copy of coordinates with a new tile_id column (-1 when no match)."""
+        """
+        Returns a copy of coordinates with a new tile_id column (-1 when no match).
+        workers is the KD query thread count (-1 = all cores).
+        """
         lons = np.asarray(coordinates[lon_col].values, dtype=np.float64)
         lats = np.asarray(coordinates[lat_col].values, dtype=np.float64)
-        ids = self.kd_index.query_many(lons, lats, tolerance_deg=tolerance_deg)
+        ids = self.kd_index.query_many(
+            lons, lats, tolerance_deg=tolerance_deg, workers=workers
+        )
 
         out = coordinates.copy()
         out[out_col] = ids
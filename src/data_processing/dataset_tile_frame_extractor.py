@@ -67,10 +67,9 @@ class DatasetTileFrameExtractor:
         if with_coords:
             tile_lon, tile_lat = self.catalog.sea_tile_coords()
 
-        # Flat sea mask to extract values in row-major order
-        tim = self.catalog.tile_id_map  # (ny, nx), -1 on land
-        ny, nx = tim.shape
-        sea_mask_flat = tim.ravel(order="C") >= 0
+        # Flat sea index (cached by the catalog) to extract values in tile_id order
+        ny, nx = self.catalog.tile_id_map.shape
+        sea_flat_idx = self.catalog.sea_flat_index()
 
         has_depth = (self.depth_dim is not None) and (self.depth_dim in da.dims)
         frames: list[pd.DataFrame] = []
@@ -88,7 +87,7 @@ class DatasetTileFrameExtractor:
 
                 # Extract sea-only values in tile_id order
                 slice2d = self._slice_2d(slice_da, ny, nx)
-                sea_vec = slice2d.ravel(order="C")[sea_mask_flat]
+                sea_vec = slice2d.ravel(order="C")[sea_flat_idx]
 
                 record = {
                     "time": np.repeat(t_val, num_tiles),
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Leading date token of the known `dia` variants; a time of day after it is ignored:
+#   "5/8/1999", "05/08/1999", "5/8/1999 0:00:00", "05-08-1999", "05.08.1999"
+#   "1999-08-05", "1999-08-05 00:00:00"
+_DATE_PATTERN = (
+    r"^\s*(?:(?P<a>\d{1,2})[/.\-](?P<b>\d{1,2})[/.\-](?P<y>\d{4})"
+    r"|(?P<iy>\d{4})-(?P<im>\d{1,2})-(?P<id>\d{1,2}))"
+)
+# A time of day ending in a UTC offset ("...T23:30:00-02:00", "... 0:00:00Z"): the
+# calendar day then depends on the offset, so these values take the slow path.
+_OFFSET_PATTERN = r"\d:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|[+-]\d{2}(?::?\d{2})?)\s*$"
+NAT_DAY = np.datetime64("NaT", "D")
+
+
+@dataclass(frozen=True)
+class DateParseResult:
+    """Parsed calendar days plus a bulk record of the rows that failed."""
+
+    dates: np.ndarray  # datetime64[D], NaT where invalid
+    invalid: np.ndarray  # bool mask aligned with the input
+    raw: pd.Series  # original values, only touched when reporting
+
+    @property
+    def invalid_count(self) -> int:
+        return int(np.count_nonzero(self.invalid))
+
+    def examples(self, n: int = 10) -> List[str]:
+        """Up to n distinct offending non-missing raw values, in first-seen order."""
+        bad = self.raw[self.invalid].dropna().astype(str)
+        return bad.unique()[:n].tolist()
+
+    def raise_if_invalid(self, column: str) -> None:
+        if self.invalid_count:
+            raise ValueError(
+                f"Unparseable dates in '{column}': {self.invalid_count} rows. "
+                f"Examples: {self.examples()}"
+            )
+
+    def as_series(self, index: pd.Index | None = None) -> pd.Series:
+        """Typed day-resolution Series (pandas stores datetime64[D] as [s])."""
+        return pd.Series(self.dates, index=index)
+
+
+class DateNormalizer:
+    """
+    Parse raw date values into calendar days (datetime64[D]) in one pass.
+
+    - Values are factorized first, so each distinct string is parsed once; haul
+      tables repeat a few thousand days over millions of rows.
+    - Distinct strings go through a single regex extraction; day/month/year are
+      then assembled with integer datetime64 arithmetic (no string rebuilding,
+      no second parse), and impossible calendar days (31/02) are rejected.
+    - dayfirst=True reads "a/b/YYYY" as day/month, False as month/day. ISO
+      "YYYY-MM-DD" is always year-month-day.
+    - Distinct strings that carry a UTC offset, or that the regex does not
+      match ("5 Jan 2023"), fall back to pd.to_datetime(utc=True) and are
+      floored in UTC, like tz-aware datetime inputs.
+    - Already-typed datetime inputs are floored to the day without parsing.
+    """
+
+    def __init__(self, *, dayfirst: bool = True) -> None:
+        self.dayfirst = dayfirst
+
+    def parse(self, values) -> DateParseResult:
+        s = values if isinstance(values, pd.Series) else pd.Series(values)
+        raw = s.reset_index(drop=True)
+
+        if pd.api.types.is_datetime64_any_dtype(s.dtype):
+            dates = self.floor_days(s)
+            return DateParseResult(dates=dates, invalid=np.isnat(dates), raw=raw)
+
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+        days = self._parse_unique(pd.Series(uniques, dtype=object).astype(str))
+        dates = np.full(codes.size, NAT_DAY)
+        has = codes >= 0
+        dates[has] = days[codes[has]]
+        return DateParseResult(dates=dates, invalid=np.isnat(dates), raw=raw)
+
+    @staticmethod
+    def floor_days(s: pd.Series) -> np.ndarray:
+        """datetime64[D] of a datetime Series; tz-aware values are taken in UTC."""
+        if isinstance(s.dtype, pd.DatetimeTZDtype):
+            s = s.dt.tz_convert("UTC").dt.tz_localize(None)
+        return s.to_numpy(dtype="datetime64[D]")
+
+    def _parse_unique(self, s: pd.Series) -> np.ndarray:
+        parts = s.str.extract(_DATE_PATTERN)
+        dmy = parts["y"].notna().to_numpy()
+        first = self._to_int(parts["a"])
+        second = self._to_int(parts["b"])
+        day = np.where(dmy, first if self.dayfirst else second, 0)
+        month = np.where(dmy, second if self.dayfirst else first, 0)
+        year = np.where(dmy, self._to_int(parts["y"]), 0)
+
+        iso = parts["iy"].notna().to_numpy()
+        year = np.where(iso, self._to_int(parts["iy"]), year)
+        month = np.where(iso, self._to_int(parts["im"]), month)
+        day = np.where(iso, self._to_int(parts["id"]), day)
+        days = self.assemble(year, month, day)
+
+        # offsets and unknown formats: pandas, in UTC; a regex hit that is not a
+        # calendar day (31/02) stays invalid whatever follows it
+        hit = dmy | iso
+        slow = ~hit | s.str.contains(_OFFSET_PATTERN).to_numpy()
+        if slow.any():
+            keep_nat = hit & np.isnat(days)
+            for flag, dayfirst in ((iso, False), (~iso, self.dayfirst)):
+                rows = slow & flag & ~keep_nat
+                if rows.any():
+                    days[rows] = self._parse_utc(s[rows], dayfirst=dayfirst)
+        return days
+
+    @classmethod
+    def _parse_utc(cls, s: pd.Series, *, dayfirst: bool) -> np.ndarray:
+        parsed = pd.to_datetime(
+            s, utc=True, format="mixed", dayfirst=dayfirst, errors="coerce"
+        )
+        return cls.floor_days(parsed)
+
+    @staticmethod
+    def assemble(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+        """Vectorized (year, month, day) -> datetime64[D]; NaT for impossible days."""
+        year = np.asarray(year, dtype=np.int64)
+        month = np.asarray(month, dtype=np.int64)
+        day = np.asarray(day, dtype=np.int64)
+        ok = (month >= 1) & (month <= 12) & (day >= 1)
+
+        months = np.where(ok, (year - 1970) * 12 + (month - 1), 0)
+        month_start = months.astype("datetime64[M]")
+        days_in_month = (month_start + 1).astype("datetime64[D]") - month_start.astype(
+            "datetime64[D]"
+        )
+        ok &= day <= days_in_month.astype(np.int64)
+
+        out = month_start.astype("datetime64[D]") + np.where(ok, day - 1, 0)
+        out[~ok] = NAT_DAY
+        return out
+
+    @staticmethod
+    def _to_int(col: pd.Series) -> np.ndarray:
+        return pd.to_numeric(col, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
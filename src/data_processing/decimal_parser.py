@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Character classes of the fixed-width buffer (latin-1 range; anything above
+# 0xFF is OTHER). NUL is the padding numpy adds to shorter strings.
+_OTHER, _DIGIT, _SEP, _SIGN, _NBSP, _PAD = range(6)
+_KIND = np.full(256, _OTHER, dtype=np.uint8)
+_KIND[ord("0") : ord("9") + 1] = _DIGIT
+_KIND[[ord(","), ord(".")]] = _SEP
+_KIND[[ord("-"), ord("+")]] = _SIGN
+_KIND[0xA0] = _NBSP  # removed anywhere (thousands separator in the exports)
+_KIND[[0, 9, 32]] = _PAD  # stripped only around the number
+_MINUS = ord("-")
+_ZERO = ord("0")
+_MAX_DIGITS = 15  # int64 mantissa stays exact in float64 below 2**53
+_POW10 = 10.0 ** np.arange(_MAX_DIGITS + 1)
+
+
+class DecimalParser:
+    """
+    Vectorized text -> float64 for logbook coordinates such as "430512,3",
+    " 925.5", "430\u00a0512,3" or "-12,5".
+
+    - Strings are laid out as a fixed-width code-point buffer (N × W uint32) and
+      parsed with array arithmetic in a single pass: decimal comma or dot,
+      NBSP ignored anywhere, spaces/tabs only around the number, optional
+      leading sign.
+    - Digits accumulate into an exact int64 mantissa which is divided once by
+      10**fraction_digits, so results are correctly rounded like pd.to_numeric.
+    - Anything else (exponents, >15 digits, stray text) falls back to the
+      legacy replace/strip/to_numeric path for just those rows, so the output
+      is identical to it; missing values stay NaN.
+    - Numeric input is returned as float64 without going through text.
+    """
+
+    def __init__(self, block_rows: int = 262_144) -> None:
+        if block_rows < 1:
+            raise ValueError("block_rows must be >= 1.")
+        self.block_rows = int(block_rows)
+
+    def parse(self, s: pd.Series) -> pd.Series:
+        if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(
+            s.dtype
+        ):
+            values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+            return pd.Series(values, index=s.index, name=s.name)
+
+        out = np.full(len(s), np.nan, dtype=np.float64)
+        present = s.notna().to_numpy()
+        text = s.to_numpy(dtype=object)[present].astype(str)
+        values, ok = self._parse_blocks(text)
+
+        rows = np.flatnonzero(present)
+        out[rows[ok]] = values[ok]
+        if not ok.all():
+            retry = rows[~ok]
+            out[retry] = self.legacy(s.iloc[retry]).to_numpy(dtype=np.float64)
+        return pd.Series(out, index=s.index, name=s.name)
+
+    @staticmethod
+    def legacy(s: pd.Series) -> pd.Series:
+        """Reference path: two str.replace passes, strip, then pd.to_numeric."""
+        s = (
+            s.astype(str)
+            .str.replace(",", ".", regex=False)
+            .str.replace("\u00a0", "", regex=False)
+            .str.strip()
+        )
+        return pd.to_numeric(s, errors="coerce")
+
+    def _parse_blocks(self, text: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        values = np.full(text.size, np.nan, dtype=np.float64)
+        ok = np.zeros(text.size, dtype=bool)
+        for start in range(0, text.size, self.block_rows):
+            stop = min(start + self.block_rows, text.size)
+            values[start:stop], ok[start:stop] = self.parse_codepoints(text[start:stop])
+        return values, ok
+
+    @staticmethod
+    def parse_codepoints(text: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Parse a fixed-width unicode array ('<U' dtype); returns (values, ok).
+        Rows with ok=False were not understood and hold NaN.
+        """
+        text = np.asarray(text, dtype=str)
+        n = text.size
+        width = max(text.dtype.itemsize // 4, 1)
+        if n == 0:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=bool)
+        # Column-major code points: one contiguous N-vector per character slot.
+        cp = np.ascontiguousarray(
+            np.ascontiguousarray(text).view(np.uint32).reshape(n, width).T
+        )
+        kind = _KIND[np.minimum(cp, 0xFF)]
+        kind[cp > 0xFF] = _OTHER
+
+        ok = np.ones(n, dtype=bool)
+        started = np.zeros(n, dtype=bool)  # first digit/separator/sign seen
+        ended = np.zeros(n, dtype=bool)  # padding seen after the number
+        seen_sep = np.zeros(n, dtype=bool)
+        negative = np.zeros(n, dtype=bool)
+        mantissa = np.zeros(n, dtype=np.int64)
+        n_digits = np.zeros(n, dtype=np.int64)
+        frac_digits = np.zeros(n, dtype=np.int64)
+
+        # Left-to-right scan; every step is a vector op over all N strings.
+        for c in range(width):
+            k = kind[c]
+            digit = k == _DIGIT
+            sep = k == _SEP
+            sign = k == _SIGN
+            core = digit | sep | sign
+            bad = (k == _OTHER) | (core & ended) | (sign & started) | (sep & seen_sep)
+            ok &= ~bad
+            ended |= (k == _PAD) & started
+            started |= core
+            negative |= sign & (cp[c] == _MINUS)
+            seen_sep |= sep
+
+            mantissa = np.where(digit, mantissa * 10 + (cp[c] - _ZERO), mantissa)
+            n_digits += digit
+            frac_digits += digit & seen_sep
+
+        ok &= (n_digits > 0) & (n_digits <= _MAX_DIGITS)
+        # Exact integer mantissa divided once by 10**k: correctly rounded.
+        values = mantissa / _POW10[np.minimum(frac_digits, _MAX_DIGITS)]
+        values = np.where(negative, -values, values)
+        values[~ok] = np.nan
+        return values, ok
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.assign_hauls_to_tiles_id import HaulTileAssigner, StaticSpec
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+
+@dataclass(frozen=True)
+class HaulChunk:
+    """Byte range [start, end) of a haul CSV; start > 0 means the header is elsewhere."""
+
+    index: int
+    path: Path
+    start: int
+    end: int
+    columns: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class BatchPart:
+    """One written output part and its row counts."""
+
+    chunk: HaulChunk
+    part_path: Path
+    rows: int
+    unmatched: int  # rows with tile_id == -1 (only possible with a tolerance)
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    lon_col: str = "lon"
+    lat_col: str = "lat"
+    time_col: str = "time"
+    tolerance_deg: Optional[float] = None
+    output_format: str = "csv"
+    read_csv_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+# Per-process state populated by _init_worker (read-only after init).
+_WORKER: Dict[str, Any] = {}
+
+
+def _load_assigner(
+    index_dir: str, static_spec: StaticSpec, options: BatchOptions
+) -> HaulTileAssigner:
+    assigner = HaulTileAssigner(
+        static_spec=static_spec,
+        lon_col=options.lon_col,
+        lat_col=options.lat_col,
+        time_col=options.time_col,
+    )
+    assigner.load_index(Path(index_dir), mmap=True)
+    return assigner
+
+
+def _init_worker(
+    index_dir: str, static_spec: StaticSpec, options: BatchOptions, kd_workers: int
+):
+    _WORKER["assigner"] = _load_assigner(index_dir, static_spec, options)
+    _WORKER["options"] = options
+    _WORKER["kd_workers"] = kd_workers
+
+
+def _read_chunk(chunk: HaulChunk, read_csv_kwargs: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Rows of one byte range. chunk.columns is the full header, so a usecols in
+    read_csv_kwargs selects from the named columns of headerless chunks too.
+    """
+    with chunk.path.open("rb") as f:
+        f.seek(chunk.start)
+        data = f.read(chunk.end - chunk.start)
+    if chunk.start == 0:
+        return pd.read_csv(io.BytesIO(data), **read_csv_kwargs)
+    return pd.read_csv(
+        io.BytesIO(data), header=None, names=list(chunk.columns), **read_csv_kwargs
+    )
+
+
+def _assign_chunk(task: tuple[HaulChunk, str]) -> BatchPart:
+    """Pool entry point: _assign_part with the state set up by _init_worker."""
+    chunk, part_path = task
+    return _assign_part(
+        _WORKER["assigner"], _WORKER["options"], _WORKER["kd_workers"], chunk, part_path
+    )
+
+
+def _assign_part(
+    assigner: HaulTileAssigner,
+    options: BatchOptions,
+    kd_workers: int,
+    chunk: HaulChunk,
+    part_path: str,
+) -> BatchPart:
+    hauls = _read_chunk(chunk, options.read_csv_kwargs)
+    enriched = assigner.assign(
+        hauls, tolerance_deg=options.tolerance_deg, workers=kd_workers
+    )
+
+    out = Path(part_path)
+    if options.output_format == "parquet":
+        enriched.to_parquet(out, index=False)
+    else:
+        enriched.to_csv(out, index=False)
+    unmatched = int(np.count_nonzero(enriched[assigner.out_tile_col].to_numpy() < 0))
+    return BatchPart(
+        chunk=chunk, part_path=out, rows=len(enriched), unmatched=unmatched
+    )
+
+
+class HaulTileBatchAssigner:
+    """
+    Assigns tile_ids to many haul CSV files (or byte-range chunks of one huge file)
+    with a single static-layer index shared by a process pool.
+
+    - The index (tile catalog + lat0) is built once into index_dir, or reused if
+      it was built from the same static file (path, mtime, size, grid hash) and
+      lat0; workers memory-map the catalog arrays read-only and query the KD
+      tree single-threaded (the pool already uses the cores).
+    - lat0 comes from the static grid (median latitude) unless given, so the same
+      static layer always yields the same index regardless of the hauls.
+    - Each chunk is written as its own part file in chunk order, so memory is
+      bounded by chunk_bytes per worker and output streams as chunks complete.
+    - Chunks split on line boundaries: quoted fields must not contain newlines.
+    """
+
+    def __init__(
+        self,
+        static_spec: StaticSpec,
+        index_dir: Path,
+        *,
+        lat0: Optional[float] = None,
+        workers: Optional[int] = None,
+        chunk_bytes: int = 64 * 1024 * 1024,
+        options: Optional[BatchOptions] = None,
+    ) -> None:
+        if chunk_bytes <= 0:
+            raise ValueError("chunk_bytes must be positive.")
+        self.static_spec = static_spec
+        self.index_dir = Path(index_dir)
+        self.lat0 = lat0
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.chunk_bytes = int(chunk_bytes)
+        self.options = options or BatchOptions()
+        if self.options.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}.")
+
+    # -------------------- index --------------------
+
+    def ensure_index(self, *, rebuild: bool = False) -> Path:
+        """Build the shared index into index_dir unless an up-to-date one exists."""
+        assigner = HaulTileAssigner(static_spec=self.static_spec)
+        if not rebuild:
+            reason = assigner.stale_index_reason(
+                self.index_dir, lat0=self.lat0, check_grid=True
+            )
+            if reason is None:
+                return self.index_dir
+            if reason != "missing":
+                logging.info(
+                    "Rebuilding haul tile index %s: %s", self.index_dir, reason
+                )
+        assigner.load_static_and_build_index(lat0_hint=self.lat0)
+        return assigner.save_index(self.index_dir)
+
+    # -------------------- planning --------------------
+
+    def plan_chunks(self, paths: Sequence[Path]) -> List[HaulChunk]:
+        """Split inputs into line-aligned byte ranges of roughly chunk_bytes."""
+        chunks: List[HaulChunk] = []
+        for path in paths:
+            for start, end, columns in self._byte_ranges(Path(path)):
+                chunks.append(
+                    HaulChunk(
+                        index=len(chunks),
+                        path=Path(path),
+                        start=start,
+                        end=end,
+                        columns=columns,
+                    )
+                )
+        return chunks
+
+    def _byte_ranges(self, path: Path) -> Iterator[tuple[int, int, tuple[str, ...]]]:
+        size = path.stat().st_size
+        # every column of the header (usecols applies after naming, in _read_chunk)
+        header_kwargs = dict(self.options.read_csv_kwargs)
+        header_kwargs.pop("usecols", None)
+        columns = tuple(pd.read_csv(path, nrows=0, **header_kwargs).columns)
+        starts = [0]
+        with path.open("rb") as f:
+            f.readline()  # header always stays in the first chunk
+            header_end = f.tell()
+            for target in range(self.chunk_bytes, size, self.chunk_bytes):
+                if target <= max(header_end, starts[-1]):
+                    continue
+                f.seek(target - 1)
+                f.readline()  # advance to the next line start
+                pos = f.tell()
+                if pos < size and pos > starts[-1]:
+                    starts.append(pos)
+        ends = starts[1:] + [size]
+        for start, end in zip(starts, ends):
+            yield start, end, columns
+
+    # -------------------- execution --------------------
+
+    def run(self, paths: Sequence[Path], out_dir: Path) -> List[BatchPart]:
+        """Assign tiles to every input and write part-NNNNN.<fmt> files into out_dir."""
+        index_dir = self.ensure_index()
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        chunks = self.plan_chunks(paths)
+        suffix = self.options.output_format
+        tasks = [(c, str(out_dir / f"part-{c.index:05d}.{suffix}")) for c in chunks]
+        if not tasks:
+            return []
+
+        initargs = (str(index_dir), self.static_spec, self.options)
+        if self.workers == 1 or len(tasks) == 1:
+            assigner = _load_assigner(*initargs)
+            return [_assign_part(assigner, self.options, -1, *t) for t in tasks]
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(*initargs, 1),
+        ) as pool:
+            return list(pool.map(_assign_chunk, tasks))
+
+    @staticmethod
+    def concat_csv_parts(parts: Sequence[BatchPart], out_path: Path) -> Path:
+        """Stream CSV parts (in order) into one file, keeping only the first header."""
+        out_path = Path(out_path)
+        with out_path.open("wb") as out:
+            for n, part in enumerate(parts):
+                with part.part_path.open("rb") as f:
+                    header = f.readline()
+                    if n == 0:
+                        out.write(header)
+                    while block := f.read(1024 * 1024):
+                        out.write(block)
+        return out_path
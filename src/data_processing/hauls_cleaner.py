@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
 import numpy as np
 import pandas as pd
 
+from src.data_processing.date_normalizer import DateNormalizer
+from src.data_processing.decimal_parser import DecimalParser
+
+
+@dataclass(frozen=True)
+class StreamSummary:
+    rows_in: int
+    rows_out: int
+    duplicates: int  # rows dropped as repeated Idlance
+    invalid_dia: int  # rows dropped for an unparseable `dia`
+
+
+# Raw columns the pipeline itself reads, besides the four coordinate columns.
+_PIPELINE_COLUMNS = ["Idlance", "dia", "PROFMax", "PROFMin"]
+
 
 class HaulDbBuilder:
     def __init__(self, hauls_db: pd.DataFrame, to_fix_hauls: pd.DataFrame):
-        self.hauls_db = hauls_db.copy()
+        self.hauls_db = hauls_db  # never mutated; run() works on its own copies
         self.to_fix_hauls = to_fix_hauls
+        self.invalid_dia: pd.DataFrame = pd.DataFrame()
 
     # --- step 1: keep only rows that have at least one long and one lat ---
     @staticmethod
@@ -22,13 +42,8 @@ class HaulDbBuilder:
     # --- primitives ---
     @staticmethod
     def sanitize_numeric(s: pd.Series) -> pd.Series:
-        s = (
-            s.astype(str)
-            .str.replace(",", ".", regex=False)
-            .str.replace("\u00a0", "", regex=False)
-            .str.strip()
-        )
-        return pd.to_numeric(s, errors="coerce")
+        # Decimal commas and NBSP handled in one vectorized pass (float64 out)
+        return DecimalParser().parse(s)
 
     @staticmethod
     def fallback(preferred: pd.Series, alternate: pd.Series) -> pd.Series:
@@ -62,29 +77,20 @@ class HaulDbBuilder:
         )
         return df
 
-    # --- NEW: sanitize `dia` into dd/mm/YYYY, drop invalid, and return failing rows ---
+    # --- sanitize `dia` into typed days, drop invalid, and return failing rows ---
     @staticmethod
     def _sanitize_dia(
         df: pd.DataFrame, dia_col: str = "dia", out_col: str = "date"
-    ) -> pd.DataFrame:
-        s = df[dia_col].astype(str).str.strip()
-
-        # Capture the first date token allowing 1–2 digits for day/month
-        # e.g. "5/8/1999", "05/08/1999", "5/8/1999 0:00:00"
-        pat = r"^\s*(\d{1,2})/(\d{1,2})/(\d{4})"
-        parts = s.str.extract(pat)
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        # One parse of the raw column (e.g. "5/8/1999", "05/08/1999 0:00:00",
+        # "1999-08-05") straight into day-resolution datetimes.
+        parsed = DateNormalizer(dayfirst=True).parse(df[dia_col])
+        dates = parsed.as_series(index=df.index)
 
-        valid = parts.notna().all(axis=1)
-
-        # Keep only valid rows and build zero-padded dd/mm/YYYY
-        df = df.loc[valid].copy()
-        parts = parts.loc[valid]
-        day = parts[0].astype(str).str.zfill(2)
-        mon = parts[1].astype(str).str.zfill(2)
-        year = parts[2].astype(str)
-
-        df[out_col] = (day + "/" + mon + "/" + year).values
-        return df
+        invalid = df.loc[parsed.invalid].copy()
+        df = df.loc[~parsed.invalid].copy()
+        df[out_col] = dates.loc[df.index]
+        return df, invalid
 
     @staticmethod
     def _result_view(df: pd.DataFrame, columns_map: dict[str, str]) -> pd.DataFrame:
@@ -132,6 +138,23 @@ class HaulDbBuilder:
             subset=["Idlance"], keep="first"
         ).reset_index(drop=True)
 
+        df, self.invalid_dia = self._clean(
+            df, columns_map, start_long, start_lat, end_long, end_lat, out_lon, out_lat
+        )
+        return df
+
+    def _clean(
+        self,
+        df: pd.DataFrame,
+        columns_map: dict[str, str],
+        start_long: str,
+        start_lat: str,
+        end_long: str,
+        end_lat: str,
+        out_lon: str,
+        out_lat: str,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Steps 1-7 on already de-duplicated rows; returns (clean, invalid_dia)."""
         # 1) only keep rows with at least one long and one lat
         df = self.keep_rows_with_any_lon_lat(
             df,
@@ -143,8 +166,11 @@ class HaulDbBuilder:
             df, start_long, start_lat, end_long, end_lat, out_lon, out_lat
         )
 
-        # 3) select columns and correct hauls
-        df = df[["Idlance", "dia", "lon", "lat", "PROFMax", "PROFMin"]]
+        # 3) select columns (plus raw ones columns_map passes through) and
+        #    correct hauls
+        keep = ["Idlance", "dia", "lon", "lat", "PROFMax", "PROFMin"]
+        keep += [c for c in columns_map.values() if c in df.columns and c not in keep]
+        df = df[keep]
 
         # 4) Remove and correct hauls
         df = self._correct_hauls(df)
@@ -153,10 +179,117 @@ class HaulDbBuilder:
         df["depth"] = df[["PROFMax", "PROFMin"]].max(axis=1)
         df = df.loc[~df["depth"].isna()]
 
-        # 6) Sanitize `dia` into dd/mm/YYYY, drop invalid
-        df = self._sanitize_dia(df)
+        # 6) Parse `dia` into typed dates, drop (and keep aside) invalid rows
+        df, invalid_dia = self._sanitize_dia(df)
 
         # 7) Return a view of final dataframe with selected columns
-        df = self._result_view(df, columns_map)
+        return self._result_view(df, columns_map), invalid_dia
 
-        return df
+    # --- streaming mode: bounded memory over multi-GB exports ---
+    @staticmethod
+    def _drop_seen(df: pd.DataFrame, seen: set, key: str = "Idlance") -> pd.DataFrame:
+        """
+        Keep the first occurrence of each key across chunks: duplicates within
+        the chunk, then keys already in seen, are dropped. seen is updated in
+        place, so each chunk costs O(len(chunk)) whatever has been kept so far.
+        """
+        ids = df[key]
+        first = ~ids.duplicated(keep="first")
+        candidates = ids[first].astype(object).where(ids[first].notna(), None)
+        new = np.fromiter(
+            (i not in seen for i in candidates), dtype=bool, count=len(candidates)
+        )
+        seen.update(candidates[new])
+        first[candidates.index[~new]] = False
+        return df.loc[first]
+
+    @staticmethod
+    def _ids_as_text(ids: pd.Series) -> pd.Series:
+        """haul ids as text, matching Idlance as read by stream_csv (12.0 -> "12")."""
+        if pd.api.types.is_float_dtype(ids) and (ids.dropna() % 1 == 0).all():
+            ids = ids.astype("Int64")
+        return ids.astype(str)
+
+    @classmethod
+    def stream_csv(
+        cls,
+        source: Path,
+        out_path: Path,
+        to_fix_hauls: pd.DataFrame,
+        columns_map: dict[str, str],
+        *,
+        chunksize: int = 250_000,
+        encoding: str = "latin-1",
+        invalid_path: Optional[Path] = None,
+        read_csv_kwargs: Optional[dict[str, Any]] = None,
+        start_long: str = "LON inicio",
+        start_lat: str = "LAT inicio",
+        end_long: str = "LON final",
+        end_lat: str = "LAT final",
+        out_lon: str = "lon",
+        out_lat: str = "lat",
+    ) -> StreamSummary:
+        """
+        Same pipeline as run(), applied chunk by chunk to a CSV export:
+          - only the columns the pipeline or columns_map use are parsed (C
+            engine, usecols)
+          - Idlance is read as text, so chunks whose ids pandas would infer
+            as int and as object still compare equal; to_fix_hauls haul_id is
+            matched as text too
+          - duplicates on Idlance are dropped within each chunk and against a
+            set of the Idlance values kept so far (first occurrence wins, as
+            in run())
+          - clean rows (and, optionally, invalid `dia` rows) are appended to
+            out_path / invalid_path as each chunk finishes
+        Memory is bounded by chunksize plus the set of seen Idlance values.
+        """
+        if chunksize <= 0:
+            raise ValueError("chunksize must be positive.")
+        kwargs = {"encoding": encoding, "engine": "c"}
+        kwargs.update(read_csv_kwargs or {})
+        usecols = [*_PIPELINE_COLUMNS, start_long, start_lat, end_long, end_lat]
+        header = pd.read_csv(source, nrows=0, **kwargs).columns
+        usecols += [c for c in columns_map.values() if c in header and c not in usecols]
+        kwargs.setdefault("usecols", usecols)
+        kwargs["dtype"] = {"Idlance": str, **(kwargs.get("dtype") or {})}
+
+        to_fix = to_fix_hauls.assign(haul_id=cls._ids_as_text(to_fix_hauls["haul_id"]))
+        builder = cls(pd.DataFrame(), to_fix)
+        seen: set = set()
+        rows_in = rows_out = duplicates = invalid = 0
+        first = True
+        for chunk in pd.read_csv(source, chunksize=chunksize, **kwargs):
+            rows_in += len(chunk)
+            unique = cls._drop_seen(chunk, seen)
+            duplicates += len(chunk) - len(unique)
+
+            clean, bad = builder._clean(
+                unique,
+                columns_map,
+                start_long,
+                start_lat,
+                end_long,
+                end_lat,
+                out_lon,
+                out_lat,
+            )
+            clean.to_csv(
+                out_path, mode="w" if first else "a", header=first, index=False
+            )
+            if invalid_path is not None:
+                bad.to_csv(
+                    invalid_path, mode="w" if first else "a", header=first, index=False
+                )
+            rows_out += len(clean)
+            invalid += len(bad)
+            first = False
+
+        if first:  # empty source: still leave a header-only output
+            cols = list(columns_map)
+            pd.DataFrame(columns=cols).to_csv(out_path, index=False)
+        return StreamSummary(
+            rows_in=rows_in,
+            rows_out=rows_out,
+            duplicates=duplicates,
+            invalid_dia=invalid,
+        )
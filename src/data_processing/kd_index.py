@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import math
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 from scipy.spatial import cKDTree
 
 from src.data_processing.tile_catalog import TileCatalog
 
+# CSR neighbor arrays: (offsets, tile_ids, distances).
+# Neighbors of query q are tile_ids[offsets[q]:offsets[q + 1]], sorted by distance.
+Neighbors = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
 
 class KDIndex:
     """KD-tree over sea cell centers for nearest-tile lookup."""
@@ -25,20 +29,108 @@ class KDIndex:
         coords = np.column_stack([x, y])
         self._tree = cKDTree(coords)
 
-    def query_many(
-        self, lons: np.ndarray, lats: np.ndarray, tolerance_deg: Optional[float] = None
-    ) -> np.ndarray:
-        """Returns nearest sea tile_id for each lon/lat; -1 when outside tolerance."""
+    def _project(self, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        """Validates inputs and returns (N, 2) query points in the index metric."""
         lons = np.asarray(lons, dtype=np.float64)
         lats = np.asarray(lats, dtype=np.float64)
         if lons.size != lats.size:
             raise ValueError("lons and lats must have the same length.")
-        if lons.size == 0:
+        x = lons.ravel() * math.cos(math.radians(self.lat0))
+        return np.column_stack([x, lats.ravel()])
+
+    def query_many(
+        self,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        tolerance_deg: Optional[float] = None,
+        workers: int = -1,
+    ) -> np.ndarray:
+        """
+        Returns nearest sea tile_id for each lon/lat; -1 when outside tolerance.
+        workers is cKDTree's thread count: -1 uses every core, pass 1 inside
+        process pools so workers do not oversubscribe the CPUs.
+        """
+        points = self._project(lons, lats)
+        if points.shape[0] == 0:
             return np.empty((0,), dtype=np.int64)
 
-        x = lons * math.cos(math.radians(self.lat0))
-        y = lats
-        dist, idx = self._tree.query(np.column_stack([x, y]), workers=-1)
+        dist, idx = self._tree.query(points, workers=workers)
         if tolerance_deg is not None:
             idx = np.where(dist <= float(tolerance_deg), idx, -1)
         return idx.astype(np.int64, copy=False)
+
+    def query_knn(
+        self,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        k: int,
+        tolerance_deg: Optional[float] = None,
+        workers: int = -1,
+    ) -> Neighbors:
+        """
+        Returns the k nearest sea tiles per lon/lat as CSR arrays.
+        Neighbors beyond tolerance_deg (or beyond the number of sea tiles) are
+        dropped, so rows may hold fewer than k entries; a neighbor exactly at
+        tolerance_deg is kept, as in query_many.
+        """
+        if k < 1:
+            raise ValueError("k must be >= 1.")
+        points = self._project(lons, lats)
+        if points.shape[0] == 0:
+            return self._empty_neighbors(0)
+
+        # cKDTree's bound is strict (<): one ulp up makes it <= tolerance_deg.
+        upper = (
+            np.inf
+            if tolerance_deg is None
+            else np.nextafter(float(tolerance_deg), np.inf)
+        )
+        # A sequence for k keeps the (N, k) shape even when k == 1.
+        dist, idx = self._tree.query(
+            points,
+            k=np.arange(1, int(k) + 1),
+            distance_upper_bound=upper,
+            workers=workers,
+        )
+        # Missing neighbors come back as dist=inf, idx=n (tree size).
+        found = np.isfinite(dist)
+        offsets = np.zeros(points.shape[0] + 1, dtype=np.int64)
+        np.cumsum(found.sum(axis=1), out=offsets[1:])
+        return offsets, idx[found].astype(np.int64, copy=False), dist[found]
+
+    def query_radius(
+        self, lons: np.ndarray, lats: np.ndarray, radius_deg: float
+    ) -> Neighbors:
+        """
+        Returns every sea tile within radius_deg (index metric) per lon/lat as CSR
+        arrays, each row sorted by distance.
+        """
+        if radius_deg < 0:
+            raise ValueError("radius_deg must be non-negative.")
+        points = self._project(lons, lats)
+        n = points.shape[0]
+        if n == 0:
+            return self._empty_neighbors(0)
+
+        # Sparse distance matrix between a query tree and the sea tree yields COO
+        # (query, tile, distance) triplets without building per-point Python lists.
+        query_tree = cKDTree(points)
+        coo = query_tree.sparse_distance_matrix(
+            self._tree, float(radius_deg), output_type="ndarray"
+        )
+        rows = coo["i"].astype(np.int64, copy=False)
+        cols = coo["j"].astype(np.int64, copy=False)
+        dist = coo["v"].astype(np.float64, copy=False)
+
+        order = np.lexsort((cols, dist, rows))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+        return offsets, cols[order], dist[order]
+
+    @staticmethod
+    def _empty_neighbors(n: int) -> Neighbors:
+        return (
+            np.zeros(n + 1, dtype=np.int64),
+            np.empty((0,), dtype=np.int64),
+            np.empty((0,), dtype=np.float64),
+        )
@@ -11,6 +11,7 @@ import xarray as xr
 
 from src.data_processing.dataset_tile_frame_extractor import DatasetTileFrameExtractor
 from src.data_processing.tile_catalog import TileCatalog
+from src.memory import measure_memory
 
 
 class NcToCsvConverter:
@@ -63,7 +64,9 @@ class NcToCsvConverter:
                 catalog.grid.validate(ds)
                 assert extractor is not None
 
-            df = extractor.to_frame_multi(ds, var_names=self._var_names)
+            with measure_memory("file", nc_path.name, bbox_id=self._bbox_id) as mem:
+                df = extractor.to_frame_multi(ds, var_names=self._var_names)
+                mem["rows"] = 0 if df is None else len(df)
             if df is None or df.empty:
                 raise ValueError(f"Extractor returned empty DataFrame for: {nc_path}")
 
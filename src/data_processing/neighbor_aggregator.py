@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.data_processing.kd_index import Neighbors
+
+WEIGHTINGS = ("uniform", "inverse_distance")
+
+
+class NeighborAggregator:
+    """
+    Weighted mean of a per-tile value vector over CSR neighborhoods produced by
+    KDIndex.query_knn / KDIndex.query_radius.
+
+    Rules:
+      - values is indexed by tile_id (length K, sea tiles only).
+      - Non-finite values are skipped; their weight is dropped from the row.
+      - Rows with no (finite) neighbors yield NaN.
+      - inverse_distance uses w = 1 / max(d, eps) ** power, so an exact hit dominates.
+    """
+
+    def __init__(
+        self,
+        weighting: str = "inverse_distance",
+        power: float = 1.0,
+        eps: float = 1e-12,
+    ) -> None:
+        if weighting not in WEIGHTINGS:
+            raise ValueError(
+                f"weighting must be one of {WEIGHTINGS}, got {weighting!r}."
+            )
+        if eps <= 0:
+            raise ValueError("eps must be positive.")
+        self.weighting = weighting
+        self.power = float(power)
+        self.eps = float(eps)
+
+    def weights(self, distances: np.ndarray) -> np.ndarray:
+        """Returns the raw (unnormalized) weight of each CSR entry."""
+        distances = np.asarray(distances, dtype=np.float64)
+        if self.weighting == "uniform":
+            return np.ones_like(distances)
+        return 1.0 / np.power(np.maximum(distances, self.eps), self.power)
+
+    def aggregate(self, values: np.ndarray, neighbors: Neighbors) -> np.ndarray:
+        """Returns one aggregated value per query row (float64, NaN when empty)."""
+        offsets, tile_ids, distances = neighbors
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 1:
+            raise ValueError("values must be a 1-D per-tile vector.")
+        if tile_ids.size and int(tile_ids.max()) >= values.size:
+            raise IndexError("tile_ids reference tiles beyond the values vector.")
+
+        n = offsets.size - 1
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        vals = values[tile_ids]
+        w = self.weights(distances)
+
+        ok = np.isfinite(vals)
+        w = np.where(ok, w, 0.0)
+        vals = np.where(ok, vals, 0.0)
+
+        num = np.bincount(rows, weights=w * vals, minlength=n)
+        den = np.bincount(rows, weights=w, minlength=n)
+        out = np.full(n, np.nan, dtype=np.float64)
+        np.divide(num, den, out=out, where=den > 0)
+        return out
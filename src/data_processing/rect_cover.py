@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.data_processing.tile_catalog import TileCatalog
+
+
+@dataclass(frozen=True)
+class CoverCostModel:
+    """
+    cost = request_cost * n_requests + cell_cost * downloaded_cells
+
+    request_cost is expressed in "cells": a request is worth paying for only if
+    it saves more than request_cost / cell_cost wasted (land or inactive) cells.
+    max_cells optionally caps a single request (API size limits).
+    """
+
+    request_cost: float
+    cell_cost: float = 1.0
+    max_cells: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.request_cost < 0 or self.cell_cost < 0:
+            raise ValueError("Costs must be non-negative.")
+        if self.max_cells is not None and self.max_cells < 1:
+            raise ValueError("max_cells must be >= 1.")
+
+    def cost(self, n_requests: int, cells: int) -> float:
+        return self.request_cost * n_requests + self.cell_cost * cells
+
+
+@dataclass(frozen=True)
+class CellRect:
+    """Grid rectangle in (j, i) indices, half-open: rows j0..j1-1, cols i0..i1-1."""
+
+    j0: int
+    j1: int
+    i0: int
+    i1: int
+    active: int  # requested sea cells inside the rectangle
+
+    @property
+    def cells(self) -> int:
+        return (self.j1 - self.j0) * (self.i1 - self.i0)
+
+
+@dataclass(frozen=True)
+class SubsetRequest:
+    """Arguments of one CMSubsetClient.subset_one call."""
+
+    bbox: Tuple[float, float, float, float]  # (min_lon, max_lon, min_lat, max_lat)
+    output_filename: str
+    start_datetime: Optional[str] = None
+    end_datetime: Optional[str] = None
+
+    def kwargs(self, output_directory: Any) -> dict:
+        """Ready for client.subset_one(**request.kwargs(out_dir))."""
+        return {
+            "bbox": self.bbox,
+            "output_filename": self.output_filename,
+            "output_directory": output_directory,
+            "start_datetime": self.start_datetime,
+            "end_datetime": self.end_datetime,
+        }
+
+
+@dataclass(frozen=True)
+class CoverPlan:
+    rects: List[CellRect]
+    active_cells: int
+    cost: float
+
+    @property
+    def num_requests(self) -> int:
+        return len(self.rects)
+
+    @property
+    def downloaded_cells(self) -> int:
+        return sum(r.cells for r in self.rects)
+
+    @property
+    def wasted_cells(self) -> int:
+        return self.downloaded_cells - self.active_cells
+
+
+class RectangleCover:
+    """
+    Covers a set of sea tiles (TileCatalog ids) with few axis-aligned grid
+    rectangles, trading wasted cells against request count.
+
+    Greedy guillotine partition: starting from the tight box around the active
+    cells, each box is cut along the row or column that minimizes the cost of
+    the two resulting tight boxes, and the cut is kept only if the subtree is
+    cheaper than downloading the box whole. A box is never cut when even a
+    perfect cover of it (one extra request, zero waste) could not beat it, so
+    dense areas stop early. Each cut costs O(box cells) with prefix min/max over
+    per-row and per-column extents; the tree is walked without recursion.
+    """
+
+    def __init__(self, catalog: TileCatalog, cost_model: CoverCostModel) -> None:
+        self.catalog = catalog
+        self.cost_model = cost_model
+
+    def plan(self, tile_ids: np.ndarray) -> CoverPlan:
+        tile_ids = np.unique(np.asarray(tile_ids, dtype=np.int64))
+        if tile_ids.size == 0:
+            return CoverPlan(rects=[], active_cells=0, cost=0.0)
+        jj, ii = self.catalog.sea_cell_ids_many(tile_ids)
+        jj = jj.astype(np.int64)
+        ii = ii.astype(np.int64)
+        j_lo, i_lo = int(jj.min()), int(ii.min())
+        mask = np.zeros((int(jj.max()) - j_lo + 1, int(ii.max()) - i_lo + 1), bool)
+        mask[jj - j_lo, ii - i_lo] = True
+
+        rects = self._cover(mask)
+        rects = [
+            CellRect(r.j0 + j_lo, r.j1 + j_lo, r.i0 + i_lo, r.i1 + i_lo, r.active)
+            for r in rects
+        ]
+        rects.sort(key=lambda r: (r.j0, r.i0))
+        cost = self.cost_model.cost(len(rects), sum(r.cells for r in rects))
+        return CoverPlan(rects=rects, active_cells=int(tile_ids.size), cost=cost)
+
+    def requests(
+        self,
+        tile_ids: np.ndarray,
+        *,
+        start_datetime: Optional[str] = None,
+        end_datetime: Optional[str] = None,
+        prefix: str = "cover",
+    ) -> List[SubsetRequest]:
+        """Plan the cover and express each rectangle as a subset_one request."""
+        window = "_".join(d for d in (start_datetime, end_datetime) if d)
+        out = []
+        for r in self.plan(tile_ids).rects:
+            name = f"{prefix}_j{r.j0}-{r.j1 - 1}_i{r.i0}-{r.i1 - 1}"
+            out.append(
+                SubsetRequest(
+                    bbox=self.rect_bbox(r),
+                    output_filename=f"{name}_{window}.nc" if window else f"{name}.nc",
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                )
+            )
+        return out
+
+    def rect_bbox(self, rect: CellRect) -> Tuple[float, float, float, float]:
+        """
+        (min_lon, max_lon, min_lat, max_lat) spanning the rectangle's cell
+        centers, padded by a quarter step so rounding never drops an edge cell
+        nor pulls in a neighbor.
+        """
+        lons = self.catalog.grid.lons
+        lats = self.catalog.grid.lats
+        lon_a, lon_b = float(lons[rect.i0]), float(lons[rect.i1 - 1])
+        lat_a, lat_b = float(lats[rect.j0]), float(lats[rect.j1 - 1])
+        pad_lon = 0.25 * float(np.min(np.abs(np.diff(lons)))) if lons.size > 1 else 0.0
+        pad_lat = 0.25 * float(np.min(np.abs(np.diff(lats)))) if lats.size > 1 else 0.0
+        return (
+            min(lon_a, lon_b) - pad_lon,
+            max(lon_a, lon_b) + pad_lon,
+            min(lat_a, lat_b) - pad_lat,
+            max(lat_a, lat_b) + pad_lat,
+        )
+
+    # -------------------- partition --------------------
+
+    def _cover(self, mask: np.ndarray) -> List[CellRect]:
+        model = self.cost_model
+        root = CellRect(0, mask.shape[0], 0, mask.shape[1], int(mask.sum()))
+        # Pre-order node list: children always come after their parent.
+        nodes: List[CellRect] = [root]
+        children: List[Optional[Tuple[int, int]]] = [None]
+        stack = [0]
+        while stack:
+            k = stack.pop()
+            split = self._best_split(mask, nodes[k])
+            if split is None:
+                continue
+            children[k] = (len(nodes), len(nodes) + 1)
+            for child in split:
+                stack.append(len(nodes))
+                nodes.append(child)
+                children.append(None)
+
+        # Bottom-up: keep a cut only where the subtree is cheaper.
+        best = np.zeros(len(nodes))
+        keep_whole = np.ones(len(nodes), dtype=bool)
+        for k in range(len(nodes) - 1, -1, -1):
+            whole = model.cost(1, nodes[k].cells)
+            if children[k] is None:
+                best[k] = whole
+                continue
+            a, b = children[k]
+            split_cost = best[a] + best[b]
+            too_big = model.max_cells is not None and nodes[k].cells > model.max_cells
+            if split_cost < whole or too_big:
+                best[k], keep_whole[k] = split_cost, False
+            else:
+                best[k] = whole
+
+        out: List[CellRect] = []
+        stack = [0]
+        while stack:
+            k = stack.pop()
+            if keep_whole[k]:
+                out.append(nodes[k])
+            else:
+                stack.extend(children[k])
+        return out
+
+    def _best_split(
+        self, mask: np.ndarray, rect: CellRect
+    ) -> Optional[Tuple[CellRect, CellRect]]:
+        model = self.cost_model
+        too_big = model.max_cells is not None and rect.cells > model.max_cells
+        if rect.cells == 1 or (rect.active == rect.cells and not too_big):
+            return None
+        # Even a waste-free two-request cover cannot beat the box as it is.
+        if not too_big and model.cost(2, rect.active) >= model.cost(1, rect.cells):
+            return None
+
+        sub = mask[rect.j0 : rect.j1, rect.i0 : rect.i1]
+        row_cut = self._axis_cuts(sub)
+        col_cut = self._axis_cuts(sub.T)
+        if row_cut is None and col_cut is None:
+            return None
+        cells, axis_is_col, (lo_box, hi_box) = min(
+            (c[0], n, c[1]) for n, c in enumerate((row_cut, col_cut)) if c is not None
+        )
+        boxes = []
+        for a0, a1, b0, b1 in (lo_box, hi_box):
+            if axis_is_col:  # boxes came from sub.T: (i range, j range)
+                a0, a1, b0, b1 = b0, b1, a0, a1
+            j0, j1 = rect.j0 + a0, rect.j0 + a1
+            i0, i1 = rect.i0 + b0, rect.i0 + b1
+            active = int(mask[j0:j1, i0:i1].sum())
+            boxes.append(CellRect(j0, j1, i0, i1, active))
+        return boxes[0], boxes[1]
+
+    @staticmethod
+    def _axis_cuts(sub: np.ndarray):
+        """
+        Best cut between consecutive rows of a tight boolean box: returns
+        (total cells of the two tight halves, (box_lo, box_hi)) with boxes as
+        half-open (row0, row1, col0, col1), or None for a single row.
+        """
+        h, w = sub.shape
+        if h < 2:
+            return None
+        has = sub.any(axis=1)
+        first = np.where(has, sub.argmax(axis=1), w)
+        last = np.where(has, w - 1 - sub[:, ::-1].argmax(axis=1), -1)
+        rows = np.arange(h)
+
+        # Top half = rows 0..k, bottom half = rows k+1..h-1 (k = 0..h-2).
+        top_last_row = np.maximum.accumulate(np.where(has, rows, -1))[:-1]
+        top_c0 = np.minimum.accumulate(first)[:-1]
+        top_c1 = np.maximum.accumulate(last)[:-1]
+        bot_first_row = np.minimum.accumulate(np.where(has, rows, h)[::-1])[::-1][1:]
+        bot_c0 = np.minimum.accumulate(first[::-1])[::-1][1:]
+        bot_c1 = np.maximum.accumulate(last[::-1])[::-1][1:]
+
+        top_cells = (top_last_row + 1) * (top_c1 - top_c0 + 1)
+        bot_cells = (h - bot_first_row) * (bot_c1 - bot_c0 + 1)
+        total = top_cells + bot_cells
+        # Among equally good cuts take the most central one (balanced tree).
+        ties = np.flatnonzero(total == total.min())
+        k = int(ties[np.argmin(np.abs(2 * ties - (h - 2)))])
+        box_lo = (0, int(top_last_row[k]) + 1, int(top_c0[k]), int(top_c1[k]) + 1)
+        box_hi = (int(bot_first_row[k]), h, int(bot_c0[k]), int(bot_c1[k]) + 1)
+        return int(total[k]), (box_lo, box_hi)
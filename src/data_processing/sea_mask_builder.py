@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import re
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import numpy as np
-import xarray as xr
+
+from src.bounding_box.bounding_box import BoundingBox
+
+if TYPE_CHECKING:
+    import xarray as xr
 
 
 class SeaMaskBuilder:
@@ -12,7 +16,8 @@ class SeaMaskBuilder:
     Build a 2-D boolean sea mask from an in-memory static dataset (xarray.Dataset).
 
     Assumptions & rules (fail fast):
-      - Spatial dims are ALWAYS named ("latitude", "longitude"). If not present → KeyError.
+      - Spatial dims are named lat_name/lon_name ("latitude", "longitude" by
+        default). If not present → KeyError.
       - If a "time" dimension exists, we select t=0.
       - If a "depth" dimension exists, we select depth=0 (no other depth aliases).
       - For bitwise masks (is_bit=True):
@@ -25,14 +30,26 @@ class SeaMaskBuilder:
           * No missing handling is applied; equality test is used directly.
 
     Output: np.ndarray[bool] with shape (latitude, longitude), True for sea.
+
+    build_lazy() applies the same rules to a lazily opened dataset: only the mask
+    variable's first time/depth plane is read, optionally restricted to a region,
+    in row chunks classified straight into the output (bool or np.packbits rows).
     """
 
     def __init__(
-        self, *, mask_name: str, is_bit: bool, sea_value: Optional[int] = None
+        self,
+        *,
+        mask_name: str,
+        is_bit: bool,
+        sea_value: Optional[int] = None,
+        lat_name: str = "latitude",
+        lon_name: str = "longitude",
     ) -> None:
         self.mask_name = mask_name
         self.is_bit = bool(is_bit)
         self.sea_value = sea_value
+        self.lat_name = lat_name
+        self.lon_name = lon_name
 
     # ---------------- Public API ----------------
 
@@ -45,25 +62,94 @@ class SeaMaskBuilder:
         if arr.ndim != 2:
             raise ValueError("Mask must be 2-D after reduction and transpose.")
 
-        if self.is_bit:
-            if self.sea_value is None:
-                raise KeyError("sea_value must be provided when is_bit=True.")
-            sea = self._bitmask_classify(da2d, int(self.sea_value))
+        # Reads the plane once; the same classifier drives the chunked path.
+        return self._chunk_classifier(da2d)(arr)
+
+    def build_lazy(
+        self,
+        ds: xr.Dataset,
+        *,
+        region: Optional[BoundingBox] = None,
+        chunk_rows: int = 256,
+        packed: bool = False,
+    ) -> np.ndarray:
+        """
+        Chunked variant of build() for lazily opened datasets (xr.open_dataset).
+        Reads rows [r0, r1) of the reduced mask plane at a time, so peak memory is
+        bounded by the output plus one chunk. With packed=True the result is
+        np.packbits(sea, axis=1) with shape (ny, ceil(nx / 8)).
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be >= 1.")
+        da = self._select_mask_var(ds, self.mask_name)
+        da2d = self._transpose_to_lat_lon(self._reduce_to_2d(da))
+        if da2d.ndim != 2:
+            raise ValueError("Mask must be 2-D after reduction and transpose.")
+        if region is not None:
+            lat_slice, lon_slice = self.region_slices(ds, region)
+            da2d = da2d.isel({self.lat_name: lat_slice, self.lon_name: lon_slice})
+
+        classify = self._chunk_classifier(da2d)
+        ny, nx = da2d.shape
+        if packed:
+            out = np.zeros((ny, (nx + 7) // 8), dtype=np.uint8)
         else:
-            sea_val = self.sea_value
-            if sea_val is None:
-                sea_val = self._infer_sea_value_from_long_name(
-                    da2d
-                )  # may raise KeyError
-            sea = arr == int(sea_val)
-        return sea
+            out = np.zeros((ny, nx), dtype=bool)
+
+        for r0 in range(0, ny, chunk_rows):
+            r1 = min(r0 + chunk_rows, ny)
+            block = np.asarray(da2d.isel({self.lat_name: slice(r0, r1)}).values)
+            sea = classify(block)
+            out[r0:r1] = np.packbits(sea, axis=1) if packed else sea
+        return out
+
+    @staticmethod
+    def unpack(packed: np.ndarray, nx: int) -> np.ndarray:
+        """Inverse of build_lazy(packed=True): returns the (ny, nx) bool mask."""
+        return np.unpackbits(packed, axis=1, count=int(nx)).astype(bool, copy=False)
+
+    def region_slices(self, ds: xr.Dataset, region: BoundingBox) -> Tuple[slice, slice]:
+        """Index slices (lat, lon) covering cell centers inside region."""
+        return (
+            self._coord_slice(ds, self.lat_name, region.min_lat, region.max_lat),
+            self._coord_slice(ds, self.lon_name, region.min_lon, region.max_lon),
+        )
 
     # ---------------- Helpers ----------------
 
+    @staticmethod
+    def _coord_slice(ds: xr.Dataset, name: str, lo: float, hi: float) -> slice:
+        if name not in ds.coords:
+            raise KeyError(f"Required coordinate '{name}' not found in dataset.")
+        values = np.asarray(ds[name].values)
+        idx = np.flatnonzero((values >= lo) & (values <= hi))
+        if idx.size == 0:
+            raise ValueError(f"Region [{lo}, {hi}] selects no '{name}' cells.")
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+
+    def _chunk_classifier(self, da: xr.DataArray):
+        """Returns a block -> bool sea classifier bound to this builder's rules."""
+        if self.is_bit:
+            if self.sea_value is None:
+                raise KeyError("sea_value must be provided when is_bit=True.")
+            sea_bit = int(self.sea_value)
+            if sea_bit <= 0:
+                raise ValueError("sea_bit must be a positive integer (e.g., 1).")
+            fv = da.attrs.get("_FillValue")
+            return lambda block: self._classify_bits(block, sea_bit, fv)
+
+        sea_val = self.sea_value
+        if sea_val is None:
+            sea_val = self._infer_sea_value_from_long_name(da)  # may raise KeyError
+        sea_val = int(sea_val)
+        return lambda block: block == sea_val
+
     @staticmethod
     def _select_mask_var(ds: xr.Dataset, name: str) -> xr.DataArray:
         if name not in ds:
             raise KeyError(f"Mask variable '{name}' not found in dataset.")
+        import xarray as xr
+
         da = ds[name]
         if not isinstance(da, xr.DataArray):
             raise TypeError(f"Dataset variable '{name}' is not a DataArray.")
@@ -79,35 +165,27 @@ class SeaMaskBuilder:
         da = da.squeeze(drop=True)
         return da
 
-    @staticmethod
-    def _transpose_to_lat_lon(da: xr.DataArray) -> xr.DataArray:
+    def _transpose_to_lat_lon(self, da: xr.DataArray) -> xr.DataArray:
         dims = set(da.dims)
-        if "latitude" not in dims or "longitude" not in dims:
+        if self.lat_name not in dims or self.lon_name not in dims:
             raise KeyError(
-                f"Required dims ('latitude','longitude') not found in {tuple(da.dims)}."
+                f"Required dims ({self.lat_name!r}, {self.lon_name!r}) "
+                f"not found in {tuple(da.dims)}."
             )
-        return da.transpose("latitude", "longitude")
+        return da.transpose(self.lat_name, self.lon_name)
 
     @staticmethod
-    def _bitmask_classify(da: xr.DataArray, sea_bit: int) -> np.ndarray:
-        if sea_bit <= 0:
-            raise ValueError("sea_bit must be a positive integer (e.g., 1).")
-        arr = np.asarray(da.values)
-        # Build a missing mask ONLY for bitwise path (NaN/Inf + _FillValue)
-        is_missing = np.zeros(arr.shape, dtype=bool)
+    def _classify_bits(arr: np.ndarray, sea_bit: int, fill_value) -> np.ndarray:
+        # Valid cells ONLY for bitwise path (not NaN/Inf and not _FillValue)
         if np.issubdtype(arr.dtype, np.floating):
-            is_missing |= ~np.isfinite(arr)
-        fv = da.attrs.get("_FillValue")
-        if fv is not None:
-            is_missing |= arr == fv
-        # Neutralize missing and safely bit-and
-        safe = np.array(arr, copy=True)
-        safe[is_missing] = 0
-        uint = safe.astype(np.uint16, copy=False)
-        sea = (uint & sea_bit) != 0
-        # Explicitly mark missing as not-sea (redundant but explicit)
-        sea[is_missing] = False
-        return sea
+            valid = np.isfinite(arr)
+        else:
+            valid = np.ones(arr.shape, dtype=bool)
+        if fill_value is not None:
+            valid &= arr != fill_value
+        # Neutralize missing and safely bit-and; missing cells are never sea
+        safe = np.where(valid, arr, 0).astype(np.uint16, copy=False)
+        return ((safe & sea_bit) != 0) & valid
 
     @staticmethod
     def _infer_sea_value_from_long_name(da: xr.DataArray) -> int:
@@ -1,12 +1,33 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import numpy as np
-import xarray as xr
 
 from src.data_processing.grid_spec import GridSpec
 
+if TYPE_CHECKING:
+    import xarray as xr
+
+TILE_ID_DTYPE = np.int32
+_ARRAY_NAMES = (
+    "sea_land_mask",
+    "tile_id_map",
+    "sea_j",
+    "sea_i",
+    "sea_lon",
+    "sea_lat",
+    "sea_flat_idx",
+)
+_META_FILENAME = "catalog.json"
+
+
+def _index_dtype(n: int) -> np.dtype:
+    """Smallest signed dtype able to hold indices 0..n-1 (int16 or int32)."""
+    return np.dtype(np.int16 if n <= np.iinfo(np.int16).max else np.int32)
+
 
 class TileCatalog:
     """Stable tile IDs on a fixed grid (sea cells only)."""
@@ -18,29 +39,38 @@ class TileCatalog:
         """
         if sea_land_mask.shape != (grid.ny, grid.nx):
             raise ValueError("sea_land_mask shape must be (ny, nx).")
+        if grid.ny * grid.nx > np.iinfo(TILE_ID_DTYPE).max:
+            raise ValueError("Grid too large for int32 tile IDs.")
         self.grid = grid
 
-        # Order sea_land_mask by rows and convert it to boo
-        self.sea_land_mask = sea_land_mask
+        # Order sea_land_mask by rows and convert it to bool
+        self.sea_land_mask = np.asarray(sea_land_mask, dtype=bool)
+        # Flat (row-major) position of every sea cell; tile_id == position in this array
+        self._sea_flat_idx = np.flatnonzero(self.sea_land_mask.ravel(order="C")).astype(
+            TILE_ID_DTYPE, copy=False
+        )
         # Build sea tile ID map
         self.tile_id_map, self._sea_j, self._sea_i = self.__build_sea_tile_id_map()
         # Build two separate arrays where each tile ID is mapped to (lon, lat)
         self._sea_lat = self.grid.lats[self._sea_j]
         self._sea_lon = self.grid.lons[self._sea_i]
+        self._sea_tile_ids: Optional[np.ndarray] = None
 
     def __build_sea_tile_id_map(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Returns array of sea tile IDs (0..K-1). tile_id_map"""
-        tile_id_map = np.full((self.grid.ny, self.grid.nx), -1, dtype=np.int64)
-        # get the index of sea cells only
-        sea_flat_idx = np.flatnonzero(self.sea_land_mask.ravel(order="C"))
+        """Returns array of sea tile IDs (0..K-1) plus compact (j, i) sea indices."""
+        tile_id_map = np.full((self.grid.ny, self.grid.nx), -1, dtype=TILE_ID_DTYPE)
         # Flatten the tile_id_map and assign the sea tile IDs in ascending order
-        tile_id_map.ravel(order="C")[sea_flat_idx] = np.arange(
-            sea_flat_idx.size, dtype=np.int64
+        tile_id_map.ravel(order="C")[self._sea_flat_idx] = np.arange(
+            self._sea_flat_idx.size, dtype=TILE_ID_DTYPE
         )
 
-        # It gets the index of sea cells only and splits into two separate j, i dimensions.
-        jj, ii = np.nonzero(self.sea_land_mask)
-        return tile_id_map, jj, ii
+        # Split the flat sea index into separate j, i dimensions.
+        jj, ii = np.divmod(self._sea_flat_idx, TILE_ID_DTYPE(self.grid.nx))
+        return (
+            tile_id_map,
+            jj.astype(_index_dtype(self.grid.ny), copy=False),
+            ii.astype(_index_dtype(self.grid.nx), copy=False),
+        )
 
     @classmethod
     def from_dataset(
@@ -49,19 +79,119 @@ class TileCatalog:
         grid = GridSpec.from_dataset(ds)
         return cls(grid=grid, sea_land_mask=mask)
 
+    # -------------------- persistence --------------------
+
+    def save(self, directory: Path) -> Path:
+        """
+        Writes the catalog arrays as .npy files plus a small JSON header so that
+        load(..., mmap=True) can share them read-only across worker processes.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "sea_land_mask": self.sea_land_mask,
+            "tile_id_map": self.tile_id_map,
+            "sea_j": self._sea_j,
+            "sea_i": self._sea_i,
+            "sea_lon": self._sea_lon,
+            "sea_lat": self._sea_lat,
+            "sea_flat_idx": self._sea_flat_idx,
+            "lons": self.grid.lons,
+            "lats": self.grid.lats,
+        }
+        for name, arr in arrays.items():
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(arr))
+        meta = {
+            "lon_name": self.grid.lon_name,
+            "lat_name": self.grid.lat_name,
+            "grid_hash": self.grid.grid_hash,
+            "num_sea_tiles": int(self._sea_flat_idx.size),
+        }
+        (directory / _META_FILENAME).write_text(json.dumps(meta, indent=2))
+        return directory
+
+    @classmethod
+    def load(cls, directory: Path, *, mmap: bool = True) -> "TileCatalog":
+        """
+        Loads a catalog written by save(). With mmap=True arrays are memory-mapped
+        read-only, so every process maps the same pages instead of copying them.
+        """
+        directory = Path(directory)
+        meta_path = directory / _META_FILENAME
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Tile catalog not found: {meta_path}")
+        meta = json.loads(meta_path.read_text())
+        mode = "r" if mmap else None
+
+        def _load(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode=mode)
+
+        grid = GridSpec(
+            lon_name=meta["lon_name"],
+            lat_name=meta["lat_name"],
+            lons=_load("lons"),
+            lats=_load("lats"),
+            grid_hash=meta["grid_hash"],
+        )
+        has_flat = (directory / "sea_flat_idx.npy").exists()
+        names = [n for n in _ARRAY_NAMES if has_flat or n != "sea_flat_idx"]
+        arrays = {name: _load(name) for name in names}
+        if arrays["sea_j"].size != int(meta["num_sea_tiles"]):
+            raise ValueError(f"Corrupt tile catalog (sea tile count): {directory}")
+
+        catalog = cls.__new__(cls)
+        catalog.grid = grid
+        catalog.sea_land_mask = arrays["sea_land_mask"]
+        catalog.tile_id_map = arrays["tile_id_map"]
+        catalog._sea_j = arrays["sea_j"]
+        catalog._sea_i = arrays["sea_i"]
+        catalog._sea_lon = arrays["sea_lon"]
+        catalog._sea_lat = arrays["sea_lat"]
+        if has_flat:
+            catalog._sea_flat_idx = arrays["sea_flat_idx"]
+        else:  # catalogs saved before the flat index was persisted
+            j = catalog._sea_j.astype(TILE_ID_DTYPE)
+            i = catalog._sea_i.astype(TILE_ID_DTYPE)
+            catalog._sea_flat_idx = j * TILE_ID_DTYPE(grid.nx) + i
+        catalog._sea_tile_ids = None
+        return catalog
+
+    # -------------------- lookups --------------------
+
     def sea_cell_ids(self, tile_id: int) -> Tuple[int, int]:
         """Returns (j,i) indices for a tile ID that matches a sea tile."""
         if tile_id < 0 or tile_id >= self._sea_i.size:
             raise IndexError("tile_id out of range.")
         return int(self._sea_j[tile_id]), int(self._sea_i[tile_id])
 
+    def sea_cell_ids_many(self, tile_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized sea_cell_ids: returns (j, i) intp arrays for valid tile IDs,
+        safe for index arithmetic such as j * nx + i (storage may be int16).
+        """
+        tile_ids = np.asarray(tile_ids)
+        if tile_ids.size and (tile_ids.min() < 0 or tile_ids.max() >= self._sea_i.size):
+            raise IndexError("tile_id out of range.")
+        return (
+            self._sea_j[tile_ids].astype(np.intp, copy=False),
+            self._sea_i[tile_ids].astype(np.intp, copy=False),
+        )
+
     def sea_cell_coords(self, tile_id: int) -> Tuple[float, float]:
         """Returns (lon, lat) cell for a tile ID."""
         return float(self._sea_lon[tile_id]), float(self._sea_lat[tile_id])
 
     def sea_tile_ids(self) -> np.ndarray:
-        """Returns all sea tile IDs."""
-        return self.tile_id_map[self.tile_id_map >= 0]
+        """Returns all sea tile IDs (cached, read-only)."""
+        if self._sea_tile_ids is None:
+            ids = np.arange(self._sea_flat_idx.size, dtype=TILE_ID_DTYPE)
+            ids.flags.writeable = False
+            self._sea_tile_ids = ids
+        return self._sea_tile_ids
+
+    def sea_flat_index(self) -> np.ndarray:
+        """Returns the row-major flat grid position of each sea tile (tile_id order)."""
+        return self._sea_flat_idx
 
     def sea_tile_coords(self) -> Tuple[np.ndarray, np.ndarray]:
         """Returns all sea tile coordinates."""
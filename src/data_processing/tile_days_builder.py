@@ -2,8 +2,27 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
+from src.data_processing.date_normalizer import DateNormalizer
+
+
+def _sorted_unique(keys: np.ndarray) -> np.ndarray:
+    keys = np.sort(keys)
+    if keys.size:
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return keys
+
+
+@dataclass(frozen=True)
+class PairDiff:
+    count: int
+    examples: list[tuple]
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
 
 @dataclass(frozen=True)
 class ColumnConfig:
@@ -19,7 +38,8 @@ class TileDaysBuilder:
     Pure in-memory builder:
       per-day rows: tile_id, tile_lon_center, tile_lat_center, time, deepest_depth
 
-    - 'time' is parsed and floored to day; column name remains 'time'
+    - 'time' may be typed (datetime64) or raw strings; either way it becomes a
+      UTC day (midnight); column name remains 'time'
     - 'deepest_depth' = max depth across ALL hauls of the tile
     - fails fast if any dates are unparseable
     - asserts that (tile_id, time) pairs in output match those in enriched hauls
@@ -48,23 +68,15 @@ class TileDaysBuilder:
         if missing:
             raise KeyError(f"Missing required columns: {missing}")
 
-        # Parse & floor time (FAIL FAST if anything is unparseable)
-        t = pd.to_datetime(
-            enriched[cols.time],
-            errors="coerce",
-            utc=True,
-            dayfirst=self.dayfirst,
-        )
-        if t.isna().any():
-            bad = enriched.loc[t.isna(), cols.time].astype(str)
-            examples = bad.dropna().unique()[:10].tolist()
-            raise ValueError(
-                f"Unparseable dates in '{cols.time}': {t.isna().sum()} rows. "
-                f"Examples: {examples}"
-            )
+        # Typed dates pass straight through; strings are parsed once
+        # (FAIL FAST if anything is unparseable)
+        parsed = DateNormalizer(dayfirst=self.dayfirst).parse(enriched[cols.time])
+        parsed.raise_if_invalid(cols.time)
 
         enriched = enriched.copy()
-        enriched[cols.time] = t.dt.floor("D")
+        enriched[cols.time] = parsed.as_series(index=enriched.index).dt.tz_localize(
+            "UTC"
+        )
 
         # Compute per-tile deepest depth (Series indexed by tile_id)
         depth_num = pd.to_numeric(enriched[cols.depth], errors="coerce")
@@ -87,22 +99,50 @@ class TileDaysBuilder:
         per_day["deepest_depth"] = per_day[cols.tile_id].map(max_depth_per_tile)
 
         # Assert tile/date coverage matches enriched hauls exactly
-        expected_pairs = set(
-            map(tuple, enriched[[cols.tile_id, cols.time]].drop_duplicates().to_numpy())
-        )
-        actual_pairs = set(
-            map(tuple, per_day[[cols.tile_id, cols.time]].drop_duplicates().to_numpy())
+        missing, extra = self._pair_mismatch(
+            enriched[[cols.tile_id, cols.time]], per_day[[cols.tile_id, cols.time]]
         )
-
-        if expected_pairs != actual_pairs:
-            missing_pairs = list(expected_pairs - actual_pairs)[:10]
-            extra_pairs = list(actual_pairs - expected_pairs)[:10]
+        if missing or extra:
             raise AssertionError(
                 "Mismatch between haul tile/dates and tiles_with_date_db tile/dates. "
-                f"missing={len(expected_pairs - actual_pairs)} "
-                f"extra={len(actual_pairs - expected_pairs)} "
-                f"missing_examples={missing_pairs} "
-                f"extra_examples={extra_pairs}"
+                f"missing={missing.count} "
+                f"extra={extra.count} "
+                f"missing_examples={missing.examples} "
+                f"extra_examples={extra.examples}"
             )
 
         return per_day
+
+    @staticmethod
+    def _pair_mismatch(
+        expected: pd.DataFrame, actual: pd.DataFrame, n_examples: int = 10
+    ) -> tuple[PairDiff, PairDiff]:
+        """
+        Set difference of the (col0, col1) pairs of two frames, both ways.
+        Both columns are factorized together into one int64 key per row, so the
+        comparison is a sort plus np.setdiff1d over integers instead of Python
+        sets of tuples.
+        """
+
+        def _codes(col: int) -> tuple[np.ndarray, pd.Index]:
+            values = pd.concat(
+                [expected.iloc[:, col], actual.iloc[:, col]], ignore_index=True
+            )
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+        a_codes, a_uniq = _codes(0)
+        b_codes, b_uniq = _codes(1)
+        width = max(len(b_uniq), 1)
+        keys = a_codes * width + b_codes
+
+        exp_keys = _sorted_unique(keys[: len(expected)])
+        act_keys = _sorted_unique(keys[len(expected) :])
+
+        def _diff(left: np.ndarray, right: np.ndarray) -> PairDiff:
+            only = np.setdiff1d(left, right, assume_unique=True)
+            head = only[:n_examples]
+            examples = list(zip(a_uniq[head // width], b_uniq[head % width]))
+            return PairDiff(count=int(only.size), examples=examples)
+
+        return _diff(exp_keys, act_keys), _diff(act_keys, exp_keys)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.date_normalizer import DateNormalizer
+from src.data_processing.tile_days_builder import ColumnConfig
+
+REFRESH_COL = "refresh"
+_DAY_OFFSET = np.int64(2**31)  # days since epoch may be negative
+
+
+@dataclass(frozen=True)
+class TileDaysDiff:
+    """Rows of the current per-day table that need (re)downloading."""
+
+    new: pd.DataFrame  # (tile_id, day) pairs absent from the previous table
+    deepened: pd.DataFrame  # already-known pairs whose tile's deepest_depth grew
+    removed: int  # previous pairs no longer present (reported, never planned)
+
+    def plan(self) -> pd.DataFrame:
+        """new + deepened rows with a boolean 'refresh' column (True = overwrite)."""
+        return pd.concat(
+            [
+                self.new.assign(**{REFRESH_COL: False}),
+                self.deepened.assign(**{REFRESH_COL: True}),
+            ],
+            ignore_index=True,
+        )
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "new": len(self.new),
+            "deepened": len(self.deepened),
+            "removed": self.removed,
+        }
+
+
+class TileDaysDelta:
+    """
+    Compares a freshly built tiles_with_date table with the previous run's one,
+    keyed by (tile_id, day), so a refresh only plans what changed:
+      - new pairs: tile/day combinations never downloaded before
+      - deepened: known pairs of tiles whose deepest_depth grew (by more than
+        depth_tol) and therefore need a deeper re-download
+    Days may be typed or strings (e.g. as read back from CSV); both are reduced
+    to calendar days before keying.
+    """
+
+    def __init__(
+        self, columns: ColumnConfig | None = None, *, depth_tol: float = 0.0
+    ) -> None:
+        if depth_tol < 0:
+            raise ValueError("depth_tol must be non-negative.")
+        self.columns = columns or ColumnConfig()
+        self.depth_tol = float(depth_tol)
+
+    def diff(self, previous: pd.DataFrame, current: pd.DataFrame) -> TileDaysDiff:
+        cols = self.columns
+        for name, df in (("previous", previous), ("current", current)):
+            missing = [
+                c for c in (cols.tile_id, cols.time, "deepest_depth") if c not in df
+            ]
+            if missing:
+                raise KeyError(f"Missing required columns in {name}: {missing}")
+
+        prev_keys = self._pair_keys(previous)
+        cur_keys = self._pair_keys(current)
+        known = np.isin(cur_keys, prev_keys)
+        removed = np.setdiff1d(prev_keys, cur_keys).size
+
+        grew = self._deepened_tiles(previous, current)
+        deeper = known & current[cols.tile_id].isin(grew).to_numpy()
+
+        return TileDaysDiff(
+            new=current.loc[~known].reset_index(drop=True),
+            deepened=current.loc[deeper].reset_index(drop=True),
+            removed=int(removed),
+        )
+
+    def _pair_keys(self, df: pd.DataFrame) -> np.ndarray:
+        """One int64 per row: tile_id in the high 32 bits, day in the low 32."""
+        cols = self.columns
+        parsed = DateNormalizer().parse(df[cols.time])
+        parsed.raise_if_invalid(cols.time)
+        days = parsed.dates.astype(np.int64) + _DAY_OFFSET
+        tiles = df[cols.tile_id].to_numpy(dtype=np.int64)
+        if tiles.size and (tiles.min() < 0 or tiles.max() >= 2**31):
+            raise ValueError(f"'{cols.tile_id}' must be within [0, 2**31).")
+        return (tiles << 32) | days
+
+    def _deepened_tiles(self, previous: pd.DataFrame, current: pd.DataFrame):
+        tile = self.columns.tile_id
+        prev_depth = previous.groupby(tile)["deepest_depth"].max()
+        cur_depth = current.groupby(tile)["deepest_depth"].max()
+        before = prev_depth.reindex(cur_depth.index)
+        grew = before.notna() & (cur_depth > before + self.depth_tol)
+        return cur_depth.index[grew.to_numpy()]
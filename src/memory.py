@@ -0,0 +1,358 @@
+"""
+Opt-in memory accounting: peak RSS and tracemalloc deltas per stage, per
+tile conversion and per file, including inside worker processes.
+
+    enable_memory_accounting()
+    with measure_memory("tile", "bbox_1/00038") as attrs:
+        ...
+        attrs["rows"] = len(df)
+    memory_accountant().write_report(path, stage="convert")
+
+Peak RSS is the kernel high-water mark (VmHWM), reset at the start of each
+block through /proc/self/clear_refs where allowed; otherwise it is the
+process peak so far (peak_scope="process"). Nested blocks propagate their
+peaks to the enclosing ones. Workers inherit ACCOUNTING_ENV, record into
+their own accountant and hand records back with drain().
+
+Standard library only, so both src.app and src.data_processing can use it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+ACCOUNTING_ENV = "PIPELINE_MEMORY_ACCOUNTING"
+MiB = 1024 * 1024
+
+
+# -------------------- process memory probes (Linux /proc, with fallbacks) ----
+
+
+def _status_kib(field_name: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field_name + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def rss_bytes() -> int:
+    """Current resident set size."""
+    kib = _status_kib("VmRSS")
+    return kib * 1024 if kib is not None else peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of the RSS (since start or the last reset)."""
+    kib = _status_kib("VmHWM")
+    if kib is not None:
+        return kib * 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux: KiB
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # resets VmHWM to the current RSS (Linux >= 4.0)
+        return True
+    except OSError:
+        return False
+
+
+def available_bytes() -> Optional[int]:
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+# -------------------- records --------------------
+
+
+@dataclass(frozen=True)
+class MemoryRecord:
+    kind: str  # "stage" | "tile" | "file" | "step"
+    name: str
+    pid: int
+    seconds: float
+    rss_start: int
+    rss_end: int
+    rss_peak: int
+    peak_scope: str  # "block": reset at start; "process": lifetime peak
+    traced_delta: Optional[int]  # Python allocations still alive at the end
+    traced_peak: Optional[int]  # peak Python allocations above the start
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def rss_growth(self) -> int:
+        return max(0, self.rss_peak - self.rss_start)
+
+
+class _Block:
+    __slots__ = ("rss_start", "rss_peak", "traced_start", "traced_peak", "t0")
+
+    def __init__(self, rss_start: int, traced_start: Optional[int]) -> None:
+        self.rss_start = rss_start
+        self.rss_peak = rss_start
+        self.traced_start = traced_start
+        self.traced_peak = traced_start
+        self.t0 = time.perf_counter()
+
+
+class MemoryAccountant:
+    """
+    Collects MemoryRecords for one process. trace_python also follows Python
+    allocations with tracemalloc (noticeably slower; started on demand).
+    Blocks opened concurrently from several threads share the process-wide
+    numbers.
+    """
+
+    def __init__(self, *, trace_python: bool = True) -> None:
+        self.trace_python = trace_python
+        self.pid = os.getpid()
+        self.records: List[MemoryRecord] = []
+        self._stack: List[_Block] = []
+        self._lock = threading.Lock()
+        self._can_reset = None  # probed on first use
+        self._started_tracing = trace_python and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def close(self) -> None:
+        """Stops tracemalloc if this accountant started it."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+    @contextmanager
+    def measure(self, kind: str, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Yields the attrs dict; add to it (rows, bytes, ...) inside the block."""
+        block = self._enter()
+        try:
+            yield attrs
+        finally:
+            self._exit(block, kind, name, attrs)
+
+    def _enter(self) -> _Block:
+        with self._lock:
+            self._fold_into_open_blocks()
+            if self._can_reset is None:
+                self._can_reset = _reset_peak_rss()
+            elif self._can_reset:
+                _reset_peak_rss()
+            traced = None
+            if self.trace_python and tracemalloc.is_tracing():
+                traced = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            block = _Block(rss_bytes(), traced)
+            self._stack.append(block)
+            return block
+
+    def _exit(self, block: _Block, kind: str, name: str, attrs: Dict) -> None:
+        with self._lock:
+            self._fold_into_open_blocks()
+            if block in self._stack:
+                self._stack.remove(block)
+            traced_now = None
+            if block.traced_start is not None and tracemalloc.is_tracing():
+                traced_now = tracemalloc.get_traced_memory()[0]
+            rec = MemoryRecord(
+                kind=kind,
+                name=name,
+                pid=os.getpid(),
+                seconds=time.perf_counter() - block.t0,
+                rss_start=block.rss_start,
+                rss_end=rss_bytes(),
+                rss_peak=block.rss_peak,
+                peak_scope="block" if self._can_reset else "process",
+                traced_delta=(
+                    None if traced_now is None else traced_now - block.traced_start
+                ),
+                traced_peak=(
+                    None
+                    if traced_now is None
+                    else block.traced_peak - block.traced_start
+                ),
+                attrs=dict(attrs),
+            )
+            self.records.append(rec)
+
+    def _fold_into_open_blocks(self) -> None:
+        """Credit the peaks since the last reset to every open block."""
+        if not self._stack:
+            return
+        rss_peak = peak_rss_bytes()
+        traced_peak = (
+            tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        )
+        for b in self._stack:
+            b.rss_peak = max(b.rss_peak, rss_peak)
+            if b.traced_peak is not None and traced_peak is not None:
+                b.traced_peak = max(b.traced_peak, traced_peak)
+
+    # -------------------- aggregation --------------------
+
+    def drain(self) -> List[MemoryRecord]:
+        """Hands over (and forgets) the records made so far, e.g. in a worker."""
+        with self._lock:
+            out, self.records = self.records, []
+        return out
+
+    def add(self, records: Iterable[MemoryRecord]) -> None:
+        with self._lock:
+            self.records.extend(records)
+
+    def outliers(
+        self, *, factor: float = 3.0, min_bytes: int = 16 * MiB
+    ) -> List[MemoryRecord]:
+        """
+        Records whose memory cost (RSS growth, or traced peak when larger) is
+        over `factor` times the median of their kind and at least min_bytes.
+        """
+        by_kind: Dict[str, List[MemoryRecord]] = {}
+        for r in self.records:
+            by_kind.setdefault(r.kind, []).append(r)
+        out = []
+        for recs in by_kind.values():
+            if len(recs) < 3:
+                continue  # no meaningful median
+            median = statistics.median(_cost(r) for r in recs)
+            limit = max(min_bytes, factor * median)
+            out.extend(r for r in recs if _cost(r) > limit)
+        return sorted(out, key=_cost, reverse=True)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        kinds = sorted({r.kind for r in self.records})
+        for kind in kinds:
+            recs = [r for r in self.records if r.kind == kind]
+            costs = sorted(_cost(r) for r in recs)
+            worst = max(recs, key=lambda r: r.rss_peak)
+            out[kind] = {
+                "count": len(recs),
+                "max_rss_peak": worst.rss_peak,
+                "max_rss_peak_name": worst.name,
+                "median_cost": int(statistics.median(costs)),
+                "p95_cost": costs[min(len(costs) - 1, int(0.95 * len(costs)))],
+                "max_cost": costs[-1],
+            }
+        tiles = [r for r in self.records if r.kind == "tile"]
+        avail = available_bytes()
+        if tiles and avail:
+            # Each worker process needs its largest footprint at once.
+            per_worker = max(r.rss_peak for r in tiles)
+            out["tile"]["suggested_max_workers"] = max(1, avail // per_worker)
+        return out
+
+    def write_report(
+        self, path: Path, *, stage: str, factor: float = 3.0, min_bytes: int = 16 * MiB
+    ) -> Path:
+        outliers = self.outliers(factor=factor, min_bytes=min_bytes)
+        for r in outliers:
+            logging.warning(
+                "memory outlier: %s %s grew %.1f MiB (pid %d)",
+                r.kind,
+                r.name,
+                _cost(r) / MiB,
+                r.pid,
+            )
+        report = {
+            "stage": stage,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "available_bytes": available_bytes(),
+            "summary": self.summary(),
+            "outliers": [asdict(r) for r in outliers],
+            "records": [asdict(r) for r in self.records],
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=1, default=str))
+        logging.info("memory report written to %s", path)
+        return path
+
+
+def _cost(r: MemoryRecord) -> int:
+    return max(r.rss_growth, r.traced_peak or 0)
+
+
+# -------------------- process-wide switch --------------------
+
+_accountant: Optional[MemoryAccountant] = None
+_accountant_lock = threading.Lock()
+
+
+def memory_accountant() -> Optional[MemoryAccountant]:
+    """This process' accountant when accounting is on (re-created after fork)."""
+    global _accountant
+    acc = _accountant
+    if acc is not None and acc.pid == os.getpid():
+        return acc
+    if acc is None and not os.environ.get(ACCOUNTING_ENV):
+        return None
+    with _accountant_lock:
+        if _accountant is None or _accountant.pid != os.getpid():
+            _accountant = MemoryAccountant(
+                trace_python=os.environ.get(ACCOUNTING_ENV) != "rss"
+            )
+        return _accountant
+
+
+def enable_memory_accounting(*, trace_python: bool = True) -> MemoryAccountant:
+    """Turns accounting on here and in every worker process started later."""
+    global _accountant
+    os.environ[ACCOUNTING_ENV] = "tracemalloc" if trace_python else "rss"
+    with _accountant_lock:
+        if _accountant is not None and _accountant.pid == os.getpid():
+            _accountant.close()
+        _accountant = MemoryAccountant(trace_python=trace_python)
+        return _accountant
+
+
+def disable_memory_accounting() -> None:
+    global _accountant
+    with _accountant_lock:
+        if _accountant is not None and _accountant.pid == os.getpid():
+            _accountant.close()
+        _accountant = None
+    os.environ.pop(ACCOUNTING_ENV, None)
+
+
+@contextmanager
+def measure_memory(kind: str, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """MemoryAccountant.measure on this process' accountant; no-op when off."""
+    acc = memory_accountant()
+    if acc is None:
+        yield attrs
+        return
+    with acc.measure(kind, name, **attrs) as a:
+        yield a
+
+
+def drain_records() -> List[MemoryRecord]:
+    acc = memory_accountant()
+    return [] if acc is None else acc.drain()
+
+
+def add_records(records: Iterable[MemoryRecord]) -> None:
+    acc = memory_accountant()
+    if acc is not None:
+        acc.add(records)
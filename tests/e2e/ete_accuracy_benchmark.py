@@ -0,0 +1,171 @@
+# ete_accuracy_benchmark.py
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.assignment_validator import BruteForceValidator
+from src.data_processing.grid_spec import GridSpec
+from src.data_processing.kd_index import KDIndex
+from src.data_processing.tile_catalog import TileCatalog
+
+# -------- Index types under test --------
+# Each entry builds an index over (catalog, lat0) and returns a query function
+# mapping (lons, lats) -> tile_ids (int64, -1 when unassigned).
+
+QueryFn = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def _kd_nearest(catalog: TileCatalog, lat0: float) -> QueryFn:
+    kd = KDIndex(catalog, lat0=lat0)
+    return kd.query_many
+
+
+def _kd_knn_first(catalog: TileCatalog, lat0: float) -> QueryFn:
+    kd = KDIndex(catalog, lat0=lat0)
+
+    def query(lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        offsets, ids, _ = kd.query_knn(lons, lats, k=1)
+        out = np.full(offsets.size - 1, -1, dtype=np.int64)
+        has = np.diff(offsets) > 0
+        out[has] = ids[offsets[:-1][has]]
+        return out
+
+    return query
+
+
+INDEX_TYPES: Dict[str, Callable[[TileCatalog, float], QueryFn]] = {
+    "kd": _kd_nearest,
+    "kd_knn1": _kd_knn_first,
+}
+
+
+# -------- Synthetic inputs (pure) --------
+
+
+@dataclass(frozen=True)
+class SyntheticCase:
+    name: str
+    catalog: TileCatalog
+    lons: np.ndarray
+    lats: np.ndarray
+
+
+def synthetic_grid(
+    *,
+    min_lon: float,
+    max_lon: float,
+    min_lat: float,
+    max_lat: float,
+    step_deg: float,
+) -> GridSpec:
+    lons = np.arange(min_lon, max_lon + step_deg / 2, step_deg, dtype=np.float64)
+    lats = np.arange(min_lat, max_lat + step_deg / 2, step_deg, dtype=np.float64)
+    return GridSpec(
+        lon_name="longitude",
+        lat_name="latitude",
+        lons=lons,
+        lats=lats,
+        grid_hash=f"synthetic-{lons.size}x{lats.size}-{step_deg}",
+    )
+
+
+def synthetic_coast_mask(grid: GridSpec, rng: np.random.Generator) -> np.ndarray:
+    """Land east of a wiggly meridional coastline, plus a few random islands."""
+    lon2d, lat2d = np.meshgrid(grid.lons, grid.lats)
+    span = grid.lons[-1] - grid.lons[0]
+    coast = grid.lons[0] + 0.7 * span + 0.08 * span * np.sin(lat2d * 3.0)
+    sea = lon2d < coast
+    for _ in range(5):
+        cx = rng.uniform(grid.lons[0], coast.min())
+        cy = rng.uniform(grid.lats[0], grid.lats[-1])
+        r = rng.uniform(0.01, 0.04) * span
+        sea &= (lon2d - cx) ** 2 + (lat2d - cy) ** 2 > r**2
+    return sea
+
+
+def synthetic_points(
+    grid: GridSpec, n: int, rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Haul-like points clustered offshore of the synthetic coastline."""
+    span = grid.lons[-1] - grid.lons[0]
+    lats = rng.uniform(grid.lats[0], grid.lats[-1], n)
+    coast = grid.lons[0] + 0.7 * span + 0.08 * span * np.sin(lats * 3.0)
+    lons = coast - rng.exponential(0.05 * span, n)
+    return np.clip(lons, grid.lons[0], grid.lons[-1]), lats
+
+
+def build_case(
+    name: str, step_deg: float, n_points: int, seed: int = 0
+) -> SyntheticCase:
+    rng = np.random.default_rng(seed)
+    grid = synthetic_grid(
+        min_lon=-20.0, max_lon=0.0, min_lat=30.0, max_lat=60.0, step_deg=step_deg
+    )
+    catalog = TileCatalog(grid=grid, sea_land_mask=synthetic_coast_mask(grid, rng))
+    lons, lats = synthetic_points(grid, n_points, rng)
+    return SyntheticCase(name=name, catalog=catalog, lons=lons, lats=lats)
+
+
+# -------- Runner --------
+
+
+def run_case(
+    case: SyntheticCase, index_types: Sequence[str] | None = None
+) -> List[Dict[str, object]]:
+    """Accuracy and throughput of every index type on one synthetic case."""
+    _, sea_lat = case.catalog.sea_tile_coords()
+    lat0 = float(np.nanmedian(case.catalog.grid.lats))
+    validator = BruteForceValidator(case.catalog, lat0)
+
+    t0 = time.perf_counter()
+    ref = validator.nearest(case.lons, case.lats)
+    ref_s = time.perf_counter() - t0
+
+    rows: List[Dict[str, object]] = []
+    for name in index_types or INDEX_TYPES:
+        t0 = time.perf_counter()
+        query = INDEX_TYPES[name](case.catalog, lat0)
+        build_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ids = query(case.lons, case.lats)
+        query_s = time.perf_counter() - t0
+
+        summary = validator.validate(case.lons, case.lats, ids, ref=ref).summary()
+        rows.append(
+            {
+                "case": case.name,
+                "index": name,
+                "sea_tiles": int(sea_lat.size),
+                "points": int(case.lons.size),
+                "build_s": build_s,
+                "query_pts_per_s": case.lons.size / max(query_s, 1e-12),
+                "bruteforce_pts_per_s": case.lons.size / max(ref_s, 1e-12),
+                **summary,
+            }
+        )
+    return rows
+
+
+def run(
+    cases: Sequence[Tuple[str, float, int]] = (
+        ("small", 0.25, 10_000),
+        ("medium", 0.083, 100_000),
+        ("large", 0.042, 1_000_000),
+    ),
+    seed: int = 0,
+) -> pd.DataFrame:
+    rows: List[Dict[str, object]] = []
+    for name, step, n in cases:
+        rows.extend(run_case(build_case(name, step, n, seed=seed)))
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print(run().to_string(index=False, float_format="{:.3f}".format))
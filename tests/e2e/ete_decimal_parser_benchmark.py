@@ -0,0 +1,60 @@
+# ete_decimal_parser_benchmark.py
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.decimal_parser import DecimalParser
+from src.data_processing.hauls_cleaner import HaulDbBuilder
+
+
+def synthetic_coordinates(n: int, seed: int = 0) -> pd.Series:
+    """DDMMmmm-style logbook values: decimal commas, some NBSP, some blanks."""
+    rng = np.random.default_rng(seed)
+    raw = np.char.mod("%.1f", rng.uniform(4_200_000, 4_400_000, n))
+    raw = np.char.replace(raw, ".", ",")
+    s = pd.Series(raw, dtype=object)
+    nbsp = rng.random(n) < 0.05
+    s[nbsp] = s[nbsp].str.slice(0, 3) + "\u00a0" + s[nbsp].str.slice(3)
+    s[rng.random(n) < 0.02] = np.nan
+    return s
+
+
+def _time(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(sizes=(100_000, 1_000_000, 5_000_000)) -> pd.DataFrame:
+    parser = DecimalParser()
+    rows: List[Dict[str, object]] = []
+    for n in sizes:
+        s = synthetic_coordinates(n)
+        legacy = DecimalParser.legacy(s).to_numpy(dtype=np.float64)
+        fast = parser.parse(s).to_numpy()
+        assert np.array_equal(legacy, fast, equal_nan=True)
+
+        legacy_s = _time(lambda: DecimalParser.legacy(s))
+        fast_s = _time(lambda: parser.parse(s))
+        convert_s = _time(lambda: HaulDbBuilder.as_decimal_lat(parser.parse(s)))
+        rows.append(
+            {
+                "rows": n,
+                "legacy_s": legacy_s,
+                "vectorized_s": fast_s,
+                "speedup": legacy_s / fast_s,
+                "vectorized_plus_ddmm_s": convert_s,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(run().to_string(index=False, float_format="{:.3f}".format))
@@ -9,6 +9,7 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
+from src.data_processing.assignment_validator import BruteForceValidator
 from src.data_processing.kd_index import KDIndex
 
 # Use your existing project types
@@ -115,11 +116,11 @@ def bruteforce_single(
 def bruteforce_batch(
     lons: Iterable[float], lats: Iterable[float], *, catalog: TileCatalog, lat0: float
 ) -> np.ndarray:
-    ids = []
-    for lo, la in zip(lons, lats):
-        k, _ = bruteforce_single(float(lo), float(la), catalog=catalog, lat0=lat0)
-        ids.append(k)
-    return np.asarray(ids, dtype=np.int64)
+    """Blocked, vectorized equivalent of bruteforce_single over all points."""
+    ids, _ = BruteForceValidator(catalog, lat0).nearest(
+        np.asarray(lons, dtype=np.float64), np.asarray(lats, dtype=np.float64)
+    )
+    return ids
 
 
 # -------- Sampling (pure) --------
@@ -184,3 +185,15 @@ def validate_sample(
     nb = (details["match_type"] == "neighbor").mean() * 100.0
     non = (details["match_type"] == "non-neighbor").mean() * 100.0
     return details, {"same_pct": same, "neighbor_pct": nb, "non_neighbor_pct": non}
+
+
+def validate_all(hauls: pd.DataFrame, rt: Runtime) -> Dict[str, float]:
+    """
+    Vectorized validation over every haul (no per-row details): KD vs exact
+    brute force, reported as same/neighbor/non-neighbor rates.
+    """
+    lons = hauls["lon"].to_numpy(dtype=np.float64)
+    lats = hauls["lat"].to_numpy(dtype=np.float64)
+    kd_ids = rt.kd.query_many(lons, lats)
+    report = BruteForceValidator(rt.catalog, rt.kd.lat0).validate(lons, lats, kd_ids)
+    return report.summary()
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from src.app.archiver import HDF5_SIGNATURE
+
+
+@pytest.fixture
+def product_tree(tmp_path):
+    root = tmp_path / "data" / "product_x"
+    for tile in range(12):
+        d = root / "bbox_00" / "nc" / f"{tile:05d}"
+        d.mkdir(parents=True)
+        # NetCDF-4 (HDF5) member: compressible payload, but must be stored.
+        (d / "2021-01-01.nc").write_bytes(HDF5_SIGNATURE + b"\0" * 50_000)
+    csv_dir = root / "bbox_00" / "csv" / "all"
+    csv_dir.mkdir(parents=True)
+    for k in range(5):
+        (csv_dir / f"tile_{k}.csv").write_text("lon,lat,thetao\n" * (2_000 + k))
+    (csv_dir / "empty.csv").write_bytes(b"")
+    (root / "bbox_00" / "csv" / "group").mkdir()
+    (root / "random.bin").write_bytes(os.urandom(4096))
+    (root / "ñame with spaces.txt").write_text("utf-8 names")
+    return root
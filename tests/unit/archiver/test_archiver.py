@@ -0,0 +1,132 @@
+import io
+import os
+import shutil
+import tarfile
+import tracemalloc
+import zipfile
+
+import pytest
+
+import src.app.archiver as archiver_mod
+from src.app.archiver import (
+    HDF5_SIGNATURE,
+    ParallelZipArchiver,
+    ZstdTarArchiver,
+    archive_entries,
+    make_archiver,
+)
+
+
+def _zip_bytes(root, **kwargs):
+    buf = io.BytesIO()
+    summary = ParallelZipArchiver(**kwargs).write(root, buf)
+    return buf.getvalue(), summary
+
+
+def test_zip_matches_make_archive_contents(product_tree, tmp_path):
+    body, summary = _zip_bytes(product_tree, workers=4)
+    reference = shutil.make_archive(
+        str(tmp_path / "ref"),
+        "zip",
+        root_dir=product_tree.parent,
+        base_dir=product_tree.name,
+    )
+    with zipfile.ZipFile(reference) as ref, zipfile.ZipFile(io.BytesIO(body)) as got:
+        assert sorted(got.namelist()) == sorted(ref.namelist())
+        assert got.testzip() is None
+        for name in ref.namelist():
+            assert got.read(name) == ref.read(name)
+            assert got.getinfo(name).external_attr == ref.getinfo(name).external_attr
+    assert summary.bytes_out == len(body)
+    assert summary.files == 20
+
+
+def test_netcdf4_members_are_stored(product_tree):
+    body, summary = _zip_bytes(product_tree)
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        methods = {i.filename: i.compress_type for i in zf.infolist()}
+    nc = [m for n, m in methods.items() if n.endswith(".nc")]
+    csv = [m for n, m in methods.items() if n.endswith(".csv") and "empty" not in n]
+    assert set(nc) == {zipfile.ZIP_STORED}
+    assert set(csv) == {zipfile.ZIP_DEFLATED}
+    assert methods["product_x/random.bin"] == zipfile.ZIP_STORED  # incompressible
+    assert summary.stored == 12 + 3  # .nc, random.bin, empty.csv, tiny .txt
+
+
+def test_output_is_deterministic_across_worker_counts(product_tree):
+    one, _ = _zip_bytes(product_tree, workers=1)
+    many, _ = _zip_bytes(product_tree, workers=6, max_inflight_bytes=1)
+    assert one == many
+
+
+def test_progress_reports_every_input_byte(product_tree):
+    seen = []
+    ParallelZipArchiver().write(product_tree, io.BytesIO(), seen.append)
+    assert sum(seen) == sum(size for _, _, size in archive_entries(product_tree))
+
+
+def test_zip64_end_records_read_back(product_tree, monkeypatch):
+    monkeypatch.setattr(archiver_mod, "_U16", 3)  # force the Zip64 end records
+    body, _ = _zip_bytes(product_tree)
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        assert len(zf.infolist()) == len(archive_entries(product_tree))
+        assert zf.testzip() is None
+
+
+def test_members_larger_than_read_size_are_streamed(tmp_path):
+    root = tmp_path / "big"
+    root.mkdir()
+    mib = 1024 * 1024
+    rows = "".join(f"{k},{k % 97}.25,{k % 13}\n" for k in range(200_000))
+    (root / "tiles.csv").write_text(rows)  # deflated
+    (root / "tile.nc").write_bytes(HDF5_SIGNATURE + b"\0" * (3 * mib))  # stored
+    (root / "noise.bin").write_bytes(os.urandom(2 * mib))  # stored, incompressible
+
+    out = tmp_path / "big.zip"
+    archiver = ParallelZipArchiver(
+        workers=2, read_size=64 * 1024, spool_bytes=64 * 1024
+    )
+    tracemalloc.start()
+    try:
+        summary = archiver.zip_dir(root, out)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < mib  # never a whole member in memory
+    assert summary.stored == 2 and summary.bytes_out == out.stat().st_size
+    with zipfile.ZipFile(out) as zf:
+        assert zf.testzip() is None
+        assert zf.getinfo("big/tiles.csv").compress_type == zipfile.ZIP_DEFLATED
+        for path in root.iterdir():
+            assert zf.read(f"big/{path.name}") == path.read_bytes()
+
+
+def test_zstd_tar_round_trip(product_tree):
+    zstandard = pytest.importorskip("zstandard")
+    buf = io.BytesIO()
+    summary = ZstdTarArchiver(level=1, threads=2).write(product_tree, buf)
+    assert summary.bytes_out == len(buf.getvalue())
+
+    raw = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(buf.getvalue()))
+    with tarfile.open(fileobj=raw, mode="r|") as tar:
+        names = []
+        for member in tar:
+            names.append(member.name)
+            if member.isfile():
+                src = product_tree.parent / member.name
+                assert tar.extractfile(member).read() == src.read_bytes()
+    assert names == [arc for _, arc, _ in archive_entries(product_tree)]
+
+
+def test_invalid_settings(tmp_path):
+    with pytest.raises(ValueError):
+        make_archiver("rar")
+    with pytest.raises(ValueError):
+        ParallelZipArchiver(level=12)
+    with pytest.raises(ValueError):
+        ParallelZipArchiver(read_size=4)
+    with pytest.raises(ValueError):
+        ZstdTarArchiver(level=0)
+    with pytest.raises(ValueError):
+        ParallelZipArchiver().write(tmp_path / "missing", io.BytesIO())
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from src.data_processing.grid_spec import GridSpec
+from src.data_processing.tile_catalog import TileCatalog
+
+
+@pytest.fixture
+def coastal_catalog():
+    # 6×8 grid, 0.25° step; land on the two eastern columns and one interior cell.
+    lons = np.arange(-5.0, -3.0, 0.25)
+    lats = np.arange(42.0, 43.5, 0.25)
+    grid = GridSpec(
+        lon_name="longitude", lat_name="latitude", lons=lons, lats=lats, grid_hash="t"
+    )
+    mask = np.ones((lats.size, lons.size), dtype=bool)
+    mask[:, -2:] = False
+    mask[3, 3] = False
+    return TileCatalog(grid=grid, sea_land_mask=mask)
+
+
+@pytest.fixture
+def random_points():
+    rng = np.random.default_rng(7)
+    lons = rng.uniform(-5.2, -2.8, 500)
+    lats = rng.uniform(41.8, 43.5, 500)
+    return lons, lats
@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.data_processing.assignment_validator import (
+    NEIGHBOR,
+    NON_NEIGHBOR,
+    SAME,
+    UNASSIGNED,
+    BruteForceValidator,
+)
+from src.data_processing.kd_index import KDIndex
+
+
+def _loop_nearest(catalog, lat0, lons, lats):
+    sea_lon, sea_lat = catalog.sea_tile_coords()
+    c = math.cos(math.radians(lat0))
+    out = []
+    for lon, lat in zip(lons, lats):
+        d2 = (sea_lon * c - lon * c) ** 2 + (sea_lat - lat) ** 2
+        out.append(int(np.argmin(d2)))
+    return np.array(out, dtype=np.int64)
+
+
+@pytest.mark.parametrize("max_block_elems", [1, 7, 100, 4_000_000])
+def test_nearest_matches_loop_for_any_block_size(
+    coastal_catalog, random_points, max_block_elems
+):
+    lons, lats = random_points
+    v = BruteForceValidator(coastal_catalog, 42.5, max_block_elems=max_block_elems)
+    ids, d2 = v.nearest(lons, lats)
+    assert ids.dtype == np.int64
+    np.testing.assert_array_equal(ids, _loop_nearest(coastal_catalog, 42.5, lons, lats))
+    assert np.all(np.isfinite(d2))
+
+
+def test_nearest_ties_pick_lowest_tile_id(coastal_catalog):
+    # Midpoint between tile 0 (j=0,i=0) and tile 1 (j=0,i=1): equidistant.
+    v = BruteForceValidator(coastal_catalog, 42.0, max_block_elems=1)
+    lon0, lat0 = coastal_catalog.sea_cell_coords(0)
+    lon1, _ = coastal_catalog.sea_cell_coords(1)
+    ids, _ = v.nearest(np.array([(lon0 + lon1) / 2]), np.array([lat0]))
+    assert ids.tolist() == [0]
+
+
+def test_kd_index_agrees_with_reference(coastal_catalog, random_points):
+    lons, lats = random_points
+    kd = KDIndex(coastal_catalog, lat0=42.5)
+    v = BruteForceValidator(coastal_catalog, 42.5)
+    report = v.validate(lons, lats, kd.query_many(lons, lats))
+    # Any disagreement must be an exact distance tie.
+    assert np.all((report.match == SAME) | report.equal_distance)
+    assert report.summary()["points"] == 500.0
+
+
+def test_validate_classifies_matches(coastal_catalog):
+    cat = coastal_catalog
+    v = BruteForceValidator(cat, 42.0)
+    lon, lat = cat.sea_cell_coords(0)  # tile (j=0, i=0)
+    lons = np.full(4, lon)
+    lats = np.full(4, lat)
+    right = int(cat.tile_id_map[0, 1])
+    far = int(cat.tile_id_map[5, 5])
+    report = v.validate(lons, lats, np.array([0, right, far, -1]))
+
+    assert report.ref_ids.tolist() == [0, 0, 0, 0]
+    assert report.match.tolist() == [SAME, NEIGHBOR, NON_NEIGHBOR, UNASSIGNED]
+    assert not report.equal_distance.any()
+    s = report.summary()
+    assert s["same_pct"] == s["neighbor_pct"] == s["unassigned_pct"] == 25.0
+
+
+def test_validate_reuses_reference_and_checks_length(coastal_catalog):
+    v = BruteForceValidator(coastal_catalog, 42.0)
+    lons, lats = np.array([-5.0]), np.array([42.0])
+    ref = v.nearest(lons, lats)
+    report = v.validate(lons, lats, ref[0], ref=ref)
+    assert report.match.tolist() == [SAME]
+    with pytest.raises(ValueError):
+        v.validate(lons, lats, np.array([0, 1]))
+
+
+def test_empty_inputs(coastal_catalog):
+    v = BruteForceValidator(coastal_catalog, 42.0)
+    ids, d2 = v.nearest(np.array([]), np.array([]))
+    assert ids.size == 0 and d2.size == 0
+    assert v.validate(np.array([]), np.array([]), ids).summary()["points"] == 0.0
+
+
+def test_sea_cell_ids_many(coastal_catalog):
+    ids = np.array([0, 1, coastal_catalog.sea_tile_ids()[-1]])
+    j, i = coastal_catalog.sea_cell_ids_many(ids)
+    assert list(zip(j.tolist(), i.tolist())) == [
+        coastal_catalog.sea_cell_ids(int(t)) for t in ids
+    ]
+    with pytest.raises(IndexError):
+        coastal_catalog.sea_cell_ids_many(np.array([0, -1]))
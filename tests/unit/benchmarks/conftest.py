@@ -0,0 +1,29 @@
+import pytest
+
+from src.benchmarks.cases import Scale
+from src.benchmarks.harness import BenchResult, SuiteResult
+
+
+@pytest.fixture
+def tiny_scale() -> Scale:
+    return Scale(24, 18, 1 / 12, 5, 200, 500, 1, 3, 2)
+
+
+def result(case, throughput=1000.0, peak=100 * 1024 * 1024, items=1000):
+    return BenchResult(
+        case=case,
+        unit="rows",
+        items=items,
+        repeat=3,
+        number=1,
+        seconds_best=items / throughput,
+        seconds_median=items / throughput,
+        peak_bytes=peak,
+        rss_growth_bytes=0,
+    )
+
+
+def suite(*results, scale="small", skipped=None):
+    return SuiteResult(
+        scale=scale, results={r.case: r for r in results}, skipped=skipped or {}
+    )
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from src.benchmarks import __main__ as bench_cli
+from src.benchmarks import cases
+from src.benchmarks.harness import (
+    SuiteResult,
+    Thresholds,
+    compare,
+    format_comparison,
+    run_suite,
+)
+
+from .conftest import result, suite
+
+MiB = 1024 * 1024
+
+
+def test_compare_flags_throughput_and_memory_regressions():
+    baseline = suite(result("a"), result("b"), result("c"), result("d"))
+    current = suite(
+        result("a", throughput=900.0),  # -10%: within tolerance
+        result("b", throughput=800.0),  # -20%
+        result("c", peak=130 * MiB),  # +30%
+        result("d", peak=130 * MiB, throughput=2000.0),
+    )
+    rows = {c.case: c for c in compare(baseline, current, Thresholds(0.15, 0.5))}
+    assert not rows["a"].failed and rows["a"].throughput_ratio == pytest.approx(0.9)
+    assert rows["b"].regressions == ("throughput",)
+    assert not rows["c"].failed  # +30% peak is within a 50% tolerance
+
+    rows = {c.case: c for c in compare(baseline, current)}
+    assert rows["c"].regressions == ("memory",)
+    assert rows["d"].regressions == ("memory",)
+    assert "REGRESSED: memory" in format_comparison(list(rows.values()))
+
+
+def test_small_peaks_need_the_absolute_floor_to_regress():
+    baseline = suite(result("a", peak=1 * MiB))
+    current = suite(result("a", peak=3 * MiB))
+    (row,) = compare(baseline, current)
+    assert row.memory_ratio == pytest.approx(3.0) and not row.failed
+    (row,) = compare(baseline, current, Thresholds(memory_floor=MiB))
+    assert row.regressions == ("memory",)
+
+
+def test_missing_new_and_incomparable_cases_are_reported_not_failed():
+    baseline = suite(result("gone"), result("skipped"), result("resized"))
+    current = suite(
+        result("resized", items=10),
+        result("new"),
+        skipped={"skipped": "missing dask"},
+    )
+    rows = {c.case: c for c in compare(baseline, current)}
+    assert not any(c.failed for c in rows.values())
+    assert rows["gone"].note == "missing: not run"
+    assert rows["skipped"].note == "missing: missing dask"
+    assert "not comparable" in rows["resized"].note
+    assert rows["new"].note == "new (no baseline)"
+    with pytest.raises(ValueError, match="Scale mismatch"):
+        compare(baseline, suite(scale="large"))
+
+
+def test_results_round_trip_through_json(tmp_path):
+    original = suite(result("a"), skipped={"b": "missing dask"})
+    path = original.write(tmp_path / "out" / "small.json")
+    data = json.loads(path.read_text())
+    assert data["results"]["a"]["throughput"] == pytest.approx(1000.0)
+    loaded = SuiteResult.read(path)
+    assert loaded.results == original.results and loaded.skipped == original.skipped
+
+
+def test_every_case_runs_on_a_tiny_scale(tiny_scale, tmp_path):
+    out = run_suite(
+        list(cases.CASES.values()),
+        "tiny",
+        tiny_scale,
+        tmp_path,
+        repeat=1,
+        min_seconds=0.0,
+    )
+    assert set(out.results) | set(out.skipped) == set(cases.CASES)
+    for r in out.results.values():
+        assert r.items > 0 and r.seconds_best > 0 and r.peak_bytes >= 0
+    assert out.results["kd_query"].items == tiny_scale.queries
+    assert out.results["tile_catalog"].items == tiny_scale.nx * tiny_scale.ny
+
+
+def test_cli_runs_then_gates_against_a_baseline(
+    tiny_scale, tmp_path, monkeypatch, capsys
+):
+    monkeypatch.setitem(cases.SCALES, "small", tiny_scale)
+    out = tmp_path / "run.json"
+    argv = ["run", "--case", "tile_days", "--repeat", "1", "--out", str(out)]
+    assert bench_cli.main(argv) == 0
+
+    # A baseline 10x faster than this run makes it a regression.
+    data = json.loads(out.read_text())
+    entry = data["results"]["tile_days"]
+    entry["seconds_best"] /= 10
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(data))
+    assert bench_cli.main(["compare", str(baseline), str(out)]) == 1
+    assert "REGRESSED: throughput" in capsys.readouterr().out
+    assert bench_cli.main(["compare", str(out), str(out)]) == 0
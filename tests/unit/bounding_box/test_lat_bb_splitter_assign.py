@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from src.app.bbox_factory import BBoxFactory
+from src.bounding_box.lat_bb_splitter import LatBandSplitter
+
+
+def _mask_reference(df, bbox, n_bands):
+    """Previous per-band mask implementation (membership only)."""
+    edges = np.linspace(bbox.min_lat, bbox.max_lat, n_bands + 1)
+    inside = (
+        (df["lon"] >= bbox.min_lon)
+        & (df["lon"] <= bbox.max_lon)
+        & (df["lat"] >= bbox.min_lat)
+        & (df["lat"] <= bbox.max_lat)
+    )
+    out = []
+    for b in range(n_bands):
+        hi_ok = df["lat"] < edges[b + 1] if b < n_bands - 1 else df["lat"] <= edges[-1]
+        out.append(df.loc[inside & (df["lat"] >= edges[b]) & hi_ok, ["lon", "lat"]])
+    return out
+
+
+def test_assign_matches_per_band_masks(coords20_df, sample_bboxes):
+    for name, bbox in sample_bboxes.items():
+        for n_bands in (1, 2, 3, 7):
+            bands = LatBandSplitter(bbox, n_bands).split(coords20_df)
+            expected = _mask_reference(coords20_df, bbox, n_bands)
+            if name == "none":
+                assert bands is None
+                continue
+            for got, exp in zip(bands, expected):
+                pd.testing.assert_frame_equal(
+                    got.coords_within_band_df, exp.reset_index(drop=True)
+                )
+
+
+def test_band_lat0_mean_or_mid(coords20_df, sample_bboxes):
+    bbox = sample_bboxes["all_inside_wide"]  # edges 0, 10, 20, 30, 40
+    bands = LatBandSplitter(bbox, n_bands=4).split(coords20_df)
+    lats = coords20_df["lat"]
+    assert bands[0].band_lat0 == lats[lats < 10].mean()
+    assert bands[1].band_lat0 == lats[(lats >= 10) & (lats < 20)].mean()
+    assert bands[3].num_points == 0 and bands[3].band_lat0 == 35.0
+
+
+def test_bands_are_views_of_one_gather(coords20_df, sample_bboxes):
+    splitter = LatBandSplitter(sample_bboxes["all_inside_tight"], n_bands=3)
+    bands = splitter.split(coords20_df)
+    base = bands[0].lat.base
+    assert base is not None and all(b.lat.base is base for b in bands)
+
+    split = splitter.assign(coords20_df["lon"], coords20_df["lat"])
+    assert split.counts.sum() == len(coords20_df)
+    assert np.all(np.diff(split.band_ids[split.order]) >= 0)
+
+
+def test_bbox_factory_uses_band_edges():
+    tiles = pd.DataFrame(
+        {"tile_lon_center": [-9.0, -8.0], "tile_lat_center": [41.0, 45.9]}
+    )
+    boxes = BBoxFactory(-10.0, 40.0, -1.0, 46.0, lat_band_count=3).build(tiles)
+    assert [b.bbox_id for b in boxes] == ["bbox_00", "bbox_01", "bbox_02"]
+    assert [(b.min_lat, b.max_lat) for b in boxes] == [
+        (40.0, 42.0),
+        (42.0, 44.0),
+        (44.0, 46.0),
+    ]
+    assert BBoxFactory(0.0, 0.0, 1.0, 1.0, lat_band_count=2).build(tiles) == []
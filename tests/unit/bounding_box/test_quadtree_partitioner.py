@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.bbox_factory import AdaptiveBBoxFactory
+from src.app.orchestrator import TileDayOrchestrator
+from src.bounding_box.bounding_box import BoundingBox
+from src.bounding_box.quadtree_partitioner import QuadtreePartitioner
+
+REGION = BoundingBox(-12.0, -1.0, 40.0, 46.0)
+
+
+def _clustered_points(seed: int = 3, n: int = 2_000):
+    rng = np.random.default_rng(seed)
+    dense = rng.normal((-9.0, 43.5), (0.3, 0.2), size=(n, 2))
+    sparse = rng.uniform((-12.0, 40.0), (-1.0, 46.0), size=(n // 10, 2))
+    pts = np.vstack([dense, sparse])
+    pts[:, 0] = np.clip(pts[:, 0], -12.0, -1.0)
+    pts[:, 1] = np.clip(pts[:, 1], 40.0, 46.0)
+    return pts[:, 0], pts[:, 1]
+
+
+def _owner(leaves, lons, lats):
+    hits = np.zeros(lons.size, dtype=int)
+    for leaf in leaves:
+        b = leaf.bbox
+        hits += (
+            (lons >= b.min_lon)
+            & (lons <= b.max_lon)
+            & (lats >= b.min_lat)
+            & (lats <= b.max_lat)
+        )
+    return hits
+
+
+def test_leaves_cover_every_point_once_within_target():
+    lons, lats = _clustered_points()
+    leaves = QuadtreePartitioner(REGION, max_points=150).partition(lons, lats)
+
+    assert sum(leaf.num_points for leaf in leaves) == lons.size
+    assert all(leaf.num_points <= 150 for leaf in leaves)
+    np.testing.assert_array_equal(_owner(leaves, lons, lats), 1)
+    assert [leaf.path for leaf in leaves] == sorted(leaf.path for leaf in leaves)
+
+
+def test_boxes_are_tight_and_inside_their_cell():
+    lons, lats = _clustered_points()
+    for leaf in QuadtreePartitioner(REGION, max_points=150).partition(lons, lats):
+        b, c = leaf.bbox, leaf.cell
+        assert c.min_lon <= b.min_lon <= b.max_lon <= c.max_lon
+        assert c.min_lat <= b.min_lat <= b.max_lat <= c.max_lat
+        mine = (
+            (lons >= b.min_lon)
+            & (lons <= b.max_lon)
+            & (lats >= b.min_lat)
+            & (lats <= b.max_lat)
+        )
+        assert lons[mine].min() == b.min_lon and lons[mine].max() == b.max_lon
+        assert lats[mine].min() == b.min_lat and lats[mine].max() == b.max_lat
+
+
+def test_paths_are_stable_when_data_changes_elsewhere():
+    lons, lats = _clustered_points()
+    part = QuadtreePartitioner(REGION, max_points=150)
+    before = {leaf.path: leaf for leaf in part.partition(lons, lats)}
+
+    # Extra tiles in the north-east quadrant only (path prefix "3").
+    extra_lon = np.linspace(-6.0, -1.5, 400)
+    extra_lat = np.linspace(43.5, 45.5, 400)
+    after = part.partition(
+        np.concatenate([lons, extra_lon]), np.concatenate([lats, extra_lat])
+    )
+    untouched = [leaf for leaf in after if not leaf.path.startswith("3")]
+    assert untouched
+    for leaf in untouched:
+        assert before[leaf.path] == leaf
+
+
+def test_area_limit_splits_large_sparse_boxes():
+    lons, lats = _clustered_points()
+    leaves = QuadtreePartitioner(
+        REGION, max_points=10_000, max_area_deg2=1.0
+    ).partition(lons, lats)
+    assert len(leaves) > 1
+    for leaf in leaves:
+        b = leaf.bbox
+        assert (b.max_lon - b.min_lon) * (b.max_lat - b.min_lat) <= 1.0
+
+
+def test_max_depth_caps_duplicated_points():
+    lons = np.full(50, -5.0)
+    lats = np.full(50, 42.0)
+    leaves = QuadtreePartitioner(REGION, max_points=10, max_depth=4).partition(
+        lons, lats
+    )
+    assert len(leaves) == 1
+    assert len(leaves[0].path) == 4 and leaves[0].num_points == 50
+
+
+def test_points_outside_region_are_ignored():
+    part = QuadtreePartitioner(REGION, max_points=5)
+    assert part.partition(np.array([20.0]), np.array([10.0])) == []
+    leaves = part.partition(np.array([-1.0, 20.0]), np.array([46.0, 10.0]))
+    assert [leaf.num_points for leaf in leaves] == [1]
+
+
+@pytest.mark.parametrize("kwargs", [{"max_points": 0}, {"max_area_deg2": 0.0}])
+def test_invalid_arguments(kwargs):
+    kwargs = {"max_points": 10, **kwargs}
+    with pytest.raises(ValueError):
+        QuadtreePartitioner(REGION, **kwargs)
+
+
+def test_adaptive_factory_plugs_into_orchestrator():
+    lons, lats = _clustered_points(n=600)
+    tiles_df = pd.DataFrame(
+        {
+            "tile_id": np.arange(lons.size),
+            "tile_lon_center": lons,
+            "tile_lat_center": lats,
+            "time": pd.Timestamp("2022-05-01", tz="UTC"),
+            "deepest_depth": 25.0,
+        }
+    )
+    bboxes = AdaptiveBBoxFactory(-12.0, 40.0, -1.0, 46.0, max_tiles=80).build(tiles_df)
+    assert len({b.bbox_id for b in bboxes}) == len(bboxes)
+    assert all(b.bbox_id.startswith("bbox_q") for b in bboxes)
+
+    orch = TileDayOrchestrator("ds", ["thetao"], spatial_resolution_deg=0.083)
+    table = orch.build_job_table(tiles_df, bboxes)
+    assert len(table) == len(tiles_df)
+    counts = np.bincount(table.bbox_index, minlength=len(bboxes))
+    assert counts.max() <= 80
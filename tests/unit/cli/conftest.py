@@ -0,0 +1,20 @@
+import pytest
+
+from src import cli
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replaces every stage handler with a recorder; returns the call list."""
+    seen = []
+    for name, stage in cli.STAGES.items():
+        monkeypatch.setitem(
+            cli.STAGES,
+            name,
+            stage._replace(handler=lambda args, name=name: seen.append((name, args))),
+        )
+    return seen
+
+
+def busy_work(n: int = 20_000) -> list:
+    return [str(i) * 3 for i in range(n)]
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+
+import pytest
+
+from src import cli
+from src.app.profiling import ProfileOptions, pstats_report, stage_profile
+from src.app.tracing import TRACE_FILE_ENV, read_spans
+
+from .conftest import busy_work
+
+
+def test_every_stage_has_a_subcommand():
+    parser = cli.build_parser()
+    for name in cli.STAGES:
+        args = parser.parse_args([name])
+        assert args.stage == name
+        assert args.workers is None and args.profile is None
+        assert args.trace_memory == 0
+
+
+def test_common_switches_parse(tmp_path):
+    args = cli.build_parser().parse_args(
+        [
+            "download",
+            "--workers",
+            "3",
+            "--profile",
+            str(tmp_path / "d.prof"),
+            "--trace-memory",
+            "--previous-tiles",
+            "prev.csv",
+        ]
+    )
+    assert args.workers == 3
+    assert args.profile == tmp_path / "d.prof"
+    assert args.trace_memory == 25
+    assert str(args.previous_tiles) == "prev.csv"
+
+
+@pytest.mark.parametrize("argv", [[], ["unknown"], ["convert", "--workers", "0"]])
+def test_invalid_command_lines_exit(argv):
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(argv)
+
+
+def test_main_dispatches_to_the_stage(calls):
+    assert cli.main(["convert", "--workers", "2"]) == 0
+    [(name, args)] = calls
+    assert name == "convert" and args.workers == 2
+
+
+def test_workers_on_a_serial_stage_warns(calls, caplog):
+    with caplog.at_level(logging.WARNING):
+        cli.main(["amalgamate", "--workers", "4"])
+    assert "no effect on the amalgamate stage" in caplog.text
+
+
+def test_main_profiles_the_stage(calls, tmp_path):
+    out = tmp_path / "prof" / "convert.prof"
+    cli.main(["convert", "--profile", str(out)])
+    assert out.exists()
+    assert out.with_suffix(".txt").read_text().strip()
+
+
+def test_stage_profile_writes_stats_and_report(tmp_path):
+    out = tmp_path / "stage.prof"
+    with stage_profile("busy", ProfileOptions(profile_path=out, top=5)):
+        busy_work()
+    assert "busy_work" in out.with_suffix(".txt").read_text()
+    assert "function calls" in pstats_report(out, top=3)
+
+
+def test_stage_profile_reports_even_on_failure(tmp_path):
+    out = tmp_path / "fail.prof"
+    with pytest.raises(RuntimeError):
+        with stage_profile("fail", ProfileOptions(profile_path=out)):
+            raise RuntimeError("boom")
+    assert out.exists()
+
+
+def test_trace_memory_logs_top_allocators(caplog):
+    import tracemalloc
+
+    with caplog.at_level(logging.INFO):
+        with stage_profile("mem", ProfileOptions(trace_memory=3)):
+            keep = busy_work()
+    assert keep
+    assert "mem: traced peak" in caplog.text
+    assert "conftest.py" in caplog.text  # busy_work's allocations
+    assert not tracemalloc.is_tracing()
+
+
+def test_disabled_profile_is_a_no_op(tmp_path):
+    with stage_profile("off", ProfileOptions()):
+        pass
+    assert not list(tmp_path.iterdir())
+
+
+def test_main_writes_trace_files(calls, tmp_path):
+
+    out = tmp_path / "run.jsonl"
+    cli.main(["plan", "--trace", str(out)])
+    [rec] = read_spans(out)
+    assert rec["name"] == "stage.plan"
+    chrome = json.loads((tmp_path / "run.trace.json").read_text())
+    assert chrome["traceEvents"][0]["name"] == "stage.plan"
+    assert TRACE_FILE_ENV not in os.environ
+
+
+def test_assign_passes_workers_to_the_action(monkeypatch):
+    from src.actions import build_tiles_source_data
+
+    seen = []
+    monkeypatch.setattr(build_tiles_source_data, "run", lambda **kw: seen.append(kw))
+    assert cli.main(["assign", "--workers", "3"]) == 0
+    assert seen == [{"workers": 3}]
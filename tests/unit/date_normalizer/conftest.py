@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def dia_variants():
+    # raw `dia` value -> expected ISO day (None when invalid)
+    return {
+        "5/8/1999": "1999-08-05",
+        "05/08/1999": "1999-08-05",
+        "5/8/1999 0:00:00": "1999-08-05",
+        " 05-08-1999": "1999-08-05",
+        "05.08.1999": "1999-08-05",
+        "1999-08-05": "1999-08-05",
+        "1999-08-05 00:00:00+00:00": "1999-08-05",
+        "29/02/2000": "2000-02-29",
+        "29/02/1999": None,
+        "31/04/2001": None,
+        "00/01/2001": None,
+        "5/13/1999": None,
+        "not a date": None,
+        "": None,
+    }
+
+
+@pytest.fixture
+def enriched_hauls():
+    return pd.DataFrame(
+        {
+            "tile_id": [1, 1, 2],
+            "tile_lon_center": [-5.0, -5.0, -4.0],
+            "tile_lat_center": [43.0, 43.0, 44.0],
+            "time": ["05/08/1999", "5/8/1999 13:00:00", "1999-08-06"],
+            "depth": [10.0, 30.0, 20.0],
+        }
+    )
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.date_normalizer import DateNormalizer
+from src.data_processing.hauls_cleaner import HaulDbBuilder
+from src.data_processing.tile_days_builder import TileDaysBuilder
+
+
+def _expected(values):
+    return np.array(
+        [np.datetime64(v, "D") if v else np.datetime64("NaT", "D") for v in values]
+    )
+
+
+def test_parses_known_variants(dia_variants):
+    res = DateNormalizer().parse(list(dia_variants))
+    assert res.dates.dtype == np.dtype("datetime64[D]")
+    np.testing.assert_array_equal(res.dates, _expected(dia_variants.values()))
+    np.testing.assert_array_equal(
+        res.invalid, [v is None for v in dia_variants.values()]
+    )
+
+
+def test_repeated_values_and_missing():
+    raw = pd.Series(["5/8/1999", None, "5/8/1999", np.nan, "bad", "bad"])
+    res = DateNormalizer().parse(raw)
+    assert res.invalid.tolist() == [False, True, False, True, True, True]
+    assert res.invalid_count == 4
+    assert res.examples() == ["bad"]
+    with pytest.raises(ValueError, match="4 rows"):
+        res.raise_if_invalid("dia")
+
+
+def test_monthfirst():
+    res = DateNormalizer(dayfirst=False).parse(["8/5/1999", "1999-08-05"])
+    np.testing.assert_array_equal(res.dates, _expected(["1999-08-05"] * 2))
+
+
+@pytest.mark.parametrize("dayfirst", [True, False])
+def test_offset_strings_are_floored_in_utc(dayfirst):
+    raw = [
+        "2023-01-05T23:30:00-02:00",  # 01:30 UTC on the 6th
+        "2023-01-06 00:30:00+02:00",  # 22:30 UTC on the 5th
+        "2023-01-05T10:00:00Z",
+        "31/02/2023 10:00:00+01:00",  # not a calendar day, offset or not
+    ]
+    res = DateNormalizer(dayfirst=dayfirst).parse(raw)
+    np.testing.assert_array_equal(
+        res.dates, _expected(["2023-01-06", "2023-01-05", "2023-01-05", None])
+    )
+
+    # same day as the tz-aware datetime path
+    typed = DateNormalizer().parse(pd.Series(pd.to_datetime(raw[:1])))
+    np.testing.assert_array_equal(typed.dates, res.dates[:1])
+
+
+def test_unknown_formats_fall_back_to_pandas():
+    res = DateNormalizer().parse(["5 Jan 2023", "Jan 5, 2023", "5/1/2023", "nope"])
+    np.testing.assert_array_equal(res.dates, _expected(["2023-01-05"] * 3 + [None]))
+
+
+def test_typed_input_is_floored_without_parsing():
+    s = pd.Series(pd.to_datetime(["1999-08-05 23:30", "2000-01-01 00:00"]))
+    res = DateNormalizer().parse(s)
+    np.testing.assert_array_equal(res.dates, _expected(["1999-08-05", "2000-01-01"]))
+
+    aware = s.dt.tz_localize("Europe/Madrid")  # 00:00 +01:00 is the previous UTC day
+    res = DateNormalizer().parse(aware)
+    np.testing.assert_array_equal(res.dates, _expected(["1999-08-05", "1999-12-31"]))
+
+
+def test_empty_input():
+    res = DateNormalizer().parse(pd.Series([], dtype=object))
+    assert res.dates.size == 0 and res.invalid_count == 0
+
+
+def test_sanitize_dia_returns_typed_dates_and_failures():
+    df = pd.DataFrame({"dia": ["5/8/1999", "31/02/1999", "1999-08-06"], "x": [1, 2, 3]})
+    ok, bad = HaulDbBuilder._sanitize_dia(df)
+    assert ok["x"].tolist() == [1, 3]
+    assert pd.api.types.is_datetime64_dtype(ok["date"])
+    assert ok["date"].dt.strftime("%Y-%m-%d").tolist() == ["1999-08-05", "1999-08-06"]
+    assert bad["dia"].tolist() == ["31/02/1999"]
+
+
+def test_tile_days_builder_accepts_strings_and_typed_dates(enriched_hauls):
+    from_str = TileDaysBuilder().build_per_day(enriched_hauls)
+
+    typed = enriched_hauls.copy()
+    typed["time"] = DateNormalizer().parse(typed["time"]).as_series()
+    from_typed = TileDaysBuilder().build_per_day(typed)
+
+    pd.testing.assert_frame_equal(from_str, from_typed)
+    assert str(from_str["time"].dt.tz) == "UTC"
+    assert from_str["time"].dt.strftime("%Y-%m-%d").tolist() == [
+        "1999-08-05",
+        "1999-08-06",
+    ]
+    assert from_str["deepest_depth"].tolist() == [30.0, 20.0]
+
+
+def test_tile_days_builder_accepts_written_out_dates(enriched_hauls):
+    enriched_hauls.loc[0, "time"] = "5 Aug 1999"
+    per_day = TileDaysBuilder().build_per_day(enriched_hauls)
+    assert per_day["time"].dt.strftime("%Y-%m-%d").tolist() == [
+        "1999-08-05",
+        "1999-08-06",
+    ]
+
+
+def test_tile_days_builder_fails_fast_on_bad_dates(enriched_hauls):
+    enriched_hauls.loc[0, "time"] = "32/01/1999"
+    with pytest.raises(ValueError, match="Unparseable dates in 'time': 1 rows"):
+        TileDaysBuilder().build_per_day(enriched_hauls)
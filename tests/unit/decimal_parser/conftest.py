@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def tricky_values():
+    return pd.Series(
+        [
+            "430512,3",
+            " 925.5",
+            "430\u00a0512,3",
+            "-12,5",
+            "+7",
+            "12,",
+            ",5",
+            "\t0012.500 ",
+            "-\u00a07",
+            # rejected by the fast path, resolved by the fallback
+            "1e5",
+            "123456789012345678",
+            "1,2,3",
+            "430 512",
+            "- 7",
+            "7-",
+            "+",
+            "abc",
+            "",
+            None,
+            np.nan,
+        ],
+        dtype=object,
+    )
+
+
+@pytest.fixture
+def random_values():
+    rng = np.random.default_rng(11)
+    n = 5000
+    raw = np.char.mod("%.3f", rng.uniform(-5_000_000, 5_000_000, n))
+    s = pd.Series(raw, dtype=object)
+    comma = rng.random(n) < 0.5
+    s[comma] = s[comma].str.replace(".", ",", regex=False)
+    nbsp = rng.random(n) < 0.1
+    s[nbsp] = s[nbsp].str.slice(0, 2) + "\u00a0" + s[nbsp].str.slice(2)
+    s[rng.random(n) < 0.05] = np.nan
+    return s
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.decimal_parser import DecimalParser
+
+
+def _assert_same(got: pd.Series, expected: pd.Series):
+    np.testing.assert_array_equal(
+        got.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64)
+    )
+
+
+def test_matches_legacy_on_edge_cases(tricky_values):
+    got = DecimalParser().parse(tricky_values)
+    _assert_same(got, DecimalParser.legacy(tricky_values))
+    assert got.iloc[:9].tolist() == [
+        430512.3,
+        925.5,
+        430512.3,
+        -12.5,
+        7.0,
+        12.0,
+        0.5,
+        12.5,
+        -7.0,
+    ]
+
+
+def test_fast_path_flags(tricky_values):
+    text = tricky_values.iloc[:18].astype(str).to_numpy().astype(str)
+    _, ok = DecimalParser.parse_codepoints(text)
+    assert ok.tolist() == [True] * 9 + [False] * 9
+
+
+@pytest.mark.parametrize("block_rows", [1, 7, 262_144])
+def test_matches_legacy_bit_for_bit(random_values, block_rows):
+    got = DecimalParser(block_rows=block_rows).parse(random_values)
+    _assert_same(got, DecimalParser.legacy(random_values))
+    assert got.index.equals(random_values.index)
+
+
+def test_numeric_input_skips_text():
+    s = pd.Series([1, None, 3], dtype="Int64", name="LAT inicio")
+    got = DecimalParser().parse(s)
+    assert got.dtype == np.float64 and got.name == "LAT inicio"
+    np.testing.assert_array_equal(got.to_numpy(), [1.0, np.nan, 3.0])
+
+
+def test_empty_and_all_missing():
+    assert DecimalParser().parse(pd.Series([], dtype=object)).size == 0
+    got = DecimalParser().parse(pd.Series([None, np.nan], dtype=object))
+    assert got.isna().all()
+
+
+def test_invalid_block_rows():
+    with pytest.raises(ValueError):
+        DecimalParser(block_rows=0)
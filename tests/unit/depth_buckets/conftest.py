@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# A typical ocean product: fine levels near the surface, coarse below.
+LEVELS = [0.49, 1.54, 2.65, 3.82, 5.08, 6.44, 7.93, 9.57, 11.4, 13.47, 15.81, 18.5]
+
+
+@pytest.fixture
+def levels():
+    return np.array(LEVELS)
+
+
+@pytest.fixture
+def tiles_df():
+    rng = np.random.default_rng(5)
+    n = 300
+    tile = rng.integers(0, 40, n)
+    return pd.DataFrame(
+        {
+            "tile_id": tile,
+            "tile_lon_center": -10.0 + (tile % 4) * 0.05,
+            "tile_lat_center": 43.0 + (tile // 4) * 0.05,
+            "time": pd.Timestamp("2021-06-01", tz="UTC")
+            + pd.to_timedelta(rng.integers(0, 3, n), unit="D"),
+            "deepest_depth": rng.uniform(0.0, 20.0, 40)[tile],
+        }
+    ).drop_duplicates(["tile_id", "time"])
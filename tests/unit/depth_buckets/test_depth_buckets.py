@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.app.depth_buckets import (
+    DepthBucketPolicy,
+    depth_policy_from_settings,
+    load_depth_levels,
+    save_depth_levels,
+)
+from src.app.orchestrator import BBoxSpec, TileDayOrchestrator
+
+
+def test_snap_to_levels_never_goes_shallower(levels):
+    policy = DepthBucketPolicy.from_levels(levels)
+    z = np.array([0.1, 0.49, 0.5, 4.0, 13.47, 18.0, 25.0])
+    np.testing.assert_array_equal(
+        policy.snap(z), [0.49, 0.49, 1.54, 5.08, 13.47, 18.5, 25.0]
+    )
+
+
+@pytest.mark.parametrize("extra", [0, 1, 2, 5])
+def test_max_extra_levels_bounds_overfetch(levels, extra):
+    policy = DepthBucketPolicy.from_levels(levels, max_extra_levels=extra)
+    z = np.linspace(0.0, levels[-1], 500)
+    snapped = policy.snap(z)
+    need = np.searchsorted(levels, z, side="left")
+    got = np.searchsorted(levels, snapped, side="left")
+    assert (snapped >= z).all()
+    assert ((got - need) <= extra).all()
+    assert levels[-1] in policy.edges
+    assert policy.edges.size <= -(-levels.size // (extra + 1)) + 1
+
+
+def test_explicit_edges_and_validation():
+    policy = DepthBucketPolicy([100.0, 10.0, 50.0])
+    np.testing.assert_array_equal(policy.edges, [10.0, 50.0, 100.0])
+    np.testing.assert_array_equal(policy.snap([3.0, 10.0, 60.0]), [10.0, 10.0, 100.0])
+    with pytest.raises(ValueError):
+        DepthBucketPolicy([])
+    with pytest.raises(ValueError):
+        DepthBucketPolicy.from_levels([1.0], max_extra_levels=-1)
+
+
+def test_levels_cache_round_trip(tmp_path, levels):
+    path = tmp_path / "meta" / "depth_levels.json"
+    save_depth_levels(path, "ds_a", levels[::-1])
+    save_depth_levels(path, "ds_b", [1.0, 2.0])
+    np.testing.assert_array_equal(load_depth_levels(path, "ds_a"), levels)
+    with pytest.raises(KeyError):
+        load_depth_levels(path, "ds_c")
+    with pytest.raises(FileNotFoundError):
+        load_depth_levels(tmp_path / "missing.json", "ds_a")
+
+    policy = depth_policy_from_settings("ds_a", levels_file=path, edges=(5.0,))
+    np.testing.assert_array_equal(policy.edges, levels)
+    assert depth_policy_from_settings("ds_a") is None
+    np.testing.assert_array_equal(
+        depth_policy_from_settings("ds_a", edges=(5.0, 50.0)).edges, [5.0, 50.0]
+    )
+
+
+def test_bucketing_reduces_request_groups(tiles_df, levels):
+    bboxes = [BBoxSpec("bbox_00", -11.0, 42.0, -9.0, 45.0)]
+    exact = TileDayOrchestrator("ds", ["thetao"], 0.083).build_job_table(
+        tiles_df, bboxes
+    )
+    policy = DepthBucketPolicy.from_levels(levels, max_extra_levels=3)
+    bucketed = TileDayOrchestrator(
+        "ds", ["thetao"], 0.083, depth_policy=policy
+    ).build_job_table(tiles_df, bboxes)
+
+    np.testing.assert_array_equal(bucketed.tile_id, exact.tile_id)
+    assert (bucketed.z_max >= exact.z_max).all()
+    _, n_exact = exact.request_groups()
+    group, n_bucketed = bucketed.request_groups()
+    assert n_bucketed < n_exact
+    assert n_bucketed == len(set(zip(bucketed.day.tolist(), bucketed.z_max)))
+    # Jobs in the same group share bbox, day and depth range.
+    for g in np.unique(group):
+        members = group == g
+        assert np.unique(bucketed.z_max[members]).size == 1
+        assert np.unique(bucketed.day[members]).size == 1
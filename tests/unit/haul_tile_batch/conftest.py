@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.assign_hauls_to_tiles_id import StaticSpec
+from tests.unit import config as test_config
+
+
+@pytest.fixture(scope="session")
+def static_spec() -> StaticSpec:
+    p = test_config.STATIC_FILE_SEA_LAND_SAMPLE
+    if not p.exists():
+        pytest.skip(f"Missing test fixture: {p}")
+    return StaticSpec(path=p, mask_var="mask", is_bit=False, sea_value=1)
+
+
+@pytest.fixture
+def haul_files(tmp_path: Path) -> list[Path]:
+    """Three haul CSVs with random positions over the Galicia static grid."""
+    rng = np.random.default_rng(42)
+    paths = []
+    for n, rows in enumerate((250, 40, 1)):
+        df = pd.DataFrame(
+            {
+                "haul_id": np.arange(rows) + 1000 * n,
+                "lon": rng.uniform(-10.5, -7.5, rows).round(5),
+                "lat": rng.uniform(41.9, 43.9, rows).round(5),
+                "time": "2020-01-01",
+            }
+        )
+        p = tmp_path / f"hauls_{n}.csv"
+        df.to_csv(p, index=False)
+        paths.append(p)
+    return paths
@@ -0,0 +1,153 @@
+import dataclasses
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from src.actions.build_tiles_source_data import (
+    build_tiles_dbs,
+    build_tiles_dbs_parallel,
+)
+from src.bounding_box.bounding_box import BoundingBox
+from src.data_processing import haul_tile_batch
+from src.data_processing.assign_hauls_to_tiles_id import HaulTileAssigner
+from src.data_processing.haul_tile_batch import BatchOptions, HaulTileBatchAssigner
+
+
+def _reference(static_spec, paths: list[Path]) -> pd.DataFrame:
+    assigner = HaulTileAssigner(static_spec=static_spec)
+    assigner.load_static_and_build_index()  # lat0 = median grid latitude
+    hauls = pd.concat([pd.read_csv(p) for p in paths], ignore_index=True)
+    return assigner.assign(hauls)
+
+
+def test_plan_chunks_cover_every_row_once(tmp_path, static_spec, haul_files):
+    batch = HaulTileBatchAssigner(static_spec, tmp_path / "idx", chunk_bytes=512)
+    chunks = batch.plan_chunks(haul_files)
+
+    big = [c for c in chunks if c.path == haul_files[0]]
+    assert len(big) > 1
+    assert big[0].start == 0
+    assert all(a.end == b.start for a, b in zip(big, big[1:]))
+    assert big[-1].end == haul_files[0].stat().st_size
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_matches_single_assigner(tmp_path, static_spec, haul_files, workers):
+    batch = HaulTileBatchAssigner(
+        static_spec, tmp_path / "idx", workers=workers, chunk_bytes=1024
+    )
+    parts = batch.run(haul_files, tmp_path / "out")
+
+    assert [p.chunk.index for p in parts] == list(range(len(parts)))
+    merged = HaulTileBatchAssigner.concat_csv_parts(parts, tmp_path / "all.csv")
+    got = pd.read_csv(merged)
+    expected = _reference(static_spec, haul_files)
+
+    assert sum(p.rows for p in parts) == len(expected)
+    assert np.array_equal(got["haul_id"], expected["haul_id"])
+    assert np.array_equal(got["tile_id"], expected["tile_id"])
+    assert np.allclose(got["tile_lon_center"], expected["tile_lon_center"])
+
+
+@pytest.mark.parametrize("usecols", [["lon", "lat", "time"], [3, 1, 2]])
+def test_usecols_applies_to_every_chunk(tmp_path, static_spec, haul_files, usecols):
+    options = BatchOptions(read_csv_kwargs={"usecols": usecols})
+    batch = HaulTileBatchAssigner(
+        static_spec, tmp_path / "idx", workers=1, chunk_bytes=1024, options=options
+    )
+    parts = batch.run(haul_files[:1], tmp_path / "out")
+    assert len(parts) > 1
+
+    got = pd.read_csv(HaulTileBatchAssigner.concat_csv_parts(parts, tmp_path / "a.csv"))
+    expected = _reference(static_spec, haul_files[:1])
+    assert "haul_id" not in got.columns
+    assert np.array_equal(got["lon"], expected["lon"])
+    assert np.array_equal(got["tile_id"], expected["tile_id"])
+
+
+def test_serial_run_leaves_worker_state_alone(tmp_path, static_spec, haul_files):
+    HaulTileBatchAssigner(static_spec, tmp_path / "idx", workers=1).run(
+        haul_files, tmp_path / "out"
+    )
+    assert haul_tile_batch._WORKER == {}
+
+
+def test_index_built_once_and_reused(tmp_path, static_spec, haul_files):
+    index_dir = tmp_path / "idx"
+    batch = HaulTileBatchAssigner(static_spec, index_dir, workers=1)
+    batch.ensure_index()
+    assert HaulTileAssigner.index_exists(index_dir)
+    stamp = (index_dir / "tile_id_map.npy").stat().st_mtime_ns
+
+    batch.run(haul_files[:1], tmp_path / "out")
+    assert (index_dir / "tile_id_map.npy").stat().st_mtime_ns == stamp
+
+
+def test_stale_index_is_rebuilt(tmp_path, static_spec, haul_files):
+    static = tmp_path / "static.nc"
+    static.write_bytes(static_spec.path.read_bytes())
+    spec = dataclasses.replace(static_spec, path=static)
+    index_dir = tmp_path / "idx"
+    HaulTileBatchAssigner(spec, index_dir, workers=1).ensure_index()
+    meta = json.loads((index_dir / "kd_index.json").read_text())
+    assert meta["static_size"] == static.stat().st_size and meta["grid_hash"]
+
+    # Another lat0 hint, then a modified static file: both rebuild the index.
+    HaulTileBatchAssigner(spec, index_dir, lat0=43.0, workers=1).ensure_index()
+    assert json.loads((index_dir / "kd_index.json").read_text())["lat0"] == 43.0
+    os.utime(static, ns=(0, 0))
+    loader = HaulTileAssigner(static_spec=spec)
+    with pytest.raises(ValueError, match="static_mtime_ns"):
+        loader.load_index(index_dir)
+    HaulTileBatchAssigner(spec, index_dir, workers=1).ensure_index()
+    loader.load_index(index_dir)
+    assert loader.stale_index_reason(index_dir, check_grid=True) is None
+
+
+def test_static_file_with_lat_lon_dims_and_region(tmp_path, static_spec, haul_files):
+    renamed = tmp_path / "static_lat_lon.nc"
+    with xr.open_dataset(static_spec.path) as ds:
+        ds.rename(latitude="lat", longitude="lon").to_netcdf(renamed)
+    region = BoundingBox(min_lon=-10.0, max_lon=-8.0, min_lat=42.0, max_lat=43.5)
+    hauls = pd.read_csv(haul_files[1])
+
+    def assign(spec):
+        assigner = HaulTileAssigner(static_spec=spec)
+        assigner.load_static_and_build_index(lat0_hint=42.5)
+        return assigner.assign(hauls)
+
+    expected = assign(dataclasses.replace(static_spec, region=region))
+    got = assign(dataclasses.replace(static_spec, path=renamed, region=region))
+    assert np.array_equal(got["tile_id"], expected["tile_id"])
+    assert np.allclose(got["tile_lat_center"], expected["tile_lat_center"])
+
+
+def test_parallel_tile_dbs_match_in_memory(tmp_path, static_spec, haul_files):
+    hauls = pd.read_csv(haul_files[0]).assign(depth=50.0)
+    hauls_csv = tmp_path / "clean_haul_db.csv"
+    hauls.to_csv(hauls_csv, index=False)
+
+    enriched, per_day = build_tiles_dbs(hauls, static_spec.path)
+    got_enriched, got_per_day = build_tiles_dbs_parallel(
+        hauls_csv, static_spec.path, tmp_path / "work", workers=2
+    )
+
+    assert np.array_equal(got_enriched["tile_id"], enriched["tile_id"])
+    assert np.array_equal(got_per_day["tile_id"], per_day["tile_id"])
+    assert not (tmp_path / "work" / "_assign_parts").exists()
+    assert HaulTileAssigner.index_exists(tmp_path / "work" / "_haul_tile_index")
+
+
+def test_invalid_arguments(tmp_path, static_spec):
+    with pytest.raises(ValueError):
+        HaulTileBatchAssigner(static_spec, tmp_path, chunk_bytes=0)
+    with pytest.raises(ValueError):
+        HaulTileBatchAssigner(
+            static_spec, tmp_path, options=BatchOptions(output_format="xlsx")
+        )
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+COLUMNS_MAP = {
+    "haul_id": "Idlance",
+    "time": "date",
+    "lat": "lat",
+    "lon": "lon",
+    "depth": "depth",
+}
+
+
+@pytest.fixture
+def columns_map():
+    return dict(COLUMNS_MAP)
+
+
+@pytest.fixture
+def raw_hauls():
+    """Logbook-like export: repeated ids, missing coords/depths, bad dates."""
+    rng = np.random.default_rng(3)
+    n = 240
+    ids = rng.integers(0, 150, n)  # plenty of duplicates, spread over chunks
+    lon = (rng.uniform(8, 10, n) * 100000).round(1).astype(str)
+    lat = (rng.uniform(42, 44, n) * 100000).round(1).astype(str)
+    lon = np.char.replace(lon, ".", ",")  # decimal commas
+    df = pd.DataFrame(
+        {
+            "Idlance": ids,
+            "dia": [
+                f"{d}/{m}/2001"
+                for d, m in zip(rng.integers(1, 29, n), rng.integers(1, 13, n))
+            ],
+            "LON inicio": lon,
+            "LAT inicio": lat,
+            "LON final": lon,
+            "LAT final": lat,
+            "PROFMax": rng.uniform(10, 500, n).round(1),
+            "PROFMin": rng.uniform(5, 100, n).round(1),
+            "Puerto": "A Coruña",  # latin-1 text in an unused column
+        }
+    )
+    df.loc[5, ["LON inicio", "LON final"]] = np.nan
+    df.loc[7, ["PROFMax", "PROFMin"]] = np.nan
+    df.loc[[11, 90], "dia"] = ["31/02/2001", "n/a"]
+    return df
+
+
+@pytest.fixture
+def to_fix_hauls(raw_hauls):
+    ids = raw_hauls["Idlance"].drop_duplicates().to_numpy()
+    return pd.DataFrame(
+        {"haul_id": ids[:2], "lon_corrected": [np.nan, -9.5]}  # drop one, fix one
+    )
+
+
+@pytest.fixture
+def raw_csv(tmp_path, raw_hauls):
+    path = tmp_path / "capturas.csv"
+    raw_hauls.to_csv(path, index=False, encoding="latin-1")
+    return path
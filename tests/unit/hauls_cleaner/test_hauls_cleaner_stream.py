@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from src.data_processing.hauls_cleaner import HaulDbBuilder
+
+
+def _in_memory(raw_csv, to_fix_hauls, columns_map):
+    raw = pd.read_csv(raw_csv, encoding="latin-1")
+    builder = HaulDbBuilder(raw, to_fix_hauls)
+    return builder.run(columns_map), builder
+
+
+@pytest.mark.parametrize("chunksize", [1, 17, 100, 10_000])
+def test_stream_matches_in_memory_run(
+    tmp_path, raw_csv, to_fix_hauls, columns_map, chunksize
+):
+    expected, builder = _in_memory(raw_csv, to_fix_hauls, columns_map)
+    out = tmp_path / "clean.csv"
+    bad = tmp_path / "bad_dia.csv"
+
+    summary = HaulDbBuilder.stream_csv(
+        raw_csv, out, to_fix_hauls, columns_map, chunksize=chunksize, invalid_path=bad
+    )
+
+    assert out.read_text() == expected.to_csv(index=False)
+    assert summary.rows_in == 240
+    assert summary.rows_out == len(expected)
+    assert (
+        summary.duplicates
+        == 240 - pd.read_csv(raw_csv, encoding="latin-1")["Idlance"].nunique()
+    )
+    assert summary.invalid_dia == len(builder.invalid_dia) >= 1
+    assert pd.read_csv(bad)["dia"].tolist() == builder.invalid_dia["dia"].tolist()
+
+
+def test_drop_seen_keeps_first_across_chunks():
+    seen = set()
+    a = HaulDbBuilder._drop_seen(pd.DataFrame({"Idlance": [1, 2, 1, None]}), seen)
+    b = HaulDbBuilder._drop_seen(pd.DataFrame({"Idlance": [2, 3, None]}), seen)
+    assert a.index.tolist() == [0, 1, 3]
+    assert b.index.tolist() == [1]
+    assert len(seen) == 4
+
+
+def test_stream_dedupes_ids_across_inferred_dtypes(
+    tmp_path, raw_csv, to_fix_hauls, columns_map
+):
+    # the first chunk infers int ids, the second object ids ("A1")
+    raw = pd.read_csv(raw_csv, encoding="latin-1").head(4)
+    mixed = pd.concat([raw, raw.head(1).assign(Idlance="A1"), raw.head(1)])
+    src = tmp_path / "mixed.csv"
+    mixed.to_csv(src, index=False, encoding="latin-1")
+
+    summary = HaulDbBuilder.stream_csv(
+        src, tmp_path / "clean.csv", to_fix_hauls, columns_map, chunksize=4
+    )
+
+    assert summary.rows_in == 6
+    assert summary.duplicates == 1 + 4 - raw["Idlance"].nunique()
+
+
+def test_stream_keeps_raw_columns_from_columns_map(
+    tmp_path, raw_csv, to_fix_hauls, columns_map
+):
+    columns_map["port"] = "Puerto"
+    expected, _ = _in_memory(raw_csv, to_fix_hauls, columns_map)
+    out = tmp_path / "clean.csv"
+
+    HaulDbBuilder.stream_csv(raw_csv, out, to_fix_hauls, columns_map, chunksize=50)
+
+    assert expected["port"].eq("A Coruña").all()
+    assert out.read_text() == expected.to_csv(index=False)
+
+
+def test_stream_rejects_bad_chunksize(tmp_path, raw_csv, to_fix_hauls, columns_map):
+    with pytest.raises(ValueError):
+        HaulDbBuilder.stream_csv(
+            raw_csv, tmp_path / "o.csv", to_fix_hauls, columns_map, chunksize=0
+        )
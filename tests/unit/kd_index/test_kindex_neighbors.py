@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from src.data_processing.kd_index import KDIndex
+from src.data_processing.tile_catalog import TileCatalog
+
+
+def _brute_sorted(kdi: KDIndex, q_lon: float, q_lat: float):
+    sea_lon, sea_lat = kdi.catalog.sea_tile_coords()
+    c = np.cos(np.radians(kdi.lat0))
+    d = np.hypot((sea_lon - q_lon) * c, sea_lat - q_lat)
+    order = np.lexsort((np.arange(d.size), d))
+    return order, d[order]
+
+
+def test_knn_csr_shape_and_order(grid_3x3, mask_all_sea):
+    kdi = KDIndex(TileCatalog(grid_3x3, mask_all_sea))
+    lons = np.array([1.0, 0.1])
+    lats = np.array([10.2, 11.9])
+
+    offsets, ids, dist = kdi.query_knn(lons, lats, k=3)
+
+    assert offsets.tolist() == [0, 3, 6]
+    assert ids.dtype == np.int64 and dist.dtype == np.float64
+    for q in range(lons.size):
+        row = slice(offsets[q], offsets[q + 1])
+        exp_ids, exp_d = _brute_sorted(kdi, lons[q], lats[q])
+        assert int(ids[row][0]) == int(exp_ids[0])
+        assert np.allclose(dist[row], exp_d[:3])
+        assert np.all(np.diff(dist[row]) >= 0)
+
+
+def test_knn_first_neighbor_matches_query_many(grid_3x3, mask_all_sea):
+    kdi = KDIndex(TileCatalog(grid_3x3, mask_all_sea))
+    rng = np.random.default_rng(0)
+    lons = rng.uniform(0.0, 2.0, 50)
+    lats = rng.uniform(10.0, 12.0, 50)
+
+    offsets, ids, _ = kdi.query_knn(lons, lats, k=1)
+    assert np.array_equal(ids[offsets[:-1]], kdi.query_many(lons, lats))
+
+
+def test_knn_tolerance_and_k_larger_than_tiles(
+    grid_counterexample, mask_counterexample
+):
+    kdi = KDIndex(TileCatalog(grid_counterexample, mask_counterexample))
+
+    # Only two sea tiles exist: k=5 yields two entries.
+    offsets, ids, _ = kdi.query_knn(np.array([0.5]), np.array([60.0]), k=5)
+    assert offsets.tolist() == [0, 2]
+    assert ids.tolist() == [0, 1]  # east wins under the cosine metric
+
+    # Far-away query with tolerance yields an empty row.
+    offsets, ids, dist = kdi.query_knn(
+        np.array([0.5, 50.0]), np.array([60.0, 0.0]), k=2, tolerance_deg=0.3
+    )
+    assert offsets.tolist() == [0, 1, 1]
+    assert ids.tolist() == [0]
+    assert dist.size == 1
+
+
+def test_knn_keeps_neighbors_exactly_at_tolerance(grid_3x3, mask_all_sea):
+    kdi = KDIndex(TileCatalog(grid_3x3, mask_all_sea))
+    # Halfway between the (0, 10) and (0, 11) centers: both exactly 0.5 away.
+    lons, lats = np.array([0.0]), np.array([10.5])
+
+    offsets, ids, dist = kdi.query_knn(lons, lats, k=3, tolerance_deg=0.5)
+    assert offsets.tolist() == [0, 2]
+    assert sorted(ids.tolist()) == [0, 3]
+    assert dist.tolist() == [0.5, 0.5]
+    assert kdi.query_many(lons, lats, tolerance_deg=0.5)[0] in ids  # not -1
+
+    offsets, _, _ = kdi.query_knn(lons, lats, k=3, tolerance_deg=0.4999)
+    assert offsets.tolist() == [0, 0]
+
+
+def test_radius_matches_bruteforce(grid_3x3, mask_all_sea):
+    kdi = KDIndex(TileCatalog(grid_3x3, mask_all_sea))
+    lons = np.array([1.0, 0.0, 5.0])
+    lats = np.array([11.0, 10.0, 20.0])
+    radius = 1.0
+
+    offsets, ids, dist = kdi.query_radius(lons, lats, radius_deg=radius)
+
+    assert offsets.size == lons.size + 1
+    for q in range(lons.size):
+        row = slice(offsets[q], offsets[q + 1])
+        exp_ids, exp_d = _brute_sorted(kdi, lons[q], lats[q])
+        keep = exp_d <= radius
+        assert ids[row].tolist() == exp_ids[keep].tolist()
+        assert np.allclose(dist[row], exp_d[keep])
+    # An exact hit on a tile center is included at distance 0.
+    assert int(ids[0]) == 4 and float(dist[0]) == 0.0
+    # The far query has no neighbors.
+    assert offsets[3] == offsets[2]
+
+
+def test_empty_and_invalid_inputs(grid_3x3, mask_all_sea):
+    kdi = KDIndex(TileCatalog(grid_3x3, mask_all_sea))
+    empty = np.array([], dtype=float)
+    for offsets, ids, dist in (
+        kdi.query_knn(empty, empty, k=2),
+        kdi.query_radius(empty, empty, radius_deg=1.0),
+    ):
+        assert offsets.tolist() == [0]
+        assert ids.size == 0 and dist.size == 0
+
+    with pytest.raises(ValueError):
+        kdi.query_knn(np.array([1.0]), np.array([1.0, 2.0]), k=1)
+    with pytest.raises(ValueError):
+        kdi.query_knn(np.array([1.0]), np.array([1.0]), k=0)
+    with pytest.raises(ValueError):
+        kdi.query_radius(np.array([1.0]), np.array([1.0]), radius_deg=-1.0)
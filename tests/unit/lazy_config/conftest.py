@@ -0,0 +1,78 @@
+import pytest
+
+from src.config import _RESOLVERS, cfg
+
+# Every variable any setting reads, so tests start from an empty environment.
+ENV_KEYS = [
+    "OUTPUT_PATH",
+    "INPUT_PATH",
+    "S3_BUCKET",
+    "S3_OUTPUT_PREFIX",
+    "AWS_CLEAN",
+    "AWS_VERBOSE",
+    "AWS_POLICY",
+    "AWS_PROGRESS_STEP",
+    "AWS_MAX_CONCURRENCY",
+    "AWS_UPLOAD_MODE",
+    "ARCHIVE_FORMAT",
+    "ARCHIVE_LEVEL",
+    "ARCHIVE_WORKERS",
+    "DOWNLOAD_AND_CONVERT",
+    "TILE_CSV_FILENAME",
+    "PRODUCT_OWNER",
+    "STATIC_FILENAME",
+    "PRODUCT_SLUG",
+    "DATASET_ID",
+    "VARIABLES",
+    "SPATIAL_RESOLUTION_DEG",
+    "REGION_MIN_LON",
+    "REGION_MAX_LON",
+    "REGION_MIN_LAT",
+    "REGION_MAX_LAT",
+    "LAT_BAND_COUNT",
+    "BBOX_MAX_TILES",
+    "DEPTH_LEVELS_FILE",
+    "DEPTH_BUCKET_EDGES",
+    "DEPTH_MAX_EXTRA_LEVELS",
+]
+
+FULL_ENV = {
+    "OUTPUT_PATH": "/tmp/out",
+    "INPUT_PATH": "/tmp/in",
+    "S3_BUCKET": "bucket",
+    "S3_OUTPUT_PREFIX": "prefix",
+    "AWS_CLEAN": "false",
+    "AWS_VERBOSE": "yes",
+    "AWS_POLICY": "skip_if_exists",
+    "AWS_PROGRESS_STEP": "0.25",
+    "AWS_MAX_CONCURRENCY": "4",
+    "DOWNLOAD_AND_CONVERT": "1",
+    "TILE_CSV_FILENAME": "tiles.csv",
+    "PRODUCT_OWNER": "owner",
+    "STATIC_FILENAME": "static.nc",
+    "PRODUCT_SLUG": "SST",
+    "DATASET_ID": "cmems_sst",
+    "VARIABLES": "thetao,so",
+    "SPATIAL_RESOLUTION_DEG": "0.05",
+    "REGION_MIN_LON": "-10",
+    "REGION_MAX_LON": "-7",
+    "REGION_MIN_LAT": "41.8",
+    "REGION_MAX_LAT": "44",
+    "LAT_BAND_COUNT": "3",
+}
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """Empty environment (no .env either); returns a setter for single keys."""
+    monkeypatch.setattr("src.config._env_loaded", True)
+    for key in ENV_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    cfg.reset()
+    yield lambda **kv: [monkeypatch.setenv(k, v) for k, v in kv.items()]
+    cfg.reset()
+
+
+@pytest.fixture
+def resolvers():
+    return _RESOLVERS
@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.config import Config, cfg
+
+from .conftest import ENV_KEYS, FULL_ENV
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+HEAVY_MODULES = ("copernicusmarine", "xarray", "boto3", "geopandas", "matplotlib")
+IMPORT_BUDGET_S = 1.0
+
+
+def test_every_config_field_has_a_resolver(resolvers):
+    assert set(resolvers) == set(Config.__dataclass_fields__)
+
+
+def test_setting_resolves_on_first_access_and_is_cached(env):
+    env(S3_BUCKET="first")
+    assert cfg.s3_bucket == "first"
+    os.environ["S3_BUCKET"] = "second"
+    assert cfg.s3_bucket == "first"
+
+    cfg.reset()
+    assert cfg.s3_bucket == "second"
+
+
+def test_missing_key_only_fails_when_read(env):
+    env(S3_BUCKET="bucket")
+    assert cfg.s3_bucket == "bucket"
+    with pytest.raises(ValueError, match="OUTPUT_PATH"):
+        cfg.output_path
+
+
+def test_unknown_setting_is_an_attribute_error(env):
+    with pytest.raises(AttributeError):
+        cfg.not_a_setting
+
+
+def test_require_lists_every_problem(env):
+    env(S3_BUCKET="bucket", AWS_MAX_CONCURRENCY="many")
+    with pytest.raises(ValueError) as exc:
+        cfg.require(
+            ["s3_bucket", "s3_output_prefix", "aws_max_concurrency", "input_path"]
+        )
+    msg = str(exc.value)
+    assert msg.startswith("Invalid configuration: ")
+    assert "S3_OUTPUT_PREFIX" in msg and "INPUT_PATH" in msg
+    assert "aws_max_concurrency (" in msg
+    assert "S3_BUCKET" not in msg
+
+
+@pytest.mark.parametrize("step", ["0", "-0.1", "1.5"])
+def test_progress_step_must_be_a_fraction(env, step):
+    env(AWS_PROGRESS_STEP=step)
+    with pytest.raises(ValueError, match="AWS_PROGRESS_STEP"):
+        cfg.aws_progress_step
+    cfg.reset()
+    env(AWS_PROGRESS_STEP="1")
+    assert cfg.aws_progress_step == 1.0
+
+
+def test_optional_settings_have_defaults(env):
+    assert cfg.aws_upload_mode == "zip"
+    assert cfg.archive_level is None
+    assert cfg.archive_workers is None
+    assert cfg.bbox_max_tiles == 0
+    assert cfg.depth_levels_file is None
+    assert cfg.depth_bucket_edges == ()
+
+
+def test_load_builds_a_full_config(env):
+    env(**FULL_ENV)
+    config = cfg.load()
+    assert isinstance(config, Config)
+    assert config.output_root == Path("/tmp/out/owner/data")
+    assert config.variables == ("thetao", "so")
+    assert config.product_slug == "sst"
+    assert config.aws_clean is False and config.aws_verbose is True
+
+
+def test_actions_import_fast_without_env_or_heavy_sdks(tmp_path):
+    script = (
+        "import sys, time\n"
+        "t0 = time.perf_counter()\n"
+        "import src.config, src.actions.zip_and_upload_to_s3\n"
+        "import src.actions.fetch_copernicus_data, src.actions.download_static_layer\n"
+        "elapsed = time.perf_counter() - t0\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(elapsed, ','.join(heavy))\n"
+    )
+    environment = {k: v for k, v in os.environ.items() if k not in ENV_KEYS}
+    environment["PYTHONPATH"] = str(REPO_ROOT)
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,  # no .env here
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert time.perf_counter() - t0 < 30  # sanity bound for the whole interpreter
+    assert len(out) == 1, f"heavy modules imported: {out[1:]}"
+    assert float(out[0]) < IMPORT_BUDGET_S
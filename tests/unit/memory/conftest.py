@@ -0,0 +1,31 @@
+import pytest
+
+from src import memory
+
+
+@pytest.fixture
+def accountant():
+    acc = memory.enable_memory_accounting()
+    yield acc
+    memory.disable_memory_accounting()
+
+
+@pytest.fixture
+def no_accounting(monkeypatch):
+    memory.disable_memory_accounting()
+    monkeypatch.delenv(memory.ACCOUNTING_ENV, raising=False)
+
+
+def record(name, growth, kind="tile"):
+    return memory.MemoryRecord(
+        kind=kind,
+        name=name,
+        pid=1,
+        seconds=0.1,
+        rss_start=100 * memory.MiB,
+        rss_end=100 * memory.MiB,
+        rss_peak=100 * memory.MiB + growth,
+        peak_scope="block",
+        traced_delta=0,
+        traced_peak=0,
+    )
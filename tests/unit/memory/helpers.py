@@ -0,0 +1,12 @@
+import numpy as np
+
+from src.memory import drain_records, measure_memory
+
+
+def allocate_in_worker(mib: int):
+    """Process-pool task: allocates `mib` MiB inside a tile block."""
+    with measure_memory("tile", f"worker/{mib}") as attrs:
+        block = np.ones(mib * 1024 * 1024, dtype=np.uint8)
+        attrs["bytes"] = int(block.nbytes)
+        del block
+    return drain_records()
@@ -0,0 +1,99 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src import cli, memory
+from src.memory import MiB, measure_memory
+
+from .conftest import record
+from .helpers import allocate_in_worker
+
+
+def test_probes_report_plausible_sizes():
+    assert memory.rss_bytes() > MiB
+    assert memory.peak_rss_bytes() >= memory.rss_bytes() // 2
+
+
+def test_block_records_rss_and_traced_peaks(accountant):
+    with measure_memory("tile", "bbox_1/00001", files=2) as attrs:
+        block = np.ones(64 * MiB, dtype=np.uint8)
+        attrs["rows"] = 10
+        del block
+
+    [rec] = accountant.records
+    assert (rec.kind, rec.name, rec.pid) == ("tile", "bbox_1/00001", os.getpid())
+    assert rec.attrs == {"files": 2, "rows": 10}
+    assert rec.traced_peak >= 60 * MiB
+    assert abs(rec.traced_delta) < 8 * MiB  # freed before the block ended
+    if rec.peak_scope == "block":
+        assert rec.rss_growth >= 48 * MiB
+
+
+def test_outer_block_keeps_the_inner_peak(accountant):
+    with measure_memory("stage", "convert"):
+        with measure_memory("tile", "t1"):
+            block = np.ones(48 * MiB, dtype=np.uint8)
+            del block
+        with measure_memory("tile", "t2"):
+            pass
+
+    stage = [r for r in accountant.records if r.kind == "stage"][0]
+    t2 = [r for r in accountant.records if r.name == "t2"][0]
+    assert stage.traced_peak >= 40 * MiB
+    assert t2.traced_peak < 8 * MiB
+
+
+def test_worker_records_come_back_to_the_parent(accountant):
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        for records in pool.map(allocate_in_worker, [8, 24]):
+            accountant.add(records)
+    workers = [r for r in accountant.records if r.name.startswith("worker/")]
+    assert len(workers) == 2
+    assert all(r.pid != os.getpid() for r in workers)
+    big = [r for r in workers if r.name == "worker/24"][0]
+    assert big.traced_peak >= 20 * MiB
+
+
+def test_outliers_are_relative_to_the_median(accountant):
+    accountant.add(record(f"t{i}", 20 * MiB) for i in range(9))
+    accountant.add([record("huge", 400 * MiB), record("stage", 900 * MiB, "stage")])
+    names = [r.name for r in accountant.outliers(factor=3.0)]
+    assert names == ["huge"]  # a lone stage has no median to compare to
+    assert accountant.outliers(factor=100.0) == []
+
+
+def test_report_has_summary_outliers_and_records(accountant, tmp_path, caplog):
+    accountant.add(record(f"t{i}", 20 * MiB) for i in range(5))
+    accountant.add([record("huge", 400 * MiB)])
+    out = accountant.write_report(tmp_path / "sst.memory-convert.json", stage="convert")
+    report = json.loads(out.read_text())
+    assert report["stage"] == "convert"
+    assert report["summary"]["tile"]["count"] == 6
+    assert report["summary"]["tile"]["max_rss_peak_name"] == "huge"
+    assert [r["name"] for r in report["outliers"]] == ["huge"]
+    assert len(report["records"]) == 6
+    assert "memory outlier: tile huge" in caplog.text
+
+
+def test_accounting_off_is_a_no_op(no_accounting):
+    assert memory.memory_accountant() is None
+    with measure_memory("tile", "x", rows=1) as attrs:
+        attrs["bytes"] = 2
+    assert memory.drain_records() == []
+
+
+def test_cli_memory_report(tmp_path, monkeypatch):
+    monkeypatch.setitem(
+        cli.STAGES,
+        "amalgamate",
+        cli.STAGES["amalgamate"]._replace(handler=lambda a: None),
+    )
+    out = tmp_path / "mem.json"
+    cli.main(["amalgamate", "--memory-report", str(out)])
+    report = json.loads(out.read_text())
+    assert [(r["kind"], r["name"]) for r in report["records"]] == [
+        ("stage", "amalgamate")
+    ]
+    assert memory.memory_accountant() is None
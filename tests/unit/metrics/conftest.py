@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from src.app.jobs import DownloadJob
+from src.app.layout import ProjectLayout
+from src.app.metrics import MetricsRegistry
+from src.app.scheduler import SchedulerContext
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class FakeCM:
+    """copernicusmarine stand-in: writes `payload` bytes, or raises for fail_on paths."""
+
+    def __init__(self, payload: int = 100, fail_on=()):
+        self.payload = payload
+        self.fail_on = set(fail_on)
+        self.calls = 0
+
+    def subset(self, **kw):
+        self.calls += 1
+        out = kw["output_directory"] + "/" + kw["output_filename"]
+        if out in self.fail_on:
+            raise RuntimeError("subset failed")
+        with open(out, "wb") as f:
+            f.write(b"x" * self.payload)
+
+
+@pytest.fixture
+def jobs():
+    return [
+        DownloadJob(
+            bbox_id="bbox_1",
+            tile_id_padded=f"{tile:05d}",
+            lon=-9.0,
+            lat=43.0,
+            day=date(2021, 6, day),
+            z_min=0.0,
+            z_max=10.0,
+            area=(-9.01, 42.99, -8.99, 43.01),
+            dataset_id="ds",
+            variables=("thetao",),
+        )
+        for tile in (1, 2)
+        for day in (1, 2, 3)
+    ]
+
+
+@pytest.fixture
+def ctx(tmp_path):
+    return SchedulerContext(layout=ProjectLayout(root=tmp_path), product_slug="sst")
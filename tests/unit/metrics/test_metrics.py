@@ -0,0 +1,183 @@
+import asyncio
+import dataclasses
+import logging
+import threading
+
+import pytest
+
+from src.app.metrics import REGISTRY, MetricsReporter, Progress
+from src.app.scheduler import AsyncScheduler, SerialScheduler
+
+from .conftest import FakeCM
+
+
+def test_registry_returns_one_object_per_name_and_labels(registry):
+    a = registry.counter("requests_total", "Requests", stage="download")
+    assert registry.counter("requests_total", stage="download") is a
+    assert registry.counter("requests_total", stage="convert") is not a
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total")
+
+
+def test_counter_gauge_histogram(registry):
+    c = registry.counter("c_total")
+    c.inc()
+    c.inc(2.5)
+    assert c.value == 3.5
+    with pytest.raises(ValueError):
+        c.inc(-1)
+
+    g = registry.gauge("queue")
+    g.set(5)
+    g.dec(2)
+    assert g.value == 3
+
+    h = registry.histogram("lat_seconds", buckets=(0.1, 1, 10))
+    for v in (0.05, 0.5, 0.5, 5, 50):
+        h.observe(v)
+    assert h.count == 5 and h.sum == pytest.approx(56.05)
+    assert h.quantile(0.5) == 1
+    assert h.quantile(1.0) == float("inf")
+
+
+def test_render_is_prometheus_text_format(registry):
+    registry.counter("rows_total", "Rows written", bbox='b"1').inc(7)
+    h = registry.histogram("lat_seconds", "Latency", buckets=(0.5, 1))
+    h.observe(0.2)
+    h.observe(2)
+    text = registry.render()
+    assert "# HELP rows_total Rows written\n# TYPE rows_total counter\n" in text
+    assert 'rows_total{bbox="b\\"1"} 7\n' in text
+    assert "# TYPE lat_seconds histogram" in text
+    assert 'lat_seconds_bucket{le="0.5"} 1' in text
+    assert 'lat_seconds_bucket{le="1"} 1' in text
+    assert 'lat_seconds_bucket{le="+Inf"} 2' in text
+    assert "lat_seconds_sum 2.2" in text and "lat_seconds_count 2" in text
+
+
+def test_textfile_is_replaced_atomically(registry, tmp_path):
+    registry.counter("a_total").inc()
+    out = registry.write_textfile(tmp_path / "prom" / "run.prom")
+    assert out.read_text() == registry.render()
+    assert [p.name for p in out.parent.iterdir()] == ["run.prom"]
+
+
+def test_updates_are_thread_and_asyncio_safe(registry):
+    c = registry.counter("hits_total")
+    h = registry.histogram("h_seconds")
+
+    def work():
+        for _ in range(5_000):
+            c.inc()
+            h.observe(0.01)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    async def main():
+        await asyncio.gather(*(asyncio.to_thread(work) for _ in range(4)))
+
+    asyncio.run(main())
+    assert c.value == 40_000
+    assert h.count == 40_000
+
+
+def test_progress_rates_and_eta():
+    p = Progress("download", unit="jobs", window=60)
+    p.start(100)
+    t0 = p._samples[0][0]
+    p.advance(10, nbytes=10 * 1024 * 1024)
+    line = p.line(now=t0 + 5)
+    assert line.startswith("download: 10/100 jobs (10.0%)")
+    assert "2.00 jobs/s" in line and "2.00 MiB/s" in line
+    assert "ETA 00:00:45" in line
+
+    p.advance(20)
+    rate, _ = p.rates(now=t0 + 125)  # window now starts at the t0+5 sample
+    assert rate == pytest.approx(20 / 120)
+    assert Progress("idle").eta(0.0) == 0.0
+
+
+def test_reporter_writes_textfile_and_logs_progress(registry, tmp_path, caplog):
+    registry.counter("x_total").inc()
+    registry.progress("convert", unit="tiles").start(4)
+    out = tmp_path / "run.prom"
+    with caplog.at_level(logging.INFO):
+        with MetricsReporter(registry, textfile=out, interval=0.05):
+            registry.progress("convert").advance(2)
+    assert "x_total 1" in out.read_text()
+    assert "progress convert: 2/4 tiles (50.0%)" in caplog.text
+
+
+def _value(name):
+    return REGISTRY.counter(name).value
+
+
+def test_serial_scheduler_feeds_download_metrics(jobs, ctx):
+    before = {
+        n: _value(n)
+        for n in (
+            "download_requests_total",
+            "download_bytes_total",
+            "download_skipped_total",
+        )
+    }
+    lat = REGISTRY.histogram("download_request_seconds").count
+    SerialScheduler(cm_handle=FakeCM(payload=100)).download(jobs, ctx)
+    SerialScheduler(cm_handle=FakeCM()).download(jobs, ctx)  # all present now
+
+    assert _value("download_requests_total") - before["download_requests_total"] == 6
+    assert _value("download_bytes_total") - before["download_bytes_total"] == 600
+    assert _value("download_skipped_total") - before["download_skipped_total"] == 6
+    assert REGISTRY.histogram("download_request_seconds").count - lat == 6
+    progress = REGISTRY.progress("download")
+    assert (progress.done, progress.total) == (6, 6)
+    assert REGISTRY.gauge("download_queue_depth").value == 0
+    assert REGISTRY.gauge("download_in_flight").value == 0
+
+
+def test_async_scheduler_counts_errors(jobs, ctx):
+    errors = _value("download_errors_total")
+    failing = ctx.layout.nc_path(
+        product="sst",
+        bbox_id=jobs[0].bbox_id,
+        tile_id_padded=jobs[0].tile_id_padded,
+        day_iso=jobs[0].day.isoformat(),
+    )
+    cm = FakeCM(fail_on={str(failing)})
+    with pytest.raises(RuntimeError):
+        AsyncScheduler(cm_handle=cm, max_concurrency=2).download(jobs, ctx)
+    assert _value("download_errors_total") - errors == 1
+    assert REGISTRY.gauge("download_in_flight").value == 0
+
+
+class _PartialCM(FakeCM):
+    """Writes a truncated file, then fails."""
+
+    def subset(self, **kw):
+        with open(kw["output_directory"] + "/" + kw["output_filename"], "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("subset failed")
+
+
+@pytest.mark.parametrize("scheduler", ["serial", "async"])
+def test_failed_refresh_keeps_previous_file(jobs, ctx, scheduler):
+    jobs = jobs[:1]
+    SerialScheduler(cm_handle=FakeCM(payload=100)).download(jobs, ctx)
+    nc_dir = ctx.layout.nc_tile_dir("sst", jobs[0].bbox_id, jobs[0].tile_id_padded)
+    refresh = [dataclasses.replace(jobs[0], refresh=True)]
+
+    cm = _PartialCM()
+    make = {
+        "serial": lambda: SerialScheduler(cm_handle=cm),
+        "async": lambda: AsyncScheduler(cm_handle=cm, max_concurrency=1),
+    }[scheduler]
+    with pytest.raises(RuntimeError):
+        make().download(refresh, ctx)
+    assert [p.stat().st_size for p in nc_dir.iterdir()] == [100]
+
+    SerialScheduler(cm_handle=FakeCM(payload=250)).download(refresh, ctx)
+    assert [p.stat().st_size for p in nc_dir.iterdir()] == [250]
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def csr_three_rows():
+    """
+    Three query rows over a 4-tile value vector:
+      row 0 → tiles 0 (d=1), 1 (d=2)
+      row 1 → no neighbors
+      row 2 → tiles 2 (d=0.5), 3 (d=1.0; value NaN, must be skipped)
+    """
+    offsets = np.array([0, 2, 2, 4], dtype=np.int64)
+    tile_ids = np.array([0, 1, 2, 3], dtype=np.int64)
+    distances = np.array([1.0, 2.0, 0.5, 1.0], dtype=np.float64)
+    return offsets, tile_ids, distances
+
+
+@pytest.fixture
+def tile_values() -> np.ndarray:
+    return np.array([10.0, 20.0, 30.0, np.nan], dtype=np.float64)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from src.data_processing.neighbor_aggregator import NeighborAggregator
+
+
+def test_uniform_mean(csr_three_rows, tile_values):
+    out = NeighborAggregator(weighting="uniform").aggregate(tile_values, csr_three_rows)
+    assert out.shape == (3,)
+    assert out[0] == pytest.approx(15.0)
+    assert np.isnan(out[1])
+    assert out[2] == pytest.approx(30.0)  # NaN neighbor skipped
+
+
+def test_inverse_distance_mean(csr_three_rows, tile_values):
+    out = NeighborAggregator(weighting="inverse_distance").aggregate(
+        tile_values, csr_three_rows
+    )
+    # weights 1/1 and 1/2 → (10 + 10) / 1.5
+    assert out[0] == pytest.approx(20.0 / 1.5)
+    assert np.isnan(out[1])
+    assert out[2] == pytest.approx(30.0)
+
+
+def test_exact_hit_dominates():
+    neighbors = (
+        np.array([0, 2], dtype=np.int64),
+        np.array([0, 1], dtype=np.int64),
+        np.array([0.0, 1.0]),
+    )
+    out = NeighborAggregator().aggregate(np.array([5.0, 100.0]), neighbors)
+    assert out[0] == pytest.approx(5.0)
+
+
+def test_invalid_arguments(csr_three_rows):
+    with pytest.raises(ValueError):
+        NeighborAggregator(weighting="gaussian")
+    with pytest.raises(IndexError):
+        NeighborAggregator().aggregate(np.array([1.0, 2.0]), csr_three_rows)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.orchestrator import BBoxSpec, TileDayOrchestrator
+
+
+@pytest.fixture
+def orchestrator():
+    return TileDayOrchestrator("ds", ["thetao", "so"], spatial_resolution_deg=0.083)
+
+
+@pytest.fixture
+def lat_bands():
+    edges = np.linspace(40.0, 46.0, 4)
+    return [
+        BBoxSpec(f"bbox_{k:02d}", -12.0, float(lo), -1.0, float(hi))
+        for k, (lo, hi) in enumerate(zip(edges[:-1], edges[1:]))
+    ]
+
+
+@pytest.fixture
+def tiles_df():
+    rng = np.random.default_rng(21)
+    n = 400
+    tile = rng.integers(0, 60, n)
+    lat = 40.0 + (tile % 13) * 0.5  # includes the shared band edges 42 and 44
+    days = pd.Timestamp("2021-03-01", tz="UTC") + pd.to_timedelta(
+        rng.integers(0, 30, n), unit="D"
+    )
+    return pd.DataFrame(
+        {
+            "tile_id": tile,
+            "tile_lon_center": -10.0 + (tile % 7) * 0.25,
+            "tile_lat_center": lat,
+            "time": days,
+            "deepest_depth": np.where(tile % 5 == 0, 0.2, tile * 3.0),
+        }
+    ).drop_duplicates(["tile_id", "time"])
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from src.app.jobs import DownloadJob
+
+
+def row_by_row_jobs(orch, df, bboxes):
+    """Reference planner: one row at a time, first containing bbox wins."""
+    eps = orch.spatial_resolution_deg / 8.0
+    out = []
+    for row in df.sort_values(["tile_id", "time"], kind="stable").itertuples(
+        index=False
+    ):
+        day = row.time
+        day = datetime.fromisoformat(day).date() if isinstance(day, str) else day.date()
+        lon, lat = float(row.tile_lon_center), float(row.tile_lat_center)
+        picked = next(b for b in bboxes if b.contains(lon, lat))
+        deepest = float(row.deepest_depth)
+        out.append(
+            DownloadJob(
+                bbox_id=picked.bbox_id,
+                tile_id_padded=str(int(row.tile_id)).zfill(5),
+                lon=lon,
+                lat=lat,
+                day=day,
+                z_min=0.6,
+                z_max=deepest if deepest > 0.6 else 0.6,
+                area=(lon - eps, lat - eps, lon + eps, lat + eps),
+                dataset_id=orch.dataset_id,
+                variables=orch.variables,
+            )
+        )
+    return out
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.app.orchestrator import BBoxSpec
+
+from .helpers import row_by_row_jobs
+
+
+def test_lat_bands_match_row_by_row(orchestrator, tiles_df, lat_bands):
+    got = orchestrator.build_jobs(tiles_df, lat_bands)
+    assert got == row_by_row_jobs(orchestrator, tiles_df, lat_bands)
+
+
+def test_string_days_and_generic_bboxes(orchestrator, tiles_df):
+    # Overlapping, unordered boxes take the generic first-match path.
+    boxes = [
+        BBoxSpec("east", -9.0, 39.0, -8.0, 47.0),
+        BBoxSpec("all", -12.0, 39.0, -1.0, 47.0),
+    ]
+    as_text = tiles_df.assign(time=tiles_df["time"].dt.strftime("%Y-%m-%d"))
+    got = orchestrator.build_jobs(as_text, boxes)
+    assert got == row_by_row_jobs(orchestrator, as_text, boxes)
+    assert {j.bbox_id for j in got} == {"east", "all"}
+
+
+def test_job_table_is_lazy_and_indexable(orchestrator, tiles_df, lat_bands):
+    table = orchestrator.build_job_table(tiles_df.assign(refresh=True), lat_bands)
+    assert len(table) == len(tiles_df)
+    assert table.area.shape == (len(tiles_df), 4)
+    assert table[-1] == list(table)[-1]
+    assert table[0].refresh is True
+    with pytest.raises(IndexError):
+        table[len(table)]
+
+
+def test_tile_outside_bboxes_raises(orchestrator, tiles_df, lat_bands):
+    tiles_df.loc[tiles_df.index[3], "tile_lat_center"] = 50.0
+    with pytest.raises(ValueError, match="lat=50.0"):
+        orchestrator.build_job_table(tiles_df, lat_bands)
+
+
+def test_depth_floor(orchestrator, tiles_df, lat_bands):
+    table = orchestrator.build_job_table(tiles_df, lat_bands)
+    assert np.all(table.z_min == 0.6)
+    assert np.all(table.z_max >= 0.6)
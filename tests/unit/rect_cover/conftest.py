@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from src.data_processing.grid_spec import GridSpec
+from src.data_processing.tile_catalog import TileCatalog
+
+
+@pytest.fixture
+def sea_catalog():
+    # 40×60 grid, 0.1° step, all sea: tile_id == j * 60 + i.
+    lons = np.round(np.arange(-10.0, -4.0, 0.1), 6)
+    lats = np.round(np.arange(40.0, 44.0, 0.1), 6)
+    grid = GridSpec(
+        lon_name="longitude", lat_name="latitude", lons=lons, lats=lats, grid_hash="t"
+    )
+    return TileCatalog(grid=grid, sea_land_mask=np.ones((40, 60), dtype=bool))
+
+
+@pytest.fixture
+def two_clusters(sea_catalog):
+    """Two dense 5×5 blocks far apart plus a sparse diagonal."""
+    nx = sea_catalog.grid.nx
+    ids = [j * nx + i for j in range(2, 7) for i in range(3, 8)]
+    ids += [j * nx + i for j in range(30, 35) for i in range(45, 50)]
+    ids += [(10 + k) * nx + (20 + k) for k in range(0, 15, 3)]
+    return np.array(ids)
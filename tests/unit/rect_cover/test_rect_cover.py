@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from src.copernicus.cm_subset_client import CMSubsetClient
+from src.data_processing.rect_cover import CoverCostModel, RectangleCover
+
+
+def _coverage(plan, shape):
+    hits = np.zeros(shape, dtype=int)
+    for r in plan.rects:
+        hits[r.j0 : r.j1, r.i0 : r.i1] += 1
+    return hits
+
+
+def _active_mask(catalog, tile_ids):
+    jj, ii = catalog.sea_cell_ids_many(tile_ids)
+    mask = np.zeros((catalog.grid.ny, catalog.grid.nx), dtype=bool)
+    mask[jj, ii] = True
+    return mask
+
+
+@pytest.mark.parametrize("request_cost", [0.0, 5.0, 50.0, 1e9])
+def test_cover_is_disjoint_and_complete(sea_catalog, two_clusters, request_cost):
+    plan = RectangleCover(sea_catalog, CoverCostModel(request_cost)).plan(two_clusters)
+    hits = _coverage(plan, (sea_catalog.grid.ny, sea_catalog.grid.nx))
+    active = _active_mask(sea_catalog, two_clusters)
+
+    assert hits.max() == 1
+    assert (hits[active] == 1).all()
+    assert plan.active_cells == two_clusters.size
+    assert sum(r.active for r in plan.rects) == plan.active_cells
+    assert plan.wasted_cells == plan.downloaded_cells - two_clusters.size
+
+
+def test_cost_model_extremes(sea_catalog, two_clusters):
+    free_requests = RectangleCover(sea_catalog, CoverCostModel(0.0))
+    assert free_requests.plan(two_clusters).wasted_cells == 0
+
+    one_box = RectangleCover(sea_catalog, CoverCostModel(1e9)).plan(two_clusters)
+    assert one_box.num_requests == 1
+    r = one_box.rects[0]
+    assert (r.j0, r.j1, r.i0, r.i1) == (2, 35, 3, 50)
+
+
+def test_moderate_cost_separates_clusters(sea_catalog, two_clusters):
+    model = CoverCostModel(request_cost=20.0)
+    plan = RectangleCover(sea_catalog, model).plan(two_clusters)
+    whole = model.cost(1, 33 * 47)
+
+    assert plan.cost < whole
+    assert 2 <= plan.num_requests < two_clusters.size
+    blocks = {(r.j0, r.j1, r.i0, r.i1) for r in plan.rects}
+    assert {(2, 7, 3, 8), (30, 35, 45, 50)} <= blocks
+
+
+def test_max_cells_caps_requests(sea_catalog):
+    ids = np.arange(20 * 60)  # 20 full rows
+    model = CoverCostModel(request_cost=1e6, max_cells=300)
+    plan = RectangleCover(sea_catalog, model).plan(ids)
+    assert all(r.cells <= 300 for r in plan.rects)
+    assert plan.wasted_cells == 0
+
+
+def test_empty_and_invalid(sea_catalog):
+    assert RectangleCover(sea_catalog, CoverCostModel(1.0)).plan([]).rects == []
+    with pytest.raises(ValueError):
+        CoverCostModel(-1.0)
+    with pytest.raises(ValueError):
+        CoverCostModel(1.0, max_cells=0)
+
+
+class _FakeCM:
+    def __init__(self):
+        self.calls = []
+
+    def subset(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+def test_requests_drive_subset_one(sea_catalog, two_clusters, tmp_path):
+    cover = RectangleCover(sea_catalog, CoverCostModel(20.0))
+    reqs = cover.requests(
+        two_clusters, start_datetime="2021-01-01", end_datetime="2021-01-07"
+    )
+    assert len({r.output_filename for r in reqs}) == len(reqs)
+
+    cm = _FakeCM()
+    client = CMSubsetClient(cm, "ds", ["thetao"])
+    for req in reqs:
+        client.subset_one(**req.kwargs(tmp_path))
+    assert len(cm.calls) == len(reqs)
+    assert cm.calls[0]["start_datetime"] == "2021-01-01"
+
+    # Each bbox selects exactly the rectangle's cell centers.
+    lons, lats = sea_catalog.grid.lons, sea_catalog.grid.lats
+    for req, rect in zip(reqs, cover.plan(two_clusters).rects):
+        min_lon, max_lon, min_lat, max_lat = req.bbox
+        cols = np.flatnonzero((lons >= min_lon) & (lons <= max_lon))
+        rows = np.flatnonzero((lats >= min_lat) & (lats <= max_lat))
+        assert (cols[0], cols[-1] + 1) == (rect.i0, rect.i1)
+        assert (rows[0], rows[-1] + 1) == (rect.j0, rect.j1)
@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def product_dir(tmp_path):
+    root = tmp_path / "data" / "product_x"
+    (root / "bbox_00" / "nc" / "00001").mkdir(parents=True)
+    (root / "bbox_00" / "csv" / "all").mkdir(parents=True)
+    (root / "bbox_00" / "nc" / "00001" / "2021-01-01.nc").write_bytes(
+        os.urandom(7 * 1024 * 1024)
+    )
+    (root / "bbox_00" / "nc" / "00001" / "2021-01-02.nc").write_bytes(
+        os.urandom(6 * 1024 * 1024)
+    )
+    (root / "bbox_00" / "csv" / "all" / "tiles.csv").write_text("a,b\n1,2\n" * 1000)
+    return root
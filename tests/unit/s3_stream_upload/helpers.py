@@ -0,0 +1,47 @@
+import threading
+import time
+
+
+class FakeS3:
+    """In-memory S3 stand-in for the multipart API (thread-safe)."""
+
+    def __init__(self, *, latency: float = 0.0, fail_part: int | None = None):
+        self.latency = latency
+        self.fail_part = fail_part
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.aborted: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"up-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            if PartNumber == self.fail_part:
+                raise ConnectionError(f"part {PartNumber} failed")
+            self.uploads[UploadId][PartNumber] = bytes(Body)
+            return {"ETag": f'"etag-{PartNumber}"'}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        numbers = [p["PartNumber"] for p in MultipartUpload["Parts"]]
+        assert numbers == sorted(parts), "parts must be listed in order"
+        self.objects[(Bucket, Key)] = b"".join(parts[n] for n in numbers)
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+        self.aborted.append(UploadId)
+        return {}
@@ -0,0 +1,100 @@
+import io
+import shutil
+import zipfile
+
+import pytest
+
+from src.app.archiver import ParallelZipArchiver
+from src.app.s3_stream_upload import (
+    MiB,
+    S3MultipartWriter,
+    stream_zip_dir_to_s3,
+)
+
+from .helpers import FakeS3
+
+
+def test_streamed_zip_matches_make_archive(product_dir, tmp_path):
+    s3 = FakeS3()
+    summary = stream_zip_dir_to_s3(
+        product_dir, s3, "bucket", "out/product_x.zip", part_size=5 * MiB
+    )
+    body = s3.objects[("bucket", "out/product_x.zip")]
+    assert summary.bytes_out == len(body)
+    assert summary.files == 3 and summary.parts >= 3
+    assert summary.stored == 2  # random .nc payloads do not deflate
+
+    reference = shutil.make_archive(
+        str(tmp_path / "ref"),
+        "zip",
+        root_dir=product_dir.parent,
+        base_dir=product_dir.name,
+    )
+    with zipfile.ZipFile(reference) as ref, zipfile.ZipFile(io.BytesIO(body)) as got:
+        assert sorted(got.namelist()) == sorted(ref.namelist())
+        assert got.testzip() is None
+        for name in ref.namelist():
+            assert got.read(name) == ref.read(name)
+
+
+def test_parts_are_bounded_and_uploaded_in_parallel(product_dir):
+    s3 = FakeS3(latency=0.5)
+    stream_zip_dir_to_s3(
+        product_dir,
+        s3,
+        "bucket",
+        "k.zip",
+        part_size=5 * MiB,
+        max_concurrency=3,
+        max_in_flight=3,
+        archiver=ParallelZipArchiver(level=1, workers=2),
+    )
+    assert 1 < s3.max_active <= 3
+    assert not s3.uploads and not s3.aborted
+
+
+def test_part_sizes_follow_s3_rules():
+    s3 = FakeS3()
+    with S3MultipartWriter(s3, "b", "k", part_size=5 * MiB) as w:
+        for _ in range(11):
+            w.write(b"x" * MiB)
+    assert w.num_parts == 3
+    assert s3.objects[("b", "k")] == b"x" * (11 * MiB)
+
+
+def test_empty_object_still_completes():
+    s3 = FakeS3()
+    with S3MultipartWriter(s3, "b", "k", part_size=5 * MiB):
+        pass
+    assert s3.objects[("b", "k")] == b""
+
+
+def test_failed_part_aborts_upload(product_dir):
+    s3 = FakeS3(fail_part=2)
+    with pytest.raises(ConnectionError):
+        stream_zip_dir_to_s3(product_dir, s3, "b", "k.zip", part_size=5 * MiB)
+    assert s3.aborted and not s3.objects and not s3.uploads
+
+
+def test_exception_in_block_aborts():
+    s3 = FakeS3()
+    with pytest.raises(RuntimeError):
+        with S3MultipartWriter(s3, "b", "k", part_size=5 * MiB) as w:
+            w.write(b"partial")
+            raise RuntimeError("producer failed")
+    assert s3.aborted and not s3.objects
+
+
+def test_invalid_settings(tmp_path):
+    with pytest.raises(ValueError):
+        S3MultipartWriter(FakeS3(), "b", "k", part_size=MiB)
+    with pytest.raises(ValueError):
+        stream_zip_dir_to_s3(tmp_path / "missing", FakeS3(), "b", "k")
+
+
+@pytest.mark.parametrize("step", [0, -0.5, 1.5])
+def test_progress_step_outside_unit_interval_is_rejected(product_dir, step):
+    s3 = FakeS3()
+    with pytest.raises(ValueError, match="progress_step"):
+        stream_zip_dir_to_s3(product_dir, s3, "b", "k", progress_step=step)
+    assert not s3.objects
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture
+def product_tree(tmp_path):
+    root = tmp_path / "data" / "product_x"
+    for tile in ("00001", "00002", "00003"):
+        d = root / "bbox_00" / "nc" / tile
+        d.mkdir(parents=True)
+        (d / "2021-01-01.nc").write_bytes(tile.encode() * 1000)
+    (root / "bbox_00" / "csv" / "all").mkdir(parents=True)
+    (root / "bbox_00" / "csv" / "all" / "tiles.csv").write_text("a,b\n1,2\n")
+    return root
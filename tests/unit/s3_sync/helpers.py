@@ -0,0 +1,72 @@
+import hashlib
+import threading
+
+
+class FakeS3Objects:
+    """In-memory S3 stand-in: put_object, multipart uploads, list_objects_v2."""
+
+    def __init__(self, page_size: int = 2, multipart_etags: bool = False):
+        self.page_size = page_size
+        self.multipart_etags = multipart_etags
+        self.objects: dict[str, bytes] = {}
+        self.puts: list[str] = []
+        self.multipart: dict[str, str] = {}  # key -> ETag of multipart objects
+        self._uploads: dict[str, dict[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def _etag(self, body: bytes) -> str:
+        md5 = hashlib.md5(body).hexdigest()
+        return f'"{md5[:20]}-2"' if self.multipart_etags else f'"{md5}"'
+
+    def put_object(self, Bucket, Key, Body):
+        data = Body.read()
+        with self._lock:
+            self.objects[Key] = data
+            self.multipart.pop(Key, None)
+            self.puts.append(Key)
+        return {"ETag": self._etag(data)}
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{len(self._uploads)}"
+        self._uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self._uploads[UploadId][PartNumber] = bytes(Body)
+        return {"ETag": f'"{hashlib.md5(Body).hexdigest()}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self._uploads.pop(UploadId)
+        numbers = [p["PartNumber"] for p in MultipartUpload["Parts"]]
+        data = b"".join(parts[n] for n in numbers)
+        digest = hashlib.md5(b"".join(hashlib.md5(parts[n]).digest() for n in numbers))
+        etag = f'"{digest.hexdigest()}-{len(numbers)}"'
+        with self._lock:
+            self.objects[Key] = data
+            self.multipart[Key] = etag
+            self.puts.append(Key)
+        return {"ETag": etag}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self._uploads.pop(UploadId, None)
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return self
+
+    def paginate(self, Bucket, Prefix):
+        keys = sorted(k for k in self.objects if k.startswith(Prefix))
+        for start in range(0, len(keys), self.page_size):
+            page = keys[start : start + self.page_size]
+            yield {
+                "Contents": [
+                    {
+                        "Key": k,
+                        "Size": len(self.objects[k]),
+                        "ETag": self.multipart.get(k) or self._etag(self.objects[k]),
+                    }
+                    for k in page
+                ]
+            }
+        if not keys:
+            yield {"KeyCount": 0}
@@ -0,0 +1,118 @@
+import logging
+import os
+
+import pytest
+
+from src.app.s3_sync import S3TreeSync, SyncManifest
+
+from .helpers import FakeS3Objects
+
+
+def _sync(s3, root, manifest_path, **kwargs):
+    manifest = SyncManifest(manifest_path)
+    return S3TreeSync(s3, "bucket", "out/product_x", manifest, **kwargs).sync(root)
+
+
+def test_first_sync_uploads_everything(product_tree, tmp_path):
+    s3 = FakeS3Objects()
+    summary = _sync(s3, product_tree, tmp_path / "m.json", max_concurrency=3)
+    assert summary.uploaded == 4 and summary.skipped == 0
+    assert set(s3.objects) == {
+        "out/product_x/bbox_00/nc/00001/2021-01-01.nc",
+        "out/product_x/bbox_00/nc/00002/2021-01-01.nc",
+        "out/product_x/bbox_00/nc/00003/2021-01-01.nc",
+        "out/product_x/bbox_00/csv/all/tiles.csv",
+    }
+    key = "out/product_x/bbox_00/csv/all/tiles.csv"
+    assert s3.objects[key] == b"a,b\n1,2\n"
+
+
+def test_refresh_only_moves_new_and_changed_files(product_tree, tmp_path):
+    s3 = FakeS3Objects()
+    manifest = tmp_path / "m.json"
+    _sync(s3, product_tree, manifest)
+    s3.puts.clear()
+
+    new_tile = product_tree / "bbox_00" / "nc" / "00004"
+    new_tile.mkdir()
+    (new_tile / "2021-01-01.nc").write_bytes(b"new")
+    (product_tree / "bbox_00" / "csv" / "all" / "tiles.csv").write_text("a,b\n3,4\n")
+    # Touched but identical content: rehashed, not re-uploaded.
+    touched = product_tree / "bbox_00" / "nc" / "00001" / "2021-01-01.nc"
+    os.utime(touched, ns=(1, 1))
+
+    summary = _sync(s3, product_tree, manifest)
+    assert summary.uploaded == 2 and summary.skipped == 3
+    assert sorted(s3.puts) == [
+        "out/product_x/bbox_00/csv/all/tiles.csv",
+        "out/product_x/bbox_00/nc/00004/2021-01-01.nc",
+    ]
+
+
+def test_manifest_etag_covers_multipart_etags(product_tree, tmp_path):
+    s3 = FakeS3Objects(multipart_etags=True)
+    manifest = tmp_path / "m.json"
+    _sync(s3, product_tree, manifest)
+    s3.puts.clear()
+    assert _sync(s3, product_tree, manifest).uploaded == 0
+
+    # Without a manifest the multipart ETag cannot be verified: re-upload.
+    assert _sync(s3, product_tree, tmp_path / "fresh.json").uploaded == 4
+
+
+def test_remote_changes_are_detected(product_tree, tmp_path):
+    s3 = FakeS3Objects()
+    manifest = tmp_path / "m.json"
+    _sync(s3, product_tree, manifest)
+    s3.objects["out/product_x/bbox_00/csv/all/tiles.csv"] = b"tampered"
+    del s3.objects["out/product_x/bbox_00/nc/00002/2021-01-01.nc"]
+    s3.objects["out/product_x/old/file.nc"] = b"stale"
+
+    summary = _sync(s3, product_tree, manifest)
+    assert summary.uploaded == 2 and summary.remote_only == 1
+    assert "out/product_x/old/file.nc" in s3.objects  # never deleted
+
+
+def test_always_put_policy(product_tree, tmp_path):
+    s3 = FakeS3Objects()
+    manifest = tmp_path / "m.json"
+    _sync(s3, product_tree, manifest)
+    assert _sync(s3, product_tree, manifest, policy="always_put").uploaded == 4
+    with pytest.raises(ValueError):
+        _sync(s3, product_tree, manifest, policy="sometimes")
+
+
+def test_progress_is_logged_per_step(product_tree, tmp_path, caplog):
+    with caplog.at_level(logging.INFO):
+        _sync(FakeS3Objects(), product_tree, tmp_path / "m.json", progress_step=0.25)
+    steps = [r.getMessage() for r in caplog.records if "S3 sync: " in r.getMessage()]
+    assert steps[-1] == "S3 sync: 100%"
+    assert len(steps) <= 4
+
+
+@pytest.mark.parametrize("step", [0, -0.25, 1.5])
+def test_progress_step_outside_unit_interval_is_rejected(tmp_path, step):
+    with pytest.raises(ValueError, match="progress_step"):
+        S3TreeSync(
+            FakeS3Objects(), "b", "p", SyncManifest(tmp_path / "m"), progress_step=step
+        )
+
+
+def test_large_files_go_multipart(product_tree, tmp_path):
+    big = product_tree / "bbox_00" / "nc" / "00001" / "big.nc"
+    big.write_bytes(os.urandom(11 * 1024 * 1024))
+    s3 = FakeS3Objects()
+    manifest = tmp_path / "m.json"
+    mib = 1024 * 1024
+    summary = _sync(
+        s3, product_tree, manifest, multipart_threshold=5 * mib, part_size=5 * mib
+    )
+    key = "out/product_x/bbox_00/nc/00001/big.nc"
+    assert summary.uploaded == 5
+    assert s3.objects[key] == big.read_bytes()
+    assert s3.multipart[key].endswith('-3"')  # 5 MiB parts: 5 + 5 + 1
+    assert set(s3.multipart) == {key}  # small files still use put_object
+
+    # The multipart ETag is kept in the manifest, so a refresh skips the file.
+    s3.puts.clear()
+    assert _sync(s3, product_tree, manifest).uploaded == 0
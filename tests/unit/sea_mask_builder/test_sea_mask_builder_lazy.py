@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from src.bounding_box.bounding_box import BoundingBox
+from src.data_processing.sea_mask_builder import SeaMaskBuilder
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 64])
+def test_lazy_matches_build_on_mock_cases(
+    chunk_rows, mock_bitwise_case, mock_categorical_case
+):
+    for ds, expected, builder in (
+        (
+            *mock_bitwise_case,
+            SeaMaskBuilder(mask_name="mask", is_bit=True, sea_value=1),
+        ),
+        (*mock_categorical_case, SeaMaskBuilder(mask_name="mask", is_bit=False)),
+    ):
+        got = builder.build_lazy(ds, chunk_rows=chunk_rows)
+        assert got.dtype == bool
+        assert np.array_equal(got, expected)
+        assert np.array_equal(got, builder.build(ds))
+
+
+@pytest.mark.parametrize(
+    "path_fixture, is_bit, sea_value",
+    [("sst_embedded_mask_path", True, 1), ("sst_static_mask_path", False, None)],
+)
+def test_lazy_matches_build_on_real_files(request, path_fixture, is_bit, sea_value):
+    path = request.getfixturevalue(path_fixture)
+    builder = SeaMaskBuilder(mask_name="mask", is_bit=is_bit, sea_value=sea_value)
+    with xr.open_dataset(path) as ds:
+        lazy = builder.build_lazy(ds, chunk_rows=3)
+        eager = builder.build(ds.load())
+    assert np.array_equal(lazy, eager)
+
+
+def test_packed_round_trip(sst_static_mask_path):
+    builder = SeaMaskBuilder(mask_name="mask", is_bit=False, sea_value=1)
+    with xr.open_dataset(sst_static_mask_path) as ds:
+        sea = builder.build_lazy(ds, chunk_rows=5)
+        packed = builder.build_lazy(ds, chunk_rows=5, packed=True)
+
+    assert packed.dtype == np.uint8
+    assert packed.shape == (sea.shape[0], (sea.shape[1] + 7) // 8)
+    assert np.array_equal(SeaMaskBuilder.unpack(packed, sea.shape[1]), sea)
+
+
+def test_region_reads_sub_window(sst_static_mask_path):
+    builder = SeaMaskBuilder(mask_name="mask", is_bit=False, sea_value=1)
+    with xr.open_dataset(sst_static_mask_path) as ds:
+        lats = ds["latitude"].values
+        lons = ds["longitude"].values
+        region = BoundingBox(
+            min_lon=float(lons[3]),
+            max_lon=float(lons[10]),
+            min_lat=float(lats[2]),
+            max_lat=float(lats[7]),
+        )
+        got = builder.build_lazy(ds, region=region, chunk_rows=4)
+        full = builder.build(ds)
+
+    assert got.shape == (6, 8)
+    assert np.array_equal(got, full[2:8, 3:11])
+
+
+def test_region_with_lat_lon_dim_names(sst_static_mask_path):
+    with xr.open_dataset(sst_static_mask_path) as ds:
+        full = SeaMaskBuilder(mask_name="mask", is_bit=False, sea_value=1).build(ds)
+        short = ds.rename(latitude="lat", longitude="lon")
+        region = BoundingBox(
+            min_lon=float(short["lon"][3]),
+            max_lon=float(short["lon"][10]),
+            min_lat=float(short["lat"][2]),
+            max_lat=float(short["lat"][7]),
+        )
+        builder = SeaMaskBuilder(
+            mask_name="mask", is_bit=False, sea_value=1, lat_name="lat", lon_name="lon"
+        )
+        got = builder.build_lazy(short, region=region, chunk_rows=4)
+
+    assert np.array_equal(got, full[2:8, 3:11])
+
+
+def test_region_outside_grid_raises(mock_categorical_case):
+    ds, _ = mock_categorical_case
+    ds = ds.assign_coords(latitude=[0.0, 1.0], longitude=np.arange(5.0))
+    builder = SeaMaskBuilder(mask_name="mask", is_bit=False)
+    with pytest.raises(ValueError):
+        builder.build_lazy(ds, region=BoundingBox(50.0, 60.0, 50.0, 60.0))
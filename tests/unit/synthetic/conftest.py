@@ -0,0 +1,27 @@
+import pytest
+
+from src.app.synthetic import SyntheticOcean, SyntheticSpec, write_synthetic_project
+
+
+@pytest.fixture(scope="session")
+def small_spec() -> SyntheticSpec:
+    """24x18 cells, 5 days, surface-to-shelf depth levels, icy north."""
+    return SyntheticSpec(
+        nx=24,
+        ny=18,
+        depths=(0.5, 10.0, 50.0, 200.0, 1000.0),
+        days=5,
+        ice_lat=42.7,
+        seed=7,
+    )
+
+
+@pytest.fixture(scope="session")
+def ocean(small_spec) -> SyntheticOcean:
+    return SyntheticOcean(small_spec)
+
+
+@pytest.fixture(scope="session")
+def project(ocean, tmp_path_factory):
+    root = tmp_path_factory.mktemp("synthetic_project")
+    return write_synthetic_project(root, ocean, n_hauls=120, grounds=4)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from src.app.layout import ProjectLayout
+from src.app.synthetic import (
+    MASK_ICE,
+    MASK_LAKE,
+    MASK_SEA,
+    PACKED_FILL,
+    SyntheticOcean,
+    SyntheticSpec,
+    write_dataset,
+)
+from src.data_processing.sea_mask_builder import SeaMaskBuilder
+
+
+def test_spec_validation():
+    with pytest.raises(ValueError, match="2x2"):
+        SyntheticSpec(nx=1)
+    with pytest.raises(ValueError, match="increasing"):
+        SyntheticSpec(depths=(5.0, 1.0))
+    with pytest.raises(ValueError, match="Unknown variables"):
+        SyntheticSpec(variables=("chl",))
+
+
+def test_equal_specs_give_equal_data(small_spec):
+    a, b = SyntheticOcean(small_spec), SyntheticOcean(small_spec)
+    other = SyntheticOcean(SyntheticSpec(nx=24, ny=18, seed=8))
+    np.testing.assert_array_equal(a.mask_bits(), b.mask_bits())
+    np.testing.assert_array_equal(a.fields(3)["thetao"], b.fields(3)["thetao"])
+    pd.testing.assert_frame_equal(a.hauls(50), b.hauls(50))
+    assert not np.array_equal(a.coast, other.coast)
+
+
+def test_static_layer_has_the_bit_semantics_sea_mask_builder_expects(ocean, tmp_path):
+    path = write_dataset(ocean.static_dataset(), tmp_path / "static.nc")
+    with xr.open_dataset(path, mask_and_scale=False) as raw:
+        assert raw["mask"].dtype == np.int8
+        assert raw["mask"].attrs["_FillValue"] == -128
+        assert raw["latitude"].attrs["units"] == "degrees_north"
+        assert raw["depth"].attrs["positive"] == "down"
+        bits = raw["mask"].values
+    assert (bits[0][ocean.sea] & MASK_SEA).all()
+    assert ((bits[0] & MASK_LAKE) != 0).sum() == ocean.spec.lakes
+    assert ((bits[0] & MASK_ICE) != 0).any()
+
+    builder = SeaMaskBuilder(mask_name="mask", is_bit=True, sea_value=MASK_SEA)
+    with xr.open_dataset(path) as ds:
+        np.testing.assert_array_equal(builder.build(ds), ocean.sea)
+        # Deeper levels keep only the cells whose sea floor is below them.
+        deep = builder.build(ds.isel(depth=slice(-1, None)))
+    np.testing.assert_array_equal(deep, ocean.sea & (ocean.seabed >= 1000.0))
+
+
+def test_data_is_packed_with_cf_attributes_and_fill_on_land(ocean, tmp_path):
+    ds = ocean.dataset(1, 2)
+    path = write_dataset(ds, tmp_path / "data.nc")
+    with xr.open_dataset(path, mask_and_scale=False) as raw:
+        t = raw["thetao"]
+        assert t.dims == ("time", "depth", "latitude", "longitude")
+        assert t.dtype == np.int16
+        assert t.attrs["_FillValue"] == PACKED_FILL
+        assert t.attrs["standard_name"] == "sea_water_potential_temperature"
+        assert (t.values[:, 0][:, ~ocean.sea] == PACKED_FILL).all()
+    with xr.open_dataset(path) as decoded:
+        np.testing.assert_allclose(
+            decoded["thetao"].values, ds["thetao"].values, atol=1e-3, equal_nan=True
+        )
+        assert str(decoded["time"].values[0])[:10] == "2020-01-02"
+    surface = ds["thetao"].values[:, 0][:, ocean.sea]
+    assert np.isfinite(surface).all() and 5 < surface.mean() < 25
+
+
+def test_zarr_output_or_a_clear_missing_dependency_error(ocean, tmp_path):
+    try:
+        import zarr  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="zarr"):
+            write_dataset(ocean.dataset(0, 1), tmp_path / "d.zarr", fmt="zarr")
+        return
+    path = write_dataset(ocean.dataset(0, 1), tmp_path / "d.zarr", fmt="zarr")
+    with xr.open_zarr(path) as ds:
+        assert ds["so"].shape[0] == 1
+
+
+def test_hauls_cluster_along_the_coast(ocean):
+    spec = ocean.spec
+    hauls = ocean.hauls(2000, grounds=5, on_land_fraction=0.05)
+    assert list(hauls.columns) == ["haul_id", "time", "lat", "lon", "depth"]
+    assert hauls["haul_id"].is_unique and (hauls["depth"] >= 5).all()
+    j = np.rint((hauls["lat"] - spec.min_lat) / spec.step).astype(int)
+    i = np.rint((hauls["lon"] - spec.min_lon) / spec.step).astype(int)
+    offshore = ocean.coast[j] - i  # cells from the coast; <= 0 on land
+    assert np.median(offshore) <= 6
+    assert 0 < (offshore <= 0).mean() < 0.15
+    days = hauls["time"].dt.floor("D")
+    assert days.min() >= pd.Timestamp(spec.start)
+    assert days.max() < pd.Timestamp(spec.start) + pd.Timedelta(days=spec.days)
+
+
+def test_project_tree_matches_the_layout_and_tile_days(project, ocean):
+    tile_days = pd.read_csv(project.tile_days_path)
+    layout = ProjectLayout(project.root / "output")
+    files = sorted(project.product_root.glob("*/nc/*/*.nc"))
+    assert project.nc_files == len(files) == len(tile_days)
+    for bbox_dir in {f.parents[2] for f in files}:
+        assert layout.csv_all_dir(project.product, bbox_dir.name).is_dir()
+
+    row = tile_days.iloc[0]
+    tile = str(int(row["tile_id"])).zfill(5)
+    day = row["time"][:10]
+    (path,) = [f for f in files if f.parent.name == tile and f.stem == day]
+    assert path == layout.nc_path(project.product, path.parents[2].name, tile, day)
+    with xr.open_dataset(path) as ds:
+        assert ds["thetao"].shape[0] == 1 and ds.sizes["latitude"] == 1
+        assert float(ds["longitude"][0]) == pytest.approx(row["tile_lon_center"])
+        assert float(ds["latitude"][0]) == pytest.approx(row["tile_lat_center"])
+        assert float(ds["depth"].max()) <= max(row["deepest_depth"], 0.5)
+        assert np.isfinite(ds["thetao"].isel(depth=0).values).all()
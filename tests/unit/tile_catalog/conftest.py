@@ -28,3 +28,17 @@ def mock_sea_land_mask() -> np.ndarray:
         ],
         dtype=bool,
     )
+
+
+@pytest.fixture
+def real_grid_3x3():
+    """A concrete GridSpec (not a Mock) so the catalog can be persisted."""
+    from src.data_processing.grid_spec import GridSpec
+
+    return GridSpec(
+        lon_name="longitude",
+        lat_name="latitude",
+        lons=np.array([100.0, 200.0, 300.0]),
+        lats=np.array([10.0, 20.0, 30.0]),
+        grid_hash="test-hash",
+    )
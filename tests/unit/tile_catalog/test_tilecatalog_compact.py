@@ -0,0 +1,89 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from src.data_processing.tile_catalog import TileCatalog
+from tests.unit.tile_catalog import helpers
+
+
+def test_compact_dtypes(mock_grid_fields, mock_sea_land_mask) -> None:
+    catalog = TileCatalog(
+        grid=Mock(**mock_grid_fields), sea_land_mask=mock_sea_land_mask
+    )
+
+    assert catalog.tile_id_map.dtype == np.int32
+    assert catalog._sea_j.dtype == np.int16
+    assert catalog._sea_i.dtype == np.int16
+    assert catalog.sea_tile_ids().dtype == np.int32
+
+
+def test_sea_tile_ids_cached_and_read_only(
+    mock_grid_fields, mock_sea_land_mask
+) -> None:
+    catalog = TileCatalog(
+        grid=Mock(**mock_grid_fields), sea_land_mask=mock_sea_land_mask
+    )
+
+    ids = catalog.sea_tile_ids()
+    assert ids is catalog.sea_tile_ids()
+    with pytest.raises(ValueError):
+        ids[0] = 99
+
+
+def test_sea_flat_index_matches_tile_id_map(
+    mock_grid_fields, mock_sea_land_mask
+) -> None:
+    catalog = TileCatalog(
+        grid=Mock(**mock_grid_fields), sea_land_mask=mock_sea_land_mask
+    )
+
+    flat = catalog.sea_flat_index()
+    expected = np.flatnonzero(catalog.tile_id_map.ravel(order="C") >= 0)
+    assert np.array_equal(flat, expected)
+    assert np.array_equal(catalog.tile_id_map.ravel()[flat], helpers.expected_ids())
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(tmp_path, real_grid_3x3, mock_sea_land_mask, mmap):
+    original = TileCatalog(grid=real_grid_3x3, sea_land_mask=mock_sea_land_mask)
+    original.save(tmp_path / "catalog")
+
+    loaded = TileCatalog.load(tmp_path / "catalog", mmap=mmap)
+
+    assert loaded.grid.grid_hash == real_grid_3x3.grid_hash
+    assert np.array_equal(loaded.tile_id_map, original.tile_id_map)
+    assert np.array_equal(loaded.sea_tile_ids(), original.sea_tile_ids())
+    assert np.array_equal(loaded.sea_flat_index(), original.sea_flat_index())
+    for k, (ej, ei) in helpers.expected_ij().items():
+        assert loaded.sea_cell_ids(k) == (ej, ei)
+        assert loaded.sea_cell_coords(k) == original.sea_cell_coords(k)
+    if mmap:
+        assert isinstance(loaded.tile_id_map, np.memmap)
+        assert not loaded.tile_id_map.flags.writeable
+        assert isinstance(loaded.sea_flat_index(), np.memmap)  # not recomputed
+
+
+def test_load_recomputes_flat_index_of_older_catalogs(
+    tmp_path, real_grid_3x3, mock_sea_land_mask
+):
+    original = TileCatalog(grid=real_grid_3x3, sea_land_mask=mock_sea_land_mask)
+    original.save(tmp_path / "catalog")
+    (tmp_path / "catalog" / "sea_flat_idx.npy").unlink()
+
+    loaded = TileCatalog.load(tmp_path / "catalog")
+    assert np.array_equal(loaded.sea_flat_index(), original.sea_flat_index())
+
+
+def test_sea_cell_ids_many_returns_intp(real_grid_3x3, mock_sea_land_mask):
+    catalog = TileCatalog(grid=real_grid_3x3, sea_land_mask=mock_sea_land_mask)
+    j, i = catalog.sea_cell_ids_many(catalog.sea_tile_ids())
+
+    assert catalog._sea_j.dtype == np.int16  # compact storage ...
+    assert j.dtype == i.dtype == np.intp  # ... widened for callers
+    assert np.array_equal(j * real_grid_3x3.nx + i, catalog.sea_flat_index())
+
+
+def test_load_missing_directory_raises(tmp_path) -> None:
+    with pytest.raises(FileNotFoundError):
+        TileCatalog.load(tmp_path / "nope")
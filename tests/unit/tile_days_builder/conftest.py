@@ -0,0 +1,13 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def random_pairs():
+    rng = np.random.default_rng(5)
+    n = 3000
+    days = pd.Timestamp("2020-01-01", tz="UTC") + pd.to_timedelta(
+        rng.integers(0, 60, n), unit="D"
+    )
+    return pd.DataFrame({"tile_id": rng.integers(0, 40, n), "time": days})
@@ -0,0 +1,49 @@
+import re
+
+import pandas as pd
+import pytest
+
+from src.data_processing.tile_days_builder import TileDaysBuilder
+
+
+def _enriched(pairs: pd.DataFrame) -> pd.DataFrame:
+    return pairs.assign(
+        tile_lon_center=pairs["tile_id"] * 0.1,
+        tile_lat_center=40.0,
+        depth=10.0,
+    )
+
+
+def _pairs(df: pd.DataFrame) -> set:
+    return set(map(tuple, df[["tile_id", "time"]].to_numpy()))
+
+
+def test_build_per_day_coverage_holds(random_pairs):
+    per_day = TileDaysBuilder().build_per_day(_enriched(random_pairs))
+    assert len(per_day) == len(random_pairs.drop_duplicates())
+    assert _pairs(per_day) == _pairs(random_pairs)
+
+
+def test_string_times_cover_the_same_days(random_pairs):
+    raw = random_pairs.assign(time=random_pairs["time"].dt.strftime("%d/%m/%Y"))
+    per_day = TileDaysBuilder().build_per_day(_enriched(raw))
+    assert _pairs(per_day) == _pairs(random_pairs)
+
+
+def test_coverage_mismatch_is_reported(random_pairs, monkeypatch):
+    # Simulate a de-duplication bug that loses every other tile-day.
+    dedup = pd.DataFrame.drop_duplicates
+    monkeypatch.setattr(
+        pd.DataFrame,
+        "drop_duplicates",
+        lambda self, *args, **kwargs: dedup(self, *args, **kwargs).iloc[::2],
+    )
+    unique = len(dedup(random_pairs))
+
+    with pytest.raises(AssertionError, match="Mismatch") as info:
+        TileDaysBuilder().build_per_day(_enriched(random_pairs))
+
+    message = str(info.value)
+    assert f"missing={unique - (unique + 1) // 2} extra=0" in message
+    examples = re.search(r"missing_examples=(\[.*?\]) extra", message).group(1)
+    assert examples.count("Timestamp(") == 10  # capped
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+
+def _table(rows):
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "tile_id",
+            "tile_lon_center",
+            "tile_lat_center",
+            "time",
+            "deepest_depth",
+        ],
+    )
+
+
+@pytest.fixture
+def previous_tiles():
+    # As read back from the previous run's CSV: times are strings.
+    return _table(
+        [
+            (1, -9.0, 43.0, "2024-01-01 00:00:00+00:00", 50.0),
+            (1, -9.0, 43.0, "2024-01-02 00:00:00+00:00", 50.0),
+            (2, -8.0, 43.0, "2024-01-01 00:00:00+00:00", 30.0),
+            (3, -7.0, 43.0, "2024-01-01 00:00:00+00:00", 10.0),
+        ]
+    )
+
+
+@pytest.fixture
+def current_tiles():
+    # Freshly built: typed UTC days; tile 1 got a deeper haul, tile 3 vanished.
+    t = pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-08"], utc=True)
+    return _table(
+        [
+            (1, -9.0, 43.0, t[0], 80.0),
+            (1, -9.0, 43.0, t[1], 80.0),
+            (1, -9.0, 43.0, t[2], 80.0),
+            (2, -8.0, 43.0, t[0], 30.0),
+            (2, -8.0, 43.0, t[2], 30.0),
+            (4, -6.0, 43.0, t[2], 5.0),
+        ]
+    )
@@ -0,0 +1,92 @@
+import os
+from datetime import date
+
+import pytest
+
+from src.app.jobs import DownloadJob
+from src.app.nc_to_csv_batch_converter import NCTileToCSVBatchConverter
+from src.app.orchestrator import BBoxSpec, TileDayOrchestrator
+from src.app.scheduler import _prepare_target
+from src.data_processing.tile_days_delta import TileDaysDelta
+
+
+def _pairs(df):
+    return sorted(zip(df["tile_id"], df["time"].dt.strftime("%Y-%m-%d")))
+
+
+def test_diff_new_and_deepened(previous_tiles, current_tiles):
+    diff = TileDaysDelta().diff(previous_tiles, current_tiles)
+
+    assert _pairs(diff.new) == [(1, "2024-01-08"), (2, "2024-01-08"), (4, "2024-01-08")]
+    assert _pairs(diff.deepened) == [(1, "2024-01-01"), (1, "2024-01-02")]
+    assert diff.summary() == {"new": 3, "deepened": 2, "removed": 1}
+
+    plan = diff.plan()
+    assert plan["refresh"].tolist() == [False, False, False, True, True]
+
+
+def test_depth_tolerance_and_no_changes(previous_tiles, current_tiles):
+    diff = TileDaysDelta(depth_tol=40.0).diff(previous_tiles, current_tiles)
+    assert diff.deepened.empty
+
+    same = TileDaysDelta().diff(current_tiles, current_tiles)
+    assert same.plan().empty and same.removed == 0
+
+
+def test_diff_validates_input(previous_tiles, current_tiles):
+    with pytest.raises(KeyError):
+        TileDaysDelta().diff(
+            previous_tiles.drop(columns="deepest_depth"), current_tiles
+        )
+    previous_tiles.loc[0, "time"] = "not a day"
+    with pytest.raises(ValueError, match="Unparseable dates"):
+        TileDaysDelta().diff(previous_tiles, current_tiles)
+    with pytest.raises(ValueError):
+        TileDaysDelta(depth_tol=-1.0)
+
+
+def test_plan_flows_into_refresh_jobs(previous_tiles, current_tiles):
+    plan = TileDaysDelta().diff(previous_tiles, current_tiles).plan()
+    orch = TileDayOrchestrator("ds", ["thetao"], spatial_resolution_deg=0.083)
+    jobs = orch.build_jobs(plan, [BBoxSpec("b0", -10.0, 42.0, -5.0, 44.0)])
+
+    refreshed = sorted((j.tile_id_padded, j.day) for j in jobs if j.refresh)
+    assert refreshed == [("00001", date(2024, 1, 1)), ("00001", date(2024, 1, 2))]
+    assert all(j.z_max == 80.0 for j in jobs if j.tile_id_padded == "00001")
+
+
+def test_prepare_target_overwrites_only_refresh_jobs(tmp_path):
+    nc = tmp_path / "2024-01-01.nc"
+    nc.write_bytes(b"old")
+    job = DownloadJob(
+        "b0",
+        "00001",
+        0.0,
+        0.0,
+        date(2024, 1, 1),
+        0.6,
+        80.0,
+        (0.0, 0.0, 0.0, 0.0),
+        "ds",
+        ("thetao",),
+    )
+    assert _prepare_target(job, nc) is False and nc.exists()
+
+    refresh = DownloadJob(**{**job.__dict__, "refresh": True})
+    # the old file stays until the new download replaces it
+    assert _prepare_target(refresh, nc) is True and nc.read_bytes() == b"old"
+
+
+def test_converter_reconverts_tiles_with_newer_netcdf(tmp_path):
+    out_csv = tmp_path / "00001.csv"
+    nc = tmp_path / "2024-01-08.nc"
+    nc.write_bytes(b"nc")
+    assert NCTileToCSVBatchConverter._is_stale(out_csv, [nc])  # missing CSV
+
+    out_csv.write_text("time\n")
+    os.utime(nc, (1_000, 1_000))
+    assert not NCTileToCSVBatchConverter._is_stale(out_csv, [nc])
+
+    os.utime(nc, None)  # a new/refreshed day lands after the last conversion
+    os.utime(out_csv, (1_000, 1_000))
+    assert NCTileToCSVBatchConverter._is_stale(out_csv, [nc])
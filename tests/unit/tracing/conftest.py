@@ -0,0 +1,16 @@
+import pytest
+
+from src.app import tracing
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tracing.enable_tracing(tmp_path / "spans.jsonl")
+    yield path
+    tracing.disable_tracing()
+
+
+@pytest.fixture
+def no_tracing(monkeypatch):
+    tracing.disable_tracing()
+    monkeypatch.delenv(tracing.TRACE_FILE_ENV, raising=False)
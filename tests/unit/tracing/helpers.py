@@ -0,0 +1,9 @@
+from src.app.tracing import span
+
+
+def traced_square(task):
+    """Process-pool task: opens a span linked to the submitting span."""
+    n, parent_id = task
+    with span("worker.square", parent_id=parent_id, n=n) as s:
+        s.set(result=n * n)
+    return n * n
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.app import tracing
+from src.app.tracing import annotate, current_span_id, span, traced
+
+from .helpers import traced_square
+
+
+def _by_name(path):
+    out = {}
+    for rec in tracing.read_spans(path):
+        out.setdefault(rec["name"], []).append(rec)
+    return out
+
+
+def test_nested_spans_record_parents_and_attrs(trace_file):
+    with span("outer", bbox_id="bbox_1") as outer:
+        with span("inner", tile_id=38) as inner:
+            inner.set(rows=10)
+            annotate(bytes=123)
+        outer.set(tiles=1)
+
+    spans = _by_name(trace_file)
+    [o], [i] = spans["outer"], spans["inner"]
+    assert o["parent_id"] is None
+    assert i["parent_id"] == o["span_id"]
+    assert o["attrs"] == {"bbox_id": "bbox_1", "tiles": 1}
+    assert i["attrs"] == {"tile_id": 38, "rows": 10, "bytes": 123}
+    assert o["start_us"] <= i["start_us"]
+    assert o["dur_us"] >= i["dur_us"] >= 0
+    assert o["pid"] == os.getpid()
+
+
+def test_failed_span_records_the_error(trace_file):
+    with pytest.raises(ValueError):
+        with span("boom"):
+            raise ValueError("bad tile")
+    [rec] = tracing.read_spans(trace_file)
+    assert rec["error"] == "ValueError: bad tile"
+
+
+def test_asyncio_tasks_keep_their_own_parent(trace_file):
+    async def tile(tile_id):
+        with span("tile", tile_id=tile_id):
+            await asyncio.sleep(0.01)
+            with span("day", tile_id=tile_id):
+                await asyncio.sleep(0.01)
+
+    async def main():
+        with span("download"):
+            await asyncio.gather(tile(1), tile(2))
+
+    asyncio.run(main())
+    spans = _by_name(trace_file)
+    [root] = spans["download"]
+    tiles = {r["attrs"]["tile_id"]: r for r in spans["tile"]}
+    assert {r["parent_id"] for r in tiles.values()} == {root["span_id"]}
+    for day in spans["day"]:
+        assert day["parent_id"] == tiles[day["attrs"]["tile_id"]]["span_id"]
+
+
+def test_threads_do_not_share_the_current_span(trace_file):
+    seen = {}
+
+    def work(k):
+        seen[k] = current_span_id()
+        with span("thread", k=k):
+            pass
+
+    with span("main"):
+        threads = [threading.Thread(target=work, args=(k,)) for k in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert set(seen.values()) == {None}  # new threads start without a parent
+    assert len(_by_name(trace_file)["thread"]) == 3
+
+
+def test_worker_process_spans_land_in_the_same_file(trace_file):
+    with span("submit") as parent:
+        tasks = [(n, parent.span_id) for n in range(4)]
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(traced_square, tasks)) == [0, 1, 4, 9]
+
+    spans = _by_name(trace_file)
+    workers = spans["worker.square"]
+    assert len(workers) == 4
+    assert {r["parent_id"] for r in workers} == {parent.span_id}
+    assert all(r["pid"] != os.getpid() for r in workers)
+    assert len({r["span_id"] for r in tracing.read_spans(trace_file)}) == 5
+
+
+def test_traced_logs_and_spans(trace_file, caplog):
+    @traced("convert")
+    def convert(x):
+        return x + 1
+
+    @traced("download")
+    async def download(x):
+        return x * 2
+
+    with caplog.at_level(logging.INFO):
+        assert convert(1) == 2
+        assert asyncio.run(download(2)) == 4
+    assert "convert: start" in caplog.text and "download: done in" in caplog.text
+    assert convert.__name__ == "convert"
+    assert set(_by_name(trace_file)) == {"convert", "download"}
+
+
+def test_disabled_tracing_is_cheap_and_silent(no_tracing, tmp_path):
+    assert tracing._active() is None
+    t0 = time.perf_counter()
+    for _ in range(20_000):
+        with span("x", tile_id=1) as s:
+            s.set(rows=1)
+    assert time.perf_counter() - t0 < 2.0
+    assert current_span_id() is None
+
+
+def test_chrome_trace_export(trace_file, tmp_path):
+    with span("stage", workers=2):
+        with span("step", rows=5):
+            pass
+    out = tracing.export_chrome_trace(trace_file, tmp_path / "trace.json")
+    doc = json.loads(out.read_text())
+    events = doc["traceEvents"]
+    assert [e["name"] for e in events] == ["stage", "step"]
+    assert all(e["ph"] == "X" for e in events)
+    assert events[1]["args"] == {"rows": 5}